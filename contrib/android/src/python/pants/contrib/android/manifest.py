@@ -0,0 +1,28 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'unpack-jars': ['unpack-libs'],
+  'gen': ['aapt'],
+  'binary': ['dex'],
+  'apk': ['apk'],
+  'sign': ['sign'],
+  'bundle': ['zipalign'],
+}
+
+BUILD_FILE_ALIASES = [
+  'android_binary',
+  'android_dependency',
+  'android_library',
+  'android_resources',
+]
+
+SUBSYSTEMS = [
+  'pants.backend.jvm.subsystems.java.Java',
+  'pants.backend.jvm.subsystems.jvm_platform.JvmPlatform',
+]
@@ -6,16 +6,38 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+import re
+import time
+from hashlib import sha1
+from multiprocessing import cpu_count
 
 from pants.base.build_environment import get_buildroot
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
-from pants.util.dirutil import safe_mkdir_for
+from pants.source.file_digests import FileDigestCache
+from pants.util.dirutil import safe_delete, safe_file_dump, safe_mkdir_for
 
 from pants.contrib.cpp.tasks.cpp_task import CppTask
 
 
+# A make rule target or prerequisite: a run of characters other than whitespace, where a backslash
+# escapes the character that follows it.
+_MAKE_WORD = re.compile(r'(?:\\.|[^\s\\])+')
+
+
+def parse_depfile(content):
+  """Returns the prerequisites of the make rule in a dependency file written by `gcc -MMD`."""
+  _, _, prerequisites = content.replace('\\\n', ' ').partition(': ')
+  return [re.sub(r'\\(.)', r'\1', word) for word in _MAKE_WORD.findall(prerequisites)]
+
+
 class CppCompile(CppTask):
-  """Compile C++ sources into object files."""
+  """Compile C++ sources into object files.
+
+  Sources are compiled concurrently. Each object is accompanied by the list of headers it
+  depends on, as written by the compiler, and by a hash of the content of all of its inputs. When a
+  target is invalidated, only those of its objects with changed inputs are recompiled.
+  """
 
   @classmethod
   def register_options(cls, register):
@@ -26,6 +48,9 @@ class CppCompile(CppTask):
              default=['.cc', '.cxx', '.cpp'],
              help=('The list of extensions to consider when determining if a file is a '
                    'C++ source file.'))
+    register('--worker-count', advanced=True, type=int, default=None,
+             help='The number of source files to compile concurrently. Defaults to the CPU count '
+                  'of the machine the task runs on.')
 
   @classmethod
   def product_types(cls):
@@ -35,6 +60,16 @@ class CppCompile(CppTask):
   def cache_target_dirs(self):
     return True
 
+  @property
+  def incremental(self):
+    return True
+
+  @property
+  def cache_incremental(self):
+    # Whether an object is reused depends only on the content of its inputs, so an incremental
+    # build produces the same objects as a clean one.
+    return True
+
   def execute(self):
     """Compile all sources in a given target to object files."""
 
@@ -47,19 +82,25 @@ class CppCompile(CppTask):
     # Compile source files to objects.
     with self.invalidated(targets, invalidate_dependents=True) as invalidation_check:
       obj_mapping = self.context.products.get('objs')
+      stale = []
       for vt in invalidation_check.all_vts:
         for source in vt.target.sources_relative_to_buildroot():
           if is_cc(source):
-            if not vt.valid:
-              with self.context.new_workunit(name='cpp-compile', labels=[WorkUnitLabel.MULTITOOL]):
-                # TODO: Parallelise the compilation.
-                # TODO: Only recompile source files that have changed since the
-                #       object file was last written. Also use the output from
-                #       gcc -M to track dependencies on headers.
-                self._compile(vt.target, vt.results_dir, source)
+            if not vt.valid and self._needs_compile(vt.target, vt.results_dir, source):
+              stale.append((vt.target, vt.results_dir, source))
             objpath = self._objpath(vt.target, vt.results_dir, source)
             obj_mapping.add(vt.target, vt.results_dir).append(objpath)
 
+      if stale:
+        with self.context.new_workunit(name='cpp-compile',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          worker_pool = WorkerPool(workunit, self.context.run_tracker,
+                                   self.get_options().worker_count or cpu_count())
+          try:
+            worker_pool.submit_work_and_wait(Work(self._compile, stale))
+          finally:
+            worker_pool.shutdown()
+
   def _objpath(self, target, results_dir, source):
     abs_source_root = os.path.join(get_buildroot(), target.target_base)
     abs_source = os.path.join(get_buildroot(), source)
@@ -69,27 +110,94 @@ class CppCompile(CppTask):
 
     return os.path.join(results_dir, obj_name)
 
-  def _compile(self, target, results_dir, source):
-    """Compile given source to an object file."""
-    obj = self._objpath(target, results_dir, source)
-    safe_mkdir_for(obj)
+  def _depfile(self, obj):
+    return obj + '.d'
 
-    abs_source = os.path.join(get_buildroot(), source)
+  def _inputs_hash_file(self, obj):
+    return obj + '.inputs'
 
+  def _include_dirs(self, target):
     # TODO: include dir should include dependent work dir when headers are copied there.
+    # NB: These are relative to the buildroot, where the compiler runs, so that the headers found
+    # under them are listed relative to the buildroot in depfiles too.
     include_dirs = []
     for dep in target.dependencies:
       if self.is_library(dep):
-        include_dirs.extend([os.path.join(get_buildroot(), dep.target_base)])
+        include_dirs.append(dep.target_base)
+    return include_dirs
+
+  def _compile_options(self, target):
+    """Returns the compiler options for the given target's sources, besides input and output."""
+    options = ['-I{0}'.format(i) for i in self._include_dirs(target)]
+    options.extend(self.get_options().cc_options)
+    return options
+
+  def _inputs(self, depfile):
+    """Returns the absolute paths of the inputs listed in the given depfile."""
+    with open(depfile, 'rb') as fp:
+      return sorted(set(os.path.join(get_buildroot(), path) for path in parse_depfile(fp.read())))
+
+  def _inputs_hash(self, target, source, inputs):
+    """Returns a hash of the compile options and of the content of every input of an object.
+
+    Input paths are hashed relative to the buildroot, so that the hash is the same in any checkout.
+
+    :raises: :class:`OSError` if any of the inputs no longer exists.
+    """
+    hasher = sha1()
+    hasher.update(self.cpp_toolchain.compiler)
+    hasher.update(source)
+    for option in self._compile_options(target):
+      hasher.update(option)
+    for path, digest in zip(inputs, FileDigestCache.global_instance().digest_many(inputs)):
+      hasher.update(os.path.relpath(path, get_buildroot()))
+      hasher.update(digest)
+    return hasher.hexdigest()
+
+  def _needs_compile(self, target, results_dir, source):
+    """Whether the object for the given source is missing, or any of its inputs have changed."""
+    obj = self._objpath(target, results_dir, source)
+    depfile = self._depfile(obj)
+    inputs_hash_file = self._inputs_hash_file(obj)
+    if not all(os.path.exists(path) for path in (obj, depfile, inputs_hash_file)):
+      return True
+    with open(inputs_hash_file, 'rb') as fp:
+      previous_hash = fp.read().strip()
+    try:
+      return previous_hash != self._inputs_hash(target, source, self._inputs(depfile))
+    except (IOError, OSError):
+      # An input has been removed.
+      return True
+
+  def _compile(self, target, results_dir, source):
+    """Compile given source to an object file."""
+    obj = self._objpath(target, results_dir, source)
+    safe_mkdir_for(obj)
+    depfile = self._depfile(obj)
+    inputs_hash_file = self._inputs_hash_file(obj)
+    safe_delete(inputs_hash_file)
 
+    # NB: `-MMD` leaves system headers out of the depfile, and the compiler runs in the buildroot
+    # so that the source and the headers found under relative include dirs are listed relative to
+    # it.
     cmd = [self.cpp_toolchain.compiler]
     cmd.extend(['-c'])
-    cmd.extend(('-I{0}'.format(i) for i in include_dirs))
-    cmd.extend(['-o' + obj, abs_source])
-    cmd.extend(self.get_options().cc_options)
+    cmd.extend(['-MMD', '-MF', depfile])
+    cmd.extend(['-o' + obj, source])
+    cmd.extend(self._compile_options(target))
 
-    # TODO: submit_async_work with self.run_command, [(cmd)] as a Work object.
+    # Truncated to the second, in case the filesystem only records mtimes to the second.
+    start = int(time.time())
     with self.context.new_workunit(name='cpp-compile', labels=[WorkUnitLabel.COMPILER]) as workunit:
-      self.run_command(cmd, workunit)
+      self.run_command(cmd, workunit, cwd=get_buildroot())
+
+    # Record the inputs of the object, so that it can be reused until any of them change. An input
+    # modified since the compile started may have been read either before or after the change: the
+    # hash is not recorded then, and the object will be recompiled by the next run.
+    inputs = self._inputs(depfile)
+    if any(os.path.getmtime(path) >= start for path in inputs):
+      self.context.log.debug('Inputs of {} changed while compiling it.'.format(obj))
+    else:
+      safe_file_dump(inputs_hash_file, self._inputs_hash(target, source, inputs))
 
     self.context.log.info('Built c++ object: {0}'.format(obj))
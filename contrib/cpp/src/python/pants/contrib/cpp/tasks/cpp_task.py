@@ -38,11 +38,12 @@ class CppTask(Task):
   def execute(self):
     raise NotImplementedError('execute must be implemented by subclasses of CppTask')
 
-  def run_command(self, cmd, workunit):
+  def run_command(self, cmd, workunit, cwd=None):
     try:
       self.context.log.debug('Executing: {0}'.format(cmd))
       # TODO: capture stdout/stderr and redirect to log
-      subprocess.check_call(cmd, stdout=workunit.output('stdout'), stderr=workunit.output('stderr'))
+      subprocess.check_call(cmd, stdout=workunit.output('stdout'), stderr=workunit.output('stderr'),
+                            cwd=cwd)
     except subprocess.CalledProcessError as e:
       raise TaskError('Execution failed: {0}'.format(e))
 
@@ -0,0 +1,84 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import time
+import unittest
+from distutils.spawn import find_executable
+
+from pants_test.tasks.task_test_base import TaskTestBase
+
+from pants.contrib.cpp.targets.cpp_library import CppLibrary
+from pants.contrib.cpp.tasks.cpp_compile import CppCompile, parse_depfile
+
+
+class ParseDepfileTest(unittest.TestCase):
+  def test_parse_depfile(self):
+    content = ('/out/a.o: /src/a\\ b.cc /usr/include/stdc-predef.h /src/h.h \\\n'
+               ' /src/other.h\n')
+    self.assertEqual(['/src/a b.cc', '/usr/include/stdc-predef.h', '/src/h.h', '/src/other.h'],
+                     parse_depfile(content))
+
+
+class RecordingCppCompile(CppCompile):
+  compiled = []
+
+  def _compile(self, target, results_dir, source):
+    self.compiled.append(source)
+    super(RecordingCppCompile, self)._compile(target, results_dir, source)
+
+
+@unittest.skipIf(not find_executable('g++'), 'g++ is required to compile c++ sources.')
+class CppCompileTest(TaskTestBase):
+  @classmethod
+  def task_type(cls):
+    return RecordingCppCompile
+
+  def setUp(self):
+    super(CppCompileTest, self).setUp()
+    del RecordingCppCompile.compiled[:]
+    self._mtime = int(time.time()) - 100
+
+  def create_source(self, relpath, contents):
+    # Inputs modified while their object compiles aren't recorded, so sources are backdated.
+    self.create_file(relpath, contents)
+    self._mtime += 1
+    os.utime(os.path.join(self.build_root, relpath), (self._mtime, self._mtime))
+
+  def compile(self, target):
+    self.set_options(compiler='g++', worker_count=2)
+    context = self.context(target_roots=[target])
+    self.create_task(context).execute()
+    return context.products.get('objs')
+
+  def test_only_changed_sources_recompiled(self):
+    self.create_source('src/cpp/lib/h.h', '#define X 1\n')
+    self.create_source('src/cpp/lib/a.cc', '#include "h.h"\nint a() { return X; }\n')
+    self.create_source('src/cpp/lib/b.cc', 'int b() { return 2; }\n')
+    target = self.make_target('src/cpp/lib', CppLibrary, sources=['a.cc', 'b.cc', 'h.h'])
+
+    objs = self.compile(target)
+    self.assertEqual({'src/cpp/lib/a.cc', 'src/cpp/lib/b.cc'}, set(RecordingCppCompile.compiled))
+    for results_dir, paths in objs.get(target).items():
+      self.assertEqual(2, len(paths))
+      for path in paths:
+        self.assertTrue(os.path.isfile(path))
+        with open('{}.d'.format(path)) as fp:
+          for dep in parse_depfile(fp.read()):
+            self.assertTrue(dep.startswith('src/cpp/lib/'))
+
+    del RecordingCppCompile.compiled[:]
+    self.create_source('src/cpp/lib/b.cc', 'int b() { return 3; }\n')
+    target.mark_invalidation_hash_dirty()
+    self.compile(target)
+    self.assertEqual(['src/cpp/lib/b.cc'], RecordingCppCompile.compiled)
+
+    del RecordingCppCompile.compiled[:]
+    self.create_source('src/cpp/lib/h.h', '#define X 2\n')
+    target.mark_invalidation_hash_dirty()
+    self.compile(target)
+    self.assertEqual(['src/cpp/lib/a.cc'], RecordingCppCompile.compiled)
@@ -0,0 +1,29 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'gen': ['go-thrift'],
+  'buildgen': ['go'],
+  'go': ['go'],
+  'go-env': ['go-env'],
+  'resolve': ['go'],
+  'compile': ['go'],
+  'binary': ['go'],
+  'run': ['go'],
+  'lint': ['go'],
+  'test': ['go'],
+  'fmt': ['go'],
+}
+
+BUILD_FILE_ALIASES = [
+  'go_binary',
+  'go_library',
+  'go_remote_libraries',
+  'go_remote_library',
+  'go_thrift_library',
+]
@@ -0,0 +1,30 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'repl': ['node'],
+  'resolve': ['node'],
+  'run': ['node'],
+  'compile': ['node'],
+  'test': ['node'],
+  'bundle': ['node'],
+}
+
+BUILD_FILE_ALIASES = [
+  'node_bundle',
+  'node_module',
+  'node_preinstalled_module',
+  'node_remote_module',
+  'node_test',
+]
+
+SUBSYSTEMS = [
+  ('pants.contrib.node.subsystems.resolvers.node_preinstalled_module_resolver.'
+   'NodePreinstalledModuleResolver'),
+  'pants.contrib.node.subsystems.resolvers.npm_resolver.NpmResolver',
+]
@@ -0,0 +1,21 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'resolve': ['scala-js-compile', 'scala-js-link'],
+}
+
+BUILD_FILE_ALIASES = [
+  'scala_js_binary',
+  'scala_js_library',
+]
+
+SUBSYSTEMS = [
+  'pants.backend.jvm.subsystems.jvm_platform.JvmPlatform',
+  'pants.contrib.scalajs.subsystems.scala_js_platform.ScalaJSPlatform',
+]
@@ -127,6 +127,7 @@ class ScroogeGen(SimpleCodegenTask, NailgunTask):
   @memoized_method
   def _target_type_for_language(self, language):
     alias_for_lang = self._registered_language_aliases()[language]
+    self.context.build_file_parser.resolve_deferred_alias(alias_for_lang)
     registered_aliases = self.context.build_file_parser.registered_aliases()
     target_types = registered_aliases.target_types_by_alias.get(alias_for_lang, None)
     if not target_types:
@@ -181,9 +181,13 @@ class PantsPlugin(PythonLibrary):
                                     description,
                                     additional_classifiers=additional_classifiers)
 
+    sources = ['register.py']
+    if os.path.exists(os.path.join(get_buildroot(), address.spec_path, 'manifest.py')):
+      sources.append('manifest.py')
+
     super(PantsPlugin, self).__init__(address,
                                       payload,
-                                      sources=['register.py'],
+                                      sources=sources,
                                       provides=setup_py,
                                       **kwargs)
 
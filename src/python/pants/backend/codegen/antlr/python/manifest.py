@@ -0,0 +1,15 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'gen': ['antlr-py'],
+}
+
+BUILD_FILE_ALIASES = [
+  'python_antlr_library',
+]
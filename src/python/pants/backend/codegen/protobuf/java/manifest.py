@@ -0,0 +1,20 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'gen': ['protoc'],
+}
+
+BUILD_FILE_ALIASES = [
+  'java_protobuf_library',
+]
+
+SUBSYSTEMS = [
+  'pants.backend.jvm.subsystems.java.Java',
+  'pants.backend.jvm.subsystems.jvm_platform.JvmPlatform',
+]
@@ -0,0 +1,19 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'markdown': ['markdown'],
+  'reference': ['reference'],
+}
+
+BUILD_FILE_ALIASES = [
+  'ConfluencePublish',
+  'Wiki',
+  'page',
+  'wiki_artifact',
+]
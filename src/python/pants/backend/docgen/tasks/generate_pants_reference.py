@@ -78,7 +78,7 @@ class GeneratePantsReference(Task):
     })
 
   def _gen_build_dictionary(self):
-    buildfile_aliases = self.context.build_file_parser.registered_aliases()
+    buildfile_aliases = self.context.build_file_parser.registered_aliases(resolve_deferred=True)
     extracter = BuildDictionaryInfoExtracter(buildfile_aliases)
     target_type_infos = extracter.get_target_type_info()
     other_infos = sorted(extracter.get_object_info() + extracter.get_object_factory_info())
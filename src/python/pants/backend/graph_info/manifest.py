@@ -0,0 +1,35 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'list': ['list'],
+  'path': ['path'],
+  'paths': ['paths'],
+  'pathdeps': ['pathdeps'],
+  'dependees': ['dependees'],
+  'filemap': ['filemap'],
+  'minimize': ['minimize'],
+  'filter': ['filter'],
+  'sort': ['sort'],
+  'cloc': ['cloc'],
+  'list-owners': ['list-owners'],
+}
+
+INDEPENDENT_GOALS = [
+  'list',
+  'path',
+  'paths',
+  'pathdeps',
+  'dependees',
+  'filemap',
+  'minimize',
+  'filter',
+  'sort',
+  'cloc',
+  'list-owners',
+]
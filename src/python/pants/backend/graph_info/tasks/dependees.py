@@ -9,6 +9,7 @@ import json
 from collections import defaultdict
 
 from pants.base.specs import DescendantAddresses
+from pants.build_graph.dependees_index import DependeesIndex
 from pants.task.console_task import ConsoleTask
 
 
@@ -33,15 +34,18 @@ class ReverseDepmap(ConsoleTask):
     self._closed = self.get_options().closed
 
   def console_output(self, _):
-    dependees_by_target = defaultdict(set)
-    for address in self.context.build_graph.inject_specs_closure([DescendantAddresses('')]):
-      target = self.context.build_graph.get_target(address)
-      # TODO(John Sirois): tighten up the notion of targets written down in a BUILD by a
-      # user vs. targets created by pants at runtime.
-      concrete_target = self.get_concrete_target(target)
-      for dependency in concrete_target.dependencies:
-        dependency = self.get_concrete_target(dependency)
-        dependees_by_target[dependency].add(concrete_target)
+    dependees_index = DependeesIndex.global_instance()
+    if dependees_index:
+      dependees_index.update(self.context.address_mapper, self.context.build_graph)
+
+      def get_dependent_addresses(roots):
+        return dependees_index.dependees_of([root.address for root in roots],
+                                            transitive=self._transitive)
+    else:
+      dependees_by_target = self.get_dependees_by_target()
+
+      def get_dependent_addresses(roots):
+        return [dependent.address for dependent in self.get_dependents(dependees_by_target, roots)]
 
     roots = set(self.context.target_roots)
     if self.get_options().output_format == 'json':
@@ -49,8 +53,8 @@ class ReverseDepmap(ConsoleTask):
       for root in roots:
         if self._closed:
           deps[root.address.spec].append(root.address.spec)
-        for dependent in self.get_dependents(dependees_by_target, [root]):
-          deps[root.address.spec].append(dependent.address.spec)
+        for address in get_dependent_addresses([root]):
+          deps[root.address.spec].append(address.spec)
       for address in deps.keys():
         deps[address].sort()
       yield json.dumps(deps, indent=4, separators=(',', ': '), sort_keys=True)
@@ -59,8 +63,20 @@ class ReverseDepmap(ConsoleTask):
         for root in roots:
           yield root.address.spec
 
-      for dependent in self.get_dependents(dependees_by_target, roots):
-        yield dependent.address.spec
+      for address in get_dependent_addresses(roots):
+        yield address.spec
+
+  def get_dependees_by_target(self):
+    dependees_by_target = defaultdict(set)
+    for address in self.context.build_graph.inject_specs_closure([DescendantAddresses('')]):
+      target = self.context.build_graph.get_target(address)
+      # TODO(John Sirois): tighten up the notion of targets written down in a BUILD by a
+      # user vs. targets created by pants at runtime.
+      concrete_target = self.get_concrete_target(target)
+      for dependency in concrete_target.dependencies:
+        dependency = self.get_concrete_target(dependency)
+        dependees_by_target[dependency].add(concrete_target)
+    return dependees_by_target
 
   def get_dependents(self, dependees_by_target, roots):
     check = set(roots)
@@ -8,7 +8,8 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import json
 
 from pants.base.exceptions import TaskError
-from pants.build_graph.source_mapper import LazySourceMapper
+from pants.build_graph.source_mapper import IndexedSourceMapper, LazySourceMapper
+from pants.build_graph.source_owners_index import SourceOwnersIndex
 from pants.task.console_task import ConsoleTask
 
 
@@ -35,12 +36,17 @@ class ListOwners(ConsoleTask):
     sources = self.get_passthru_args()
     if not sources:
       raise TaskError('No source was specified')
-    lazy_source_mapper = LazySourceMapper(self.context.address_mapper, self.context.build_graph)
+    source_owners_index = SourceOwnersIndex.global_instance()
+    if source_owners_index:
+      source_mapper = IndexedSourceMapper(source_owners_index, self.context.address_mapper,
+                                          self.context.build_graph)
+    else:
+      source_mapper = LazySourceMapper(self.context.address_mapper, self.context.build_graph)
     owner_info = {}
+    target_addresses_for_sources = source_mapper.target_addresses_for_sources(sources)
     for source in sources:
       owner_info[source] = []
-      target_addresses_for_source = lazy_source_mapper.target_addresses_for_source(source)
-      for address in target_addresses_for_source:
+      for address in target_addresses_for_sources[source]:
         owner_info[source].append(address.spec)
     if self.get_options().output_format == 'json':
       yield json.dumps(owner_info, indent=4, separators=(',', ': '))
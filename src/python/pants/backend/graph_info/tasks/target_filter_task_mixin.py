@@ -26,6 +26,7 @@ class TargetFilterTaskMixin(Task):
     :raises :class:`TargetFilterTaskMixin.InvalidTargetType`: when no target types correspond to
                                                               the given `alias`.
     """
+    self.context.build_file_parser.resolve_deferred_alias(alias)
     registered_aliases = self.context.build_file_parser.registered_aliases()
     target_types = registered_aliases.target_types_by_alias.get(alias, None)
     if not target_types:
@@ -22,6 +22,8 @@ from pants.backend.jvm.subsystems.jar_dependency_management import (JarDependenc
                                                                     PinnedJarArtifactSet)
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.base.generator import Generator, TemplateData
+from pants.base.hash_utils import hash_file
+from pants.base.payload_field import stable_json_sha1
 from pants.base.revision import Revision
 from pants.build_graph.target import Target
 from pants.ivy.bootstrapper import Bootstrapper
@@ -180,7 +182,8 @@ class IvyFetchStep(IvyResolutionStep):
                                  symlink_map,
                                  self.hash_name,
                                  self.workdir_reports_by_conf,
-                                 frozen_resolutions)
+                                 frozen_resolutions,
+                                 cache_parsed_reports=True)
 
   def _do_fetch(self, executor, extra_args, frozen_resolution, jvm_options, workunit_name,
                         workunit_factory):
@@ -227,7 +230,8 @@ class IvyResolveStep(IvyResolutionStep):
     return IvyResolveResult(artifact_paths,
                             symlink_map,
                             self.hash_name,
-                            self.workdir_reports_by_conf)
+                            self.workdir_reports_by_conf,
+                            cache_parsed_reports=True)
 
   def exec_and_load(self, executor, extra_args, targets, jvm_options,
                        workunit_name, workunit_factory):
@@ -377,11 +381,22 @@ class IvyResolveResult(object):
   and the targets that requested them and the hash name of the resolve.
   """
 
-  def __init__(self, resolved_artifact_paths, symlink_map, resolve_hash_name, reports_by_conf):
+  def __init__(self, resolved_artifact_paths, symlink_map, resolve_hash_name, reports_by_conf,
+               cache_parsed_reports=False):
+    """
+    :param list resolved_artifact_paths: The paths of the resolved artifacts.
+    :param dict symlink_map: A map from the paths of resolved artifacts to the symlinks to them.
+    :param string resolve_hash_name: The hash name of the resolve, or None if there was none.
+    :param dict reports_by_conf: A map from ivy conf to the path of the xml report for it.
+    :param bool cache_parsed_reports: `True` to keep the modules parsed from the reports in sidecar
+                                      files next to them.
+    """
     self._reports_by_conf = reports_by_conf
     self.resolved_artifact_paths = resolved_artifact_paths
     self.resolve_hash_name = resolve_hash_name
     self._symlink_map = symlink_map
+    self._cache_parsed_reports = cache_parsed_reports
+    self._ivy_info_by_conf = {}
 
   @property
   def has_resolved_artifacts(self):
@@ -443,8 +458,12 @@ class IvyResolveResult(object):
     return target.jar_dependencies
 
   def _ivy_info_for(self, conf):
-    report_path = self._reports_by_conf.get(conf)
-    return IvyUtils.parse_xml_report(conf, report_path)
+    ivy_info = self._ivy_info_by_conf.get(conf)
+    if ivy_info is None:
+      report_path = self._reports_by_conf.get(conf)
+      ivy_info = IvyUtils.parse_xml_report(conf, report_path, cache=self._cache_parsed_reports)
+      self._ivy_info_by_conf[conf] = ivy_info
+    return ivy_info
 
   def _new_resolved_jar_with_symlink_path(self, conf, target, resolved_jar_without_symlink):
     def candidate_cache_paths():
@@ -481,9 +500,10 @@ class IvyFetchResolveResult(IvyResolveResult):
   """A resolve result that uses the frozen resolution to look up dependencies."""
 
   def __init__(self, resolved_artifact_paths, symlink_map, resolve_hash_name, reports_by_conf,
-               frozen_resolutions):
+               frozen_resolutions, cache_parsed_reports=False):
     super(IvyFetchResolveResult, self).__init__(resolved_artifact_paths, symlink_map,
-                                                resolve_hash_name, reports_by_conf)
+                                                resolve_hash_name, reports_by_conf,
+                                                cache_parsed_reports=cache_parsed_reports)
     self._frozen_resolutions = frozen_resolutions
 
   def _jar_dependencies_for_target(self, conf, target):
@@ -510,6 +530,187 @@ class IvyResolveMappingError(Exception):
   """Raised when there is a failure mapping the ivy resolve results to pants objects."""
 
 
+class IvyResolutionIndex(object):
+  """An index of the resolves run in an ivy workdir, by the jars, excludes and overrides requested.
+
+  A resolve of a set of jars can be answered by projecting an earlier resolve of a superset of those
+  jars, with the same excludes and overrides, so long as Ivy evicted no module in the earlier
+  resolve: with no version conflicts to settle, the modules resolved for each jar of the subset
+  are those of the superset reachable from that jar. Only resolves that evicted no module are
+  recorded, and records are dropped once the files of their resolves are gone.
+
+  A projection is stored in the workdir of the resolve it answers, as though ivy had run it, so
+  that it is loaded, frozen and cached like any other resolve.
+  """
+
+  _VERSION = 1
+
+  # Protects the index file against concurrent updates from this process.
+  _lock = threading.Lock()
+
+  def __init__(self, global_ivy_workdir):
+    """
+    :param string global_ivy_workdir: The workdir that all ivy outputs live in.
+    """
+    self._global_ivy_workdir = global_ivy_workdir
+    self._path = os.path.join(global_ivy_workdir, 'resolution-index.json')
+
+  @staticmethod
+  def _request(resolve_step, targets, extra_args):
+    """Returns the key shared by resolves that can answer for each other, and the jars resolved."""
+    jars, global_excludes = IvyUtils.calculate_classpath(targets)
+    if resolve_step.soft_excludes:
+      global_excludes = []
+    key = stable_json_sha1(dict(
+      excludes=sorted((exclude.org, exclude.name) for exclude in global_excludes),
+      overrides=list(PinnedJarArtifactSet(resolve_step.pinned_artifacts).id),
+      extra_args=list(extra_args or ()),
+    ))
+    return key, {jar.cache_key(): bool(jar.force) for jar in jars}
+
+  def _load(self):
+    try:
+      with open(self._path, 'r') as fp:
+        index = json.load(fp)
+    except (IOError, OSError, ValueError):
+      return {}
+    if index.get('version') != self._VERSION:
+      return {}
+    return index['resolves']
+
+  def _save(self, resolves):
+    try:
+      with safe_concurrent_creation(self._path) as tmp_path:
+        with open(tmp_path, 'w') as fp:
+          json.dump(dict(version=self._VERSION, resolves=resolves), fp)
+    except (IOError, OSError) as e:
+      logger.warn('Failed to update the ivy resolution index at {}: {}'.format(self._path, e))
+
+  def _recorded_step(self, resolve_step, hash_name, confs):
+    return IvyResolveStep(tuple(confs),
+                          hash_name,
+                          resolve_step.pinned_artifacts,
+                          resolve_step.soft_excludes,
+                          resolve_step.ivy_cache_dir,
+                          self._global_ivy_workdir)
+
+  def record(self, resolve_step, targets, extra_args=None):
+    """Records the resolve just run by the given step for the given targets.
+
+    Records of resolves whose files no longer exist are dropped.
+
+    :param resolve_step: The step that ran the resolve.
+    :type resolve_step: :class:`IvyResolveStep`
+    :param targets: The targets resolved.
+    :param extra_args: The extra command line arguments passed to ivy.
+    """
+    for report in resolve_step.workdir_reports_by_conf.values():
+      if IvyUtils.report_has_evictions(report):
+        logger.debug('Not indexing resolve {}, which evicted modules.'
+                     .format(resolve_step.hash_name))
+        return
+
+    key, jars = self._request(resolve_step, targets, extra_args)
+    with self._lock:
+      resolves = {hash_name: resolve for hash_name, resolve in self._load().items()
+                  if self._recorded_step(resolve_step, hash_name,
+                                         resolve['confs']).required_load_files_exist()}
+      resolves[resolve_step.hash_name] = dict(key=key, confs=list(resolve_step.confs), jars=jars)
+      self._save(resolves)
+
+  def project(self, resolve_step, targets, extra_args=None):
+    """Answers the resolve of the given step from a recorded resolve of a superset of its jars.
+
+    The projection is stored in the workdir of the given step, as its resolve.
+
+    :param resolve_step: The step that would run the resolve.
+    :type resolve_step: :class:`IvyResolveStep`
+    :param targets: The targets to resolve.
+    :param extra_args: The extra command line arguments to pass to ivy.
+    :returns: The result loaded from the stored projection, or None if no recorded resolve can
+              answer for this one.
+    :rtype: :class:`IvyResolveResult`
+    """
+    with self._lock:
+      resolves = self._load()
+    if not resolves:
+      return None
+
+    key, jars = self._request(resolve_step, targets, extra_args)
+    confs = set(resolve_step.confs)
+
+    def answers(resolve):
+      # Any jar forced only in the superset may have overridden the revision of a module the
+      # subset depends on.
+      return (resolve['key'] == key and
+              confs.issubset(resolve['confs']) and
+              all(jar in resolve['jars'] for jar in jars) and
+              not any(force for jar, force in resolve['jars'].items() if jar not in jars))
+
+    # The smallest superset has the smallest reports to parse.
+    candidates = sorted((len(resolve['jars']), hash_name)
+                        for hash_name, resolve in resolves.items()
+                        if hash_name != resolve_step.hash_name and answers(resolve))
+    gone = []
+    try:
+      for _, hash_name in candidates:
+        superset_step = self._recorded_step(resolve_step, hash_name, resolves[hash_name]['confs'])
+        if not superset_step.required_load_files_exist():
+          gone.append(hash_name)
+          continue
+        superset_result = superset_step.load(targets)
+        if not superset_result.all_linked_artifacts_exist():
+          continue
+
+        reports_by_conf = {conf: superset_step.workdir_reports_by_conf[conf]
+                           for conf in resolve_step.confs}
+        projection = IvyResolveResult([], superset_result._symlink_map, hash_name, reports_by_conf)
+        pants_paths = set()
+        try:
+          for conf in resolve_step.confs:
+            for _, resolved_jars in projection.resolved_jars_for_each_target(conf, targets):
+              pants_paths.update(resolved_jar.pants_path for resolved_jar in resolved_jars)
+        except (IvyResolveMappingError, IvyUtils.IvyError) as e:
+          logger.debug('Failed to project resolve {} from resolve {}: {}'
+                       .format(resolve_step.hash_name, hash_name, e))
+          continue
+
+        logger.debug('Projected resolve {} from resolve {}.'.format(resolve_step.hash_name,
+                                                                    hash_name))
+        return self._store_projection(resolve_step, targets, superset_step, superset_result,
+                                      pants_paths)
+      return None
+    finally:
+      if gone:
+        with self._lock:
+          resolves = self._load()
+          for hash_name in gone:
+            resolves.pop(hash_name, None)
+          self._save(resolves)
+
+  @staticmethod
+  def _store_projection(resolve_step, targets, superset_step, superset_result, pants_paths):
+    """Stores the projection of the given superset resolve as the resolve of the given step."""
+    # The superset's reports answer for the subset, since the subset's modules are found by
+    # traversing them from its own jars.
+    safe_mkdir(resolve_step.workdir)
+    for conf in resolve_step.confs:
+      atomic_copy(superset_step.workdir_reports_by_conf[conf],
+                  resolve_step.workdir_reports_by_conf[conf])
+    # Written last, since it marks the resolve as complete.
+    cache_path_by_symlink = {symlink: path for path, symlink in superset_result._symlink_map.items()}
+    with safe_concurrent_creation(resolve_step.ivy_cache_classpath_filename) as tmp_path:
+      with safe_open(tmp_path, 'w') as fp:
+        fp.write(os.pathsep.join(cache_path_by_symlink.get(path, path)
+                                 for path in superset_result.resolved_artifact_paths
+                                 if path in pants_paths))
+
+    result = resolve_step.load(targets)
+    frozen_resolutions_by_conf = result.get_frozen_resolutions_by_conf(targets)
+    FrozenResolution.dump_to_file(resolve_step.frozen_resolve_file, frozen_resolutions_by_conf)
+    return result
+
+
 class IvyModuleRef(object):
   """
   :API: public
@@ -885,13 +1086,31 @@ class IvyUtils(object):
                                                          resolve_hash_name, conf))
 
   @classmethod
-  def parse_xml_report(cls, conf, path):
+  def report_has_evictions(cls, path):
+    """Returns True if the ivy xml report at the given path records any evicted module revision.
+
+    :param string path: The path to the ivy report file.
+    :raises: :class:`IvyResolveReportError` if no report exists.
+    """
+    if not os.path.exists(path):
+      raise cls.IvyResolveReportError('Missing expected ivy output file {}'.format(path))
+    for _, element in ET.iterparse(path):
+      if element.tag == 'revision' and element.get('evicted'):
+        return True
+      element.clear()
+    return False
+
+  @classmethod
+  def parse_xml_report(cls, conf, path, cache=False):
     """Parse the ivy xml report corresponding to the name passed to ivy.
 
     :API: public
 
     :param string conf: the ivy conf name (e.g. "default")
     :param string path: The path to the ivy report file.
+    :param bool cache: `True` to keep the modules parsed from the report in a sidecar file next to
+                       it, and to load them from there rather than parse the report again while
+                       the report is unchanged.
     :returns: The info in the xml report.
     :rtype: :class:`IvyInfo`
     :raises: :class:`IvyResolveMappingError` if no report exists.
@@ -899,33 +1118,105 @@ class IvyUtils(object):
     if not os.path.exists(path):
       raise cls.IvyResolveReportError('Missing expected ivy output file {}'.format(path))
 
-    logger.debug("Parsing ivy report {}".format(path))
+    parsed = None
+    if cache:
+      digest = hash_file(path)
+      parsed = cls._load_parsed_xml_report(path, digest)
+    if parsed is None:
+      logger.debug("Parsing ivy report {}".format(path))
+      parsed = cls._parse_xml_report_modules(path)
+      if cache:
+        cls._save_parsed_xml_report(path, digest, parsed)
+
+    refs, modules = parsed
+    ivy_module_refs = [IvyModuleRef(*ref) for ref in refs]
     ret = IvyInfo(conf)
-    etree = ET.parse(path)
-    doc = etree.getroot()
-    for module in doc.findall('dependencies/module'):
-      org = module.get('organisation')
-      name = module.get('name')
-      for revision in module.findall('revision'):
-        rev = revision.get('name')
-        callers = []
-        for caller in revision.findall('caller'):
-          callers.append(IvyModuleRef(caller.get('organisation'),
-                                      caller.get('name'),
-                                      caller.get('callerrev')))
-
-        for artifact in revision.findall('artifacts/artifact'):
-          classifier = artifact.get('extra-classifier')
-          ext = artifact.get('ext')
-          ivy_module_ref = IvyModuleRef(org=org, name=name, rev=rev,
-                                        classifier=classifier, ext=ext)
-
-          artifact_cache_path = artifact.get('location')
-          ivy_module = IvyModule(ivy_module_ref, artifact_cache_path, tuple(callers))
-
-          ret.add_module(ivy_module)
+    for ref_id, artifact_cache_path, caller_ids in modules:
+      callers = tuple(ivy_module_refs[caller_id] for caller_id in caller_ids)
+      ret.add_module(IvyModule(ivy_module_refs[ref_id], artifact_cache_path, callers))
     return ret
 
+  @classmethod
+  def _parse_xml_report_modules(cls, path):
+    """Streams the modules out of the ivy xml report at the given path.
+
+    :returns: A list of the distinct module refs in the report, as lists of their fields, and a
+              list of its module artifacts, as lists of the index of their ref, their path and the
+              indexes of the refs of their callers.
+    """
+    refs = []
+    ids_by_ref = {}
+
+    def ref_id(*ref):
+      existing = ids_by_ref.get(ref)
+      if existing is not None:
+        return existing
+      ids_by_ref[ref] = len(refs)
+      refs.append(list(ref))
+      return ids_by_ref[ref]
+
+    modules = []
+    tags = []
+    org = name = rev = None
+    callers = []
+    artifacts = []
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+      if event == 'start':
+        tags.append(element.tag)
+        if tags[1:] == ['dependencies', 'module']:
+          org = element.get('organisation')
+          name = element.get('name')
+        elif tags[1:] == ['dependencies', 'module', 'revision']:
+          rev = element.get('name')
+          callers = []
+          artifacts = []
+        continue
+
+      if tags[1:] == ['dependencies', 'module', 'revision', 'caller']:
+        callers.append(ref_id(element.get('organisation'), element.get('name'),
+                              element.get('callerrev'), None, None))
+      elif tags[1:] == ['dependencies', 'module', 'revision', 'artifacts', 'artifact']:
+        artifacts.append((element.get('extra-classifier'), element.get('ext'),
+                          element.get('location')))
+      elif tags[1:] == ['dependencies', 'module', 'revision']:
+        for classifier, ext, artifact_cache_path in artifacts:
+          modules.append([ref_id(org, name, rev, classifier, ext), artifact_cache_path, callers])
+      elif tags[1:] == ['dependencies', 'module']:
+        # Modules are not revisited, so drop them to keep the parse in constant memory.
+        element.clear()
+      tags.pop()
+    return refs, modules
+
+  _PARSED_XML_REPORT_VERSION = 1
+
+  @staticmethod
+  def _parsed_xml_report_path(path):
+    return '{}.json'.format(os.path.splitext(path)[0])
+
+  @classmethod
+  def _load_parsed_xml_report(cls, path, digest):
+    parsed_path = cls._parsed_xml_report_path(path)
+    try:
+      with open(parsed_path, 'r') as fp:
+        parsed = json.load(fp)
+    except (IOError, OSError, ValueError):
+      return None
+    if parsed.get('version') != cls._PARSED_XML_REPORT_VERSION or parsed.get('digest') != digest:
+      return None
+    return parsed['refs'], parsed['modules']
+
+  @classmethod
+  def _save_parsed_xml_report(cls, path, digest, parsed):
+    parsed_path = cls._parsed_xml_report_path(path)
+    refs, modules = parsed
+    try:
+      with safe_concurrent_creation(parsed_path) as tmp_path:
+        with open(tmp_path, 'w') as fp:
+          json.dump(dict(version=cls._PARSED_XML_REPORT_VERSION, digest=digest, refs=refs,
+                         modules=modules), fp)
+    except (IOError, OSError) as e:
+      logger.warn('Failed to save the parsed ivy report to {}: {}'.format(parsed_path, e))
+
   @classmethod
   def generate_ivy(cls, targets, jars, excludes, ivyxml, confs, resolve_hash_name=None,
                    pinned_artifacts=None, jar_dep_manager=None):
@@ -0,0 +1,96 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'ng-killall': ['ng-killall'],
+  'invalidate': ['ng-killall'],
+  'clean-all': ['ng-killall'],
+  'bootstrap': ['jar-dependency-management', 'bootstrap-jvm-tools', 'provide-tools-jar'],
+  'jvm-platform-explain': ['jvm-platform-explain'],
+  'jvm-platform-validate': ['jvm-platform-validate'],
+  'compile': ['zinc', 'jvm-dep-check', 'compile-jvm-prep-command'],
+  'resolve': ['ivy'],
+  'imports': ['ivy-imports'],
+  'unpack-jars': ['unpack-jars'],
+  'outdated': ['ivy'],
+  'resources': ['prepare', 'services'],
+  'export-classpath': ['export-classpath'],
+  'dep-usage': ['jvm'],
+  'classmap': ['classmap'],
+  'doc': ['javadoc', 'scaladoc'],
+  'jar': ['create'],
+  'binary': ['jvm', 'dup', 'binary-jvm-prep-command'],
+  'bundle': ['consolidate-classpath', 'jvm', 'dup'],
+  'detect-duplicates': ['detect-duplicates'],
+  'check-published-deps': ['check-published-deps'],
+  'publish': ['jar'],
+  'test': ['junit', 'test-jvm-prep-command'],
+  'bench': ['bench'],
+  'lint': ['scalafmt', 'scalastyle', 'checkstyle'],
+  'run': ['jvm'],
+  'run-dirty': ['jvm-dirty'],
+  'repl': ['scala'],
+  'repl-dirty': ['scala-dirty'],
+  'fmt': ['scalafmt'],
+}
+
+INDEPENDENT_GOALS = [
+  'ng-killall',
+]
+
+BUILD_FILE_ALIASES = [
+  'DirectoryReMapper',
+  'Duplicate',
+  'Skip',
+  'annotation_processor',
+  'artifact',
+  'benchmark',
+  'bundle',
+  'credentials',
+  'developer',
+  'exclude',
+  'github',
+  'jar',
+  'jar_library',
+  'jar_rules',
+  'java_agent',
+  'java_library',
+  'java_tests',
+  'javac_plugin',
+  'junit_tests',
+  'jvm_app',
+  'jvm_binary',
+  'jvm_prep_command',
+  'license',
+  'managed_jar_dependencies',
+  'managed_jar_libraries',
+  'netrc_credentials',
+  'ossrh',
+  'repository',
+  'scala_artifact',
+  'scala_jar',
+  'scala_library',
+  'scalac_plugin',
+  'scm',
+  'shading_exclude',
+  'shading_exclude_package',
+  'shading_keep',
+  'shading_keep_package',
+  'shading_relocate',
+  'shading_relocate_package',
+  'shading_zap',
+  'shading_zap_package',
+  'unpacked_jars',
+]
+
+SUBSYSTEMS = [
+  'pants.backend.jvm.subsystems.java.Java',
+  'pants.backend.jvm.subsystems.junit.JUnit',
+  'pants.backend.jvm.subsystems.jvm_platform.JvmPlatform',
+  'pants.backend.jvm.subsystems.scala_platform.ScalaPlatform',
+]
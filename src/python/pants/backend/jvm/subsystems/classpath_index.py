@@ -0,0 +1,216 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.source.file_digests import FileDigestCache
+from pants.subsystem.subsystem import Subsystem
+from pants.util.dirutil import fast_relpath_optional, safe_mkdir_for
+from pants.util.memo import memoized_method
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClasspathIndex(object):
+  """Indexes the files in classpath entries, so that each jar and classes directory is listed once.
+
+  The contents of a jar are keyed by the digest of the jar. The contents of a directory within a
+  results dir are keyed by the real path of the directory, which is named by the cache key of the
+  results it holds. Contents may also be persisted to a sqlite database, in which case they are
+  reused across runs. Directories outside of results dirs are listed each time they are asked for,
+  since nothing keys their contents.
+
+  Every key ever seen would otherwise stay in the database, so persisted contents that have not
+  been looked up for a while are deleted when the database is opened.
+  """
+
+  # Persisted contents are deleted once they have not been looked up for this long.
+  _MAX_UNUSED_SECS = 14 * 24 * 60 * 60
+
+  # The last use of persisted contents is only recorded once it is older than this, so that most
+  # lookups do not write to the database.
+  _LAST_USED_RESOLUTION_SECS = 24 * 60 * 60
+
+  def __init__(self, pants_workdir, path=None):
+    """
+    :param string pants_workdir: The workdir that results dirs are created under.
+    :param string path: A sqlite database file to persist contents to, or None to hold them in
+                        memory only.
+    """
+    self._workdir = os.path.abspath(pants_workdir)
+    self._real_workdir = os.path.realpath(pants_workdir)
+    self._path = path
+    # Contents may be requested from worker threads: this lock guards the memoized contents and
+    # the connection shared between them.
+    self._lock = threading.Lock()
+    self._conn = None
+    self._connected = False
+    self._contents_by_key = {}
+    self._file_sets_by_key = {}
+
+  def contents(self, entry):
+    """Returns the files and directories in a classpath entry.
+
+    :param string entry: The path of a jar or directory. Other entries have no contents.
+    :returns: The relative paths of the contents, as `ClasspathUtil.classpath_entries_contents`
+              lists them.
+    :rtype: tuple of string
+    """
+    key = self._key(entry)
+    if key is None:
+      return self._list_contents(entry)
+
+    with self._lock:
+      contents = self._contents_by_key.get(key)
+      if contents is None:
+        contents = self._load(key)
+        if contents is None:
+          contents = self._list_contents(entry)
+          self._persist(key, contents)
+        self._contents_by_key[key] = contents
+      return contents
+
+  def classnames(self, entry):
+    """Returns the names of the classes in a classpath entry, in the order of its contents."""
+    classnames = (ClasspathUtil.classname_for_rel_classfile(f) for f in self.contents(entry))
+    return [classname for classname in classnames if classname]
+
+  def entries_containing(self, rel_path, entries):
+    """Returns those of the given classpath entries that contain the given file, in order."""
+    return [entry for entry in entries if rel_path in self._file_set(entry)]
+
+  def shared_contents(self, entries):
+    """Returns the files and directories found in more than one of the given classpath entries.
+
+    :returns: A dict from the relative path of each file or directory found in more than one entry
+              to the entries it was found in, in order.
+    :rtype: dict of string to list of string
+    """
+    entries_by_rel_path = OrderedDict()
+    for entry in OrderedDict.fromkeys(entries):
+      for rel_path in self.contents(entry):
+        entries_by_rel_path.setdefault(rel_path, []).append(entry)
+    return OrderedDict((rel_path, entries) for rel_path, entries in entries_by_rel_path.items()
+                       if len(entries) > 1)
+
+  def _list_contents(self, entry):
+    return tuple(ClasspathUtil.classpath_entries_contents([entry]))
+
+  def _file_set(self, entry):
+    key = self._key(entry)
+    if key is None:
+      return frozenset(self.contents(entry))
+    file_set = self._file_sets_by_key.get(key)
+    if file_set is None:
+      file_set = frozenset(self.contents(entry))
+      self._file_sets_by_key[key] = file_set
+    return file_set
+
+  def _key(self, entry):
+    if ClasspathUtil.is_jar(entry):
+      return 'jar:{}'.format(FileDigestCache.global_instance().digest(entry))
+    elif ClasspathUtil.is_dir(entry):
+      return self._directory_key(entry)
+    else:
+      return None
+
+  def _directory_key(self, directory):
+    # A results dir is reached through a stable symlink to a dir named by its cache key (see
+    # `VersionedTarget.create_results_dir`), so the real path of a directory within one differs from
+    # its path relative to the workdir.
+    real_path = os.path.realpath(directory)
+    real_relpath = fast_relpath_optional(real_path, self._real_workdir)
+    if real_relpath is None:
+      return None
+    if real_relpath == fast_relpath_optional(os.path.abspath(directory), self._workdir):
+      return None
+    # A results dir that is cleaned and filled again under the same cache key gets a new mtime.
+    return 'dir:{}:{!r}'.format(real_relpath, os.stat(real_path).st_mtime)
+
+  def _connect(self):
+    if self._connected:
+      return self._conn
+    self._connected = True
+    if not self._path:
+      return None
+    try:
+      safe_mkdir_for(self._path)
+      conn = sqlite3.connect(self._path, timeout=60, check_same_thread=False)
+      with conn:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(contents)')]
+        if columns and 'last_used' not in columns:
+          # Written before the last use of contents was recorded.
+          conn.execute('DROP TABLE contents')
+        conn.execute('CREATE TABLE IF NOT EXISTS contents (key TEXT PRIMARY KEY, '
+                     'rel_paths TEXT NOT NULL, last_used INTEGER NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS contents_last_used ON contents (last_used)')
+        conn.execute('DELETE FROM contents WHERE last_used < ?',
+                     (int(time.time()) - self._MAX_UNUSED_SECS,))
+    except sqlite3.Error as e:
+      # The index is only an optimization: carry on without persisting it.
+      logger.warn('Failed to open the classpath index at {}, it will not be persisted: {}'
+                  .format(self._path, e))
+      return None
+    self._conn = conn
+    return conn
+
+  def _load(self, key):
+    conn = self._connect()
+    if conn is None:
+      return None
+    try:
+      row = conn.execute('SELECT rel_paths, last_used FROM contents WHERE key = ?',
+                         (key,)).fetchone()
+      if row is None:
+        return None
+      now = int(time.time())
+      if row[1] < now - self._LAST_USED_RESOLUTION_SECS:
+        with conn:
+          conn.execute('UPDATE contents SET last_used = ? WHERE key = ?', (now, key))
+    except sqlite3.Error as e:
+      logger.warn('Failed to read the classpath index at {}: {}'.format(self._path, e))
+      return None
+    return tuple(json.loads(row[0]))
+
+  def _persist(self, key, contents):
+    conn = self._connect()
+    if conn is None:
+      return
+    try:
+      with conn:
+        conn.execute('INSERT OR REPLACE INTO contents VALUES (?, ?, ?)',
+                     (key, json.dumps(contents), int(time.time())))
+    except sqlite3.Error as e:
+      logger.warn('Failed to persist to the classpath index at {}: {}'.format(self._path, e))
+
+
+class ClasspathIndexFactory(Subsystem):
+  """Configures the index of the contents of classpath entries shared by JVM tasks."""
+
+  options_scope = 'classpath-index'
+
+  @classmethod
+  def register_options(cls, register):
+    super(ClasspathIndexFactory, cls).register_options(register)
+    register('--persist', advanced=True, type=bool, default=True,
+             help='Persist the contents of jars and of compiled classes directories under the '
+                  'workdir, so that they are not listed again by later runs.')
+
+  @memoized_method
+  def get_index(self):
+    """Returns the ClasspathIndex configured by these options."""
+    options = self.get_options()
+    path = os.path.join(options.pants_workdir, 'classpath_index.db') if options.persist else None
+    return ClasspathIndex(options.pants_workdir, path=path)
@@ -0,0 +1,106 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+from hashlib import sha1
+
+from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.source.file_digests import FileDigestCache
+
+
+class ClassFingerprinter(object):
+  """Fingerprints compiled classes by the compiled classes and jars they transitively depend on.
+
+  The classes compiled from each source are taken from the `classes_by_source` product, and the
+  class files, jars and sources each source depends on from the zinc analysis recorded in the
+  `product_deps_by_src` product. Unlike the fingerprint of a target, the fingerprint of a class is
+  unchanged by changes to classes of the same or dependee targets that it does not reach.
+  """
+
+  def __init__(self, buildroot, classes_by_source, product_deps_by_src):
+    """
+    :param string buildroot: The buildroot that the sources in `classes_by_source` are relative to.
+    :param classes_by_source: A dict from the path of each source relative to the buildroot to the
+                              `MultipleRootedProducts` of the classes compiled from it.
+    :param product_deps_by_src: A dict from each target to a dict from the absolute path of each of
+                                its sources to the absolute paths of the files it depends on.
+    """
+    self._class_files_by_src = {}
+    self._src_by_class_file = {}
+    self._src_by_classname = {}
+    for rel_src, products in classes_by_source.items():
+      src = os.path.join(buildroot, rel_src)
+      class_files = self._class_files_by_src.setdefault(src, [])
+      for root, abs_paths in products.abs_paths():
+        for class_file in abs_paths:
+          class_files.append(class_file)
+          # Analysis may refer to a class file via the stable symlink to its results dir, or not.
+          self._src_by_class_file[os.path.realpath(class_file)] = src
+          classname = ClasspathUtil.classname_for_rel_classfile(os.path.relpath(class_file, root))
+          if classname:
+            self._src_by_classname.setdefault(classname, src)
+
+    self._deps_by_src = {}
+    for deps_by_src in product_deps_by_src.values():
+      for src, deps in deps_by_src.items():
+        self._deps_by_src.setdefault(src, set()).update(deps)
+
+  def dependencies(self, classname):
+    """Returns the files that the given class transitively depends on.
+
+    These are the class files compiled from the source of the class and from each source it
+    transitively depends on, and any jars and other class files those sources depend on.
+
+    :param string classname: The fully qualified name of a compiled class.
+    :returns: The absolute paths of the files, or None if no source is known to produce the class.
+    :rtype: set of string
+    """
+    src = self._src_by_classname.get(classname)
+    if src is None:
+      return None
+
+    files = set()
+    visited = {src}
+    to_visit = [src]
+    while to_visit:
+      src = to_visit.pop()
+      files.update(self._class_files_by_src.get(src, ()))
+      for dep in self._deps_by_src.get(src, ()):
+        dep_src = self._source_for(dep)
+        if dep_src is None:
+          files.add(dep)
+        elif dep_src not in visited:
+          visited.add(dep_src)
+          to_visit.append(dep_src)
+    return files
+
+  def fingerprint(self, classname):
+    """Returns a fingerprint of the contents of the files the given class transitively depends on.
+
+    The fingerprint does not depend on the paths of the files, so that it is the same for the same
+    classes compiled in different workdirs.
+
+    :param string classname: The fully qualified name of a compiled class.
+    :returns: A hex sha1 fingerprint, or None if no source is known to produce the class.
+    :rtype: string
+    """
+    files = self.dependencies(classname)
+    if files is None:
+      return None
+    # Analysis may record dependencies that are not files here, such as classes within a JDK.
+    digests = FileDigestCache.global_instance().digest_many(f for f in files if os.path.isfile(f))
+    hasher = sha1()
+    for digest in sorted(digests):
+      hasher.update(digest)
+    return hasher.hexdigest()
+
+  def _source_for(self, dep):
+    if dep in self._class_files_by_src or dep in self._deps_by_src:
+      return dep
+    if dep.endswith('.class'):
+      return self._src_by_class_file.get(os.path.realpath(dep))
+    return None
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+from pants.backend.jvm.subsystems.classpath_index import ClasspathIndexFactory
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.task.console_task import ConsoleTask
@@ -22,12 +23,14 @@ class ClassmapTask(ConsoleTask):
     register('--transitive', default=True, type=bool,
              help='Outputs all targets in the build graph transitively.')
 
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(ClassmapTask, cls).subsystem_dependencies() + (ClasspathIndexFactory,)
+
   def classname_for_classfile(self, target, classpath_products):
-    contents = ClasspathUtil.classpath_contents((target,), classpath_products)
-    for f in contents:
-      classname = ClasspathUtil.classname_for_rel_classfile(f)
-      # None for non `.class` files
-      if classname:
+    index = ClasspathIndexFactory.global_instance().get_index()
+    for entry in ClasspathUtil.classpath((target,), classpath_products):
+      for classname in index.classnames(entry):
         yield classname
 
   def console_output(self, _):
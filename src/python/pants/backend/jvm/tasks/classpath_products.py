@@ -7,6 +7,8 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import re
+import threading
+from collections import OrderedDict
 
 from twitter.common.collections import OrderedSet
 
@@ -142,14 +144,6 @@ def _matches_exclude(coordinate, exclude):
   return False
 
 
-def _not_excluded_filter(excludes):
-  def not_excluded(product_to_target):
-    path_tuple = product_to_target[0]
-    conf, classpath_entry = path_tuple
-    return not classpath_entry.is_excluded_by(excludes)
-  return not_excluded
-
-
 class MissingClasspathEntryError(Exception):
   """Indicates an unexpected problem finding a classpath entry."""
 
@@ -159,10 +153,21 @@ class ClasspathProducts(object):
   :API: public
   """
 
-  def __init__(self, pants_workdir, classpaths=None, excludes=None):
+  # The number of classpath queries to memoize the results of.
+  _MAX_MEMOIZED_CLASSPATHS = 1024
+
+  def __init__(self, pants_workdir, classpaths=None, excludes=None, interned_entries=None):
     self._classpaths = classpaths or UnionProducts()
     self._excludes = excludes or UnionProducts()
     self._pants_workdir = pants_workdir
+    # The one (conf, ClasspathEntry) tuple held for each distinct classpath element, shared with
+    # copies, so that an element added for many targets or copied to many products is held once.
+    self._interned_entries = {} if interned_entries is None else interned_entries
+    # The results of recent classpath queries, keyed by their targets and the excludes applied, in
+    # least recently used order. Cleared whenever the classpaths or excludes are edited.
+    self._memoized_classpaths = OrderedDict()
+    self._version = 0
+    self._lock = threading.Lock()
 
   @staticmethod
   def init_func(pants_workdir):
@@ -285,13 +290,17 @@ class ClasspathProducts(object):
     excludes in the original. The copy is shallow though, so edits to the the copy's product values
     will mutate the original's product values.  See `UnionProducts.copy`.
 
+    The classpaths and excludes of each target are shared with the copy until either edits them,
+    so copying is cheap.
+
     :API: public
 
     :rtype: :class:`ClasspathProducts`
     """
     return ClasspathProducts(pants_workdir=self._pants_workdir,
                              classpaths=self._classpaths.copy(),
-                             excludes=self._excludes.copy())
+                             excludes=self._excludes.copy(),
+                             interned_entries=self._interned_entries)
 
   def add_for_targets(self, targets, classpath_elements):
     """Adds classpath path elements to the products of all the provided targets."""
@@ -312,7 +321,7 @@ class ClasspathProducts(object):
       if not jar.pants_path:
         raise TaskError('Jar: {!s} has no specified path.'.format(jar.coordinate))
       cp_entry = ArtifactClasspathEntry(jar.pants_path, jar.coordinate, jar.cache_path)
-      classpath_entries.append((conf, cp_entry))
+      classpath_entries.append(self._intern(conf, cp_entry))
 
     for target in targets:
       self._add_elements_for_target(target, classpath_entries)
@@ -327,10 +336,12 @@ class ClasspathProducts(object):
     """
     for target in targets:
       self._add_excludes_for_target(target)
+    self._invalidate()
 
   def remove_for_target(self, target, classpath_elements):
     """Removes the given entries for the target."""
     self._classpaths.remove_for_target(target, self._wrap_path_elements(classpath_elements))
+    self._invalidate()
 
   def get_for_target(self, target):
     """Gets the classpath products for the given target.
@@ -368,9 +379,29 @@ class ClasspathProducts(object):
     :rtype: list of (string, :class:`ClasspathEntry`)
     """
 
-    # remove the duplicate, preserve the ordering.
-    return list(OrderedSet([cp for cp, target in self.get_product_target_mappings_for_targets(
-                            targets, respect_excludes)]))
+    targets = tuple(targets)
+    excludes = self._excludes_for_targets(targets) if respect_excludes else None
+    key = (targets, excludes)
+    with self._lock:
+      version = self._version
+      classpath = self._memoized_classpaths.pop(key, None)
+      if classpath is not None:
+        self._memoized_classpaths[key] = classpath
+
+    if classpath is None:
+      classpath_target_tuples = self._classpaths.get_product_target_mappings_for_targets(targets)
+      if excludes:
+        classpath_target_tuples = self._filter_excluded(classpath_target_tuples, excludes)
+      # remove the duplicate, preserve the ordering.
+      classpath = tuple(OrderedSet(cp for cp, target in classpath_target_tuples))
+      with self._lock:
+        # Results computed while the products were being edited are not memoized.
+        if version == self._version:
+          self._memoized_classpaths[key] = classpath
+          if len(self._memoized_classpaths) > self._MAX_MEMOIZED_CLASSPATHS:
+            self._memoized_classpaths.popitem(last=False)
+
+    return list(classpath)
 
   def get_product_target_mappings_for_targets(self, targets, respect_excludes=True):
     """Gets the classpath products-target associations for the given targets.
@@ -427,13 +458,42 @@ class ClasspathProducts(object):
       self._classpaths.add_for_target(target, products)
     for target, products in other._excludes._products_by_target.items():
       self._excludes.add_for_target(target, products)
+    self._invalidate()
 
   def _filter_by_excludes(self, classpath_target_tuples, root_targets):
+    return self._filter_excluded(classpath_target_tuples, self._excludes_for_targets(root_targets))
+
+  def _excludes_for_targets(self, root_targets):
     # Excludes are always applied transitively, so regardless of whether a transitive
-    # set of targets was included here, their closure must be included.
-    closure = BuildGraph.closure(root_targets, bfs=True)
-    excludes = self._excludes.get_for_targets(closure)
-    return filter(_not_excluded_filter(excludes), classpath_target_tuples)
+    # set of targets was included here, their closure must be included. The order of the closure
+    # does not matter, so the memoized depth first closure of the build graph is used.
+    closure = BuildGraph.closure(root_targets)
+    return frozenset(self._excludes.get_for_targets(closure))
+
+  @staticmethod
+  def _filter_excluded(classpath_target_tuples, excludes):
+    # Classpath elements are commonly shared by many targets, so each is checked against the
+    # excludes only once.
+    excluded_by_entry = {}
+
+    def not_excluded(product_to_target):
+      conf, classpath_entry = product_to_target[0]
+      excluded = excluded_by_entry.get(classpath_entry)
+      if excluded is None:
+        excluded = classpath_entry.is_excluded_by(excludes)
+        excluded_by_entry[classpath_entry] = excluded
+      return not excluded
+
+    return filter(not_excluded, classpath_target_tuples)
+
+  def _invalidate(self):
+    with self._lock:
+      self._version += 1
+      self._memoized_classpaths.clear()
+
+  def _intern(self, conf, classpath_entry):
+    element = (conf, classpath_entry)
+    return self._interned_entries.setdefault(element, element)
 
   def _add_excludes_for_target(self, target):
     if target.is_exported:
@@ -443,11 +503,12 @@ class ClasspathProducts(object):
       self._excludes.add_for_target(target, target.excludes)
 
   def _wrap_path_elements(self, classpath_elements):
-    return [(element[0], ClasspathEntry(element[1])) for element in classpath_elements]
+    return [self._intern(element[0], ClasspathEntry(element[1])) for element in classpath_elements]
 
   def _add_elements_for_target(self, target, elements):
     self._validate_classpath_tuples(elements, target)
     self._classpaths.add_for_target(target, elements)
+    self._invalidate()
 
   def _validate_classpath_tuples(self, classpath, target):
     """Validates that all files are located within the working directory, to simplify relativization.
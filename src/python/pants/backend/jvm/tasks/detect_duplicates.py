@@ -7,8 +7,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
+from twitter.common.collections import OrderedSet
+
+from pants.backend.jvm.subsystems.classpath_index import ClasspathIndexFactory
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.jvm_binary_task import JvmBinaryTask
 from pants.base.exceptions import TaskError
@@ -29,6 +32,10 @@ class DuplicateDetector(JvmBinaryTask):
   def _isdir(name):
     return name[-1] == '/'
 
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(DuplicateDetector, cls).subsystem_dependencies() + (ClasspathIndexFactory,)
+
   @classmethod
   def register_options(cls, register):
     super(DuplicateDetector, cls).register_options(register)
@@ -70,29 +77,47 @@ class DuplicateDetector(JvmBinaryTask):
       self.context.log.debug("Duplicate checking is disabled.")
       return None
 
+    binary_targets = filter(self.is_binary, self.context.targets())
+    # Conflict structure returned for tests.
+    return self.detect_duplicates(binary_targets)
+
+  def detect_duplicates(self, binary_targets):
+    """Detects the files found in more than one artifact of each of the given binaries.
+
+    The contents of the classpath entries of all the binaries are joined at once, so that each
+    entry is listed once however many binaries it is on the classpath of.
+
+    :returns: A dict from each binary with conflicts to its conflicts, by the artifacts in conflict.
+    """
+    artifacts_by_entry_by_binary = OrderedDict(
+      (binary_target, self._get_artifacts_by_entry(binary_target))
+      for binary_target in binary_targets)
+
+    # Only files found in more than one entry, or in an entry of more than one artifact, can
+    # conflict.
+    index = ClasspathIndexFactory.global_instance().get_index()
+    entries = OrderedSet(entry for artifacts_by_entry in artifacts_by_entry_by_binary.values()
+                         for entry in artifacts_by_entry)
+    entries_by_file_name = index.shared_contents(entries)
+    for artifacts_by_entry in artifacts_by_entry_by_binary.values():
+      for entry, artifacts in artifacts_by_entry.items():
+        if len(artifacts) > 1:
+          for file_name in index.contents(entry):
+            entries_by_file_name.setdefault(file_name, [entry])
+
     conflicts_by_binary = {}
-    for binary_target in filter(self.is_binary, self.context.targets()):
-      conflicts_by_artifacts = self.detect_duplicates_for_target(binary_target)
+    for binary_target, artifacts_by_entry in artifacts_by_entry_by_binary.items():
+      artifacts_by_file_name = defaultdict(set)
+      for file_name, file_entries in entries_by_file_name.items():
+        for entry in file_entries:
+          artifacts_by_file_name[file_name].update(artifacts_by_entry.get(entry, ()))
+      conflicts_by_artifacts = self._check_conflicts(artifacts_by_file_name, binary_target)
       if conflicts_by_artifacts:
         conflicts_by_binary[binary_target] = conflicts_by_artifacts
-
-    # Conflict structure returned for tests.
     return conflicts_by_binary
 
   def detect_duplicates_for_target(self, binary_target):
-    artifacts_by_file_name = defaultdict(set)
-
-    # Extract external dependencies on libraries (jars)
-    external_deps = self._get_external_dependencies(binary_target)
-    for (file_name, jar_names) in external_deps.items():
-      artifacts_by_file_name[file_name].update(jar_names)
-
-    # Extract internal dependencies on classes and resources
-    internal_deps = self._get_internal_dependencies(binary_target)
-    for (file_name, target_specs) in internal_deps.items():
-      artifacts_by_file_name[file_name].update(target_specs)
-
-    return self._check_conflicts(artifacts_by_file_name, binary_target)
+    return self.detect_duplicates([binary_target]).get(binary_target, {})
 
   def _check_conflicts(self, artifacts_by_file_name, binary_target):
     conflicts_by_artifacts = self._get_conflicts_by_artifacts(artifacts_by_file_name)
@@ -102,27 +127,23 @@ class DuplicateDetector(JvmBinaryTask):
         raise TaskError('Failing build for target {}.'.format(binary_target))
     return conflicts_by_artifacts
 
-  def _get_internal_dependencies(self, binary_target):
-    artifacts_by_file_name = defaultdict(set)
-    classpath_products = self.context.products.get_data('runtime_classpath')
+  def _get_artifacts_by_entry(self, binary_target):
+    artifacts_by_entry = defaultdict(set)
+
+    # Extract external dependencies on libraries (jars)
+    for external_dep, coordinate in self.list_external_jar_dependencies(binary_target):
+      artifacts_by_entry[external_dep].add(coordinate.artifact_filename)
 
     # Select classfiles from the classpath - we want all the direct products of internal targets,
     # no external JarLibrary products.
-    def record_file_ownership(target):
-      entries = ClasspathUtil.internal_classpath([target], classpath_products)
-      for f in ClasspathUtil.classpath_entries_contents(entries):
-        artifacts_by_file_name[f].add(target.address.reference())
+    classpath_products = self.context.products.get_data('runtime_classpath')
 
-    binary_target.walk(record_file_ownership)
-    return artifacts_by_file_name
+    def record_entry_ownership(target):
+      for entry in ClasspathUtil.internal_classpath([target], classpath_products):
+        artifacts_by_entry[entry].add(target.address.reference())
 
-  def _get_external_dependencies(self, binary_target):
-    artifacts_by_file_name = defaultdict(set)
-    for external_dep, coordinate in self.list_external_jar_dependencies(binary_target):
-      self.context.log.debug('  scanning {} from {}'.format(coordinate, external_dep))
-      for qualified_file_name in ClasspathUtil.classpath_entries_contents([external_dep]):
-        artifacts_by_file_name[qualified_file_name].add(coordinate.artifact_filename)
-    return artifacts_by_file_name
+    binary_target.walk(record_entry_ownership)
+    return artifacts_by_entry
 
   def _is_excluded(self, path):
     if self._isdir(path) or Manifest.PATH == path:
@@ -9,7 +9,8 @@ import hashlib
 import logging
 import os
 
-from pants.backend.jvm.ivy_utils import NO_RESOLVE_RUN_RESULT, IvyFetchStep, IvyResolveStep
+from pants.backend.jvm.ivy_utils import (NO_RESOLVE_RUN_RESULT, IvyFetchStep, IvyResolutionIndex,
+                                         IvyResolveStep)
 from pants.backend.jvm.subsystems.jar_dependency_management import JarDependencyManagement
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.targets.jvm_target import JvmTarget
@@ -95,6 +96,10 @@ class IvyTaskMixin(TaskBase):
     register('--soft-excludes', type=bool, advanced=True, fingerprint=True,
              help='If a target depends on a jar that is excluded by another target '
                   'resolve this jar anyway')
+    register('--reuse-resolves', type=bool, default=False, advanced=True,
+             help='Answer a resolve from an earlier resolve of a superset of its jars, with the '
+                  'same excludes and overrides, rather than running ivy. Only resolves in which '
+                  'ivy evicted no module are reused.')
 
   @classmethod
   def implementation_version(cls):
@@ -257,8 +262,10 @@ class IvyTaskMixin(TaskBase):
     # 1. If last was successful fetch, load it.
     # 2. If last was successful resolve, load it.
     # Slow paths
-    # 1. If the resolve file exists, do a fetch.
-    # 2. Finally, if none of the above matches,
+    # 1. If an earlier resolve of a superset of the jars can be projected, store it as the resolve
+    #    and cache the coordinates from the result.
+    # 2. If the resolve file exists, do a fetch.
+    # 3. Finally, if none of the above matches,
     #    - do a resolve.
     #    - cache the coordinates from the result.
     jvm_options = self.get_options().jvm_options
@@ -275,6 +282,14 @@ class IvyTaskMixin(TaskBase):
         logger.debug('Using previous resolve.')
         return result
 
+    if self.get_options().reuse_resolves:
+      result = IvyResolutionIndex(resolve.global_ivy_workdir).project(resolve, targets, extra_args)
+      if result and result.all_linked_artifacts_exist():
+        logger.debug('Using a projection of a previous resolve.')
+        if self.artifact_cache_writes_enabled():
+          self.update_artifact_cache([(resolve_vts, [resolve.frozen_resolve_file])])
+        return result
+
     if not invalidation_check.invalid_vts and fetch.required_exec_files_exist():
       logger.debug('Performing a fetch using ivy.')
       result = fetch.exec_and_load(executor, extra_args, targets, jvm_options, workunit_name,
@@ -287,6 +302,8 @@ class IvyTaskMixin(TaskBase):
     logger.debug('Performing a resolve using ivy.')
     result = resolve.exec_and_load(executor, extra_args, targets, jvm_options, workunit_name,
                                    workunit_factory)
+    if self.get_options().reuse_resolves:
+      IvyResolutionIndex(resolve.global_ivy_workdir).record(resolve, targets, extra_args)
     if self.artifact_cache_writes_enabled():
       self.update_artifact_cache([(resolve_vts, [resolve.frozen_resolve_file])])
     return result
@@ -5,19 +5,27 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import json
 import os
+import shutil
 import sys
+import threading
+import time
 from abc import abstractmethod
+from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
+from hashlib import sha1
 
 from six.moves import range
 from twitter.common.collections import OrderedSet
 
 from pants.backend.jvm import argfile
+from pants.backend.jvm.subsystems.classpath_index import ClasspathIndexFactory
 from pants.backend.jvm.subsystems.junit import JUnit
 from pants.backend.jvm.subsystems.jvm_platform import JvmPlatform
 from pants.backend.jvm.targets.junit_tests import JUnitTests
 from pants.backend.jvm.targets.jvm_target import JvmTarget
+from pants.backend.jvm.tasks.class_fingerprinter import ClassFingerprinter
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.coverage.base import Coverage
 from pants.backend.jvm.tasks.coverage.cobertura import Cobertura, CoberturaTaskSettings
@@ -26,19 +34,23 @@ from pants.backend.jvm.tasks.jvm_tool_task_mixin import JvmToolTaskMixin
 from pants.backend.jvm.tasks.reports.junit_html_report import JUnitHtmlReport
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import ErrorWhileTesting, TargetDefinitionException, TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
 from pants.build_graph.target_scopes import Scopes
+from pants.invalidation.build_invalidator import CacheKey
 from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import SubprocessExecutor
 from pants.java.junit.junit_xml_parser import RegistryOfTests, Test, parse_failed_targets
 from pants.process.lock import OwnerPrintingInterProcessFileLock
+from pants.source.file_digests import FileDigestCache
+from pants.task.recorded_durations import RecordedDurations
 from pants.task.testrunner_task_mixin import TestRunnerTaskMixin
 from pants.util import desktop
 from pants.util.argutil import ensure_arg, remove_arg
 from pants.util.contextutil import environment_as
-from pants.util.dirutil import safe_mkdir, safe_rmtree
-from pants.util.memo import memoized_method
+from pants.util.dirutil import safe_mkdir, safe_rmtree, touch
+from pants.util.memo import memoized_method, memoized_property
 from pants.util.meta import AbstractClass
 from pants.util.strutil import pluralize
 
@@ -135,6 +147,12 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     super(JUnitRun, cls).register_options(register)
     register('--batch-size', advanced=True, type=int, default=sys.maxint,
              help='Run at most this many tests in a single test process.')
+    register('--batch-concurrency', type=int, default=1,
+             help='The number of batches of tests to run concurrently, each in its own JVM. When '
+                  'more than 1, test classes are packed into at least this many batches of at '
+                  'most --batch-size test classes, balanced by the durations of the test classes '
+                  'in previous runs, and the longest batches are started first. The tests of a '
+                  'class always run in the same batch.')
     register('--test', type=list,
              help='Force running of just these tests.  Tests can be specified using any of: '
                   '[classname], [classname]#[methodname], [filename] or [filename]#[methodname]')
@@ -168,6 +186,13 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
                   'such a target will raise an error during the test run.')
     register('--use-experimental-runner', type=bool, advanced=True,
              help='Use experimental junit-runner logic for more options for parallelism.')
+    register('--cache-test-results', type=bool, advanced=True,
+             help='Cache the results of test classes that pass, and only run a test class again '
+                  'once the compiled classes it transitively depends on, per the zinc analysis of '
+                  'its sources, or the jars and resources on its classpath change. Results are '
+                  'also stored in the artifact cache, if one is configured. Not suitable for test '
+                  'classes that load classes they do not reference. Ignored when measuring '
+                  'coverage or running a --test-shard.')
     register('--html-report', type=bool,
              help='If true, generate an html summary report of tests that were run.')
     register('--open', type=bool,
@@ -178,7 +203,8 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
 
   @classmethod
   def subsystem_dependencies(cls):
-    return super(JUnitRun, cls).subsystem_dependencies() + (DistributionLocator, JUnit)
+    return super(JUnitRun, cls).subsystem_dependencies() + (ClasspathIndexFactory,
+                                                            DistributionLocator, JUnit)
 
   @classmethod
   def request_classes_by_source(cls, test_specs):
@@ -200,6 +226,11 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     if cls.request_classes_by_source(options.test or ()):
       round_manager.require_data('classes_by_source')
 
+    # Test results are keyed by the classes each test class depends on.
+    if options.cache_test_results:
+      round_manager.require_data('classes_by_source')
+      round_manager.require_data('product_deps_by_src')
+
   def __init__(self, *args, **kwargs):
     super(JUnitRun, self).__init__(*args, **kwargs)
 
@@ -212,6 +243,12 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     self._failure_summary = options.failure_summary
     self._open = options.open
     self._html_report = self._open or options.html_report
+    self._batch_concurrency = options.batch_concurrency
+    # Skipping the test classes with cached results would change which tests each shard runs.
+    self._cache_test_results = options.cache_test_results and not options.test_shard
+    # The environment of a test process is copied from ours when it is spawned: this lock keeps
+    # concurrently spawned processes from seeing each other's extra environment variables.
+    self._spawn_lock = threading.Lock()
 
   @memoized_method
   def _args(self, output_dir):
@@ -286,13 +323,17 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     :param Executor executor: the java subprocess executor to use. If not specified, construct
       using the distribution.
     :param Distribution distribution: The JDK or JRE installed.
+    :param dict env_vars: Extra environment variables to spawn the process with, if any.
     :rtype: ProcessHandler
     """
 
+    env_vars = kwargs.pop('env_vars', None) or {}
     actual_executor = executor or SubprocessExecutor(distribution)
-    return distribution.execute_java_async(*args,
-                                           executor=actual_executor,
-                                           **kwargs)
+    with self._spawn_lock:
+      with environment_as(**env_vars):
+        return distribution.execute_java_async(*args,
+                                               executor=actual_executor,
+                                               **kwargs)
 
   def execute_java_for_targets(self, targets, *args, **kwargs):
     """Execute java for targets using the test mixin spawn and wait.
@@ -378,69 +419,103 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     # the below will be None if not set, and we'll default back to runtime_classpath
     classpath_product = self.context.products.get_data('instrument_classpath')
 
-    result = 0
-    for properties, tests in tests_by_properties.items():
+    # Coverage is measured from the tests that run, so all of them must run.
+    result_keys = {}
+    if self._cache_test_results and not coverage:
+      self._prune_test_results()
+      result_keys = self._test_result_keys(test_registry, tests_by_properties)
+      cached_tests = self._restore_test_results(result_keys, output_dir)
+      if cached_tests:
+        self.context.log.info('Skipping {} with cached results.'
+                              .format(pluralize(len(cached_tests), 'test class')))
+        uncached_tests_by_properties = {}
+        for properties, tests in tests_by_properties.items():
+          uncached_tests = tuple(test for test in tests if test not in cached_tests)
+          if uncached_tests:
+            uncached_tests_by_properties[properties] = uncached_tests
+        tests_by_properties = uncached_tests_by_properties
+
+    # The tests of the batches whose test processes exited successfully.
+    completed_tests = []
+
+    def run_batch(properties, batch):
       (workdir, platform, target_jvm_options, target_env_vars, concurrency, threads) = properties
-      for batch in self._partition(tests):
-        # Batches of test classes will likely exist within the same targets: dedupe them.
-        relevant_targets = {test_registry.get_owning_target(t) for t in batch}
-        complete_classpath = OrderedSet()
-        complete_classpath.update(classpath_prepend)
-        complete_classpath.update(JUnit.global_instance().runner_classpath(self.context))
-        complete_classpath.update(self.classpath(relevant_targets,
-                                                 classpath_product=classpath_product))
-        complete_classpath.update(classpath_append)
-        distribution = JvmPlatform.preferred_jvm_distribution([platform], self._strict_jvm_version)
-
-        # Override cmdline args with values from junit_test() target that specify concurrency:
-        args = self._args(output_dir) + [u'-xmlreport']
-
-        if concurrency is not None:
-          args = remove_arg(args, '-default-parallel')
-          if concurrency == JUnitTests.CONCURRENCY_SERIAL:
-            args = ensure_arg(args, '-default-concurrency', param='SERIAL')
-          elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES:
-            args = ensure_arg(args, '-default-concurrency', param='PARALLEL_CLASSES')
-          elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_METHODS:
-            args = ensure_arg(args, '-default-concurrency', param='PARALLEL_METHODS')
-          elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES_AND_METHODS:
-            args = ensure_arg(args, '-default-concurrency', param='PARALLEL_CLASSES_AND_METHODS')
-
-        if threads is not None:
-          args = remove_arg(args, '-parallel-threads', has_param=True)
-          args += ['-parallel-threads', str(threads)]
-
-        batch_test_specs = [test.render_test_spec() for test in batch]
-        with argfile.safe_args(batch_test_specs, self.get_options()) as batch_tests:
-          self.context.log.debug('CWD = {}'.format(workdir))
-          self.context.log.debug('platform = {}'.format(platform))
-          with environment_as(**dict(target_env_vars)):
-            subprocess_result = self._spawn_and_wait(
-              executor=SubprocessExecutor(distribution),
-              distribution=distribution,
-              classpath=complete_classpath,
-              main=JUnit.RUNNER_MAIN,
-              jvm_options=self.jvm_options + extra_jvm_options + list(target_jvm_options),
-              args=args + batch_tests,
-              workunit_factory=self.context.new_workunit,
-              workunit_name='run',
-              workunit_labels=[WorkUnitLabel.TEST],
-              cwd=workdir,
-              synthetic_jar_dir=output_dir,
-              create_synthetic_jar=self.synthetic_classpath,
-            )
-            self.context.log.debug('JUnit subprocess exited with result ({})'.format(subprocess_result))
-            result += abs(subprocess_result)
-
-          tests_info = self.parse_test_info(output_dir, parse_error_handler, ['classname'])
-          for test_name, test_info in tests_info.items():
-            test_item = Test(test_info['classname'], test_name)
-            test_target = test_registry.get_owning_target(test_item)
-            self.report_all_info_for_single_test(self.options_scope, test_target,
-                                                 test_name, test_info)
-
+      # Batches of test classes will likely exist within the same targets: dedupe them.
+      relevant_targets = {test_registry.get_owning_target(t) for t in batch}
+      complete_classpath = OrderedSet()
+      complete_classpath.update(classpath_prepend)
+      complete_classpath.update(JUnit.global_instance().runner_classpath(self.context))
+      complete_classpath.update(self.classpath(relevant_targets,
+                                               classpath_product=classpath_product))
+      complete_classpath.update(classpath_append)
+      distribution = JvmPlatform.preferred_jvm_distribution([platform], self._strict_jvm_version)
+
+      # Override cmdline args with values from junit_test() target that specify concurrency:
+      args = self._args(output_dir) + [u'-xmlreport']
+
+      if concurrency is not None:
+        args = remove_arg(args, '-default-parallel')
+        if concurrency == JUnitTests.CONCURRENCY_SERIAL:
+          args = ensure_arg(args, '-default-concurrency', param='SERIAL')
+        elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES:
+          args = ensure_arg(args, '-default-concurrency', param='PARALLEL_CLASSES')
+        elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_METHODS:
+          args = ensure_arg(args, '-default-concurrency', param='PARALLEL_METHODS')
+        elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES_AND_METHODS:
+          args = ensure_arg(args, '-default-concurrency', param='PARALLEL_CLASSES_AND_METHODS')
+
+      if threads is not None:
+        args = remove_arg(args, '-parallel-threads', has_param=True)
+        args += ['-parallel-threads', str(threads)]
+
+      batch_test_specs = [test.render_test_spec() for test in batch]
+      with argfile.safe_args(batch_test_specs, self.get_options()) as batch_tests:
+        self.context.log.debug('CWD = {}'.format(workdir))
+        self.context.log.debug('platform = {}'.format(platform))
+        subprocess_result = self._spawn_and_wait(
+          executor=SubprocessExecutor(distribution),
+          distribution=distribution,
+          classpath=complete_classpath,
+          main=JUnit.RUNNER_MAIN,
+          jvm_options=self.jvm_options + extra_jvm_options + list(target_jvm_options),
+          args=args + batch_tests,
+          workunit_factory=self.context.new_workunit,
+          workunit_name='run',
+          workunit_labels=[WorkUnitLabel.TEST],
+          cwd=workdir,
+          synthetic_jar_dir=output_dir,
+          create_synthetic_jar=self.synthetic_classpath,
+          env_vars=dict(target_env_vars),
+        )
+        self.context.log.debug('JUnit subprocess exited with result ({})'.format(subprocess_result))
+        if subprocess_result == 0:
+          completed_tests.extend(batch)
+        return abs(subprocess_result)
+
+    batches = [(properties, batch)
+               for properties, tests in tests_by_properties.items()
+               for batch in self._partition(tests)]
+    try:
+      if self._batch_concurrency > 1 and len(batches) > 1:
+        result = self._run_batches_concurrently(batches, run_batch)
+      else:
+        result = 0
+        for properties, batch in batches:
+          result += run_batch(properties, batch)
           if result != 0 and self._fail_fast:
             break
+    finally:
+      # Report the results of the batches that ran, even if running another one failed.
+      whole_classes = {test.classname for _, batch in batches for test in batch
+                       if test.methodname is None}
+      passed_classes = self._report_test_results(test_registry, output_dir, whole_classes,
+                                                 parse_error_handler)
+    if result_keys:
+      # A class run whole by a successful test process without a report of its own has no tests.
+      passed_classes.update(test.classname for test in completed_tests
+                            if test.methodname is None and not os.path.exists(
+                              os.path.join(output_dir, self._test_report_name(test.classname))))
+      self._store_test_results(result_keys, passed_classes, output_dir)
 
     if result != 0:
       target_to_failed_test = parse_failed_targets(test_registry, output_dir, parse_error_handler)
@@ -469,10 +544,258 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
       )
       raise ErrorWhileTesting('\n'.join(error_message_lines), failed_targets=list(failed_targets))
 
+  def _run_batches_concurrently(self, batches, run_batch):
+    """Runs the given batches on up to --batch-concurrency JVMs at once, longest batches first.
+
+    :returns: The sum of the absolute exit codes of the batches that were run.
+    """
+    estimates = self._test_durations.estimates({test.classname
+                                                for _, batch in batches for test in batch})
+
+    def estimate(properties_and_batch):
+      _, batch = properties_and_batch
+      return sum(estimates[test.classname] for test in batch)
+
+    results = []
+    failed = threading.Event()
+
+    def run(properties, batch):
+      if self._fail_fast and failed.is_set():
+        return
+      result = run_batch(properties, batch)
+      results.append(result)
+      if result != 0:
+        failed.set()
+
+    with self.context.new_workunit(name='batches', labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+      worker_pool = WorkerPool(workunit, self.context.run_tracker, self._batch_concurrency)
+      try:
+        worker_pool.submit_work_and_wait(Work(run, sorted(batches, key=lambda b: -estimate(b))))
+      finally:
+        worker_pool.shutdown()
+    return sum(results)
+
+  def _report_test_results(self, test_registry, output_dir, whole_classes, parse_error_handler):
+    """Reports the results of each test run, and records the durations of whole test classes run.
+
+    Each report file is parsed separately, since the tests of different classes may share names.
+
+    :returns: The names of the whole test classes run whose reports show that all their tests
+              passed.
+    :rtype: set of string
+    """
+    durations = defaultdict(float)
+    passed_classes = set()
+    for name in sorted(os.listdir(output_dir)):
+      if not (name.startswith('TEST-') and name.endswith('.xml')):
+        continue
+      tests_info = self.parse_test_info(os.path.join(output_dir, name), parse_error_handler,
+                                        ['classname'])
+      report_classname = name[len('TEST-'):-len('.xml')]
+      if tests_info and report_classname in whole_classes and all(
+          test_info['result_code'] in ('success', 'skipped') for test_info in tests_info.values()):
+        passed_classes.add(report_classname)
+      for test_name, test_info in tests_info.items():
+        test_item = Test(test_info['classname'], test_name)
+        test_target = test_registry.get_owning_target(test_item)
+        self.report_all_info_for_single_test(self.options_scope, test_target,
+                                             test_name, test_info)
+        if test_info['classname'] in whole_classes and test_info['time'] is not None:
+          durations[test_info['classname']] += test_info['time']
+
+    for classname, duration in durations.items():
+      self._test_durations.record(classname, duration)
+    self._test_durations.save()
+    return passed_classes
+
+  @staticmethod
+  def _test_report_name(classname):
+    return 'TEST-{}.xml'.format(classname)
+
+  _TEST_RESULTS_DIR = '_test_results'
+
+  # Stands in for the report of a test class that has no tests.
+  _NO_TESTS_MARKER = 'no-tests'
+
+  def _test_result_dir(self, test, result_key):
+    return os.path.join(self.workdir, self._TEST_RESULTS_DIR, test.classname, result_key.hash)
+
+  # The locally stored results of a test class are removed once they have gone unused for this long.
+  _TEST_RESULTS_MAX_AGE_SECS = 30 * 24 * 60 * 60
+
+  def _prune_test_results(self):
+    """Removes the locally stored results of the test classes that have not been used for a while.
+
+    Storing or restoring the result of a class marks its results used. Results are kept whether or
+    not their class is among the tests of the current run, so that runs of other targets do not
+    evict them, and only the results of classes that are gone or long unrun are removed.
+    """
+    results_dir = os.path.join(self.workdir, self._TEST_RESULTS_DIR)
+    if not os.path.isdir(results_dir):
+      return
+    cutoff = time.time() - self._TEST_RESULTS_MAX_AGE_SECS
+    for classname in os.listdir(results_dir):
+      class_results_dir = os.path.join(results_dir, classname)
+      if os.path.getmtime(class_results_dir) < cutoff:
+        safe_rmtree(class_results_dir)
+
+  def _test_result_keys(self, test_registry, tests_by_properties):
+    """Returns a `CacheKey` for the result of each whole test class that can be fingerprinted.
+
+    The result of a test class is keyed by the compiled classes it transitively depends on, and by
+    everything else that may change it: the jars and resources on the classpath of its target, the
+    test runner and the properties it is run with.
+
+    :rtype: dict from :class:`pants.java.junit.junit_xml_parser.Test` to `CacheKey`
+    """
+    classes_by_source = self.context.products.get_data('classes_by_source')
+    product_deps_by_src = self.context.products.get_data('product_deps_by_src')
+    if classes_by_source is None or product_deps_by_src is None:
+      return {}
+    fingerprinter = ClassFingerprinter(get_buildroot(), classes_by_source, product_deps_by_src)
+
+    # The classes of compiled targets are fingerprinted by the test classes that depend on them.
+    runtime_classpath = self.context.products.get_data('runtime_classpath')
+    compiled_entries = {entry for target in product_deps_by_src
+                        for _, entry in runtime_classpath.get_for_target(target)}
+    runner_fingerprint = self._files_fingerprint(
+      JUnit.global_instance().runner_classpath(self.context))
+
+    classpath_fingerprints = {}
+    result_keys = {}
+    for properties, tests in tests_by_properties.items():
+      properties_fingerprint = self._properties_fingerprint(properties)
+      for test in tests:
+        if test.methodname is not None:
+          continue
+        classes_fingerprint = fingerprinter.fingerprint(test.classname)
+        if classes_fingerprint is None:
+          continue
+        target = test_registry.get_owning_target(test)
+        if target not in classpath_fingerprints:
+          classpath_fingerprints[target] = self._classpath_fingerprint(target, compiled_entries)
+
+        hasher = sha1()
+        hasher.update(self.fingerprint)
+        hasher.update(runner_fingerprint)
+        hasher.update(properties_fingerprint)
+        hasher.update(classpath_fingerprints[target])
+        hasher.update(classes_fingerprint)
+        result_keys[test] = CacheKey('junit.{}'.format(test.classname), hasher.hexdigest())
+    return result_keys
+
+  def _properties_fingerprint(self, properties):
+    workdir, platform, target_jvm_options, target_env_vars, concurrency, threads = properties
+    # The tests are run by the distribution chosen for their platform, which may change with the
+    # installed JVMs even when the platform does not.
+    distribution = JvmPlatform.preferred_jvm_distribution([platform], self._strict_jvm_version)
+    return json.dumps([os.path.relpath(workdir, get_buildroot()),
+                       [str(setting) for setting in platform],
+                       distribution.home,
+                       str(distribution.version),
+                       list(self.jvm_options) + list(target_jvm_options),
+                       sorted(target_env_vars),
+                       concurrency,
+                       threads])
+
+  def _classpath_fingerprint(self, target, compiled_entries):
+    """Fingerprints the jars and resources on the classpath of the given test target."""
+    index = ClasspathIndexFactory.global_instance().get_index()
+    jars = []
+    resources = []
+    for entry in self.classpath([target]):
+      if entry in compiled_entries:
+        continue
+      if ClasspathUtil.is_jar(entry):
+        jars.append(entry)
+      elif ClasspathUtil.is_dir(entry):
+        resources.extend((rel_path, os.path.join(entry, rel_path))
+                         for rel_path in index.contents(entry) if not rel_path.endswith('/'))
+
+    hasher = sha1()
+    hasher.update(self._files_fingerprint(jars))
+    # Resources are looked up by their paths, so a moved resource changes the fingerprint too.
+    digests = FileDigestCache.global_instance().digest_many(path for _, path in resources)
+    for (rel_path, _), digest in zip(resources, digests):
+      hasher.update(rel_path.encode('utf-8'))
+      hasher.update(digest)
+    return hasher.hexdigest()
+
+  @staticmethod
+  def _files_fingerprint(paths):
+    hasher = sha1()
+    for digest in FileDigestCache.global_instance().digest_many(paths):
+      hasher.update(digest)
+    return hasher.hexdigest()
+
+  def _restore_test_results(self, result_keys, output_dir):
+    """Restores the results of the test classes that passed with the same keys before.
+
+    Results that are not found locally are fetched from the artifact cache, if one is configured.
+    The reports of the restored results are copied to the output dir.
+
+    :returns: The tests whose results were restored.
+    :rtype: set of :class:`pants.java.junit.junit_xml_parser.Test`
+    """
+    def restore(test):
+      result_dir = self._test_result_dir(test, result_keys[test])
+      report = os.path.join(result_dir, self._test_report_name(test.classname))
+      if os.path.isfile(report):
+        shutil.copy(report, output_dir)
+      elif not os.path.isfile(os.path.join(result_dir, self._NO_TESTS_MARKER)):
+        return False
+      # Mark the results of the class used, so that they are not pruned.
+      os.utime(os.path.dirname(result_dir), None)
+      return True
+
+    restored = {test for test in result_keys if restore(test)}
+    unrestored = [test for test in result_keys if test not in restored]
+    fetched = self.fetch_cached_artifacts([result_keys[test] for test in unrestored])
+    restored.update(test for test, was_fetched in zip(unrestored, fetched)
+                    if was_fetched and restore(test))
+    return restored
+
+  def _store_test_results(self, result_keys, passed_classes, output_dir):
+    """Stores the results of the given test classes that passed, locally and in the artifact cache.
+
+    Only the latest result of each test class is kept locally.
+    """
+    keys_artifactfiles_pairs = []
+    for test, result_key in result_keys.items():
+      if test.classname not in passed_classes:
+        continue
+      result_dir = self._test_result_dir(test, result_key)
+      safe_mkdir(os.path.dirname(result_dir), clean=True)
+      safe_mkdir(result_dir)
+      report = os.path.join(output_dir, self._test_report_name(test.classname))
+      if os.path.isfile(report):
+        result = os.path.join(result_dir, os.path.basename(report))
+        shutil.copy(report, result)
+      else:
+        result = os.path.join(result_dir, self._NO_TESTS_MARKER)
+        touch(result)
+      keys_artifactfiles_pairs.append((result_key, [result]))
+    self.update_artifact_cache_for_keys(keys_artifactfiles_pairs)
+
+  _TEST_DURATIONS_FILE = 'test_durations.json'
+
+  @memoized_property
+  def _test_durations(self):
+    return RecordedDurations(os.path.join(self.workdir, self._TEST_DURATIONS_FILE))
+
   def _partition(self, tests):
+    if self._batch_concurrency > 1:
+      # The tests of a class are kept in one batch: every JVM that runs tests of a class writes
+      # the same TEST-<classname>.xml report, so concurrent batches must not share a class.
+      tests_by_class = OrderedDict()
+      for test in tests:
+        tests_by_class.setdefault(test.classname, []).append(test)
+      batches = self._test_durations.balance(tests_by_class.values(), self._batch_concurrency,
+                                             key=lambda class_tests: class_tests[0].classname,
+                                             max_size=self._batch_size)
+      return [[test for class_tests in batch for test in class_tests] for batch in batches]
     stride = min(self._batch_size, len(tests))
-    for i in range(0, len(tests), stride):
-      yield tests[i:i + stride]
+    return [tests[i:i + stride] for i in range(0, len(tests), stride)]
 
   def _get_possible_tests_to_run(self):
     buildroot = get_buildroot()
@@ -486,11 +809,10 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
     generates tuples (Test, Target).
     """
     classpath_products = self.context.products.get_data('runtime_classpath')
+    index = ClasspathIndexFactory.global_instance().get_index()
     for target in targets:
-      contents = ClasspathUtil.classpath_contents((target,), classpath_products, confs=self.confs)
-      for f in contents:
-        classname = ClasspathUtil.classname_for_rel_classfile(f)
-        if classname:
+      for entry in ClasspathUtil.classpath((target,), classpath_products, confs=self.confs):
+        for classname in index.classnames(entry):
           yield Test(classname=classname), target
 
   def _test_target_filter(self):
@@ -567,7 +889,8 @@ class JUnitRun(TestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
         # Kill everything except the isolated runs/ dir.
         for name in os.listdir(self.workdir):
           path = os.path.join(self.workdir, name)
-          if name not in (run_dir, lock_file):
+          if name not in (run_dir, lock_file, self._TEST_DURATIONS_FILE,
+                          self._TEST_RESULTS_DIR):
             if os.path.isdir(path):
               safe_rmtree(path)
             else:
@@ -7,12 +7,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import Queue as queue
 import threading
+import time
 import traceback
 from collections import defaultdict, deque
 from heapq import heappop, heappush
 
-from pants.base.worker_pool import Work
-
 
 class Job(object):
   """A unit of scheduling for the ExecutionGraph.
@@ -129,24 +128,6 @@ class JobExistsError(UnexecutableGraphError):
                                           .format(key))
 
 
-class ThreadSafeCounter(object):
-  def __init__(self):
-    self.lock = threading.Lock()
-    self._counter = 0
-
-  def get(self):
-    with self.lock:
-      return self._counter
-
-  def increment(self):
-    with self.lock:
-      self._counter += 1
-
-  def decrement(self):
-    with self.lock:
-      self._counter -= 1
-
-
 class ExecutionGraph(object):
   """A directed acyclic graph of work to execute.
 
@@ -154,10 +135,12 @@ class ExecutionGraph(object):
   global execution graph.
   """
 
-  def __init__(self, job_list):
+  def __init__(self, job_list, job_weights=None):
     """
 
     :param job_list Job: list of Jobs to schedule and run.
+    :param dict job_weights: Optional dict of job key to the weight of the job on a critical path,
+                             such as its expected duration. Defaults to the size of each job.
     """
     self._dependencies = defaultdict(list)
     self._dependees = defaultdict(list)
@@ -175,7 +158,11 @@ class ExecutionGraph(object):
     if len(self._job_keys_with_no_dependencies) == 0:
       raise NoRootJobError()
 
-    self._job_priority = self._compute_job_priorities(job_list)
+    self._job_priority = self._compute_job_priorities(job_list, job_weights)
+    # The durations in seconds of the jobs that complete successfully, by key.
+    self.job_durations = {}
+    # The time in seconds that each job waited for a worker after becoming ready to run, by key.
+    self.job_queue_waits = {}
 
   def format_dependee_graph(self):
     return "\n".join([
@@ -198,11 +185,11 @@ class ExecutionGraph(object):
     for dependency_key in dependency_keys:
       self._dependees[dependency_key].append(key)
 
-  def _compute_job_priorities(self, job_list):
+  def _compute_job_priorities(self, job_list, job_weights=None):
     """Walks the dependency graph breadth-first, starting from the most dependent tasks,
-     and computes the job priority as the sum of the jobs sizes along the critical path."""
+     and computes the job priority as the sum of the jobs weights along the critical path."""
 
-    job_size = {job.key: job.size for job in job_list}
+    job_size = job_weights or {job.key: job.size for job in job_list}
     job_priority = defaultdict(int)
 
     bfs_queue = deque()
@@ -230,14 +217,15 @@ class ExecutionGraph(object):
     :param pool: A WorkerPool to run jobs on
     :param log: logger for logging debug information and progress
 
-    submits all the work without any dependencies to the worker pool
+    submits the highest priority jobs without any dependencies to the worker pool, up to its size
     when a unit of work finishes,
+      its worker submits the next highest priority job that is ready to run, if any
       if it is successful
         calls success callback
         checks for dependees whose dependencies are all successful, and submits them
       if it fails
         calls failure callback
-        marks dependees as failed and queues them directly into the finished work queue
+        cancels its transitive dependees, calling their failure callbacks
     when all work is either successful or failed,
       cleans up the work pool
     if there's an exception on the main thread,
@@ -252,43 +240,79 @@ class ExecutionGraph(object):
     finished_queue = queue.Queue()
 
     heap = []
-    jobs_in_flight = ThreadSafeCounter()
+    # When each job became ready to run, for measuring how long it then waited for a worker.
+    ready_at = {}
+    # The number of jobs submitted to the pool that have not yet finished, in a list so that it can
+    # be updated from workers.
+    jobs_in_flight = [0]
+    # Guards the heap and the jobs in flight: workers refill their own slots from the heap. It is
+    # reentrant for pools that run work in the submitting thread.
+    lock = threading.RLock()
 
     def put_jobs_into_heap(job_keys):
-      for job_key in job_keys:
-        # minus because jobs with larger priority should go first
-        heappush(heap, (-self._job_priority[job_key], job_key))
+      now = time.time()
+      with lock:
+        for job_key in job_keys:
+          ready_at[job_key] = now
+          # minus because jobs with larger priority should go first
+          heappush(heap, (-self._job_priority[job_key], job_key))
+
+    def worker(job_key):
+      start = time.time()
+      self.job_queue_waits[job_key] = start - ready_at[job_key]
+      try:
+        self._jobs[job_key]()
+        self.job_durations[job_key] = time.time() - start
+        result = (job_key, SUCCESSFUL, None)
+      except Exception as e:
+        result = (job_key, FAILED, e)
+      # Free this job's slot before reporting it, so that the dependees the main thread submits in
+      # response can start immediately.
+      with lock:
+        jobs_in_flight[0] -= 1
+      finished_queue.put(result)
+      try_to_submit_jobs_from_heap()
 
     def try_to_submit_jobs_from_heap():
-      def worker(worker_key, work):
-        try:
-          work()
-          result = (worker_key, SUCCESSFUL, None)
-        except Exception as e:
-          result = (worker_key, FAILED, e)
-        finished_queue.put(result)
-        jobs_in_flight.decrement()
-
-      while len(heap) > 0 and jobs_in_flight.get() < pool.num_workers:
-        priority, job_key = heappop(heap)
-        jobs_in_flight.increment()
-        status_table.mark_queued(job_key)
-        pool.submit_async_work(Work(worker, [(job_key, (self._jobs[job_key]))]))
+      with lock:
+        while len(heap) > 0 and jobs_in_flight[0] < pool.num_workers:
+          priority, job_key = heappop(heap)
+          jobs_in_flight[0] += 1
+          status_table.mark_queued(job_key)
+          pool.submit_async_call(worker, job_key)
 
     def submit_jobs(job_keys):
       put_jobs_into_heap(job_keys)
       try_to_submit_jobs_from_heap()
 
+    def run_failure_callback(job_key):
+      try:
+        self._jobs[job_key].run_failure_callback()
+      except Exception as e:
+        log.debug(traceback.format_exc())
+        raise ExecutionFailure("Error in on_failure for {}".format(job_key), e)
+
+    def cancel_dependees(job_key):
+      dependees = deque(self._dependees[job_key])
+      while dependees:
+        dependee = dependees.popleft()
+        if status_table.is_unstarted(dependee):
+          status_table.mark_as(CANCELED, dependee)
+          run_failure_callback(dependee)
+          log.debug("{} finished with status {}".format(dependee, CANCELED))
+          dependees.extend(self._dependees[dependee])
+
     try:
       submit_jobs(self._job_keys_with_no_dependencies)
 
       while not status_table.are_all_done():
         try:
+          # NB: Workers submit jobs on their own, so this timeout only paces progress logging. One
+          # is needed regardless: python ignores SIGINT while waiting without a timeout.
           finished_key, result_status, value = finished_queue.get(timeout=10)
         except queue.Empty:
           log.debug("Waiting on \n  {}\n".format("\n  ".join(
             "{}: {}".format(key, state) for key, state in status_table.unfinished_items())))
-          try_to_submit_jobs_from_heap()
           continue
 
         finished_job = self._jobs[finished_key]
@@ -310,18 +334,10 @@ class ExecutionGraph(object):
               ready_dependees.append(dependee)
 
           submit_jobs(ready_dependees)
-        else:  # Failed or canceled.
-          try:
-            finished_job.run_failure_callback()
-          except Exception as e:
-            log.debug(traceback.format_exc())
-            raise ExecutionFailure("Error in on_failure for {}".format(finished_key), e)
-
+        else:  # Failed.
+          run_failure_callback(finished_key)
           # Propagate failures downstream.
-          for dependee in direct_dependees:
-            if status_table.is_unstarted(dependee):
-              status_table.mark_queued(dependee)
-              finished_queue.put((dependee, CANCELED, None))
+          cancel_dependees(finished_key)
 
         # Log success or failure for this job.
         if result_status is FAILED:
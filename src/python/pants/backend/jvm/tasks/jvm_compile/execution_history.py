@@ -0,0 +1,62 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+from pants.task.recorded_durations import RecordedDurations
+
+
+class ExecutionHistory(RecordedDurations):
+  """The durations of the jobs of previously executed ExecutionGraphs, persisted in a json file.
+
+  Recorded durations are used to weigh jobs when prioritizing the critical path of later
+  executions. Each job's size estimate and dependencies are recorded along with its duration, so
+  that recorded graphs can be replayed by simulation.
+  """
+
+  @property
+  def jobs(self):
+    """A dict of job key to a dict of its recorded `size`, `dependencies` and `duration`."""
+    return self._entries
+
+  def weights_for(self, jobs):
+    """Returns a dict of job key to a weight for prioritizing each of the given jobs.
+
+    A job with a recorded duration is weighed by it. A job without one is weighed by its size
+    estimate, scaled to a duration by the median duration per unit of size of all recorded jobs.
+    If there are no recorded durations for any of the jobs, their size estimates are used as is.
+    """
+    durations = {job.key: self.get(job.key) for job in jobs}
+    if all(duration is None for duration in durations.values()):
+      return {job.key: job.size for job in jobs}
+
+    recorded = [entry for entry in self._entries.values() if entry.get('duration') is not None]
+    rates = sorted(entry['duration'] / entry['size'] for entry in recorded if entry.get('size') > 0)
+    if rates:
+      rate = rates[len(rates) // 2]
+      fallback = lambda job: job.size * rate
+    else:
+      # Without sizes to scale, assume a job without a duration is a typical one.
+      estimates = self.estimates([job.key for job in jobs])
+      fallback = lambda job: estimates[job.key]
+
+    return {job.key: durations[job.key] if durations[job.key] is not None else fallback(job)
+            for job in jobs}
+
+  def record_jobs(self, jobs, durations):
+    """Records the given jobs and any of their durations, and saves the history.
+
+    :param list jobs: The Jobs of an executed ExecutionGraph.
+    :param dict durations: A dict of job key to duration in seconds for the jobs that completed.
+    """
+    for job in jobs:
+      with self._lock:
+        entry = self._entries.setdefault(job.key, {})
+        entry['size'] = job.size
+        entry['dependencies'] = list(job.dependencies)
+      duration = durations.get(job.key)
+      if duration is not None:
+        self.record(job.key, duration)
+    self.save()
@@ -27,6 +27,7 @@ from pants.backend.jvm.tasks.jvm_compile.compile_context import (CompileContext,
                                                                  strict_dependencies)
 from pants.backend.jvm.tasks.jvm_compile.execution_graph import (ExecutionFailure, ExecutionGraph,
                                                                  Job)
+from pants.backend.jvm.tasks.jvm_compile.execution_history import ExecutionHistory
 from pants.backend.jvm.tasks.jvm_compile.missing_dependency_finder import (CompileErrorExtractor,
                                                                            MissingDependencyFinder)
 from pants.backend.jvm.tasks.jvm_dependency_analyzer import JvmDependencyAnalyzer
@@ -169,6 +170,11 @@ class JvmCompile(NailgunTaskBase):
                   'constraints). Choose \'random\' to choose random sizes for each target, which '
                   'may be useful for distributed builds.')
 
+    register('--duration-history', advanced=True, type=bool, default=True,
+             help='Record how long each target takes to compile, and prioritize targets on the '
+                  'critical path by their recorded durations in later runs. Targets without a '
+                  'recorded duration fall back to the --size-estimator.')
+
     register('--capture-log', advanced=True, type=bool,
              fingerprint=True,
              help='Capture compilation output to per-target logs.')
@@ -368,6 +374,12 @@ class JvmCompile(NailgunTaskBase):
                                           dict(include_scopes=Scopes.JVM_COMPILE_SCOPES,
                                                respect_intransitive=True))
 
+  @memoized_property
+  def _execution_history(self):
+    if not self.get_options().duration_history:
+      return None
+    return ExecutionHistory(os.path.join(self.workdir, 'execution_history.json'))
+
   @property
   def _unused_deps_check_enabled(self):
     return self.get_options().unused_deps != 'ignore'
@@ -536,11 +548,26 @@ class JvmCompile(NailgunTaskBase):
                                      invalid_targets,
                                      invalidation_check.invalid_vts)
 
-    exec_graph = ExecutionGraph(jobs)
+    history = self._execution_history
+    exec_graph = ExecutionGraph(jobs, job_weights=history.weights_for(jobs) if history else None)
     try:
       exec_graph.execute(worker_pool, self.context.log)
     except ExecutionFailure as e:
       raise TaskError("Compilation failure: {}".format(e))
+    finally:
+      if history:
+        history.record_jobs(jobs, exec_graph.job_durations)
+      self._report_job_timings(exec_graph, invalid_targets)
+
+  def _report_job_timings(self, exec_graph, targets):
+    """Reports how long each compile waited for a worker, and then ran, to the RunTracker."""
+    for target in targets:
+      key = self.exec_graph_key_for_target(target)
+      for name, timings in (('queue_wait', exec_graph.job_queue_waits),
+                            ('run_time', exec_graph.job_durations)):
+        if key in timings:
+          self.context.run_tracker.report_target_info(self.options_scope, target.address.spec,
+                                                      ['compile', name], timings[key])
 
   def _record_compile_classpath(self, classpath, targets, outdir):
     text = '\n'.join(classpath)
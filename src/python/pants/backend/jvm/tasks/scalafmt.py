@@ -48,6 +48,8 @@ class ScalaFmt(NailgunTask, AbstractClass):
   @memoized_property
   def _formatted_target_types(self):
     aliases = set(self.get_options().target_types)
+    for alias in aliases:
+      self.context.build_file_parser.resolve_deferred_alias(alias)
     registered_aliases = self.context.build_file_parser.registered_aliases()
     return tuple({target_type
                   for alias in aliases
@@ -0,0 +1,25 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'idea': ['idea'],
+  'idea-plugin': ['idea-plugin'],
+  'eclipse': ['eclipse'],
+  'ensime': ['ensime'],
+  'export': ['export'],
+  'depmap': ['depmap'],
+  'dependencies': ['dependencies'],
+  'filedeps': ['filedeps'],
+}
+
+INDEPENDENT_GOALS = [
+  'idea-plugin',
+  'depmap',
+  'dependencies',
+  'filedeps',
+]
@@ -0,0 +1,30 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+
+GOALS = {
+  'pyprep': ['interpreter', 'requirements', 'sources'],
+  'run': ['py'],
+  'test': ['pytest-prep', 'pytest'],
+  'repl': ['py'],
+  'setup-py': ['setup-py'],
+  'binary': ['py'],
+  'fmt': ['isort'],
+}
+
+BUILD_FILE_ALIASES = [
+  'pants_requirement',
+  'python_artifact',
+  'python_binary',
+  'python_library',
+  'python_requirement',
+  'python_requirement_library',
+  'python_requirements',
+  'python_tests',
+  'resources',
+  'setup_py',
+]
@@ -8,6 +8,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import itertools
 import os
 import shutil
+import threading
 import time
 import traceback
 from contextlib import contextmanager
@@ -22,12 +23,15 @@ from pants.backend.python.tasks2.pytest_prep import PytestPrep
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import ErrorWhileTesting, TaskError
 from pants.base.hash_utils import Sharder
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
+from pants.task.recorded_durations import RecordedDurations
 from pants.task.task import Task
 from pants.task.testrunner_task_mixin import TestRunnerTaskMixin
 from pants.util.contextutil import temporary_dir, temporary_file
 from pants.util.dirutil import safe_mkdir, safe_mkdir_for
+from pants.util.memo import memoized_property
 from pants.util.process_handler import SubprocessProcessHandler
 from pants.util.strutil import safe_shlex_split
 from pants.util.xml_parser import XmlParser
@@ -104,6 +108,12 @@ class PytestRun(TestRunnerTaskMixin, Task):
              help='Run all tests in a single pytest invocation. If turned off, each test target '
                   'will run in its own pytest invocation, which will be slower, but isolates '
                   'tests from process-wide state created by tests in other targets.')
+    register('--partition-concurrency', type=int, default=1,
+             help='The number of partitions to run concurrently, each in its own pytest '
+                  'invocation. Partitions that took longest in previous runs are started first. '
+                  'When partitions run concurrently, each emits its coverage data and reports on '
+                  'its own, to a subdirectory of --coverage-output-dir if that is set. Only has '
+                  'an effect with --no-fast.')
     register('--junit-xml-dir', metavar='<DIR>', fingerprint=True,
              help='Specifying a directory causes junit xml results files to be emitted under '
                   'that dir for each test run.')
@@ -184,7 +194,7 @@ class PytestRun(TestRunnerTaskMixin, Task):
   def _debug(self):
     return self.get_options().level == 'debug'
 
-  def _generate_coverage_config(self, source_mappings):
+  def _generate_coverage_config(self, source_mappings, data_file=None):
     # For the benefit of macos testing, add the 'real' path the the directory as an equivalent.
     def add_realpath(path):
       realpath = os.path.realpath(path)
@@ -193,6 +203,8 @@ class PytestRun(TestRunnerTaskMixin, Task):
 
     cp = configparser.SafeConfigParser()
     cp.readfp(StringIO(self.DEFAULT_COVERAGE_CONFIG))
+    if data_file:
+      cp.set('run', 'data_file', data_file)
 
     # We use the source_mappings to setup the `combine` coverage command to transform paths in
     # coverage data files into canonical form.
@@ -220,8 +232,8 @@ class PytestRun(TestRunnerTaskMixin, Task):
     return cp
 
   @contextmanager
-  def _cov_setup(self, source_mappings, coverage_sources=None):
-    cp = self._generate_coverage_config(source_mappings=source_mappings)
+  def _cov_setup(self, source_mappings, coverage_sources=None, data_file=None):
+    cp = self._generate_coverage_config(source_mappings=source_mappings, data_file=data_file)
     # Note that it's important to put the tmpfile under the workdir, because pytest
     # uses all arguments that look like paths to compute its rootdir, and we want
     # it to pick the buildroot.
@@ -237,7 +249,7 @@ class PytestRun(TestRunnerTaskMixin, Task):
       yield args, coverage_rc
 
   @contextmanager
-  def _maybe_emit_coverage_data(self, targets, pex):
+  def _maybe_emit_coverage_data(self, targets, pex, coverage_data_dir=None):
     coverage = self.get_options().coverage
     if coverage is None:
       yield []
@@ -297,8 +309,15 @@ class PytestRun(TestRunnerTaskMixin, Task):
           # The source is to be interpreted as a package name.
           coverage_sources.append(source)
 
+    # Unless told otherwise, coverage writes its data to the cwd, which is shared by all partitions.
+    data_file = None
+    if coverage_data_dir:
+      safe_mkdir(coverage_data_dir, clean=True)
+      data_file = os.path.join(coverage_data_dir, '.coverage')
+    coverage_file = data_file or '.coverage'
     with self._cov_setup(source_mappings,
-                         coverage_sources=coverage_sources) as (args, coverage_rc):
+                         coverage_sources=coverage_sources,
+                         data_file=data_file) as (args, coverage_rc):
       try:
         yield args
       finally:
@@ -309,19 +328,22 @@ class PytestRun(TestRunnerTaskMixin, Task):
           return self._pex_run(pex, workunit_name='coverage', args=arguments, env=env)
 
         # On failures or timeouts, the .coverage file won't be written.
-        if not os.path.exists('.coverage'):
+        if not os.path.exists(coverage_file):
           self.context.log.warn('No .coverage file was found! Skipping coverage reporting.')
         else:
           # Normalize .coverage.raw paths using combine and `paths` config in the rc file.
           # This swaps the /tmp pex chroot source paths for the local original source paths
           # the pex was generated from and which the user understands.
-          shutil.move('.coverage', '.coverage.raw')
+          shutil.move(coverage_file, '{}.raw'.format(coverage_file))
           pex_run(['combine', '--rcfile', coverage_rc])
           pex_run(['report', '-i', '--rcfile', coverage_rc])
+          relpath = Target.maybe_readable_identify(targets)
           if self.get_options().coverage_output_dir:
             target_dir = self.get_options().coverage_output_dir
+            if coverage_data_dir:
+              # Concurrent partitions must not write their reports over each other.
+              target_dir = os.path.join(target_dir, relpath)
           else:
-            relpath = Target.maybe_readable_identify(targets)
             pants_distdir = self.context.options.for_global_scope().pants_distdir
             target_dir = os.path.join(pants_distdir, 'coverage', relpath)
           safe_mkdir(target_dir)
@@ -417,10 +439,11 @@ class PytestRun(TestRunnerTaskMixin, Task):
       yield conftest
 
   @contextmanager
-  def _test_runner(self, targets, sources_map):
+  def _test_runner(self, targets, sources_map, coverage_data_dir=None):
     pex = self.context.products.get_data(PytestPrep.PYTEST_BINARY)
     with self._conftest(sources_map) as conftest:
-      with self._maybe_emit_coverage_data(targets, pex) as coverage_args:
+      with self._maybe_emit_coverage_data(targets, pex,
+                                          coverage_data_dir=coverage_data_dir) as coverage_args:
         yield pex, [conftest] + coverage_args
 
   def _do_run_tests_with_args(self, pex, args):
@@ -508,18 +531,25 @@ class PytestRun(TestRunnerTaskMixin, Task):
     else:
       return tuple((target,) for target in targets)
 
+  @staticmethod
+  def _partition_key(partition):
+    return Target.maybe_readable_identify(partition)
+
+  @memoized_property
+  def _partition_durations(self):
+    return RecordedDurations(os.path.join(self.workdir, 'partition_durations.json'))
+
   def _run_tests(self, targets):
     partitions = self._partition(targets)
 
-    results = {}
-    for partition in partitions:
-      try:
-        rv = self._do_run_tests(partition)
-      except ErrorWhileTesting as e:
-        rv = PytestResult.from_error(e)
-      results[partition] = rv
-      if not rv.success and self.get_options().fail_fast:
-        break
+    concurrency = self.get_options().partition_concurrency
+    try:
+      if concurrency > 1 and len(partitions) > 1:
+        results = self._run_partitions_concurrently(partitions, concurrency)
+      else:
+        results = self._run_partitions(partitions)
+    finally:
+      self._partition_durations.save()
 
     for partition in sorted(results):
       rv = results[partition]
@@ -533,16 +563,89 @@ class PytestRun(TestRunnerTaskMixin, Task):
     if failed_targets:
       raise ErrorWhileTesting(failed_targets=failed_targets)
 
+  def _run_partitions(self, partitions):
+    results = {}
+    for partition in partitions:
+      try:
+        rv = self._do_run_tests(partition)
+      except ErrorWhileTesting as e:
+        rv = PytestResult.from_error(e)
+      results[partition] = rv
+      if not rv.success and self.get_options().fail_fast:
+        break
+    return results
+
+  def _run_partitions_concurrently(self, partitions, concurrency):
+    results = {}
+    fail_fast = self.get_options().fail_fast
+    failed = threading.Event()
+
+    def run_partition(partition, invalid_targets):
+      if fail_fast and failed.is_set():
+        return
+      partition_key = self._partition_key(partition)
+      with self.context.new_workunit(name=partition_key):
+        coverage_data_dir = os.path.join(self.workdir, 'coverage', partition_key)
+        try:
+          rv = self._run_partition(partition, invalid_targets, coverage_data_dir=coverage_data_dir)
+        except ErrorWhileTesting as e:
+          rv = PytestResult.from_error(e)
+      results[partition] = rv
+      if not rv.success:
+        failed.set()
+
+    targets = [target for partition in partitions for target in partition]
+    with self.invalidated(targets,
+                          # Re-run tests when the code they test (and depend on) changes.
+                          invalidate_dependents=True) as invalidation_check:
+      invalid_targets = {tgt for vts in invalidation_check.invalid_vts for tgt in vts.targets}
+      stale = []
+      for partition in self._partition_durations.longest_first(partitions,
+                                                               key=self._partition_key):
+        invalid_tgts = [tgt for tgt in partition if tgt in invalid_targets]
+        if invalid_tgts:
+          stale.append((partition, invalid_tgts))
+        else:
+          results[partition] = PytestResult.rc(0)
+
+      if stale:
+        with self.context.new_workunit(name='partitions',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          worker_pool = WorkerPool(workunit, self.context.run_tracker, concurrency)
+          try:
+            worker_pool.submit_work_and_wait(Work(run_partition, stale))
+          finally:
+            worker_pool.shutdown()
+
+      # Only the targets of the partitions that passed are marked valid on leaving the block: the
+      # targets of partitions that failed, or were not run, stay invalid.
+      passed = {target for partition, rv in results.items() if rv.success for target in partition}
+      invalidation_check.invalid_vts = [vts for vts in invalidation_check.invalid_vts
+                                        if all(target in passed for target in vts.targets)]
+    return results
+
   def _do_run_tests(self, targets):
     with self.invalidated(targets,
                           # Re-run tests when the code they test (and depend on) changes.
                           invalidate_dependents=True) as invalidation_check:
 
       invalid_tgts = [tgt for vts in invalidation_check.invalid_vts for tgt in vts.targets]
-      result = self._run_pytest(invalid_tgts)
+      result = self._run_partition(targets, invalid_tgts)
       return result.checked()
 
-  def _run_pytest(self, targets):
+  def _run_partition(self, partition, targets, coverage_data_dir=None):
+    """Runs the tests of the given targets of a partition.
+
+    The duration of the run is recorded for the partition if all of its targets were run, so that
+    the longest partitions can be started first when partitions run concurrently.
+    """
+    start = time.time()
+    result = self._run_pytest(targets, coverage_data_dir=coverage_data_dir)
+    if targets and len(targets) == len(partition):
+      self._partition_durations.record(self._partition_key(partition), time.time() - start)
+    return result
+
+  def _run_pytest(self, targets, coverage_data_dir=None):
     if not targets:
       return PytestResult.rc(0)
 
@@ -557,7 +660,8 @@ class PytestRun(TestRunnerTaskMixin, Task):
     if not sources_map:
       return PytestResult.rc(0)
 
-    with self._test_runner(targets, sources_map) as (pex, test_args):
+    with self._test_runner(targets, sources_map,
+                           coverage_data_dir=coverage_data_dir) as (pex, test_args):
       # Validate that the user didn't provide any passthru args that conflict
       # with those we must set ourselves.
       for arg in self.get_passthru_args():
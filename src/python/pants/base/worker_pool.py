@@ -80,6 +80,16 @@ class WorkerPool(object):
                       workunit_parent=workunit_parent, on_failure=on_failure)
       return self._pool.map_async(do_work, work.args_tuples, chunksize=1, callback=on_success)
 
+  def submit_async_call(self, func, *args):
+    """Submit a single call to be executed in the background.
+
+    Unlike `submit_async_work`, this has no workunit or callbacks of its own: it is for callers
+    that schedule their own calls, and that handle results and errors within `func`.
+
+    :return: `multiprocessing.pool.ApplyResult`
+    """
+    return self._pool.apply_async(self._do_work, (func, args, None, None))
+
   def submit_async_work_chain(self, work_chain, workunit_parent, done_hook=None):
     """Submit work to be executed in the background.
 
@@ -141,11 +151,13 @@ class WorkerPool(object):
 
   def _do_work(self, func, args_tuple, workunit_name, workunit_parent, on_failure=None):
     try:
-      if workunit_name:
-        with self._run_tracker.new_workunit_under_parent(name=workunit_name, parent=workunit_parent):
+      with self._run_tracker.thread_working():
+        if workunit_name:
+          with self._run_tracker.new_workunit_under_parent(name=workunit_name,
+                                                           parent=workunit_parent):
+            return func(*args_tuple)
+        else:
           return func(*args_tuple)
-      else:
-        return func(*args_tuple)
     except KeyboardInterrupt:
       # If a worker thread intercepts a KeyboardInterrupt, we want to propagate it to the main
       # thread.
@@ -38,10 +38,30 @@ class LegacySymbolTable(SymbolTable):
 
   @classmethod
   @memoized_method
-  def aliases(cls):
-    """TODO: This is a nasty escape hatch to pass aliases to LegacyPythonCallbacksParser."""
+  def _build_configuration(cls):
     _, build_config = OptionsInitializer(OptionsBootstrapper()).setup(init_logging=False)
-    return build_config.registered_aliases()
+    return build_config
+
+  @classmethod
+  def aliases(cls):
+    """TODO: This is a nasty escape hatch to pass aliases to LegacyPythonCallbacksParser.
+
+    Only the aliases whose definitions are loaded are returned: see `deferred_aliases`.
+    """
+    return cls._build_configuration().registered_aliases()
+
+  @classmethod
+  def deferred_aliases(cls):
+    """Returns the aliases whose definitions are only loaded once a BUILD file uses them."""
+    return cls._build_configuration().deferred_aliases()
+
+  @classmethod
+  def resolve_deferred_alias(cls, alias):
+    """Loads the definition of the given deferred alias.
+
+    :returns: The BuildFileAliases whose definitions this call loaded.
+    """
+    return cls._build_configuration().resolve_deferred_alias(alias)
 
   @classmethod
   @memoized_method
@@ -116,7 +136,8 @@ class EngineInitializer(object):
                          build_ignore_patterns=None,
                          exclude_target_regexps=None,
                          subproject_roots=None,
-                         include_trace_on_error=True):
+                         include_trace_on_error=True,
+                         address_map_snapshot=None):
     """Construct and return the components necessary for LegacyBuildGraph construction.
 
     :param list pants_ignore_patterns: A list of path ignore patterns for FileSystemProjectTree,
@@ -132,6 +153,8 @@ class EngineInitializer(object):
     :param list subproject_roots: Paths that correspond with embedded build roots
                                   under the current build root.
     :param bool include_trace_on_error: If True, when an error occurs, the error message will include the graph trace.
+    :param AddressMapSnapshot address_map_snapshot: If specified, a snapshot of previously parsed
+                                                    BUILD files to parse through.
     :returns: A tuple of (scheduler, engine, symbol_table_cls, build_graph_cls).
     """
 
@@ -147,7 +170,8 @@ class EngineInitializer(object):
                                    parser_cls=LegacyPythonCallbacksParser,
                                    build_ignore_patterns=build_ignore_patterns,
                                    exclude_target_regexps=exclude_target_regexps,
-                                   subproject_roots=subproject_roots)
+                                   subproject_roots=subproject_roots,
+                                   address_map_snapshot=address_map_snapshot)
 
     # Load the native backend.
     native = native or Native.Factory.global_instance().create()
@@ -14,8 +14,11 @@ from pants.base.workunit import WorkUnit, WorkUnitLabel
 from pants.bin.engine_initializer import EngineInitializer
 from pants.bin.repro import Reproducer
 from pants.build_graph.build_file_address_mapper import BuildFileAddressMapper
+from pants.build_graph.build_file_code_cache import BuildFileParsing
 from pants.build_graph.build_file_parser import BuildFileParser
+from pants.build_graph.dependees_index import DependeesIndexer
 from pants.build_graph.mutable_build_graph import MutableBuildGraph
+from pants.build_graph.source_owners_index import SourceOwnersIndexer
 from pants.engine.round_engine import RoundEngine
 from pants.engine.subsystem.native import Native
 from pants.goal.context import Context
@@ -27,6 +30,7 @@ from pants.init.target_roots import TargetRoots
 from pants.java.nailgun_executor import NailgunProcessGroup
 from pants.reporting.reporting import Reporting
 from pants.scm.subsystems.changed import Changed
+from pants.source.file_digests import FileDigests
 from pants.source.source_root import SourceRootConfig
 from pants.task.task import QuietTaskMixin
 from pants.util.filtering import create_filters, wrap_filters
@@ -113,11 +117,13 @@ class GoalRunnerFactory(object):
       return graph, address_mapper, target_roots.as_specs()
     else:
       spec_roots = TargetRoots.parse_specs(target_specs, self._root_dir)
+      parse_workers = BuildFileParsing.global_instance().get_options().workers
       address_mapper = BuildFileAddressMapper(self._build_file_parser,
                                               get_project_tree(self._global_options),
                                               build_ignore_patterns,
                                               exclude_target_regexps,
-                                              subproject_build_roots)
+                                              subproject_build_roots,
+                                              parse_workers)
       return MutableBuildGraph(address_mapper), address_mapper, spec_roots
 
   def _determine_goals(self, requested_goals):
@@ -159,6 +165,13 @@ class GoalRunnerFactory(object):
 
   def _setup_context(self, pantsd_launcher):
     with self._run_tracker.new_workunit(name='setup', labels=[WorkUnitLabel.SETUP]):
+      # Digest the sources of targets as configured for this run when fingerprinting them.
+      FileDigests.global_instance().install()
+      # Compile BUILD files via the persistent cache, if so configured.
+      BuildFileParsing.global_instance().install()
+      # Answer dependee and source owner queries from the persistent indexes, if so configured.
+      DependeesIndexer.global_instance().install()
+      SourceOwnersIndexer.global_instance().install()
       self._build_graph, self._address_mapper, spec_roots = self._init_graph(
         self._global_options.enable_v2_engine,
         self._global_options.pants_ignore,
@@ -196,11 +209,14 @@ class GoalRunnerFactory(object):
     self._maybe_launch_pantsd(pantsd_launcher)
     self._handle_help(self._help_request)
     goals, context = self._setup_context(pantsd_launcher)
+    # Runs forked by pantsd may be concurrent, so they lock out those that modify the workdir.
+    run_lock = pantsd_launcher.run_lock(self._requested_goals) if self._daemon_graph_helper else None
     return GoalRunner(context=context,
                       goals=goals,
                       run_tracker=self._run_tracker,
                       kill_nailguns=self._kill_nailguns,
-                      exiter=self._exiter)
+                      exiter=self._exiter,
+                      run_lock=run_lock)
 
 
 class GoalRunner(object):
@@ -208,24 +224,29 @@ class GoalRunner(object):
 
   Factory = GoalRunnerFactory
 
-  def __init__(self, context, goals, run_tracker, kill_nailguns, exiter=sys.exit):
+  def __init__(self, context, goals, run_tracker, kill_nailguns, exiter=sys.exit, run_lock=None):
     """
     :param Context context: The global, pre-initialized Context as created by GoalRunnerFactory.
     :param list[Goal] goals: The list of goals to act on.
     :param Runtracker run_tracker: The global, pre-initialized/running RunTracker instance.
     :param bool kill_nailguns: Whether or not to kill nailguns after the run.
     :param func exiter: A function that accepts an exit code value and exits (for tests, Optional).
+    :param run_lock: A contextmanager to hold while executing the goals. (Optional)
     """
     self._context = context
     self._goals = goals
     self._run_tracker = run_tracker
     self._kill_nailguns = kill_nailguns
     self._exiter = exiter
+    self._run_lock = run_lock
 
   @classmethod
   def subsystems(cls):
     """Subsystems used outside of any task."""
     return {
+      BuildFileParsing,
+      DependeesIndexer,
+      FileDigests,
       SourceRootConfig,
       Reporting,
       Reproducer,
@@ -233,6 +254,7 @@ class GoalRunner(object):
       Changed.Factory,
       Native.Factory,
       PantsDaemonLauncher.Factory,
+      SourceOwnersIndexer,
     }
 
   def _execute_engine(self):
@@ -259,7 +281,11 @@ class GoalRunner(object):
     should_kill_nailguns = self._kill_nailguns
 
     try:
-      result = self._execute_engine()
+      if self._run_lock:
+        with self._run_lock:
+          result = self._execute_engine()
+      else:
+        result = self._execute_engine()
       if result:
         self._run_tracker.set_root_outcome(WorkUnit.FAILURE)
     except KeyboardInterrupt:
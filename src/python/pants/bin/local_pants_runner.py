@@ -5,15 +5,23 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import logging
+import os
+
 from pants.base.build_environment import get_buildroot
 from pants.bin.goal_runner import GoalRunner
 from pants.bin.reporting_initializer import ReportingInitializer
 from pants.bin.repro import Reproducer
+from pants.goal.sampling_profiler import SamplingProfiler
 from pants.init.options_initializer import OptionsInitializer
 from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.reporting.report import Report
 from pants.util.contextutil import hard_exit_handler, maybe_profiled
 
 
+logger = logging.getLogger(__name__)
+
+
 class LocalPantsRunner(object):
   """Handles a single pants invocation running in the process-local context."""
 
@@ -58,6 +66,13 @@ class LocalPantsRunner(object):
     # Launch RunTracker as early as possible (just after Subsystem options are initialized).
     run_tracker, reporting = ReportingInitializer().setup()
 
+    # Start sampling here rather than around the whole run, so that a run in a DaemonPantsRunner
+    # fork is sampled by a thread of the forked process.
+    sampling_profiler = None
+    if global_options.sampling_profiler_rate > 0:
+      sampling_profiler = SamplingProfiler(run_tracker, 1.0 / global_options.sampling_profiler_rate)
+      sampling_profiler.start()
+
     try:
       # Determine the build root dir.
       root_dir = get_buildroot()
@@ -82,8 +97,23 @@ class LocalPantsRunner(object):
         # TODO: Have Repro capture the 'after' state (as a diff) as well?
         repro.log_location_of_repro_file()
     finally:
+      if sampling_profiler:
+        self._write_sampled_profiles(run_tracker, sampling_profiler)
       run_tracker_result = run_tracker.end()
 
     # Take the exit code with higher abs value in case of negative values.
     final_exit_code = goal_runner_result if abs(goal_runner_result) > abs(run_tracker_result) else run_tracker_result
     self._exiter.exit(final_exit_code)
+
+  @staticmethod
+  def _write_sampled_profiles(run_tracker, sampling_profiler):
+    # NB: This runs in the finally block of the run, so it must not raise: that would mask the
+    # result of the run and skip ending the RunTracker.
+    try:
+      sampling_profiler.stop()
+      profile_dir = os.path.join(run_tracker.run_info_dir, 'sampled_profiles')
+      paths = sampling_profiler.write(profile_dir)
+      run_tracker.log(Report.INFO, 'Wrote {} stack samples to:\n  {}'.format(
+        sampling_profiler.num_samples, '\n  '.join(paths)))
+    except Exception as e:
+      logger.warn('Failed to write sampled profiles: {!r}'.format(e))
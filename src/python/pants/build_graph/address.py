@@ -123,6 +123,9 @@ class Address(object):
   Where ``path/to/buildfile:targetname`` is the dependent target address.
   """
 
+  # Large graphs hold many addresses: they need no per-instance dict.
+  __slots__ = ('_spec_path', '_target_name', '_hash')
+
   @classmethod
   def parse(cls, spec, relative_to='', subproject_roots=None):
     """Parses an address from its serialized form.
@@ -254,6 +257,14 @@ class Address(object):
   def __lt__(self, other):
     return (self._spec_path, self._target_name) < (other._spec_path, other._target_name)
 
+  # NB: Classes with __slots__ need these to be pickled with protocols older than 2.
+  def __getstate__(self):
+    return self._spec_path, self._target_name
+
+  def __setstate__(self, state):
+    self._spec_path, self._target_name = state
+    self._hash = hash(state)
+
 
 class BuildFileAddress(Address):
   """Represents the address of a type materialized from a BUILD file.
@@ -261,6 +272,8 @@ class BuildFileAddress(Address):
   :API: public
   """
 
+  __slots__ = ('rel_path', '_build_file')
+
   def __init__(self, build_file=None, target_name=None, rel_path=None):
     """
     :param build_file: The build file that contains the object this address points to.
@@ -295,6 +308,13 @@ class BuildFileAddress(Address):
     """
     return self._build_file
 
+  def __getstate__(self):
+    return super(BuildFileAddress, self).__getstate__() + (self.rel_path, self._build_file)
+
+  def __setstate__(self, state):
+    super(BuildFileAddress, self).__setstate__(state[:2])
+    self.rel_path, self._build_file = state[2:]
+
   def __repr__(self):
     return ('BuildFileAddress({rel_path}, {target_name})'
             .format(rel_path=self.rel_path, target_name=self.target_name))
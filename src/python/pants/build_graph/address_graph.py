@@ -0,0 +1,127 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+from array import array
+
+
+class AddressGraph(object):
+  """Directed edges between addresses, held compactly for very large graphs.
+
+  Each address is interned to a consecutive integer id, and the dependencies and dependees of each
+  address are held in arrays of those ids. An edge so costs 4 bytes in each direction, rather than
+  an entry in an OrderedSet and in a set, and an address with no edges in a direction holds no
+  array at all.
+
+  :API: public
+  """
+
+  # A signed C int holds ids for over two billion addresses.
+  _TYPECODE = b'i'
+
+  def __init__(self):
+    self._version = 0
+    self._ids = {}
+    self._addresses = []
+    self._dependencies = []
+    self._dependees = []
+
+  def __len__(self):
+    return len(self._addresses)
+
+  @property
+  def version(self):
+    """The number of edges added, so that data derived from the edges can be invalidated."""
+    return self._version
+
+  def id_of(self, address, canonical=False):
+    """Returns the id of the given address, interning it if it has none.
+
+    :param Address address: The address to return the id of.
+    :param bool canonical: True to have the given address object stand for its id from now on,
+                           rather than the equal one it was first interned with.
+    """
+    address_id = self._ids.get(address)
+    if address_id is None:
+      address_id = len(self._addresses)
+      self._ids[address] = address_id
+      self._addresses.append(address)
+      self._dependencies.append(None)
+      self._dependees.append(None)
+    elif canonical:
+      self._addresses[address_id] = address
+    return address_id
+
+  def address_of(self, address_id):
+    """Returns the address interned with the given id."""
+    return self._addresses[address_id]
+
+  def add_edge(self, dependent, dependency):
+    """Adds an edge from `dependent` to `dependency`.
+
+    :returns: False if the edge was already present, True otherwise.
+    """
+    dependent_id = self.id_of(dependent)
+    dependency_id = self.id_of(dependency)
+    if not self._append(self._dependencies, dependent_id, dependency_id):
+      return False
+    self._append(self._dependees, dependency_id, dependent_id)
+    self._version += 1
+    return True
+
+  def dependencies_of(self, address):
+    """Returns a live view of the addresses `address` depends on, in the order they were added."""
+    return _AddressesView(self, self._dependencies, self.id_of(address))
+
+  def dependees_of(self, address):
+    """Returns a live view of the addresses that depend on `address`."""
+    return _AddressesView(self, self._dependees, self.id_of(address))
+
+  def dependency_ids(self, address_id):
+    """Returns the ids of the dependencies of the address with the given id."""
+    return self._dependencies[address_id] or ()
+
+  def dependee_ids(self, address_id):
+    """Returns the ids of the dependees of the address with the given id."""
+    return self._dependees[address_id] or ()
+
+  def _append(self, adjacency, from_id, to_id):
+    ids = adjacency[from_id]
+    if ids is None:
+      adjacency[from_id] = array(self._TYPECODE, (to_id,))
+    elif to_id in ids:
+      return False
+    else:
+      ids.append(to_id)
+    return True
+
+
+class _AddressesView(object):
+  """A live, read-only view of the addresses adjacent to an address in one direction."""
+
+  __slots__ = ('_graph', '_adjacency', '_address_id')
+
+  def __init__(self, graph, adjacency, address_id):
+    self._graph = graph
+    self._adjacency = adjacency
+    self._address_id = address_id
+
+  def _ids(self):
+    return self._adjacency[self._address_id] or ()
+
+  def __iter__(self):
+    addresses = self._graph._addresses
+    return (addresses[address_id] for address_id in self._ids())
+
+  def __len__(self):
+    return len(self._ids())
+
+  def __contains__(self, address):
+    address_id = self._graph._ids.get(address)
+    return address_id is not None and address_id in self._ids()
+
+  def __repr__(self):
+    return '{}({})'.format(type(self).__name__, ', '.join(repr(address) for address in self))
@@ -5,12 +5,14 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
+import itertools
 import logging
 from collections import Iterable, namedtuple
 
 from pants.base.parse_context import ParseContext
 from pants.build_graph.addressable import AddressableCallProxy
-from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.build_file_aliases import BuildFileAliases, DeferredSymbol
 from pants.build_graph.target_addressable import TargetAddressable
 from pants.subsystem.subsystem import Subsystem
 from pants.util.memo import memoized_method
@@ -32,18 +34,28 @@ class BuildConfiguration(object):
     self._target_macro_factory_by_alias = {}
     self._exposed_object_by_alias = {}
     self._exposed_context_aware_object_factory_by_alias = {}
+    # Deferred alias -> zero-arg callable returning the BuildFileAliases that defines it.
+    self._load_aliases_by_deferred_alias = {}
     self._subsystems = set()
 
-  def registered_aliases(self):
+  def registered_aliases(self, resolve_deferred=False):
     """Return the registered aliases exposed in BUILD files.
 
     These returned aliases aren't so useful for actually parsing BUILD files.
     They are useful for generating things like http://pantsbuild.github.io/build_dictionary.html.
 
+    :param bool resolve_deferred: `True` to first load the definitions of any deferred aliases, so
+                                  that all registered aliases are returned, which may import many
+                                  backends; `False` to return only the aliases whose definitions
+                                  are already loaded.
     :returns: A new BuildFileAliases instance containing this BuildConfiguration's registered alias
               mappings.
     :rtype: :class:`pants.build_graph.build_file_aliases.BuildFileAliases`
     """
+    if resolve_deferred:
+      while self._load_aliases_by_deferred_alias:
+        self.resolve_deferred_alias(next(iter(self._load_aliases_by_deferred_alias)))
+
     target_factories_by_alias = self._target_by_alias.copy()
     target_factories_by_alias.update(self._target_macro_factory_by_alias)
     return BuildFileAliases(
@@ -60,6 +72,11 @@ class BuildConfiguration(object):
     if not isinstance(aliases, BuildFileAliases):
       raise TypeError('The aliases must be a BuildFileAliases, given {}'.format(aliases))
 
+    # These definitions supersede any deferred ones registered earlier for the same aliases.
+    for alias in itertools.chain(aliases.target_types_by_alias, aliases.objects,
+                                 aliases.context_aware_object_factories):
+      self._load_aliases_by_deferred_alias.pop(alias, None)
+
     for alias, target_type in aliases.target_types.items():
       self._register_target_alias(alias, target_type)
 
@@ -72,6 +89,60 @@ class BuildConfiguration(object):
     for alias, context_aware_object_factory in aliases.context_aware_object_factories.items():
       self._register_exposed_context_aware_object_factory(alias, context_aware_object_factory)
 
+  def register_deferred_aliases(self, aliases, load_aliases):
+    """Registers aliases to be exposed in parsed BUILD files without loading their definitions.
+
+    The definitions are only loaded once one of the aliases is used: `load_aliases` is then called,
+    and those of the given aliases still deferred to it are registered from the BuildFileAliases it
+    returns. As with `register_aliases`, the most recent registration of an alias wins.
+
+    :param aliases: The aliases to register.
+    :type aliases: :class:`collections.Iterable` of strings.
+    :param load_aliases: A zero-arg callable returning the BuildFileAliases that define `aliases`.
+    """
+    for alias in aliases:
+      self._load_aliases_by_deferred_alias[alias] = load_aliases
+
+  def deferred_aliases(self):
+    """Returns the registered aliases whose definitions have not been loaded yet.
+
+    :rtype: frozenset of string
+    """
+    return frozenset(self._load_aliases_by_deferred_alias)
+
+  def resolve_deferred_alias(self, alias):
+    """Loads the definition of the given alias, if it is deferred, and registers it.
+
+    The other aliases deferred to the same loader are loaded and registered along with it.
+
+    :param string alias: The alias to load.
+    :returns: A BuildFileAliases containing the aliases registered by this call; empty if `alias`
+              was not deferred.
+    :rtype: :class:`pants.build_graph.build_file_aliases.BuildFileAliases`
+    """
+    load_aliases = self._load_aliases_by_deferred_alias.get(alias)
+    if load_aliases is None:
+      return BuildFileAliases()
+
+    loaded = load_aliases() or BuildFileAliases()
+    deferred = {deferred_alias
+                for deferred_alias, load in self._load_aliases_by_deferred_alias.items()
+                if load is load_aliases}
+    for deferred_alias in deferred:
+      del self._load_aliases_by_deferred_alias[deferred_alias]
+
+    def restrict(objects_by_alias):
+      return {a: obj for a, obj in objects_by_alias.items() if a in deferred}
+
+    targets = restrict(loaded.target_types)
+    targets.update(restrict(loaded.target_macro_factories))
+    resolved = BuildFileAliases(
+      targets=targets,
+      objects=restrict(loaded.objects),
+      context_aware_object_factories=restrict(loaded.context_aware_object_factories))
+    self.register_aliases(resolved)
+    return resolved
+
   # TODO(John Sirois): Warn on alias override across all aliases since they share a global
   # namespace in BUILD files.
   # See: https://github.com/pantsbuild/pants/issues/2151
@@ -183,4 +254,32 @@ class BuildConfiguration(object):
     for alias, target_macro_factory in self._target_macro_factory_by_alias.items():
       parse_globals[alias] = target_macro_factory.target_macro(parse_context)
 
+    # Expose deferred aliases too, exposing their definitions above once one of them is used.
+    def resolve(alias):
+      resolved = self.resolve_deferred_alias(alias)
+      for resolved_alias, obj in resolved.objects.items():
+        type_aliases[resolved_alias] = obj
+        parse_globals[resolved_alias] = obj
+      for resolved_alias, target_type in resolved.target_types.items():
+        proxy = create_call_proxy(target_type, resolved_alias)
+        type_aliases[resolved_alias] = proxy
+        type_aliases[target_type] = proxy
+        parse_globals[resolved_alias] = proxy
+      for resolved_alias, target_macro_factory in resolved.target_macro_factories.items():
+        for target_type in target_macro_factory.target_types:
+          type_aliases[target_type] = create_call_proxy(target_type)
+        parse_globals[resolved_alias] = target_macro_factory.target_macro(parse_context)
+      for resolved_alias, object_factory in resolved.context_aware_object_factories.items():
+        parse_globals[resolved_alias] = object_factory(parse_context)
+
+      symbol = parse_globals[alias]
+      if isinstance(symbol, DeferredSymbol):
+        # The backend deferring the alias turned out not to define it.
+        del parse_globals[alias]
+        raise NameError("name '{}' is not defined".format(alias))
+      return symbol
+
+    for alias in self._load_aliases_by_deferred_alias:
+      parse_globals[alias] = DeferredSymbol(alias, functools.partial(resolve, alias))
+
     return self.ParseState(parse_context, parse_globals)
@@ -48,13 +48,16 @@ class BuildFileAddressMapper(AddressMapper):
   _UNMATCHED_KEY = '** unmatched **'
 
   def __init__(self, build_file_parser, project_tree, build_ignore_patterns=None, exclude_target_regexps=None,
-               subproject_roots=None):
+               subproject_roots=None, parse_workers=0):
     """Create a BuildFileAddressMapper.
 
     :param build_file_parser: An instance of BuildFileParser
     :param build_file_type: A subclass of BuildFile used to construct and cache BuildFile objects
+    :param int parse_workers: The number of processes to parse the BUILD files of many directories
+                              with at once; they are parsed in this process if less than 2.
     """
     self._build_file_parser = build_file_parser
+    self._parse_workers = parse_workers
     self._spec_path_to_address_map_map = {}  # {spec_path: {address: addressable}} mapping
     self._project_tree = project_tree
     self._build_ignore_patterns = PathSpec.from_lines(GitWildMatchPattern, build_ignore_patterns or [])
@@ -100,6 +103,35 @@ class BuildFileAddressMapper(AddressMapper):
       self._spec_path_to_address_map_map[spec_path] = address_map
     return self._spec_path_to_address_map_map[spec_path]
 
+  def _parse_spec_paths(self, spec_paths):
+    """Parses the BUILD files of the given spec paths in parallel, if so configured.
+
+    The address maps of spec paths that fail to parse in parallel are left to be parsed on demand by
+    `_address_map_from_spec_path`, which raises their errors as usual.
+    """
+    if self._parse_workers < 2:
+      return
+    families_by_spec_path = {}
+    for spec_path in spec_paths:
+      if spec_path in self._spec_path_to_address_map_map or spec_path in families_by_spec_path:
+        continue
+      try:
+        build_files = list(BuildFile.get_build_files_family(self._project_tree, spec_path,
+                                                            self._build_ignore_patterns))
+      except BuildFile.BuildFileError:
+        continue
+      if build_files:
+        families_by_spec_path[spec_path] = build_files
+    if len(families_by_spec_path) < 2:
+      return
+
+    spec_paths = list(families_by_spec_path)
+    address_maps = self._build_file_parser.address_maps_from_build_file_families(
+      [families_by_spec_path[spec_path] for spec_path in spec_paths], self._parse_workers)
+    for index, mapping in address_maps.items():
+      address_map = {address: (address, addressed) for address, addressed in mapping.items()}
+      self._spec_path_to_address_map_map[spec_paths[index]] = address_map
+
   def addresses_in_spec_path(self, spec_path):
     """Returns only the addresses gathered by `address_map_from_spec_path`, with no values."""
     return self._address_map_from_spec_path(spec_path).keys()
@@ -155,9 +187,11 @@ class BuildFileAddressMapper(AddressMapper):
 
     addresses = set()
     try:
-      for build_file in BuildFile.scan_build_files(self._project_tree,
-                                                   base_relpath=base_path,
-                                                   build_ignore_patterns=self._build_ignore_patterns):
+      build_files = BuildFile.scan_build_files(self._project_tree,
+                                               base_relpath=base_path,
+                                               build_ignore_patterns=self._build_ignore_patterns)
+      self._parse_spec_paths(build_file.spec_path for build_file in build_files)
+      for build_file in build_files:
         for address in self.addresses_in_spec_path(build_file.spec_path):
           addresses.add(address)
     except BuildFile.BuildFileError as e:
@@ -222,6 +256,7 @@ class BuildFileAddressMapper(AddressMapper):
       except BuildFile.BuildFileError as e:
         raise AddressLookupError(e)
 
+      self._parse_spec_paths(os.path.dirname(build_file) for build_file in build_files)
       for build_file in build_files:
         try:
           addresses.update(self.addresses_in_spec_path(os.path.dirname(build_file)))
@@ -298,3 +298,31 @@ class _BuildFileTargetFactoryMacro(BuildFileTargetFactory, TargetMacro):
 
   def target_types(self):
     return self._target_types
+
+
+class DeferredSymbol(object):
+  """A BUILD file symbol that stands in for an alias whose definition has not been loaded yet.
+
+  The definition is loaded the first time the symbol is called or one of its attributes is used;
+  from then on the symbol behaves as the definition does.
+  """
+
+  def __init__(self, alias, resolve):
+    """
+    :param string alias: The alias this symbol stands in for.
+    :param resolve: A zero-arg callable that loads the alias and returns its definition.
+    """
+    self._alias = alias
+    self._resolve = resolve
+
+  def __call__(self, *args, **kwargs):
+    return self._resolve()(*args, **kwargs)
+
+  def __getattr__(self, name):
+    # Don't load the definition just to answer protocol queries (copying, pickling, etc.).
+    if name.startswith('__'):
+      raise AttributeError(name)
+    return getattr(self._resolve(), name)
+
+  def __repr__(self):
+    return 'DeferredSymbol({!r})'.format(self._alias)
@@ -0,0 +1,208 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import binascii
+import hashlib
+import imp
+import logging
+import marshal
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from pants.base.build_environment import get_buildroot
+from pants.subsystem.subsystem import Subsystem
+from pants.util.dirutil import (safe_concurrent_creation, safe_delete, safe_rmtree, safe_walk,
+                                touch)
+
+
+logger = logging.getLogger(__name__)
+
+
+class BuildFileCodeCache(object):
+  """Memoizes the code objects compiled from BUILD files, keyed by a digest of their content.
+
+  The most recently used code object of each BUILD file is held in memory, up to a bound. Code
+  objects may also be persisted to a directory, one marshalled file per BUILD file as for .pyc
+  files, in which case BUILD files that are unchanged since a previous run are not compiled again.
+  """
+
+  # The maximum number of BUILD files to hold code objects for in memory.
+  _MAX_ENTRIES = 10000
+
+  # The file extension of persisted code objects.
+  _EXTENSION = '.code'
+
+  # How often `maybe_prune` prunes the persisted code objects. Pruning stats the BUILD file of each
+  # persisted code object, so it is not done on every run.
+  _PRUNE_INTERVAL_SECS = 24 * 60 * 60
+
+  # Marks when the persisted code objects were last pruned, by its modification time.
+  _PRUNED_MARKER = 'last_pruned'
+
+  _global_instance = None
+
+  @classmethod
+  def global_instance(cls):
+    """Returns the cache used to compile BUILD files in this process.
+
+    Unless another has been installed via `set_global_instance`, this is a cache that is held in
+    memory only.
+    """
+    if cls._global_instance is None:
+      cls._global_instance = cls()
+    return cls._global_instance
+
+  @classmethod
+  def set_global_instance(cls, instance):
+    cls._global_instance = instance
+
+  def __init__(self, path=None, max_entries=None):
+    """
+    :param string path: A directory to persist code objects to, or None to hold them in memory only.
+    :param int max_entries: The maximum number of BUILD files to hold code objects for in memory.
+    """
+    self._path = path
+    self._max_entries = max_entries or self._MAX_ENTRIES
+    self._lock = threading.Lock()
+    # The full path of each BUILD file -> the (key, code) of its most recently used code object.
+    self._codes = OrderedDict()
+
+  def code(self, build_file):
+    """Returns the code object for the given BUILD file.
+
+    :param build_file: The BUILD file to compile.
+    :type build_file: :class:`pants.base.build_file.BuildFile`
+    :raises: :class:`SyntaxError` if the BUILD file cannot be compiled.
+    """
+    source = build_file.source()
+    key = self._key(build_file.full_path, source)
+    with self._lock:
+      entry = self._codes.pop(build_file.full_path, None)
+      if entry and entry[0] == key:
+        self._codes[build_file.full_path] = entry
+        return entry[1]
+    code = self._load(build_file, key)
+    if code is None:
+      code = compile(source, build_file.full_path, 'exec', flags=0, dont_inherit=True)
+      self._save(build_file, key, code)
+    with self._lock:
+      self._codes[build_file.full_path] = (key, code)
+      if len(self._codes) > self._max_entries:
+        self._codes.popitem(last=False)
+    return code
+
+  def maybe_prune(self, build_root):
+    """Prunes the persisted code objects if they have not been pruned for a while.
+
+    :param string build_root: The buildroot the BUILD files compiled by this cache are under.
+    :returns: Whether the persisted code objects were pruned.
+    """
+    if not self._path:
+      return False
+    marker = os.path.join(self._path, self._PRUNED_MARKER)
+    try:
+      if os.path.getmtime(marker) > time.time() - self._PRUNE_INTERVAL_SECS:
+        return False
+    except OSError:
+      pass  # Never pruned.
+    self.prune(build_root)
+    touch(marker)
+    return True
+
+  def prune(self, build_root):
+    """Deletes the persisted code objects of BUILD files that no longer exist under the buildroot.
+
+    The code objects persisted by other python interpreter versions are deleted too.
+
+    :param string build_root: The buildroot the BUILD files compiled by this cache are under.
+    """
+    if not self._path or not os.path.isdir(self._path):
+      return
+    versioned_path = self._versioned_path()
+    for name in os.listdir(self._path):
+      path = os.path.join(self._path, name)
+      if path != versioned_path and name != self._PRUNED_MARKER:
+        safe_rmtree(path)
+    for dirpath, _, filenames in safe_walk(versioned_path):
+      for filename in filenames:
+        code_path = os.path.join(dirpath, filename)
+        relpath, ext = os.path.splitext(os.path.relpath(code_path, versioned_path))
+        if ext != self._EXTENSION or not os.path.isfile(os.path.join(build_root, relpath)):
+          safe_delete(code_path)
+
+  @staticmethod
+  def _key(full_path, source):
+    # Code objects record the path they were compiled from, and their format is specific to the
+    # python interpreter.
+    hasher = hashlib.sha1()
+    hasher.update(imp.get_magic())
+    hasher.update(full_path.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(source)
+    return hasher.hexdigest()
+
+  def _versioned_path(self):
+    # Persisted code objects are read only by the python interpreter version that wrote them.
+    return os.path.join(self._path, binascii.hexlify(imp.get_magic()).decode('ascii'))
+
+  def _code_path(self, build_file):
+    # The layout mirrors the buildroot, so that the code objects of deleted BUILD files are found by
+    # `prune` without reading them.
+    return os.path.join(self._versioned_path(), build_file.relpath + self._EXTENSION)
+
+  def _load(self, build_file, key):
+    if not self._path:
+      return None
+    code_path = self._code_path(build_file)
+    if not os.path.isfile(code_path):
+      return None
+    try:
+      with open(code_path, 'rb') as fp:
+        saved_key, code = marshal.load(fp)
+    except (IOError, OSError, EOFError, ValueError, TypeError) as e:
+      logger.debug('Ignoring unreadable compiled BUILD file {}: {}'.format(code_path, e))
+      return None
+    # The code object was compiled from other content.
+    return code if saved_key == key else None
+
+  def _save(self, build_file, key, code):
+    if not self._path:
+      return
+    code_path = self._code_path(build_file)
+    try:
+      with safe_concurrent_creation(code_path) as tmp_path:
+        with open(tmp_path, 'wb') as fp:
+          marshal.dump((key, code), fp)
+    except (IOError, OSError, ValueError) as e:
+      logger.warn('Failed to save compiled BUILD file to {}: {}'.format(code_path, e))
+
+
+class BuildFileParsing(Subsystem):
+  """Configures how BUILD files are parsed without the v2 engine."""
+
+  options_scope = 'build-file-parsing'
+
+  @classmethod
+  def register_options(cls, register):
+    super(BuildFileParsing, cls).register_options(register)
+    register('--cache-code', advanced=True, type=bool, default=True,
+             help='Persist the code compiled from BUILD files under the workdir, so that BUILD '
+                  'files that are unchanged since a previous run are not compiled again.')
+    register('--workers', advanced=True, type=int, default=0,
+             help='The number of processes to parse BUILD files with when many are scanned at '
+                  'once, as for `::` specs. BUILD files are parsed in the pants process itself if '
+                  'this is less than 2.')
+
+  def install(self):
+    """Installs a BuildFileCodeCache configured by these options as the global instance."""
+    options = self.get_options()
+    path = os.path.join(options.pants_workdir, 'build_file_code') if options.cache_code else None
+    cache = BuildFileCodeCache(path=path)
+    cache.maybe_prune(get_buildroot())
+    BuildFileCodeCache.set_global_instance(cache)
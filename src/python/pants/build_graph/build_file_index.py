@@ -0,0 +1,159 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import cPickle as pickle
+import hashlib
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from pants.base.build_environment import get_buildroot
+from pants.base.hash_utils import hash_file
+from pants.source.file_digests import FileDigestCache
+from pants.subsystem.subsystem import Subsystem
+from pants.util.dirutil import safe_concurrent_creation
+from pants.version import VERSION
+
+
+logger = logging.getLogger(__name__)
+
+
+class BuildFileIndex(object):
+  """A base class for indexes of what the targets declared in the BUILD files of directories have.
+
+  Each entry of an index covers a directory, and is keyed by a digest of the content of the BUILD
+  files in that directory: an entry is only ever used for identical BUILD files. An index may be
+  persisted to a file, in which case it is kept up to date across runs.
+
+  Subclasses maintain `self._entries`, a dict from spec path to a tuple of the digest of its BUILD
+  files and a value of their choosing, and must hold `self._lock` while they do.
+  """
+
+  # Bump to discard indexes persisted with a previous format.
+  _VERSION = 1
+
+  _global_instance = None
+
+  @classmethod
+  def global_instance(cls):
+    """Returns the index of this type in use in this process, or None if there is none."""
+    return cls._global_instance
+
+  @classmethod
+  def set_global_instance(cls, instance):
+    cls._global_instance = instance
+
+  @staticmethod
+  def digest_spec_paths(build_files):
+    """Returns a dict from the spec path of each of the given BUILD files to a digest of them all.
+
+    :param build_files: Paths of BUILD files relative to the buildroot.
+    """
+    build_files = sorted(build_files)
+    buildroot = get_buildroot()
+    digests = FileDigestCache.global_instance().digest_many(
+      os.path.join(buildroot, build_file) for build_file in build_files)
+
+    hashers = defaultdict(hashlib.sha1)
+    for build_file, digest in zip(build_files, digests):
+      hasher = hashers[os.path.dirname(build_file)]
+      hasher.update(build_file.encode('utf-8'))
+      hasher.update(b'\0')
+      hasher.update(digest)
+    return {spec_path: hasher.hexdigest() for spec_path, hasher in hashers.items()}
+
+  def __init__(self, path=None, fingerprint=None):
+    """
+    :param string path: A file to persist the index to, or None to hold it in memory only.
+    :param string fingerprint: A fingerprint of everything other than the content of BUILD files
+                               that the indexed values depend on. An index persisted with another
+                               fingerprint is discarded.
+    """
+    self._path = path
+    self._fingerprint = fingerprint
+    self._lock = threading.Lock()
+    self._entries = self._load()
+
+  def matches(self, path, fingerprint):
+    """Returns True if this index was created with the given path and fingerprint."""
+    return self._path == path and self._fingerprint == fingerprint
+
+  def _version(self):
+    return '{}-{}-{}-{}'.format(type(self).__name__, self._VERSION, VERSION, self._fingerprint)
+
+  def _save(self):
+    if not self._path:
+      return
+    try:
+      with safe_concurrent_creation(self._path) as tmp_path:
+        with open(tmp_path, 'wb') as fp:
+          pickle.dump({'version': self._version(), 'entries': self._entries}, fp,
+                      protocol=pickle.HIGHEST_PROTOCOL)
+    except (IOError, OSError, pickle.PicklingError) as e:
+      logger.warn('Failed to save the index to {}: {}'.format(self._path, e))
+
+  def _load(self):
+    if not self._path or not os.path.isfile(self._path):
+      return {}
+    try:
+      with open(self._path, 'rb') as fp:
+        content = pickle.load(fp)
+    except Exception as e:
+      logger.warn('Ignoring unreadable index {}: {}'.format(self._path, e))
+      return {}
+    if not isinstance(content, dict) or content.get('version') != self._version():
+      return {}
+    return content['entries']
+
+
+class BuildFileIndexer(Subsystem):
+  """A base class for subsystems that configure a BuildFileIndex."""
+
+  # The BuildFileIndex subclass to install.
+  index_type = None
+
+  # A description of what the index is used for, for the help of the `--enabled` option.
+  index_usage = None
+
+  @classmethod
+  def register_options(cls, register):
+    super(BuildFileIndexer, cls).register_options(register)
+    register('--enabled', advanced=True, type=bool, default=False,
+             help='{} from an index persisted under the workdir, only re-reading the BUILD files '
+                  'that changed since the previous run. Changes to target dependencies or sources '
+                  'made by command line flags alone are not noticed by the index.'
+                  .format(cls.index_usage))
+
+  def install(self):
+    """Installs the index configured by these options as the global instance of its type.
+
+    An index already installed in this process with the same configuration is kept, so that a
+    long-lived process such as pantsd holds the index in memory.
+    """
+    options = self.get_options()
+    if not options.enabled:
+      self.index_type.set_global_instance(None)
+      return
+    path = os.path.join(options.pants_workdir, '{}.pickle'.format(self.options_scope))
+    fingerprint = self._fingerprint()
+    index = self.index_type.global_instance()
+    if index is None or not index.matches(path, fingerprint):
+      self.index_type.set_global_instance(self.index_type(path=path, fingerprint=fingerprint))
+
+  def _fingerprint(self):
+    # What targets declared in BUILD files have may depend on their types and on subsystems, per
+    # the configuration, as well as on their BUILD files.
+    options = self.get_options()
+    hasher = hashlib.sha1()
+    for value in [options.cache_key_gen_version] + options.backend_packages + options.plugins:
+      hasher.update(value.encode('utf-8'))
+      hasher.update(b'\0')
+    for config_file in options.pants_config_files:
+      if os.path.isfile(config_file):
+        hasher.update(hash_file(config_file))
+    return hasher.hexdigest()
@@ -5,17 +5,43 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import cPickle as pickle
 import logging
+import multiprocessing
 import warnings
+from cStringIO import StringIO
 
 import six
 
 from pants.build_graph.address import BuildFileAddress
+from pants.build_graph.build_file_code_cache import BuildFileCodeCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# The parser and BUILD file families being parsed in parallel, inherited by forked workers.
+_parallel_parse_state = None
+
+
+def _parse_family_in_worker(index):
+  """Parses the family of BUILD files at the given index in a worker process.
+
+  :returns: A tuple of the pickled address map of the family and of the deferred aliases loaded to
+            parse it, or None if the family failed to parse or its address map is not picklable.
+  """
+  parser, families = _parallel_parse_state
+  try:
+    deferred_aliases = parser._build_configuration.deferred_aliases()
+    address_map = parser.address_map_from_build_files(families[index])
+    loaded_aliases = deferred_aliases - parser._build_configuration.deferred_aliases()
+    return parser._dumps(families[index], address_map), loaded_aliases
+  except Exception as e:
+    logger.debug('Deferring the parse of {} to the pants process: {!r}'
+                 .format(families[index], e))
+    return None
+
+
 # Note: Significant effort has been made to keep the types BuildFile, BuildGraph, Address, and
 # Target separated appropriately.  The BuildFileParser is intended to have knowledge of just
 # BuildFile and Address.
@@ -60,9 +86,16 @@ class BuildFileParser(object):
   def root_dir(self):
     return self._root_dir
 
-  def registered_aliases(self):
-    """Returns a copy of the registered build file aliases this build file parser uses."""
-    return self._build_configuration.registered_aliases()
+  def registered_aliases(self, resolve_deferred=False):
+    """Returns a copy of the registered build file aliases this build file parser uses.
+
+    :param bool resolve_deferred: `True` to include deferred aliases, loading their definitions.
+    """
+    return self._build_configuration.registered_aliases(resolve_deferred=resolve_deferred)
+
+  def resolve_deferred_alias(self, alias):
+    """Loads the definition of the given alias, if it is deferred, so that it is registered."""
+    self._build_configuration.resolve_deferred_alias(alias)
 
   def address_map_from_build_files(self, build_files):
     family_address_map_by_build_file = self.parse_build_files(build_files)
@@ -87,6 +120,55 @@ class BuildFileParser(object):
       family_address_map_by_build_file[bf] = bf_address_map
     return family_address_map_by_build_file
 
+  def address_maps_from_build_file_families(self, families, workers):
+    """Parses the given families of sibling BUILD files in a pool of worker processes.
+
+    Address maps are pickled back from the workers, so a family whose BUILD files fail to parse, or
+    declare anything that cannot be pickled, is left out of the result: it should be parsed in this
+    process instead, which raises the errors of failed parses as usual.
+
+    :param families: A list of lists of sibling BuildFiles.
+    :param int workers: The number of processes to parse with.
+    :returns: A dict from the index of each family that was parsed to its address map.
+    """
+    global _parallel_parse_state
+    _parallel_parse_state = (self, families)
+    pool = multiprocessing.Pool(workers)
+    try:
+      results = pool.map(_parse_family_in_worker, range(len(families)),
+                         chunksize=max(1, len(families) // (workers * 4)))
+    finally:
+      pool.terminate()
+      pool.join()
+      _parallel_parse_state = None
+
+    address_maps = {}
+    for index, result in enumerate(results):
+      if result is not None:
+        pickled, loaded_aliases = result
+        # Register the definitions the worker loaded to parse the family here too.
+        for alias in loaded_aliases:
+          self._build_configuration.resolve_deferred_alias(alias)
+        address_maps[index] = self._loads(families[index], pickled)
+    return address_maps
+
+  @staticmethod
+  def _dumps(build_files, address_map):
+    # The project tree the BUILD files belong to is referenced rather than copied, so that the
+    # addresses unpickled in the pants process refer to its own.
+    buf = StringIO()
+    pickler = pickle.Pickler(buf, protocol=pickle.HIGHEST_PROTOCOL)
+    project_tree = build_files[0].project_tree
+    pickler.persistent_id = lambda obj: 'project_tree' if obj is project_tree else None
+    pickler.dump(address_map)
+    return buf.getvalue()
+
+  @staticmethod
+  def _loads(build_files, pickled):
+    unpickler = pickle.Unpickler(StringIO(pickled))
+    unpickler.persistent_load = lambda persistent_id: build_files[0].project_tree
+    return unpickler.load()
+
   def parse_build_file(self, build_file):
     """Capture Addressable instances from parsing `build_file`.
     Prepare a context for parsing, read a BUILD file from the filesystem, and return the
@@ -124,7 +206,7 @@ class BuildFileParser(object):
                  .format(build_file=build_file))
 
     try:
-      build_file_code = build_file.code()
+      build_file_code = BuildFileCodeCache.global_instance().code(build_file)
     except SyntaxError as e:
       raise self.ParseError(_format_context_msg(e.lineno, e.offset, e.__class__.__name__, e))
     except Exception as e:
@@ -8,11 +8,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import itertools
 import logging
 from abc import abstractmethod
+from array import array
 from collections import OrderedDict, defaultdict, deque
 
 from twitter.common.collections import OrderedSet
 
 from pants.build_graph.address import Address
+from pants.build_graph.address_graph import AddressGraph
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.target import Target
 from pants.util.meta import AbstractClass
@@ -92,6 +94,9 @@ class BuildGraph(AbstractClass):
       self._expanded[vertex].add(level)
       return True
 
+  # The most transitive closures to memoize at once: each holds an id per address it reaches.
+  _MAX_MEMOIZED_CLOSURES = 256
+
   @staticmethod
   def closure(*vargs, **kwargs):
     """See `Target.closure_for_targets` for arguments.
@@ -122,8 +127,9 @@ class BuildGraph(AbstractClass):
     :API: public
     """
     self._target_by_address = OrderedDict()
-    self._target_dependencies_by_address = defaultdict(OrderedSet)
-    self._target_dependees_by_address = defaultdict(set)
+    self._edges = AddressGraph()
+    self._closures = OrderedDict()
+    self._closures_version = None
     self._derived_from_by_derivative_address = {}
     self.synthetic_addresses = set()
 
@@ -158,7 +164,7 @@ class BuildGraph(AbstractClass):
       'Cannot retrieve dependencies of {address} because it is not in the BuildGraph.'
       .format(address=address)
     )
-    return self._target_dependencies_by_address[address]
+    return self._edges.dependencies_of(address)
 
   def dependents_of(self, address):
     """Returns the Targets which depend on the target at `address`.
@@ -171,7 +177,7 @@ class BuildGraph(AbstractClass):
       'Cannot retrieve dependents of {address} because it is not in the BuildGraph.'
       .format(address=address)
     )
-    return self._target_dependees_by_address[address]
+    return self._edges.dependees_of(address)
 
   def get_derived_from(self, address):
     """Get the target the specified target was derived from.
@@ -243,6 +249,7 @@ class BuildGraph(AbstractClass):
       self.synthetic_addresses.add(address)
 
     self._target_by_address[address] = target
+    self._edges.id_of(address, canonical=True)
 
     for dependency_address in dependencies:
       self.inject_dependency(dependent=address, dependency=dependency_address)
@@ -279,12 +286,9 @@ class BuildGraph(AbstractClass):
                      ' the cycle.'
                      .format(dependent=dependent, dependency=dependency))
 
-    if dependency in self.dependencies_of(dependent):
+    if not self._edges.add_edge(dependent, dependency):
       logger.debug('{dependent} already depends on {dependency}'
                    .format(dependent=dependent, dependency=dependency))
-    else:
-      self._target_dependencies_by_address[dependent].add(dependency)
-      self._target_dependees_by_address[dependency].add(dependent)
 
   def targets(self, predicate=None):
     """Returns all the targets in the graph in no particular order.
@@ -326,31 +330,42 @@ class BuildGraph(AbstractClass):
     # slow things down by few millis.
     walker = self.DepthAwareWalk if leveled_predicate else self.DepthAgnosticWalk
     walk = walker()
-    def _walk_rec(addr, level=0):
-      # If we've followed an edge to this address, stop recursing.
+
+    def expand(addr, level):
+      # If we've followed an edge to this address, don't expand it again.
       if not walk.expand_once(addr, level):
-        return
+        return None
 
       target = self._target_by_address[addr]
 
       if predicate and not predicate(target):
-        return
+        return None
 
       if not postorder and walk.do_work_once(addr):
         work(target)
 
-      for dep_address in self._target_dependencies_by_address[addr]:
-        if walk.expanded_or_worked(dep_address):
-          continue
-        if not leveled_predicate \
-                or leveled_predicate(self._target_by_address[dep_address], level):
-          _walk_rec(dep_address, level + 1)
-
-      if postorder and walk.do_work_once(addr):
-        work(target)
+      return addr, level, target, iter(self._edges.dependencies_of(addr))
 
+    # The walk is depth first, but keeps its own stack rather than recursing so that deep graphs
+    # don't exhaust the recursion limit.
     for address in addresses:
-      _walk_rec(address)
+      frame = expand(address, 0)
+      stack = [frame] if frame else []
+      while stack:
+        addr, level, target, dep_addresses = stack[-1]
+        for dep_address in dep_addresses:
+          if walk.expanded_or_worked(dep_address):
+            continue
+          if not leveled_predicate \
+                  or leveled_predicate(self._target_by_address[dep_address], level):
+            frame = expand(dep_address, level + 1)
+            if frame:
+              stack.append(frame)
+              break
+        else:
+          stack.pop()
+          if postorder and walk.do_work_once(addr):
+            work(target)
 
   def walk_transitive_dependee_graph(self, addresses, work, predicate=None, postorder=False):
     """Identical to `walk_transitive_dependency_graph`, but walks dependees preorder (or postorder
@@ -363,19 +378,31 @@ class BuildGraph(AbstractClass):
     """
     walked = set()
 
-    def _walk_rec(addr):
-      if addr not in walked:
-        walked.add(addr)
-        target = self._target_by_address[addr]
-        if not predicate or predicate(target):
-          if not postorder:
-            work(target)
-          for dep_address in self._target_dependees_by_address[addr]:
-            _walk_rec(dep_address)
+    def expand(addr):
+      if addr in walked:
+        return None
+      walked.add(addr)
+      target = self._target_by_address[addr]
+      if predicate and not predicate(target):
+        return None
+      if not postorder:
+        work(target)
+      return target, iter(self._edges.dependees_of(addr))
+
+    for address in addresses:
+      frame = expand(address)
+      stack = [frame] if frame else []
+      while stack:
+        target, dep_addresses = stack[-1]
+        for dep_address in dep_addresses:
+          frame = expand(dep_address)
+          if frame:
+            stack.append(frame)
+            break
+        else:
+          stack.pop()
           if postorder:
             work(target)
-    for address in addresses:
-      _walk_rec(address)
 
   def transitive_dependees_of_addresses(self, addresses, predicate=None, postorder=False):
     """Returns all transitive dependees of `address`.
@@ -389,12 +416,15 @@ class BuildGraph(AbstractClass):
     :param list<Address> addresses: The root addresses to transitively close over.
     :param function predicate: The predicate passed through to `walk_transitive_dependee_graph`.
     """
+    if not predicate:
+      return self._closure(addresses, dependees=True, postorder=postorder)
     ret = OrderedSet()
     self.walk_transitive_dependee_graph(addresses, ret.add, predicate=predicate,
                                         postorder=postorder)
     return ret
 
-  def transitive_subgraph_of_addresses(self, addresses, *vargs, **kwargs):
+  def transitive_subgraph_of_addresses(self, addresses, predicate=None, postorder=False,
+                                       leveled_predicate=None):
     """Returns all transitive dependencies of `address`.
 
     Note that this uses `walk_transitive_dependencies_graph` and the predicate is passed through,
@@ -416,12 +446,87 @@ class BuildGraph(AbstractClass):
       target in the search tree as a second parameter, and it is checked just before a dependency is
       expanded.
     """
+    if not predicate and not leveled_predicate:
+      return self._closure(addresses, dependees=False, postorder=postorder)
     ret = OrderedSet()
     self.walk_transitive_dependency_graph(addresses, ret.add,
-                                          *vargs,
-                                          **kwargs)
+                                          predicate=predicate,
+                                          postorder=postorder,
+                                          leveled_predicate=leveled_predicate)
     return ret
 
+  def _closure(self, addresses, dependees, postorder):
+    """Returns the unfiltered transitive closure of `addresses`, ordered as the walks would be.
+
+    Closures are memoized until an edge is next added to the graph, least recently used first out
+    once there are more than `_MAX_MEMOIZED_CLOSURES`.
+    """
+    if self._closures_version != self._edges.version:
+      self._closures.clear()
+      self._closures_version = self._edges.version
+
+    root_ids = []
+    for address in addresses:
+      if address not in self._target_by_address:
+        raise KeyError(address)
+      root_ids.append(self._edges.id_of(address))
+    key = (dependees, bool(postorder), tuple(root_ids))
+
+    closure_ids = self._closures.pop(key, None)
+    if closure_ids is None:
+      closure_ids = self._closure_ids(key)
+      if len(self._closures) >= self._MAX_MEMOIZED_CLOSURES:
+        self._closures.popitem(last=False)
+    self._closures[key] = closure_ids
+
+    return OrderedSet(self._target_by_address[self._edges.address_of(closure_id)]
+                      for closure_id in closure_ids)
+
+  def _closure_ids(self, key):
+    """Walks the closure of the given memo key depth first, and returns the ids found in order.
+
+    The closure of many roots is the union of the closures of each, in root order: a walk from a
+    root that has already been walked on its own is replaced by the memoized closure of that root,
+    less the ids already found.
+    """
+    dependees, postorder, root_ids = key
+    adjacent_ids = self._edges.dependee_ids if dependees else self._edges.dependency_ids
+    # A mark per address id, rather than a set of ids, for the ids found so far.
+    found = bytearray(len(self._edges))
+    closure_ids = array(b'i')
+
+    for root_id in root_ids:
+      if found[root_id]:
+        continue
+
+      root_closure_ids = self._closures.get((dependees, postorder, (root_id,)))
+      if root_closure_ids is not None:
+        for closure_id in root_closure_ids:
+          if not found[closure_id]:
+            found[closure_id] = 1
+            closure_ids.append(closure_id)
+        continue
+
+      found[root_id] = 1
+      if not postorder:
+        closure_ids.append(root_id)
+      stack = [(root_id, iter(adjacent_ids(root_id)))]
+      while stack:
+        node_id, node_adjacent_ids = stack[-1]
+        for adjacent_id in node_adjacent_ids:
+          if not found[adjacent_id]:
+            found[adjacent_id] = 1
+            if not postorder:
+              closure_ids.append(adjacent_id)
+            stack.append((adjacent_id, iter(adjacent_ids(adjacent_id))))
+            break
+        else:
+          stack.pop()
+          if postorder:
+            closure_ids.append(node_id)
+
+    return closure_ids
+
   def transitive_subgraph_of_addresses_bfs(self, addresses, predicate=None, leveled_predicate=None):
     """Returns the transitive dependency closure of `addresses` using BFS.
 
@@ -453,7 +558,7 @@ class BuildGraph(AbstractClass):
         continue
       if walk.do_work_once(address):
         ordered_closure.add(target)
-      for addr in self._target_dependencies_by_address[address]:
+      for addr in self._edges.dependencies_of(address):
         if walk.expanded_or_worked(addr):
           continue
         if not leveled_predicate or leveled_predicate(self._target_by_address[addr], level):
@@ -0,0 +1,142 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+from collections import defaultdict
+
+from pants.base.specs import DescendantAddresses
+from pants.build_graph.address import Address
+from pants.build_graph.address_lookup_error import AddressLookupError
+from pants.build_graph.build_file_index import BuildFileIndex, BuildFileIndexer
+
+
+logger = logging.getLogger(__name__)
+
+
+class DependeesIndex(BuildFileIndex):
+  """An index from the address of each target declared in a BUILD file to those of its dependees.
+
+  The index records the dependencies of the targets declared in the BUILD files of each directory,
+  keyed by a digest of the content of those BUILD files. Updating the index only injects the
+  targets of the directories whose BUILD files changed since the last update into the build graph,
+  so dependee queries need not inject every target of the repo. The index may be persisted to a
+  file, in which case it is kept up to date across runs.
+  """
+
+  def __init__(self, path=None, fingerprint=None):
+    super(DependeesIndex, self).__init__(path=path, fingerprint=fingerprint)
+    # The entries map the name of each target declared in a directory to the (spec_path,
+    # target_name) keys of its dependencies. This is their reverse, built on first use.
+    self._dependees = None
+
+  def update(self, address_mapper, build_graph):
+    """Re-indexes the targets of the directories whose BUILD files changed since the last update.
+
+    :param address_mapper: The AddressMapper to find BUILD files and the addresses they declare with.
+    :type address_mapper: :class:`pants.build_graph.address_mapper.AddressMapper`
+    :param build_graph: The BuildGraph to inject the targets of changed BUILD files into.
+    :type build_graph: :class:`pants.build_graph.build_graph.BuildGraph`
+    """
+    with self._lock:
+      digests = self.digest_spec_paths(address_mapper.scan_build_files(''))
+      stale = {spec_path for spec_path, digest in digests.items()
+               if self._entries.get(spec_path, (None, None))[0] != digest}
+      removed = set(self._entries) - set(digests)
+      if not stale and not removed:
+        return
+
+      if self._entries:
+        addresses_by_spec_path = {}
+        for spec_path in list(stale):
+          try:
+            addresses_by_spec_path[spec_path] = address_mapper.addresses_in_spec_path(spec_path)
+          except AddressLookupError as e:
+            # The directory declares no targets, or its BUILD files are broken: drop what was
+            # indexed for it, which no longer holds, and leave it unindexed so that it is retried
+            # next time.
+            logger.debug('Not indexing {}: {}'.format(spec_path, e))
+            stale.discard(spec_path)
+            removed.add(spec_path)
+        for addresses in addresses_by_spec_path.values():
+          for address in addresses:
+            build_graph.inject_address_closure(address)
+      else:
+        # Nothing is indexed yet, so inject the whole repo in one go.
+        addresses_by_spec_path = defaultdict(list)
+        for address in build_graph.inject_specs_closure([DescendantAddresses('')]):
+          addresses_by_spec_path[address.spec_path].append(address)
+
+      for spec_path in removed:
+        self._set_entry(spec_path, None)
+      for spec_path in stale:
+        targets = {}
+        for address in addresses_by_spec_path.get(spec_path, ()):
+          targets[address.target_name] = tuple(sorted(self._dependency_keys(build_graph, address)))
+        self._set_entry(spec_path, (digests[spec_path], targets))
+      self._save()
+
+  def dependees_of(self, addresses, transitive=False):
+    """Returns the addresses of the targets that depend on any of the given addresses.
+
+    The given addresses themselves are never included, even if they depend on one another.
+
+    :param addresses: The addresses of concrete targets declared in BUILD files.
+    :param bool transitive: True to include transitive dependees.
+    :rtype: set of :class:`pants.build_graph.address.Address`
+    """
+    with self._lock:
+      dependees_by_key = self._dependees_by_key()
+      roots = {(address.spec_path, address.target_name) for address in addresses}
+      found = set()
+      check = roots
+      while check:
+        dependees = set()
+        for key in check:
+          dependees.update(dependees_by_key.get(key, ()))
+        check = dependees - found
+        found.update(check)
+        if not transitive:
+          break
+      return {Address(spec_path, target_name) for spec_path, target_name in found - roots}
+
+  @staticmethod
+  def _dependency_keys(build_graph, address):
+    for dependency in build_graph.dependencies_of(address):
+      concrete = build_graph.get_concrete_derived_from(dependency).address
+      yield concrete.spec_path, concrete.target_name
+
+  def _set_entry(self, spec_path, entry):
+    if self._dependees is not None:
+      for target_name, dependencies in self._entries.get(spec_path, (None, {}))[1].items():
+        for dependency in dependencies:
+          self._dependees[dependency].discard((spec_path, target_name))
+      for target_name, dependencies in (entry[1] if entry else {}).items():
+        for dependency in dependencies:
+          self._dependees[dependency].add((spec_path, target_name))
+    if entry:
+      self._entries[spec_path] = entry
+    else:
+      self._entries.pop(spec_path, None)
+
+  def _dependees_by_key(self):
+    if self._dependees is None:
+      self._dependees = defaultdict(set)
+      for spec_path, (_, targets) in self._entries.items():
+        for target_name, dependencies in targets.items():
+          for dependency in dependencies:
+            self._dependees[dependency].add((spec_path, target_name))
+    return self._dependees
+
+
+class DependeesIndexer(BuildFileIndexer):
+  """Configures the index that dependee queries are answered from."""
+
+  options_scope = 'dependees-index'
+
+  index_type = DependeesIndex
+
+  index_usage = 'Answer the dependees goal and dependee inclusion for changed targets'
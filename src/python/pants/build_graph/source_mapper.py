@@ -17,6 +17,14 @@ class SourceMapper(object):
   def target_addresses_for_source(self, source):
     raise NotImplementedError
 
+  def target_addresses_for_sources(self, sources):
+    """Bulk form of `target_addresses_for_source`.
+
+    :param sources: The sources to look up.
+    :returns: A dict from each source to the addresses of the targets that own it.
+    """
+    return {source: self.target_addresses_for_source(source) for source in sources}
+
 
 class SpecSourceMapper(SourceMapper):
   """
@@ -166,3 +174,32 @@ class LazySourceMapper(SourceMapper):
     """
     self._find_owners(source)
     return self._source_to_address[source]
+
+
+class IndexedSourceMapper(SourceMapper):
+  """Looks up the owners of sources in a SourceOwnersIndex.
+
+  The index only re-reads the BUILD files that changed since it was last consulted, and so is
+  cheap to query for many sources, or in many runs of a long-lived process.
+  """
+
+  def __init__(self, index, address_mapper, build_graph, stop_after_match=False):
+    """
+    :param SourceOwnersIndex index: The index to look up owners in.
+    :param AddressMapper address_mapper: An address mapper that can be used to populate the
+      `build_graph` with targets the index needs to re-read.
+    :param BuildGraph build_graph: The build graph to map sources from.
+    :param bool stop_after_match: If `True` a search will not traverse into parent directories once
+      an owner is identified.
+    """
+    self._index = index
+    self._address_mapper = address_mapper
+    self._build_graph = build_graph
+    self._stop_after_match = stop_after_match
+
+  def target_addresses_for_source(self, source):
+    return self.target_addresses_for_sources([source])[source]
+
+  def target_addresses_for_sources(self, sources):
+    return self._index.owners_of(self._address_mapper, self._build_graph, sources,
+                                 stop_after_match=self._stop_after_match)
@@ -0,0 +1,132 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import os
+
+from pants.base.build_environment import get_buildroot
+from pants.base.build_file import BuildFile
+from pants.build_graph.address import Address
+from pants.build_graph.address_mapper import AddressMapper
+from pants.build_graph.build_file_index import BuildFileIndex, BuildFileIndexer
+from pants.source.filespec import matches_filespec
+
+
+logger = logging.getLogger(__name__)
+
+
+class SourceOwnersIndex(BuildFileIndex):
+  """An index from source files to the addresses of the targets that own them.
+
+  The index records, for the targets declared in the BUILD files of each directory, the BUILD file
+  that declares them, the filespec of their sources and the addresses of their resources targets,
+  keyed by a digest of the content of those BUILD files. Only the directories that contain or are
+  ancestors of the queried files are indexed, and a directory is only re-indexed once its BUILD
+  files change.
+
+  Owners are matched against the recorded filespecs rather than against expanded globs, so that a
+  file added under an existing glob is owned without re-indexing, and queries need not touch the
+  filesystem for anything but BUILD files.
+  """
+
+  def owners_of(self, address_mapper, build_graph, paths, stop_after_match=False):
+    """Returns the addresses of the targets that own each of the given paths.
+
+    A target owns the files matched by its sources or by those of its resources targets, and the
+    BUILD file that declares it.
+
+    :param address_mapper: The AddressMapper to read the addresses declared in BUILD files with.
+    :type address_mapper: :class:`pants.build_graph.address_mapper.AddressMapper`
+    :param build_graph: The BuildGraph to inject the targets of changed BUILD files into.
+    :type build_graph: :class:`pants.build_graph.build_graph.BuildGraph`
+    :param paths: Paths of files relative to the buildroot.
+    :param bool stop_after_match: If `True` the BUILD files of the parent directories of a path are
+                                  not consulted once an owner of the path is found.
+    :returns: A dict from each of the given paths to a set of the addresses that own it.
+    """
+    with self._lock:
+      buildroot = get_buildroot()
+      checked = set()
+      changed = []
+
+      def entry(spec_path):
+        if spec_path not in checked:
+          checked.add(spec_path)
+          if self._index_spec_path(address_mapper, build_graph, buildroot, spec_path):
+            changed.append(spec_path)
+        return self._entries[spec_path][1]
+
+      def owns(path, target):
+        rel_path, filespec, resources = target
+        if path == rel_path or matches_filespec(path, filespec):
+          return True
+        for resource_spec_path, resource_name in resources:
+          resource = entry(resource_spec_path).get(resource_name)
+          if resource and matches_filespec(path, resource[1]):
+            return True
+        return False
+
+      owners = {}
+      for path in paths:
+        if path in owners:
+          continue
+        owners[path] = set()
+        spec_path = path
+        while spec_path:
+          spec_path = os.path.dirname(spec_path)
+          for target_name, target in entry(spec_path).items():
+            if owns(path, target):
+              owners[path].add(Address(spec_path, target_name))
+          if stop_after_match and owners[path]:
+            break
+
+      if changed:
+        self._save()
+      return owners
+
+  def _index_spec_path(self, address_mapper, build_graph, buildroot, spec_path):
+    """Re-indexes the given directory if its BUILD files changed, and returns True if they did."""
+    try:
+      build_files = [os.path.join(spec_path, name)
+                     for name in os.listdir(os.path.join(buildroot, spec_path))
+                     if BuildFile._is_buildfile_name(name)]
+    except OSError:
+      build_files = []
+    build_files = [build_file for build_file in build_files
+                   if os.path.isfile(os.path.join(buildroot, build_file))]
+    digest = self.digest_spec_paths(build_files).get(spec_path, '')
+    if spec_path in self._entries and self._entries[spec_path][0] == digest:
+      return False
+
+    targets = {}
+    if build_files:
+      try:
+        addresses = address_mapper.addresses_in_spec_path(spec_path)
+      except AddressMapper.BuildFileScanError as e:
+        # The entry is re-indexed once the BUILD files are fixed, since that changes their digest.
+        logger.debug('Not indexing {}: {}'.format(spec_path, e))
+        addresses = []
+      for address in addresses:
+        build_graph.inject_address_closure(address)
+        target = build_graph.get_target(address)
+        sources_field = target.payload.get_field('sources')
+        filespec = sources_field.filespec if sources_field else None
+        resources = tuple(sorted((resource.address.spec_path, resource.address.target_name)
+                                 for resource in target.resources)) if target.has_resources else ()
+        targets[address.target_name] = (address.rel_path, filespec, resources)
+    self._entries[spec_path] = (digest, targets)
+    return True
+
+
+class SourceOwnersIndexer(BuildFileIndexer):
+  """Configures the index that the owners of source files are looked up from."""
+
+  options_scope = 'source-owners-index'
+
+  index_type = SourceOwnersIndex
+
+  index_usage = 'Look up the targets that own source files for list-owners and changed targets'
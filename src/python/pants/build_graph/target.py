@@ -311,12 +311,11 @@ class Target(AbstractTarget):
     closure = OrderedSet()
 
     if not bfs:
-      build_graph.walk_transitive_dependency_graph(
+      closure.update(build_graph.transitive_subgraph_of_addresses(
         addresses=addresses,
-        work=closure.add,
         postorder=postorder,
         leveled_predicate=leveled_predicate,
-      )
+      ))
     else:
       closure.update(build_graph.transitive_subgraph_of_addresses_bfs(
         addresses=addresses,
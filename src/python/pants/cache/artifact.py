@@ -108,31 +108,54 @@ class TarballArtifact(Artifact):
         tarout.add(path, relpath)
         self._relpaths.add(relpath)
 
-  def extract(self):
+  def extract(self, fileobj=None):
+    """Extract the files in this artifact to their locations under artifact root.
+
+    :param fileobj: If given, a stream of the tarball's bytes to extract from as they arrive,
+                    instead of the tarball file itself.
+    """
     try:
-      with open_tar(self._tarfile, 'r', errorlevel=2) as tarin:
-        # Note: We create all needed paths proactively, even though extractall() can do this for us.
-        # This is because we may be called concurrently on multiple artifacts that share directories,
-        # and there will be a race condition inside extractall(): task T1 A) sees that a directory
-        # doesn't exist and B) tries to create it. But in the gap between A) and B) task T2 creates
-        # the same directory, so T1 throws "File exists" in B).
-        # This actually happened, and was very hard to debug.
-        # Creating the paths here up front allows us to squelch that "File exists" error.
-        paths = []
-        dirs = set()
-        for tarinfo in tarin.getmembers():
-          paths.append(tarinfo.name)
-          if tarinfo.isdir():
-            dirs.add(tarinfo.name)
-          else:
-            dirs.add(os.path.dirname(tarinfo.name))
-        for d in dirs:
-          try:
-            os.makedirs(os.path.join(self._artifact_root, d))
-          except OSError as e:
-            if e.errno != errno.EEXIST:
-              raise
-        tarin.extractall(self._artifact_root)
-        self._relpaths.update(paths)
+      if fileobj is not None:
+        self._extract_stream(fileobj)
+      else:
+        self._extract_file()
     except tarfile.ReadError as e:
       raise ArtifactError(str(e))
+
+  def _extract_file(self):
+    with open_tar(self._tarfile, 'r', errorlevel=2) as tarin:
+      # Note: We create all needed paths proactively, even though extractall() can do this for us.
+      # This is because we may be called concurrently on multiple artifacts that share directories,
+      # and there will be a race condition inside extractall(): task T1 A) sees that a directory
+      # doesn't exist and B) tries to create it. But in the gap between A) and B) task T2 creates
+      # the same directory, so T1 throws "File exists" in B).
+      # This actually happened, and was very hard to debug.
+      # Creating the paths here up front allows us to squelch that "File exists" error.
+      paths = []
+      dirs = set()
+      for tarinfo in tarin.getmembers():
+        paths.append(tarinfo.name)
+        if tarinfo.isdir():
+          dirs.add(tarinfo.name)
+        else:
+          dirs.add(os.path.dirname(tarinfo.name))
+      for d in dirs:
+        self._makedirs(d)
+      tarin.extractall(self._artifact_root)
+      self._relpaths.update(paths)
+
+  def _extract_stream(self, fileobj):
+    # A stream can't be scanned for its members up front, so, for the same reasons as described in
+    # `_extract_file`, each member's directory is created just before the member is extracted.
+    with open_tar(fileobj, 'r|*', errorlevel=2) as tarin:
+      for tarinfo in tarin:
+        self._makedirs(tarinfo.name if tarinfo.isdir() else os.path.dirname(tarinfo.name))
+        tarin.extract(tarinfo, self._artifact_root)
+        self._relpaths.add(tarinfo.name)
+
+  def _makedirs(self, relpath):
+    try:
+      os.makedirs(os.path.join(self._artifact_root, relpath))
+    except OSError as e:
+      if e.errno != errno.EEXIST:
+        raise
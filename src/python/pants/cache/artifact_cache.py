@@ -114,6 +114,18 @@ class ArtifactCache(object):
   def has(self, cache_key):
     pass
 
+  def has_many(self, cache_keys):
+    """Check for the presence of artifacts for many keys at once.
+
+    Implementations for which each check is expensive (e.g. remote caches) should override this to
+    perform the checks concurrently.
+
+    :param list cache_keys: A list of CacheKey objects.
+    :returns: A list of booleans, one per key and in the same order, indicating which keys may be
+              read from this cache.
+    """
+    return [self.has(cache_key) for cache_key in cache_keys]
+
   def use_cached_files(self, cache_key, results_dir=None):
     """Use the files cached for the given key.
 
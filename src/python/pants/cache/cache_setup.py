@@ -15,6 +15,7 @@ from six.moves import range
 from pants.base.build_environment import get_buildroot
 from pants.base.deprecated import deprecated_conditional
 from pants.cache.artifact_cache import ArtifactCacheError
+from pants.cache.content_addressed_artifact_cache import ContentAddressedArtifactCache
 from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
 from pants.cache.pinger import BestUrlSelector, Pinger
 from pants.cache.resolver import NoopResolver, Resolver, RESTfulResolver
@@ -76,12 +77,25 @@ class CacheSetup(Subsystem):
              help='The gzip compression level (0-9) for created artifacts.')
     register('--dereference-symlinks', type=bool, default=True, fingerprint=True,
              help='Dereference symlinks when creating cache tarball.')
+    register('--local-store', advanced=True, choices=['tarball', 'content-addressed'],
+             default='tarball',
+             help='How a local filesystem cache stores artifacts. tarball: one tarball per '
+                  'cache key. content-addressed: each distinct file is stored once by its '
+                  'content digest, and restored by copying, or by hardlinking where possible if '
+                  '--link-local-store-files is set.')
+    register('--link-local-store-files', advanced=True, type=bool, default=True,
+             help='Restore read-only files from a content-addressed local store by hardlinking '
+                  'them rather than copying them. Writable files are always copied.')
     register('--max-entries-per-target', advanced=True, type=int, default=8,
              help='Maximum number of old cache files to keep per task target pair')
     register('--pinger-timeout', advanced=True, type=float, default=0.5,
              help='number of seconds before pinger times out')
     register('--pinger-tries', advanced=True, type=int, default=2,
              help='number of times pinger tries a cache')
+    register('--max-connections', advanced=True, type=int,
+             default=RESTfulArtifactCache.DEFAULT_MAX_CONNECTIONS,
+             help='Maximum number of concurrent keep-alive connections to use for batched '
+                  'lookups against a remote cache.')
     register('--write-permissions', advanced=True, type=str, default=None,
              help='Permissions to use when writing artifacts to a local cache, in octal.')
 
@@ -259,6 +273,12 @@ class CacheFactory(object):
       path = os.path.join(parent_path, self._stable_name)
       self._log.debug('{0} {1} local artifact cache at {2}'
                       .format(self._stable_name, action, path))
+      if self._options.local_store == 'content-addressed':
+        return ContentAddressedArtifactCache(artifact_root, path, compression,
+                                             self._options.max_entries_per_target,
+                                             permissions=self._options.write_permissions,
+                                             dereference=self._options.dereference_symlinks,
+                                             link=self._options.link_local_store_files)
       return LocalArtifactCache(artifact_root, path, compression,
                                 self._options.max_entries_per_target,
                                 permissions=self._options.write_permissions,
@@ -271,7 +291,8 @@ class CacheFactory(object):
         best_url_selector = BestUrlSelector(['{}/{}'.format(url.rstrip('/'), self._stable_name)
                                              for url in urls])
         local_cache = local_cache or TempLocalArtifactCache(artifact_root, compression)
-        return RESTfulArtifactCache(artifact_root, best_url_selector, local_cache)
+        return RESTfulArtifactCache(artifact_root, best_url_selector, local_cache,
+                                    max_connections=self._options.max_connections)
 
     local_cache = create_local_cache(spec.local) if spec.local else None
     remote_cache = create_remote_cache(spec.remote, local_cache) if spec.remote else None
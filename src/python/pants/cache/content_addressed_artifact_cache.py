@@ -0,0 +1,285 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import errno
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from pants.base.hash_utils import hash_file
+from pants.cache.artifact import ArtifactError
+from pants.cache.artifact_cache import UnreadableArtifact
+from pants.cache.local_artifact_cache import BaseLocalArtifactCache
+from pants.util.dirutil import (safe_concurrent_creation, safe_delete, safe_mkdir, safe_mkdir_for,
+                                safe_rm_oldest_items_in_dir, safe_rmtree, safe_walk)
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContentAddressedArtifactCache(BaseLocalArtifactCache):
+  """An artifact cache that stores each distinct cached file exactly once, in local files.
+
+  Every file of an artifact is stored as a blob named by the sha1 of its content, and every cache
+  key maps to a small json manifest listing the files (and directories and symlinks) that make up
+  the artifact. Files that are identical across targets or across versions of the same target
+  are therefore only stored once.
+
+  Blobs are stored read-only. Read-only files are restored by hardlinking their blobs into place,
+  falling back to a copy when a link can't be made (e.g.: when the cache and the artifact root are
+  on different devices). Writable files are always restored by copying, so that writing to a
+  restored file in place can't change the blob shared by other cache keys. Pass `link=False` to
+  restore every file by copying.
+  """
+
+  _MANIFEST_VERSION = 1
+
+  # The number of prunes of old manifests to batch up before collecting the blobs they released:
+  # a collection walks every manifest and blob in the cache.
+  _GC_BATCH_SIZE = 64
+
+  # The permission bits that blobs never have.
+  _WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+  # Manifest entry kinds.
+  _DIR = 'd'
+  _FILE = 'f'
+  _SYMLINK = 'l'
+
+  def __init__(self, artifact_root, cache_root, compression, max_entries_per_target=None,
+               permissions=None, dereference=True, link=True, gc_batch_size=None):
+    """
+    :param str artifact_root: The path under which cacheable products will be read/written.
+    :param str cache_root: The locally cached blobs and manifests are stored under this directory.
+    :param int compression: The gzip compression level for tarballs created for remote caches.
+    :param int max_entries_per_target: The maximum number of old manifests to leave behind for a
+                                       target on a cache miss.
+    :param str permissions: File permissions to use when creating blobs and manifests.
+    :param bool dereference: Dereference symlinks when storing artifacts.
+    :param bool link: Restore read-only files by hardlinking them from the cache where possible.
+    :param int gc_batch_size: The number of prunes to batch up before collecting garbage.
+    """
+    super(ContentAddressedArtifactCache, self).__init__(
+      artifact_root,
+      compression,
+      permissions=int(permissions.strip(), base=8) if permissions else None,
+      dereference=dereference
+    )
+    self._cache_root = os.path.realpath(os.path.expanduser(cache_root))
+    self._blobs_root = os.path.join(self._cache_root, 'blobs')
+    self._manifests_root = os.path.join(self._cache_root, 'manifests')
+    # Holds a marker file per prune since the last garbage collection, shared between processes.
+    self._prunes_root = os.path.join(self._cache_root, 'prunes')
+    self._gc_batch_size = gc_batch_size or self._GC_BATCH_SIZE
+    self._max_entries_per_target = max_entries_per_target
+    self._link = link
+    safe_mkdir(self._cache_root)
+
+  def prune(self, root):
+    """Prune stale manifests, and then, once enough prunes have accumulated, unreferenced blobs.
+
+    If the option --cache-max-entries-per-target is greater than zero, then prune will remove all
+    but n old manifests for each target/task. The blobs released by pruned manifests are collected
+    in batches, so that the cost of walking the whole cache is amortized over many prunes.
+
+    :param str root: The manifest directory of the target to prune.
+    """
+    max_entries_per_target = self._max_entries_per_target
+    if os.path.isdir(root) and max_entries_per_target:
+      if len(os.listdir(root)) > max_entries_per_target:
+        safe_rm_oldest_items_in_dir(root, max_entries_per_target)
+        safe_mkdir(self._prunes_root)
+        fd, _ = tempfile.mkstemp(dir=self._prunes_root)
+        os.close(fd)
+        if len(os.listdir(self._prunes_root)) >= self._gc_batch_size:
+          self.collect_garbage()
+
+  def collect_garbage(self):
+    """Delete all blobs that are not referenced by any manifest.
+
+    NB: A blob stored by a concurrent insert whose manifest has not yet been written may be
+    collected too; the subsequent read of that key will then see a missing blob and report the
+    artifact as unreadable, which is treated like a cache miss.
+    """
+    # Prunes recorded from here on may release blobs that this collection sees as live.
+    if os.path.isdir(self._prunes_root):
+      for name in os.listdir(self._prunes_root):
+        safe_delete(os.path.join(self._prunes_root, name))
+
+    live = set()
+    for dirpath, _, filenames in safe_walk(self._manifests_root):
+      for filename in filenames:
+        try:
+          entries = self._read_manifest(os.path.join(dirpath, filename))
+        except (ArtifactError, ValueError):
+          # An in-flight or corrupt manifest: it can't keep anything alive.
+          continue
+        live.update(entry[2] for entry in entries or () if entry[0] == self._FILE)
+
+    for dirpath, _, filenames in safe_walk(self._blobs_root):
+      for filename in filenames:
+        if os.path.basename(dirpath) + filename not in live:
+          safe_delete(os.path.join(dirpath, filename))
+
+  def has(self, cache_key):
+    return os.path.isfile(self._manifest_for_key(cache_key))
+
+  def use_cached_files(self, cache_key, results_dir=None):
+    manifest = self._manifest_for_key(cache_key)
+    try:
+      entries = self._read_manifest(manifest)
+      if entries is not None:
+        if results_dir is not None:
+          safe_rmtree(results_dir)
+        self._restore(entries)
+        return True
+    except Exception as e:
+      logger.warn('Error while reading {0} from local artifact cache: {1}'.format(manifest, e))
+      if results_dir is not None:
+        safe_mkdir(results_dir, clean=True)
+      safe_delete(manifest)
+      return UnreadableArtifact(cache_key, e)
+
+    return False
+
+  def try_insert(self, cache_key, paths):
+    self._store_paths(cache_key, paths)
+
+  def delete(self, cache_key):
+    # Blobs may be shared with other manifests: they are reclaimed by `collect_garbage`.
+    safe_delete(self._manifest_for_key(cache_key))
+
+  @contextmanager
+  def insert_paths(self, cache_key, paths):
+    """Store paths in this cache, and yield the path to a temporary artifact tarball of them.
+
+    The tarball is used by a remote cache fronted by this cache for uploads.
+    """
+    self._store_paths(cache_key, paths)
+    with self._tmpfile(cache_key, 'write') as tmp:
+      self._artifact(tmp.name).collect(paths)
+      yield tmp.name
+
+  def store_and_use_artifact(self, cache_key, src, results_dir=None):
+    """Extract the artifact tarball from the given `src` iterator, and then store its files.
+
+    :param cache_key: Cache key for the artifact.
+    :param src: Iterator over binary data of an artifact tarball.
+    :param str results_dir: The path to the expected destination of the artifact extraction: will
+      be cleared both before extraction, and after a failure to extract.
+    """
+    with self._tmpfile(cache_key, 'read') as tmp:
+      artifact = self._artifact(tmp.name)
+      self._stream_extract(artifact, src, tmp, results_dir)
+      self._store_paths(cache_key, list(artifact.get_paths()))
+      return True
+
+  def _store_paths(self, cache_key, paths):
+    entries = OrderedDict()
+    for path in paths:
+      for entry in self._entries_for(path):
+        entries[entry[1]] = entry
+
+    manifest = self._manifest_for_key(cache_key)
+    with safe_concurrent_creation(manifest) as tmp_manifest:
+      with open(tmp_manifest, 'w') as fp:
+        json.dump({'version': self._MANIFEST_VERSION, 'entries': entries.values()}, fp)
+      if self._permissions:
+        os.chmod(tmp_manifest, self._permissions)
+    self.prune(os.path.dirname(manifest))  # Remove old manifests.
+
+  def _entries_for(self, path, enclosing_dirs=frozenset()):
+    """Yields manifest entries for the given path, storing the blobs of any files found.
+
+    :param frozenset enclosing_dirs: The real paths of the directories being walked that enclose
+                                     the path, so that a symlink back to one of them is not
+                                     followed forever.
+    """
+    relpath = os.path.relpath(path, self.artifact_root)
+    if not self._dereference and os.path.islink(path):
+      yield [self._SYMLINK, relpath, os.readlink(path)]
+    elif os.path.isdir(path):
+      real_path = os.path.realpath(path)
+      if real_path in enclosing_dirs:
+        logger.warn('Not caching {}: it is a symlink to an enclosing directory.'.format(path))
+        return
+      enclosing_dirs = enclosing_dirs | {real_path}
+      yield [self._DIR, relpath]
+      for name in sorted(os.listdir(path)):
+        for entry in self._entries_for(os.path.join(path, name), enclosing_dirs):
+          yield entry
+    else:
+      yield [self._FILE, relpath, self._store_blob(path), stat.S_IMODE(os.stat(path).st_mode)]
+
+  def _store_blob(self, path):
+    digest = hash_file(path)
+    blob = self._blob_for_digest(digest)
+    if not os.path.exists(blob):
+      with safe_concurrent_creation(blob) as tmp_blob:
+        shutil.copyfile(path, tmp_blob)
+        mode = self._permissions or stat.S_IMODE(os.stat(path).st_mode)
+        os.chmod(tmp_blob, mode & ~self._WRITE_BITS)
+    return digest
+
+  def _read_manifest(self, manifest):
+    """Returns the entries of the given manifest, or None if it does not exist."""
+    try:
+      with open(manifest, 'rb') as fp:
+        content = json.load(fp)
+    except IOError as e:
+      if e.errno == errno.ENOENT:
+        return None
+      raise
+    if content.get('version') != self._MANIFEST_VERSION:
+      raise ArtifactError('Unsupported manifest version in {}: {}'
+                          .format(manifest, content.get('version')))
+    return content['entries']
+
+  def _restore(self, entries):
+    for entry in entries:
+      kind, relpath = entry[0], entry[1]
+      dest = os.path.join(self.artifact_root, relpath)
+      if kind == self._DIR:
+        safe_mkdir(dest)
+      elif kind == self._FILE:
+        safe_mkdir_for(dest)
+        self._restore_blob(entry[2], entry[3], dest)
+      elif kind == self._SYMLINK:
+        safe_mkdir_for(dest)
+        safe_delete(dest)
+        os.symlink(entry[2], dest)
+      else:
+        raise ArtifactError('Unknown manifest entry kind {!r} for {}'.format(kind, relpath))
+
+  def _restore_blob(self, digest, mode, dest):
+    blob = self._blob_for_digest(digest)
+    safe_delete(dest)
+    # A blob can only be linked if its permissions are those the restored file should have, and a
+    # writable file must not share its inode with the blob.
+    if (self._link and not mode & self._WRITE_BITS and
+        stat.S_IMODE(os.stat(blob).st_mode) == mode):
+      try:
+        os.link(blob, dest)
+        return
+      except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+          raise
+    shutil.copyfile(blob, dest)
+    os.chmod(dest, mode)
+
+  def _blob_for_digest(self, digest):
+    return os.path.join(self._blobs_root, digest[:2], digest[2:])
+
+  def _manifest_for_key(self, cache_key):
+    # Note: as in LocalArtifactCache, the id is used as well as the hash, because two different
+    # targets may have the same hash if both have no sources.
+    return os.path.join(self._manifests_root, cache_key.id, cache_key.hash) + '.json'
@@ -19,6 +19,44 @@ from pants.util.dirutil import (safe_delete, safe_mkdir, safe_mkdir_for,
 logger = logging.getLogger(__name__)
 
 
+class _TeeStream(object):
+  """A minimal read-only file-like view of an iterator of byte chunks.
+
+  Every chunk pulled from the iterator is also written to `sink`.
+  """
+
+  def __init__(self, chunks, sink):
+    self._chunks = iter(chunks)
+    self._sink = sink
+    self._chunk = b''
+    self._pos = 0
+
+  def _next_chunk(self):
+    for chunk in self._chunks:
+      if chunk:
+        self._sink.write(chunk)
+        self._chunk, self._pos = chunk, 0
+        return True
+    return False
+
+  def read(self, size=-1):
+    parts = []
+    while size != 0:
+      if self._pos == len(self._chunk) and not self._next_chunk():
+        break
+      available = len(self._chunk) - self._pos
+      count = available if size < 0 else min(size, available)
+      parts.append(self._chunk[self._pos:self._pos + count])
+      self._pos += count
+      if size > 0:
+        size -= count
+    return b''.join(parts)
+
+  def drain(self):
+    while self._next_chunk():
+      pass
+
+
 class BaseLocalArtifactCache(ArtifactCache):
 
   def __init__(self, artifact_root, compression, permissions=None, dereference=True):
@@ -53,7 +91,10 @@ class BaseLocalArtifactCache(ArtifactCache):
       yield self._store_tarball(cache_key, tmp.name)
 
   def store_and_use_artifact(self, cache_key, src, results_dir=None):
-    """Store and then extract the artifact from the given `src` iterator for the given cache_key.
+    """Extract and then store the artifact from the given `src` iterator for the given cache_key.
+
+    The artifact is extracted while it is being received from `src`, and is only stored once it
+    has been extracted successfully.
 
     :param cache_key: Cache key for the artifact.
     :param src: Iterator over binary data to store for the artifact.
@@ -61,31 +102,35 @@ class BaseLocalArtifactCache(ArtifactCache):
       be cleared both before extraction, and after a failure to extract.
     """
     with self._tmpfile(cache_key, 'read') as tmp:
-      for chunk in src:
-        tmp.write(chunk)
-      tmp.close()
-      tarball = self._store_tarball(cache_key, tmp.name)
-      artifact = self._artifact(tarball)
+      self._stream_extract(self._artifact(tmp.name), src, tmp, results_dir)
+      self._store_tarball(cache_key, tmp.name)
+      return True
 
-      # NOTE(mateo): The two clean=True args passed in this method are likely safe, since the cache will by
-      # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
-      # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
-      # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
-      if results_dir is not None:
-        safe_mkdir(results_dir, clean=True)
+  def _stream_extract(self, artifact, src, tmp, results_dir):
+    """Extract `artifact` from the `src` iterator, teeing all of its data into the open `tmp` file.
 
-      try:
-        artifact.extract()
-      except Exception:
-        # Do our best to clean up after a failed artifact extraction. If a results_dir has been
-        # specified, it is "expected" to represent the output destination of the extracted
-        # artifact, and so removing it should clear any partially extracted state.
-        if results_dir is not None:
-          safe_mkdir(results_dir, clean=True)
-        safe_delete(tarball)
-        raise
+    On return `tmp` is closed and holds the complete artifact tarball.
+    """
+    # NOTE(mateo): The two clean=True args passed in this method are likely safe, since the cache will by
+    # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
+    # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
+    # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
+    if results_dir is not None:
+      safe_mkdir(results_dir, clean=True)
 
-      return True
+    try:
+      stream = _TeeStream(src, tmp)
+      artifact.extract(fileobj=stream)
+      # Consume any trailing data (e.g.: tar padding) so that the stored tarball is complete.
+      stream.drain()
+      tmp.close()
+    except Exception:
+      # Do our best to clean up after a failed artifact extraction. If a results_dir has been
+      # specified, it is "expected" to represent the output destination of the extracted
+      # artifact, and so removing it should clear any partially extracted state.
+      if results_dir is not None:
+        safe_mkdir(results_dir, clean=True)
+      raise
 
   def _store_tarball(self, cache_key, src):
     """Given a src path to an artifact tarball, store it and return stored artifact's path."""
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import threading
 import urlparse
 from collections import Counter, deque
 from contextlib import contextmanager
@@ -88,6 +89,18 @@ class BestUrlSelector(object):
     self.parsed_urls = deque(self._parse_urls(available_urls))
     self.unsuccessful_calls = Counter()
     self.max_failures = max_failures
+    # Guards failure accounting, since batched requests select urls from multiple threads.
+    self._lock = threading.Lock()
+
+  def __getstate__(self):
+    # Selectors are shipped along with their caches to subprocesses, but locks can't be pickled.
+    state = self.__dict__.copy()
+    del state['_lock']
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._lock = threading.Lock()
 
   def _parse_urls(self, urls):
     parsed_urls = [urlparse.urlparse(url) for url in urls]
@@ -112,12 +125,14 @@ class BestUrlSelector(object):
     try:
       yield best_url
     except Exception:
-      self.unsuccessful_calls[best_url] += 1
-
-      # Not thread-safe but pool used by cache is based on subprocesses, therefore no race.
-      if self.unsuccessful_calls[best_url] > self.max_failures:
-        self.parsed_urls.rotate(-1)
-        self.unsuccessful_calls[best_url] = 0
+      with self._lock:
+        self.unsuccessful_calls[best_url] += 1
+        # Only rotate if no other thread has already rotated `best_url` away.
+        if (self.unsuccessful_calls[best_url] > self.max_failures and
+            self.parsed_urls[0] == best_url):
+          self.parsed_urls.rotate(-1)
+          self.unsuccessful_calls[best_url] = 0
       raise
     else:
-      self.unsuccessful_calls[best_url] = 0
+      with self._lock:
+        self.unsuccessful_calls[best_url] = 0
@@ -6,9 +6,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+from multiprocessing.pool import ThreadPool
 
 import requests
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 
 from pants.cache.artifact_cache import ArtifactCache, NonfatalArtifactCacheError, UnreadableArtifact
 
@@ -22,11 +24,22 @@ logging.getLogger('requests').setLevel(logging.WARNING)
 
 class RequestsSession(object):
   _session = None
+  _max_connections = 0
 
   @classmethod
-  def instance(cls):
+  def instance(cls, max_connections=None):
+    """Returns the shared session, pooling at least `max_connections` keep-alive connections per host.
+
+    :param int max_connections: The number of connections to a single host that are expected to
+                                be in use concurrently.
+    """
     if cls._session is None:
       cls._session = requests.Session()
+    if max_connections and max_connections > cls._max_connections:
+      cls._max_connections = max_connections
+      adapter = HTTPAdapter(pool_maxsize=max_connections)
+      cls._session.mount('http://', adapter)
+      cls._session.mount('https://', adapter)
     return cls._session
 
 
@@ -35,19 +48,24 @@ class RESTfulArtifactCache(ArtifactCache):
 
   READ_SIZE_BYTES = 4 * 1024 * 1024
 
-  def __init__(self, artifact_root, best_url_selector, local):
+  DEFAULT_MAX_CONNECTIONS = 16
+
+  def __init__(self, artifact_root, best_url_selector, local, max_connections=None):
     """
     :param string artifact_root: The path under which cacheable products will be read/written.
     :param BestUrlSelector best_url_selector: Url selector that supports fail-over. Each returned
       url represents prefix for some RESTful service. We must be able to PUT and GET to any path
       under this base.
     :param BaseLocalArtifactCache local: local cache instance for storing and creating artifacts
+    :param int max_connections: The maximum number of concurrent keep-alive connections used for
+      batched requests.
     """
     super(RESTfulArtifactCache, self).__init__(artifact_root)
 
     self.best_url_selector = best_url_selector
     self._timeout_secs = 4.0
     self._localcache = local
+    self._max_connections = max_connections or self.DEFAULT_MAX_CONNECTIONS
 
   def try_insert(self, cache_key, paths):
     # Delegate creation of artifact to local cache.
@@ -62,6 +80,32 @@ class RESTfulArtifactCache(ArtifactCache):
       return True
     return self._request('HEAD', cache_key) is not None
 
+  def has_many(self, cache_keys):
+    """Check for many keys at once, issuing concurrent HEAD requests over pooled connections.
+
+    Keys that are in the local cache are not requested remotely. A key whose remote check fails is
+    reported as present, so that the subsequent read surfaces the failure for it.
+    """
+    found = self._localcache.has_many(cache_keys)
+    remote_keys = [cache_key for cache_key, in_local in zip(cache_keys, found) if not in_local]
+    if not remote_keys:
+      return found
+
+    pool = ThreadPool(processes=min(self._max_connections, len(remote_keys)))
+    try:
+      found_remotely = iter(pool.map(self._probe, remote_keys, chunksize=1))
+    finally:
+      pool.close()
+      pool.join()
+    return [in_local or next(found_remotely) for in_local in found]
+
+  def _probe(self, cache_key):
+    try:
+      return self._request('HEAD', cache_key) is not None
+    except NonfatalArtifactCacheError as e:
+      logger.debug('Error while probing remote artifact cache for {0}: {1}'.format(cache_key, e))
+      return True
+
   def use_cached_files(self, cache_key, results_dir=None):
     if self._localcache.has(cache_key):
       return self._localcache.use_cached_files(cache_key, results_dir)
@@ -86,7 +130,7 @@ class RESTfulArtifactCache(ArtifactCache):
   # Returns a response if we get a 200, None if we get a 404 and raises an exception otherwise.
   def _request(self, method, cache_key, body=None):
 
-    session = RequestsSession.instance()
+    session = RequestsSession.instance(self._max_connections)
     with self.best_url_selector.select_best_url() as best_url:
       url = self._url_for_key(best_url, cache_key)
       logger.debug('Sending {0} request to {1}'.format(method, url))
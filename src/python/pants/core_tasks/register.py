@@ -19,6 +19,7 @@ from pants.core_tasks.reporting_server_run import ReportingServerRun
 from pants.core_tasks.roots import ListRoots
 from pants.core_tasks.run_prep_command import (RunBinaryPrepCommand, RunCompilePrepCommand,
                                                RunTestPrepCommand)
+from pants.core_tasks.run_stats import RunStats
 from pants.core_tasks.substitute_aliased_targets import SubstituteAliasedTargets
 from pants.core_tasks.targets_help import TargetsHelp
 from pants.core_tasks.what_changed import WhatChanged
@@ -91,6 +92,7 @@ def register_goals():
   # Workspace information.
   task(name='roots', action=ListRoots).install()
   task(name='bash-completion', action=BashCompletion).install()
+  task(name='stats', action=RunStats).install()
 
   # Handle sources that aren't loose files in the repo.
   task(name='deferred-sources', action=DeferredSourcesMapper).install()
@@ -0,0 +1,80 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import time
+
+from pants.stats.statsdb import StatsDBFactory
+from pants.task.console_task import ConsoleTask
+
+
+class RunStats(ConsoleTask):
+  """Show the slowest tasks and the tasks and targets that got slower, from the stats of past runs.
+
+  Timings over the last `--days` are compared against those over the same number of days before.
+  """
+
+  _SECS_PER_DAY = 24 * 60 * 60
+
+  @classmethod
+  def subsystem_dependencies(cls):
+    return super(RunStats, cls).subsystem_dependencies() + (StatsDBFactory,)
+
+  @classmethod
+  def register_options(cls, register):
+    super(RunStats, cls).register_options(register)
+    register('--days', type=int, default=7,
+             help='Show stats for the runs of this many most recent days.')
+    register('--timings', choices=['self_timings', 'cumulative_timings'], default='self_timings',
+             help='Rank tasks by the time spent in their workunits excluding, or including, that '
+                  'spent in their child workunits.')
+    register('--percentile', type=int, default=50,
+             help='Compare this percentile of the timings of tasks and targets.')
+    register('--threshold', type=float, default=1.2,
+             help='Show tasks and targets whose timing grew by at least this factor.')
+    register('--min-runs', type=int, default=3,
+             help='Ignore tasks and targets timed fewer than this many times in either window.')
+    register('--limit', type=int, default=10,
+             help='Show at most this many tasks or targets in each section.')
+
+  def console_output(self, targets):
+    options = self.get_options()
+    statsdb = StatsDBFactory.global_instance().get_db()
+    now = time.time()
+    current = (now - options.days * self._SECS_PER_DAY, now)
+    baseline = (current[0] - options.days * self._SECS_PER_DAY, current[0])
+
+    yield 'Slowest tasks over the last {} days (p{} of {}):'.format(
+      options.days, options.percentile, options.timings)
+    slowest = sorted(statsdb.get_percentiles(options.timings, [options.percentile],
+                                             since=current[0], until=current[1]),
+                     key=lambda row: (-row[2][0], row[0]))
+    for label, count, timings in slowest[:options.limit]:
+      yield '  {:>10}  {}  ({} runs)'.format(self._format_ms(timings[0]), label, count)
+
+    for title, timing_table, label_like in (('Tasks', options.timings, '%'),
+                                            ('Targets', 'target_timings', 'compile.run_time')):
+      yield '{} trending up (p{} over the last {} days vs the {} days before):'.format(
+        title, options.percentile, options.days, options.days)
+      regressions = statsdb.get_regressions(timing_table, baseline, current,
+                                            percentile=options.percentile,
+                                            threshold=options.threshold,
+                                            min_runs=options.min_runs,
+                                            label_like=label_like)
+      for regression in regressions[:options.limit]:
+        yield '  {:>10} -> {:>10}  x{:.2f}  {}'.format(self._format_ms(regression.baseline),
+                                                      self._format_ms(regression.current),
+                                                      regression.ratio, regression.key)
+
+    yield 'Artifact cache over the last {} days:'.format(options.days)
+    for cache_name, num_hits, num_misses in statsdb.get_cache_stats(*current):
+      total = num_hits + num_misses
+      yield '  {}: {} hits, {} misses ({:.0%} hit rate)'.format(
+        cache_name, num_hits, num_misses, num_hits / total if total else 0)
+
+  @staticmethod
+  def _format_ms(ms):
+    return '{:.3f}s'.format(ms / 1000)
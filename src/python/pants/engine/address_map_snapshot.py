@@ -0,0 +1,150 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import cPickle as pickle
+import hashlib
+import logging
+import os
+import threading
+
+from pants.engine.mapper import AddressMap
+from pants.util.dirutil import safe_concurrent_creation
+from pants.version import VERSION
+
+
+logger = logging.getLogger(__name__)
+
+
+def _type_name(obj):
+  type_ = obj if isinstance(obj, type) else type(obj)
+  return '{}.{}'.format(type_.__module__, type_.__name__)
+
+
+def parser_signature(symbol_table_cls, parser_cls):
+  """Returns a string identifying everything other than its content that a BUILD file parse uses.
+
+  :param symbol_table_cls: The symbol table cls to expose a symbol table dict.
+  :type symbol_table_cls: A :class:`pants.engine.parser.SymbolTable`.
+  :param parser_cls: The parser cls to use.
+  :type parser_cls: A :class:`pants.engine.parser.Parser`.
+  """
+  signature = [_type_name(parser_cls), _type_name(symbol_table_cls)]
+  signature.extend('{}={}'.format(alias, _type_name(type_))
+                   for alias, type_ in sorted(symbol_table_cls.table().items()))
+  # Legacy symbol tables also expose the objects and macros that a BUILD file may call.
+  aliases = getattr(symbol_table_cls, 'aliases', None)
+  if aliases:
+    build_file_aliases = aliases()
+    for category in ('target_types', 'target_macro_factories', 'objects',
+                     'context_aware_object_factories'):
+      signature.extend('{}:{}={}'.format(category, alias, _type_name(obj))
+                       for alias, obj in sorted(getattr(build_file_aliases, category).items()))
+  return '\n'.join(signature)
+
+
+class AddressMapSnapshot(object):
+  """A persistent cache of the AddressMaps parsed from BUILD files.
+
+  A restarted pantsd uses the snapshot to skip re-parsing the BUILD files whose content it has
+  already parsed: each entry is keyed by a digest of the BUILD file's content and of the symbol
+  table and parser that parsed it, so an entry is only ever used for an identical parse.
+  """
+
+  _VERSION = 1
+
+  def __init__(self, path, build_root):
+    """
+    :param string path: The file to load the snapshot from and save it to.
+    :param string build_root: The buildroot that the paths of parsed BUILD files are relative to.
+    """
+    self._path = path
+    self._build_root = build_root
+    self._lock = threading.Lock()
+    self._signatures = {}
+    self._loaded = self._load()
+    self._entries = {}
+    self._dirty = False
+
+  @property
+  def dirty(self):
+    """True if entries have been parsed since the snapshot was loaded or last saved."""
+    return self._dirty
+
+  def parse(self, filepath, filecontent, symbol_table_cls, parser_cls):
+    """Returns the AddressMap of the given BUILD file, parsing it only if it is not in the snapshot.
+
+    Takes the same parameters as `AddressMap.parse`.
+    """
+    digest = self._digest(filecontent, symbol_table_cls, parser_cls)
+    with self._lock:
+      entry = self._entries.get(filepath) or self._loaded.get(filepath)
+      if entry and entry[0] == digest:
+        self._entries[filepath] = entry
+        return entry[1]
+
+    address_map = AddressMap.parse(filepath, filecontent, symbol_table_cls, parser_cls)
+    with self._lock:
+      self._entries[filepath] = (digest, address_map)
+      self._dirty = True
+    return address_map
+
+  def save(self):
+    """Saves the snapshot, if it has changed.
+
+    Loaded entries that have not been used since are saved as is, since their BUILD files may
+    simply not have been parsed yet, unless their BUILD files no longer exist.
+    """
+    with self._lock:
+      if not self._dirty:
+        return
+      entries = dict(self._loaded)
+      entries.update(self._entries)
+      self._dirty = False
+    deleted = [filepath for filepath in entries
+               if not os.path.isfile(os.path.join(self._build_root, filepath))]
+    for filepath in deleted:
+      del entries[filepath]
+    with self._lock:
+      for filepath in deleted:
+        self._loaded.pop(filepath, None)
+        self._entries.pop(filepath, None)
+    try:
+      with safe_concurrent_creation(self._path) as tmp_path:
+        with open(tmp_path, 'wb') as fp:
+          pickle.dump({'version': self._version(), 'entries': entries}, fp,
+                      protocol=pickle.HIGHEST_PROTOCOL)
+    except (IOError, OSError, pickle.PicklingError, TypeError) as e:
+      logger.warn('Failed to save the BUILD file snapshot to {}: {}'.format(self._path, e))
+
+  def _digest(self, filecontent, symbol_table_cls, parser_cls):
+    key = (symbol_table_cls, parser_cls)
+    signature = self._signatures.get(key)
+    if signature is None:
+      signature = self._signatures[key] = parser_signature(symbol_table_cls, parser_cls)
+    hasher = hashlib.sha1()
+    hasher.update(signature.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(filecontent)
+    return hasher.hexdigest()
+
+  @classmethod
+  def _version(cls):
+    return '{}-{}'.format(cls._VERSION, VERSION)
+
+  def _load(self):
+    if not os.path.isfile(self._path):
+      return {}
+    try:
+      with open(self._path, 'rb') as fp:
+        content = pickle.load(fp)
+    except Exception as e:
+      # Unpickling may fail with nearly any error if the classes it references have changed.
+      logger.warn('Ignoring unreadable BUILD file snapshot {}: {}'.format(self._path, e))
+      return {}
+    if not isinstance(content, dict) or content.get('version') != self._version():
+      return {}
+    return content['entries']
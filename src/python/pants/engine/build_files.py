@@ -17,7 +17,7 @@ from pants.build_graph.address import Address, BuildFileAddress
 from pants.engine.addressable import (AddressableDescriptor, BuildFileAddresses, Collection,
                                       Exactly, TypeConstraintError)
 from pants.engine.fs import FilesContent, PathGlobs, Snapshot
-from pants.engine.mapper import AddressFamily, AddressMap, AddressMapper, ResolveError
+from pants.engine.mapper import AddressFamily, AddressMapper, ResolveError
 from pants.engine.objects import Locatable, SerializableFactory, Validatable
 from pants.engine.rules import RootRule, SingletonRule, TaskRule, rule
 from pants.engine.selectors import Select, SelectDependencies, SelectProjection
@@ -79,10 +79,8 @@ def parse_address_family(address_mapper, path, build_files):
   for filecontent_product in files_content:
     if filecontent_product.path in ignored_paths:
       continue
-    address_maps.append(AddressMap.parse(filecontent_product.path,
-                                         filecontent_product.content,
-                                         address_mapper.symbol_table_cls,
-                                         address_mapper.parser_cls))
+    address_maps.append(address_mapper.parse_address_map(filecontent_product.path,
+                                                         filecontent_product.content))
   return AddressFamily.create(path.path, address_maps)
 
 
@@ -7,7 +7,12 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import logging
 
+from pants.base.build_environment import get_buildroot
 from pants.base.specs import DescendantAddresses
+from pants.build_graph.dependees_index import DependeesIndex
+from pants.build_graph.source_mapper import IndexedSourceMapper
+from pants.build_graph.source_owners_index import SourceOwnersIndex
+from pants.engine.legacy.address_mapper import LegacyAddressMapper
 from pants.engine.legacy.graph import LegacyBuildGraph
 from pants.engine.legacy.source_mapper import EngineSourceMapper
 from pants.scm.change_calculator import ChangeCalculator
@@ -36,17 +41,38 @@ class EngineChangeCalculator(ChangeCalculator):
     if not changed_files:
       return
 
-    changed_addresses = set(address
-                            for address
-                            in self._mapper.iter_target_addresses_for_sources(changed_files))
+    graph = None
+    source_owners_index = SourceOwnersIndex.global_instance()
+    if source_owners_index:
+      graph = LegacyBuildGraph.create(self._scheduler, self._symbol_table_cls)
+      mapper = IndexedSourceMapper(source_owners_index,
+                                   LegacyAddressMapper(self._scheduler, get_buildroot()),
+                                   graph)
+      changed_addresses = set()
+      for addresses in mapper.target_addresses_for_sources(changed_files).values():
+        changed_addresses.update(addresses)
+    else:
+      changed_addresses = set(address
+                              for address
+                              in self._mapper.iter_target_addresses_for_sources(changed_files))
     for address in changed_addresses:
       yield address
 
     if changed_request.include_dependees not in ('direct', 'transitive'):
       return
 
+    graph = graph or LegacyBuildGraph.create(self._scheduler, self._symbol_table_cls)
+
+    dependees_index = DependeesIndex.global_instance()
+    if dependees_index:
+      dependees_index.update(LegacyAddressMapper(self._scheduler, get_buildroot()), graph)
+      transitive = changed_request.include_dependees == 'transitive'
+      for address in dependees_index.dependees_of(changed_addresses, transitive=transitive):
+        if address not in changed_addresses:
+          yield address
+      return
+
     # For dependee finding, we need to parse all build files.
-    graph = LegacyBuildGraph.create(self._scheduler, self._symbol_table_cls)
     for _ in graph.inject_specs_closure([DescendantAddresses('')]):
       pass
 
@@ -41,6 +41,35 @@ class _DestWrapper(datatype('DestWrapper', ['target_types'])):
   """
 
 
+class _TargetTypesByAlias(dict):
+  """The target types of a SymbolTable by alias.
+
+  A SymbolTable may defer loading an alias until a BUILD file uses it, which is after the graph
+  reading the target types is created, so aliases missing here are looked up again on demand.
+  """
+
+  def __init__(self, symbol_table_cls):
+    super(_TargetTypesByAlias, self).__init__()
+    self._symbol_table_cls = symbol_table_cls
+    self._update()
+
+  def _update(self):
+    aliases = self._symbol_table_cls.aliases()
+    self.update(aliases.target_types)
+    for alias, factory in aliases.target_macro_factories.items():
+      target_type, = factory.target_types
+      self[alias] = target_type
+
+  def __missing__(self, alias):
+    resolve_deferred_alias = getattr(self._symbol_table_cls, 'resolve_deferred_alias', None)
+    if resolve_deferred_alias:
+      resolve_deferred_alias(alias)
+    self._update()
+    if alias not in self:
+      raise KeyError(alias)
+    return self[alias]
+
+
 class LegacyBuildGraph(BuildGraph):
   """A directed acyclic graph of Targets and dependencies. Not necessarily connected.
 
@@ -72,12 +101,7 @@ class LegacyBuildGraph(BuildGraph):
 
   @staticmethod
   def _get_target_types(symbol_table_cls):
-    aliases = symbol_table_cls.aliases()
-    target_types = dict(aliases.target_types)
-    for alias, factory in aliases.target_macro_factories.items():
-      target_type, = factory.target_types
-      target_types[alias] = target_type
-    return target_types
+    return _TargetTypesByAlias(symbol_table_cls)
 
   def _index(self, roots):
     """Index from the given roots into the storage provided by the base class.
@@ -138,17 +162,16 @@ class LegacyBuildGraph(BuildGraph):
     address = target_adaptor.address
     target = self._instantiate_target(target_adaptor)
     self._target_by_address[address] = target
+    self._edges.id_of(address, canonical=True)
 
     for dependency in target_adaptor.dependencies:
-      if dependency in self._target_dependencies_by_address[address]:
+      # Link its declared dependencies, which will be indexed independently.
+      if not self._edges.add_edge(address, dependency):
         raise self.DuplicateAddressError(
           'Addresses in dependencies must be unique. '
           "'{spec}' is referenced more than once by target '{target}'."
           .format(spec=dependency.spec, target=address.spec)
         )
-      # Link its declared dependencies, which will be indexed independently.
-      self._target_dependencies_by_address[address].add(dependency)
-      self._target_dependees_by_address[dependency].add(address)
     return target
 
   def _instantiate_target(self, target_adaptor):
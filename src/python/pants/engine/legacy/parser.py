@@ -5,12 +5,14 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
 import os
 
 import six
 
 from pants.base.build_file_target_factory import BuildFileTargetFactory
 from pants.base.parse_context import ParseContext
+from pants.build_graph.build_file_aliases import DeferredSymbol
 from pants.engine.legacy.structs import BundleAdaptor, Globs, RGlobs, TargetAdaptor, ZGlobs
 from pants.engine.mapper import UnaddressableObjectError
 from pants.engine.objects import Serializable
@@ -91,6 +93,33 @@ class LegacyPythonCallbacksParser(Parser):
       for target_type in target_macro_factory.target_types:
         symbols[target_type] = Registrar(alias, underlying_symbol)
 
+    # Expose the aliases the symbol table defers loading, adding their symbols once one is used.
+    def resolve(alias):
+      resolved = symbol_table_cls.resolve_deferred_alias(alias)
+      for resolved_alias in resolved.target_types:
+        symbols[resolved_alias] = Registrar(resolved_alias,
+                                            symbol_table.get(resolved_alias, TargetAdaptor))
+      symbols.update(resolved.objects)
+      for resolved_alias, object_factory in resolved.context_aware_object_factories.items():
+        symbols[resolved_alias] = object_factory(parse_context)
+      for resolved_alias, target_macro_factory in resolved.target_macro_factories.items():
+        underlying_symbol = (Registrar(resolved_alias, symbol_table[resolved_alias])
+                             if resolved_alias in symbol_table else TargetAdaptor)
+        symbols[resolved_alias] = target_macro_factory.target_macro(parse_context)
+        for target_type in target_macro_factory.target_types:
+          symbols[target_type] = Registrar(resolved_alias, underlying_symbol)
+
+      symbol = symbols[alias]
+      if isinstance(symbol, DeferredSymbol):
+        # The backend deferring the alias turned out not to define it.
+        del symbols[alias]
+        raise NameError("name '{}' is not defined".format(alias))
+      return symbol
+
+    deferred_aliases = getattr(symbol_table_cls, 'deferred_aliases', None)
+    for alias in (deferred_aliases() if deferred_aliases else ()):
+      symbols[alias] = DeferredSymbol(alias, functools.partial(resolve, alias))
+
     # TODO: Replace builtins for paths with objects that will create wrapped PathGlobs objects.
     # The strategy for https://github.com/pantsbuild/pants/issues/3560 should account for
     # migrating these additional captured arguments to typed Sources.
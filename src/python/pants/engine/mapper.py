@@ -172,7 +172,8 @@ class AddressMapper(object):
                build_patterns=None,
                build_ignore_patterns=None,
                exclude_target_regexps=None,
-               subproject_roots=None):
+               subproject_roots=None,
+               address_map_snapshot=None):
     """Create an AddressMapper.
 
     Both the set of files that define a mappable BUILD files and the parser used to parse those
@@ -186,6 +187,9 @@ class AddressMapper(object):
                                  used to resolve addresses.
     :param list build_ignore_patterns: A list of path ignore patterns used when searching for BUILD files.
     :param list exclude_target_regexps: A list of regular expressions for excluding targets.
+    :param address_map_snapshot: If specified, a snapshot of previously parsed BUILD files to parse
+                                 through.
+    :type address_map_snapshot: :class:`pants.engine.address_map_snapshot.AddressMapSnapshot`
     """
     self.symbol_table_cls = symbol_table_cls
     self.parser_cls = parser_cls
@@ -194,6 +198,14 @@ class AddressMapper(object):
     self._exclude_target_regexps = exclude_target_regexps or []
     self.exclude_patterns = [re.compile(pattern) for pattern in self._exclude_target_regexps]
     self.subproject_roots = subproject_roots or []
+    self.address_map_snapshot = address_map_snapshot
+
+  def parse_address_map(self, filepath, filecontent):
+    """Parses the given BUILD file into an AddressMap, via the snapshot if there is one."""
+    if self.address_map_snapshot:
+      return self.address_map_snapshot.parse(filepath, filecontent, self.symbol_table_cls,
+                                             self.parser_cls)
+    return AddressMap.parse(filepath, filecontent, self.symbol_table_cls, self.parser_cls)
 
   def __eq__(self, other):
     if self is other:
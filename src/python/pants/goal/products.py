@@ -35,6 +35,8 @@ class UnionProducts(object):
     """
     # A map of target to OrderedSet of product members.
     self._products_by_target = products_by_target or defaultdict(OrderedSet)
+    # The targets whose OrderedSets are not shared with a copy, and so may be edited in place.
+    self._owned_targets = set()
 
   def copy(self):
     """Returns a copy of this UnionProducts.
@@ -43,21 +45,22 @@ class UnionProducts(object):
     The copy is shallow though, so edits to the the copy's product values will mutate the original's
     product values.
 
+    The products of each target are shared by the original and the copy until either edits them,
+    so a copy costs an entry per target rather than a copy of the products of every target.
+
     :API: public
 
     :rtype: :class:`UnionProducts`
     """
-    products_by_target = defaultdict(OrderedSet)
-    for key, value in self._products_by_target.items():
-      products_by_target[key] = OrderedSet(value)
-    return UnionProducts(products_by_target=products_by_target)
+    self._owned_targets = set()
+    return UnionProducts(products_by_target=defaultdict(OrderedSet, self._products_by_target))
 
   def add_for_target(self, target, products):
     """Updates the products for a particular target, adding to existing entries.
 
     :API: public
     """
-    self._products_by_target[target].update(products)
+    self._editable_products(target).update(products)
 
   def add_for_targets(self, targets, products):
     """Updates the products for the given targets, adding to existing entries.
@@ -73,8 +76,9 @@ class UnionProducts(object):
 
     :API: public
     """
+    target_products = self._editable_products(target)
     for product in products:
-      self._products_by_target[target].discard(product)
+      target_products.discard(product)
 
   def get_for_target(self, target):
     """Gets the products for the given target.
@@ -121,6 +125,13 @@ class UnionProducts(object):
         return target
     return None
 
+  def _editable_products(self, target):
+    """Returns the products of the given target, first copying them if they are shared."""
+    if target not in self._owned_targets:
+      self._products_by_target[target] = OrderedSet(self._products_by_target.get(target, ()))
+      self._owned_targets.add(target)
+    return self._products_by_target[target]
+
   def __str__(self):
     return "UnionProducts({})".format(self._products_by_target)
 
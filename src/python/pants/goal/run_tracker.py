@@ -132,6 +132,10 @@ class RunTracker(Subsystem):
     # Note that multiple threads may share a name (e.g., all the threads in a pool).
     self._threadlocal = threading.local()
 
+    # The current workunit of each thread that is doing work, by thread ident, for observers on
+    # other threads. Idle threads, e.g. pool threads waiting for work, have no entry.
+    self._current_workunits = {}
+
     # For main thread work. Created on start().
     self._main_root_workunit = None
 
@@ -163,8 +167,38 @@ class RunTracker(Subsystem):
     """Register the parent workunit for all work in the calling thread.
 
     Multiple threads may have the same parent (e.g., all the threads in a pool).
+
+    The thread is idle until it does work in a new workunit, or under `thread_working`.
+    """
+    self._set_current_workunit(parent_workunit, working=False)
+
+  def _set_current_workunit(self, workunit, working=True):
+    self._threadlocal.current_workunit = workunit
+    ident = threading.current_thread().ident
+    if working:
+      self._current_workunits[ident] = workunit
+    else:
+      self._current_workunits.pop(ident, None)
+
+  def _is_thread_working(self):
+    return threading.current_thread().ident in self._current_workunits
+
+  @contextmanager
+  def thread_working(self):
+    """Marks the calling thread as doing work under its current workunit for the duration.
+
+    For work that runs in a registered thread without a workunit of its own.
     """
-    self._threadlocal.current_workunit = parent_workunit
+    working = self._is_thread_working()
+    self._set_current_workunit(self._threadlocal.current_workunit)
+    try:
+      yield
+    finally:
+      self._set_current_workunit(self._threadlocal.current_workunit, working=working)
+
+  def current_workunits(self):
+    """Returns a dict from the ident of each thread doing work for this run to its workunit."""
+    return dict(self._current_workunits)
 
   def is_under_main_root(self, workunit):
     """Is the workunit running under the main thread's root."""
@@ -180,7 +214,7 @@ class RunTracker(Subsystem):
 
     self._main_root_workunit = WorkUnit(run_info_dir=self.run_info_dir, parent=None,
                                         name=RunTracker.DEFAULT_ROOT_NAME, cmd=None)
-    self.register_thread(self._main_root_workunit)
+    self._set_current_workunit(self._main_root_workunit)
     self._main_root_workunit.start()
     self.report.start_workunit(self._main_root_workunit)
 
@@ -212,13 +246,14 @@ class RunTracker(Subsystem):
     :API: public
     """
     parent = self._threadlocal.current_workunit
+    parent_working = self._is_thread_working()
     with self.new_workunit_under_parent(name, parent=parent, labels=labels, cmd=cmd,
                                         log_config=log_config) as workunit:
-      self._threadlocal.current_workunit = workunit
+      self._set_current_workunit(workunit)
       try:
         yield workunit
       finally:
-        self._threadlocal.current_workunit = parent
+        self._set_current_workunit(parent, working=parent_working)
 
   @contextmanager
   def new_workunit_under_parent(self, name, parent, labels=None, cmd='', log_config=None):
@@ -361,6 +396,8 @@ class RunTracker(Subsystem):
       pass
 
     self.end_workunit(self._main_root_workunit)
+    # All the work of the run is done.
+    self._current_workunits.clear()
 
     outcome = self._main_root_workunit.outcome()
     if self._background_root_workunit:
@@ -0,0 +1,123 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from pants.base.workunit import WorkUnitLabel
+from pants.util.dirutil import safe_mkdir, safe_open
+
+
+class SamplingProfiler(object):
+  """Periodically samples the python stacks of the threads doing work for a pants run.
+
+  Each sample of a thread is attributed to the current workunit of that thread in the RunTracker,
+  and so to the goal that workunit runs under. Threads not doing work for the run, such as those of
+  reporters or idle pool threads, are not sampled.
+
+  Samples are reported per goal in the collapsed stack format of flame graph tools, e.g.
+  https://github.com/brendangregg/FlameGraph or https://www.speedscope.app, with the names of the
+  enclosing workunits as the outermost frames of each stack.
+  """
+
+  def __init__(self, run_tracker, interval_secs):
+    """
+    :param run_tracker: The RunTracker whose threads to sample.
+    :type run_tracker: :class:`pants.goal.run_tracker.RunTracker`
+    :param float interval_secs: The time to wait between samples.
+    """
+    self._run_tracker = run_tracker
+    self._interval_secs = interval_secs
+    # Samples are counted by workunit and stack of code objects, and only formatted on report, so
+    # that taking a sample allocates little more than a tuple.
+    self._samples = Counter()
+    self._stop = threading.Event()
+    self._thread = None
+
+  def start(self):
+    """Starts sampling in a daemon thread.
+
+    The profiler must be started in the process whose threads it samples: threads do not survive
+    a fork, so a profiler started before the fork of a DaemonPantsRunner would not sample the
+    forked run.
+    """
+    self._thread = threading.Thread(target=self._run, name='sampling-profiler')
+    self._thread.daemon = True
+    self._thread.start()
+
+  def stop(self):
+    """Stops sampling, and waits for the sample in progress, if any, to be counted."""
+    self._stop.set()
+    if self._thread:
+      self._thread.join()
+
+  def _run(self):
+    ident = threading.current_thread().ident
+    # NB: Like the EmitterThread of Report, this sleeps rather than waiting on the event, which may
+    # raise spuriously on shutdown on some platforms.
+    while not self._stop.is_set():
+      self._sample(exclude_ident=ident)
+      time.sleep(self._interval_secs)
+
+  def _sample(self, exclude_ident=None):
+    workunits = self._run_tracker.current_workunits()
+    for ident, frame in sys._current_frames().items():
+      workunit = workunits.get(ident)
+      if workunit is None or ident == exclude_ident:
+        continue
+      codes = []
+      while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+      self._samples[(workunit, tuple(reversed(codes)))] += 1
+
+  @property
+  def num_samples(self):
+    return sum(self._samples.values())
+
+  def collapsed_stacks(self):
+    """Returns a dict from goal name to a Counter of the collapsed stacks sampled under that goal.
+
+    Samples not taken under a goal, e.g. while setting up the run, are attributed to the outermost
+    workunit beneath the root, e.g. 'setup'.
+    """
+    labels = {}
+
+    def label(code):
+      code_label = labels.get(code)
+      if code_label is None:
+        code_label = '{} ({}:{})'.format(code.co_name, code.co_filename,
+                                         code.co_firstlineno).replace(';', ':')
+        labels[code] = code_label
+      return code_label
+
+    stacks_by_goal = defaultdict(Counter)
+    for (workunit, codes), count in self._samples.items():
+      workunits = list(reversed(workunit.ancestors()))
+      goal = next((w for w in workunits if w.has_label(WorkUnitLabel.GOAL)), None)
+      goal_name = goal.name if goal else workunits[min(1, len(workunits) - 1)].name
+      frames = [w.name.replace(';', ':') for w in workunits] + [label(code) for code in codes]
+      stacks_by_goal[goal_name][';'.join(frames)] += count
+    return stacks_by_goal
+
+  def write(self, profile_dir):
+    """Writes the collapsed stacks sampled under each goal to `<goal>.collapsed` in a dir.
+
+    :returns: The paths of the files written.
+    """
+    safe_mkdir(profile_dir, clean=True)
+    paths = []
+    for goal_name, stacks in sorted(self.collapsed_stacks().items()):
+      path = os.path.join(profile_dir, '{}.collapsed'.format(goal_name))
+      with safe_open(path, 'w') as fp:
+        for stack, count in sorted(stacks.items()):
+          fp.write('{} {}\n'.format(stack, count).encode('utf-8'))
+      paths.append(path)
+    return paths
@@ -13,6 +13,9 @@ from twitter.common.collections import OrderedSet
 
 from pants.base.exceptions import BackendConfigurationError
 from pants.build_graph.build_configuration import BuildConfiguration
+from pants.goal.goal import Goal
+from pants.option.arg_splitter import OptionsHelp, UnknownGoalHelp
+from pants.option.scope import ScopeInfo
 
 
 class PluginLoadingError(Exception): pass
@@ -24,21 +27,181 @@ class PluginNotFound(PluginLoadingError): pass
 class PluginLoadOrderError(PluginLoadingError): pass
 
 
-def load_backends_and_plugins(plugins, working_set, backends, build_configuration=None):
+class BackendManifest(object):
+  """A static declaration of what a backend's register module provides.
+
+  A backend declares its manifest in a `manifest` module alongside its `register` module, using
+  these module-level constants (all optional):
+
+  GOALS: A dict from the name of each goal `register_goals` installs tasks in to the names of those
+    tasks.
+  INDEPENDENT_GOALS: The names of those goals whose tasks need no products from the tasks of other
+    goals.
+  BUILD_FILE_ALIASES: The aliases `build_file_aliases` registers.
+  SUBSYSTEMS: The fully qualified names of the subsystem types `global_subsystems` registers and
+    of those the types registered by `build_file_aliases` use.
+
+  The manifest module must be cheap to import: it is imported in place of the register module (and
+  all the task and target modules it imports) when backends are loaded on demand. It repeats what
+  the register module provides, so that the backend need only be loaded once one of its goals or
+  aliases is used: `pants_test.init.test_backend_manifests` checks that the two agree.
+  """
+
+  @classmethod
+  def load(cls, backend_package):
+    """Returns the manifest of the given backend package, or `None` if it does not declare one."""
+    try:
+      module = importlib.import_module(backend_package + '.manifest')
+    except ImportError:
+      return None
+    return cls(backend_package,
+               goals=getattr(module, 'GOALS', None),
+               independent_goals=getattr(module, 'INDEPENDENT_GOALS', None),
+               build_file_aliases=getattr(module, 'BUILD_FILE_ALIASES', None),
+               subsystems=getattr(module, 'SUBSYSTEMS', None))
+
+  def __init__(self, backend_package, goals=None, independent_goals=None, build_file_aliases=None,
+               subsystems=None):
+    self.backend_package = backend_package
+    self.goals = {goal: tuple(task_names) for goal, task_names in (goals or {}).items()}
+    self.independent_goals = frozenset(independent_goals or ())
+    self.build_file_aliases = frozenset(build_file_aliases or ())
+    self.subsystems = tuple(subsystems or ())
+
+  def subsystem_types(self):
+    """Imports and returns the declared subsystem types."""
+    subsystem_types = []
+    for subsystem in self.subsystems:
+      module_name, _, type_name = subsystem.rpartition('.')
+      try:
+        subsystem_types.append(getattr(importlib.import_module(module_name), type_name))
+      except (ImportError, AttributeError) as e:
+        raise BackendConfigurationError('Failed to load subsystem {} declared by the {} backend '
+                                        'manifest: {}'.format(subsystem, self.backend_package, e))
+    return subsystem_types
+
+  def scope_infos(self):
+    """Returns ScopeInfos for the options scopes of the declared tasks."""
+    return [ScopeInfo(Goal.scope(goal, task_name), ScopeInfo.TASK)
+            for goal, task_names in self.goals.items() for task_name in task_names]
+
+
+class DeferredBackends(object):
+  """Tracks the backends whose loading is deferred until one of their goals or aliases is used.
+
+  A deferred backend's BUILD file aliases are registered with the BuildConfiguration as deferred
+  aliases, which load the backend's register module when first used in a BUILD file. Its goals are
+  registered once `load_for_goals` finds they are needed, which must happen before options are
+  parsed, since each task registers options.
+
+  Backends and plugins may install tasks relative to, or in place of, the tasks of those loaded
+  before them. So every `register_goals` entrypoint is recorded in load order, and all goals are
+  re-registered in that order whenever deferred backends are loaded, as though those backends had
+  been loaded in the first place.
+  """
+
+  def __init__(self):
+    # (manifest, register_goals) for each backend and plugin in load order. The manifest is None
+    # for those loaded eagerly; register_goals is None for deferred backends until they are loaded.
+    self._entries = []
+
+  def add_loaded(self, register_goals):
+    """Records the `register_goals` entrypoint of a backend or plugin that was loaded eagerly."""
+    self._entries.append((None, register_goals))
+
+  def add_deferred(self, manifest):
+    """Records a backend whose loading is deferred."""
+    self._entries.append((manifest, None))
+
+  @property
+  def pending(self):
+    """The manifests of the deferred backends whose goals have not been registered yet."""
+    return [manifest for manifest, register_goals in self._entries
+            if manifest and not register_goals]
+
+  def scope_infos(self):
+    """Returns ScopeInfos for the options scopes of the tasks of the pending backends."""
+    return [scope_info for manifest in self.pending for scope_info in manifest.scope_infos()]
+
+  def load_for_goals(self, build_configuration, goals, scopes, help_request=None):
+    """Loads the pending backends needed to run the given goals.
+
+    Tasks of one goal may need the products of tasks in any other goal, so unless all the given
+    goals are declared independent by the deferred backends that declare them, all pending
+    backends are loaded. Help for options and goals needs all backends too.
+
+    :param BuildConfiguration build_configuration: The BuildConfiguration to load backends into.
+    :param goals: The names of the requested goals.
+    :param scopes: The options scopes set on the command line.
+    :param help_request: The HelpRequest of the run, if any.
+    """
+    pending = self.pending
+    if not pending:
+      return
+
+    goals = set(goals)
+    # Setting an option of a task needs its goal as much as requesting the goal does.
+    task_scopes = {scope_info.scope for scope_info in self.scope_infos()}
+    goals.update(scope.split('.')[0] for scope in scopes if scope in task_scopes)
+
+    manifests = [manifest for manifest, _ in self._entries if manifest]
+
+    def independent(goal):
+      declaring = [manifest for manifest in manifests if goal in manifest.goals]
+      return declaring and all(goal in manifest.independent_goals for manifest in declaring)
+
+    if isinstance(help_request, (OptionsHelp, UnknownGoalHelp)):
+      needed = pending
+    elif all(independent(goal) for goal in goals):
+      needed = [manifest for manifest in pending if goals.intersection(manifest.goals)]
+    else:
+      needed = pending
+    if needed:
+      self.load(build_configuration, needed)
+
+  def load(self, build_configuration, manifests):
+    """Loads the given deferred backends, re-registering all goals.
+
+    :param BuildConfiguration build_configuration: The BuildConfiguration to load backends into.
+    :param manifests: The manifests of the deferred backends to load.
+    """
+    backend_packages = {manifest.backend_package for manifest in manifests}
+    for index, (manifest, register_goals) in enumerate(self._entries):
+      if manifest and not register_goals and manifest.backend_package in backend_packages:
+        module = _load_register_module(manifest.backend_package)
+        for alias in manifest.build_file_aliases:
+          build_configuration.resolve_deferred_alias(alias)
+        subsystems = _invoke_entrypoint(module, 'global_subsystems')
+        if subsystems:
+          build_configuration.register_subsystems(subsystems)
+        self._entries[index] = (manifest, getattr(module, 'register_goals', lambda: None))
+
+    Goal.clear()
+    for _, register_goals in self._entries:
+      if register_goals:
+        register_goals()
+
+
+def load_backends_and_plugins(plugins, working_set, backends, build_configuration=None,
+                              deferred_backends=None):
   """Load named plugins and source backends
 
   :param list<str> plugins: Plugins to load (see `load_plugins`).  Plugins are loaded after
     backends.
   :param WorkingSet working_set: A pkg_resources.WorkingSet to load plugins from.
   :param list<str> backends: Source backends to load (see `load_build_configuration_from_source`).
+  :param DeferredBackends deferred_backends: If supplied, backends that declare a manifest are
+    deferred (see `load_build_configuration_from_source`).
   """
   build_configuration = build_configuration or BuildConfiguration()
-  load_build_configuration_from_source(build_configuration, backends)
-  load_plugins(build_configuration, plugins or [], working_set)
+  load_build_configuration_from_source(build_configuration, backends,
+                                       deferred_backends=deferred_backends)
+  load_plugins(build_configuration, plugins or [], working_set,
+               deferred_backends=deferred_backends)
   return build_configuration
 
 
-def load_plugins(build_configuration, plugins, working_set):
+def load_plugins(build_configuration, plugins, working_set, deferred_backends=None):
   """Load named plugins from the current working_set into the supplied build_configuration
 
   "Loading" a plugin here refers to calling registration methods -- it is assumed each plugin
@@ -61,6 +224,8 @@ def load_plugins(build_configuration, plugins, working_set):
   :param list<str> plugins: A list of plugin names optionally with versions, in requirement format.
                             eg ['widgetpublish', 'widgetgen==1.2'].
   :param WorkingSet working_set: A pkg_resources.WorkingSet to load plugins from.
+  :param DeferredBackends deferred_backends: If supplied, the `register_goals` entrypoints of the
+    plugins are recorded in it.
   """
   loaded = {}
   for plugin in plugins:
@@ -84,7 +249,10 @@ def load_plugins(build_configuration, plugins, working_set):
       build_configuration.register_aliases(aliases)
 
     if 'register_goals' in entries:
-      entries['register_goals'].load()()
+      register_goals = entries['register_goals'].load()
+      register_goals()
+      if deferred_backends is not None:
+        deferred_backends.add_loaded(register_goals)
 
     if 'global_subsystems' in entries:
       subsystems = entries['global_subsystems'].load()()
@@ -93,11 +261,14 @@ def load_plugins(build_configuration, plugins, working_set):
     loaded[dist.as_requirement().key] = dist
 
 
-def load_build_configuration_from_source(build_configuration, backends=None):
+def load_build_configuration_from_source(build_configuration, backends=None,
+                                         deferred_backends=None):
   """Installs pants backend packages to provide BUILD file symbols and cli goals.
 
   :param BuildConfiguration build_configuration: The BuildConfiguration (for adding aliases).
   :param backends: An optional list of additional packages to load backends from.
+  :param DeferredBackends deferred_backends: If supplied, the backends that declare a
+    `BackendManifest` are not loaded but deferred into it, and the others are recorded in it.
   :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
     the build configuration.
   """
@@ -106,7 +277,52 @@ def load_build_configuration_from_source(build_configuration, backends=None):
   # pants.core_tasks aren't really backends.
   backend_packages = OrderedSet(['pants.build_graph', 'pants.core_tasks'] + (backends or []))
   for backend_package in backend_packages:
-    load_backend(build_configuration, backend_package)
+    manifest = BackendManifest.load(backend_package) if deferred_backends is not None else None
+    if manifest:
+      defer_backend(build_configuration, manifest)
+      deferred_backends.add_deferred(manifest)
+    else:
+      register_goals = load_backend(build_configuration, backend_package)
+      if deferred_backends is not None:
+        deferred_backends.add_loaded(register_goals)
+
+
+def defer_backend(build_configuration, manifest):
+  """Installs the given backend's BUILD file aliases and subsystems without loading the backend.
+
+  The backend's register module is only imported once one of its aliases is used.
+
+  :param build_configuration the :class:``pants.build_graph.build_configuration.BuildConfiguration``
+    to install the backend's aliases and subsystems into.
+  :param BackendManifest manifest: The manifest of the backend.
+  """
+  def load_aliases():
+    return _invoke_entrypoint(_load_register_module(manifest.backend_package),
+                              'build_file_aliases')
+
+  build_configuration.register_deferred_aliases(manifest.build_file_aliases, load_aliases)
+  build_configuration.register_subsystems(manifest.subsystem_types())
+
+
+def _load_register_module(backend_package):
+  backend_module = backend_package + '.register'
+  try:
+    return importlib.import_module(backend_module)
+  except ImportError as e:
+    traceback.print_exc()
+    raise BackendConfigurationError('Failed to load the {backend} backend: {error}'
+                                    .format(backend=backend_module, error=e))
+
+
+def _invoke_entrypoint(module, name):
+  entrypoint = getattr(module, name, lambda: None)
+  try:
+    return entrypoint()
+  except TypeError as e:
+    traceback.print_exc()
+    raise BackendConfigurationError(
+        'Entrypoint {entrypoint} in {backend} must be a zero-arg callable: {error}'
+        .format(entrypoint=name, backend=module.__name__, error=e))
 
 
 def load_backend(build_configuration, backend_package):
@@ -117,31 +333,17 @@ def load_backend(build_configuration, backend_package):
   :param string backend_package: the package name containing the backend plugin register module that
     provides the plugin entrypoints.
   :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
-    the build configuration."""
-  backend_module = backend_package + '.register'
-  try:
-    module = importlib.import_module(backend_module)
-  except ImportError as e:
-    traceback.print_exc()
-    raise BackendConfigurationError('Failed to load the {backend} backend: {error}'
-                                    .format(backend=backend_module, error=e))
+    the build configuration.
+  :returns: The backend's `register_goals` entrypoint, which this call has invoked."""
+  module = _load_register_module(backend_package)
 
-  def invoke_entrypoint(name):
-    entrypoint = getattr(module, name, lambda: None)
-    try:
-      return entrypoint()
-    except TypeError as e:
-      traceback.print_exc()
-      raise BackendConfigurationError(
-          'Entrypoint {entrypoint} in {backend} must be a zero-arg callable: {error}'
-          .format(entrypoint=name, backend=backend_module, error=e))
-
-  build_file_aliases = invoke_entrypoint('build_file_aliases')
+  build_file_aliases = _invoke_entrypoint(module, 'build_file_aliases')
   if build_file_aliases:
     build_configuration.register_aliases(build_file_aliases)
 
-  subsystems = invoke_entrypoint('global_subsystems')
+  subsystems = _invoke_entrypoint(module, 'global_subsystems')
   if subsystems:
     build_configuration.register_subsystems(subsystems)
 
-  invoke_entrypoint('register_goals')
+  _invoke_entrypoint(module, 'register_goals')
+  return getattr(module, 'register_goals', lambda: None)
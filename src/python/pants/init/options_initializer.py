@@ -13,7 +13,7 @@ import pkg_resources
 from pants.base.build_environment import pants_version
 from pants.base.exceptions import BuildConfigurationError
 from pants.goal.goal import Goal
-from pants.init.extension_loader import load_backends_and_plugins
+from pants.init.extension_loader import DeferredBackends, load_backends_and_plugins
 from pants.init.plugin_resolver import PluginResolver
 from pants.logging.setup import setup_logging
 from pants.option.global_options import GlobalOptionsRegistrar
@@ -34,6 +34,9 @@ class OptionsInitializer(object):
   # Class-level cache for the `BuildConfiguration` object.
   _build_configuration = None
 
+  # Class-level cache for the backends whose loading is deferred, if `--lazy-backends` is enabled.
+  _deferred_backends = None
+
   def __init__(self, options_bootstrapper, working_set=None, exiter=sys.exit):
     """
     :param OptionsBootStrapper options_bootstrapper: An options bootstrapper instance.
@@ -57,9 +60,14 @@ class OptionsInitializer(object):
   def _set_build_configuration(cls, build_configuration):
     cls._build_configuration = build_configuration
 
+  @classmethod
+  def _set_deferred_backends(cls, deferred_backends):
+    cls._deferred_backends = deferred_backends
+
   @classmethod
   def reset(cls):
     cls._set_build_configuration(None)
+    cls._set_deferred_backends(None)
 
   def _setup_logging(self, quiet, level, log_dir):
     """Initializes logging."""
@@ -67,9 +75,13 @@ class OptionsInitializer(object):
     level = 'ERROR' if quiet else level.upper()
     setup_logging(level, console_stream=sys.stderr, log_dir=log_dir)
 
-  def _load_plugins(self, working_set, python_paths, plugins, backend_packages):
+  def _load_plugins(self, working_set, python_paths, plugins, backend_packages,
+                    deferred_backends=None):
     """Load backends and plugins.
 
+    :param DeferredBackends deferred_backends: If supplied, defer loading backends that declare a
+                                               manifest into it.
+
     :returns: A `BuildConfiguration` object constructed during backend/plugin loading.
     """
     # Add any extra paths to python path (e.g., for loading extra source backends).
@@ -79,7 +91,8 @@ class OptionsInitializer(object):
         pkg_resources.fixup_namespace_packages(path)
 
     # Load plugins and backends.
-    return load_backends_and_plugins(plugins, working_set, backend_packages)
+    return load_backends_and_plugins(plugins, working_set, backend_packages,
+                                     deferred_backends=deferred_backends)
 
   def _register_options(self, subsystems, options):
     """Registers global options."""
@@ -95,10 +108,10 @@ class OptionsInitializer(object):
       # Register task options.
       goal.register_options(options)
 
-  def _install_options(self, options_bootstrapper, build_configuration):
-    """Parse and register options.
+  def _known_scopes(self, build_configuration):
+    """Gathers the subsystems and known scopes of the loaded backends and plugins.
 
-    :returns: An Options object representing the full set of runtime options.
+    :returns: A tuple of (subsystems, known_scope_infos).
     """
     # TODO: This inline import is currently necessary to resolve a ~legitimate cycle between
     # `GoalRunner`->`EngineInitializer`->`OptionsInitializer`->`GoalRunner`.
@@ -118,6 +131,30 @@ class OptionsInitializer(object):
     for goal in Goal.all():
       known_scope_infos.extend(filter(None, goal.known_scope_infos()))
 
+    return subsystems, known_scope_infos
+
+  def _load_deferred_backends(self, options_bootstrapper, build_configuration, deferred_backends):
+    """Loads the deferred backends needed by the goals and task options on the command line."""
+    if not deferred_backends.pending:
+      return
+
+    # The deferred backends' goals and tasks must be known scopes for the command line to be split
+    # into goals, options and targets the same way as when all the backends are loaded.
+    _, known_scope_infos = self._known_scopes(build_configuration)
+    known_scope_infos.extend(deferred_backends.scope_infos())
+    options = options_bootstrapper.get_full_options(known_scope_infos)
+    deferred_backends.load_for_goals(build_configuration,
+                                     goals=options.goals,
+                                     scopes=options.scope_to_flags.keys(),
+                                     help_request=options.help_request)
+
+  def _install_options(self, options_bootstrapper, build_configuration):
+    """Parse and register options.
+
+    :returns: An Options object representing the full set of runtime options.
+    """
+    subsystems, known_scope_infos = self._known_scopes(build_configuration)
+
     # Now that we have the known scopes we can get the full options.
     options = options_bootstrapper.get_full_options(known_scope_infos)
     self._register_options(subsystems, options)
@@ -149,14 +186,22 @@ class OptionsInitializer(object):
 
     # Conditionally load backends/plugins and materialize a `BuildConfiguration` object.
     if not self._has_build_configuration():
+      if global_bootstrap_options.lazy_backends and not global_bootstrap_options.enable_pantsd:
+        self._set_deferred_backends(DeferredBackends())
       build_configuration = self._load_plugins(self._working_set,
                                                global_bootstrap_options.pythonpath,
                                                global_bootstrap_options.plugins,
-                                               global_bootstrap_options.backend_packages)
+                                               global_bootstrap_options.backend_packages,
+                                               deferred_backends=self._deferred_backends)
       self._set_build_configuration(build_configuration)
     else:
       build_configuration = self._get_build_configuration()
 
+    # Load any deferred backends this run's goals need before their tasks' options are registered.
+    if self._deferred_backends is not None:
+      self._load_deferred_backends(self._options_bootstrapper, build_configuration,
+                                   self._deferred_backends)
+
     # Parse and register options.
     options = self._install_options(self._options_bootstrapper, build_configuration)
 
@@ -9,6 +9,7 @@ import logging
 import os
 
 from pants.base.build_environment import get_buildroot
+from pants.engine.address_map_snapshot import AddressMapSnapshot
 from pants.engine.subsystem.native import Native
 from pants.init.target_roots import TargetRoots
 from pants.init.util import clean_global_runtime_state
@@ -18,7 +19,7 @@ from pants.pantsd.service.pailgun_service import PailgunService
 from pants.pantsd.service.scheduler_service import SchedulerService
 from pants.pantsd.subsystem.subprocess import Subprocess
 from pants.pantsd.subsystem.watchman_launcher import WatchmanLauncher
-from pants.process.lock import OwnerPrintingInterProcessFileLock
+from pants.process.lock import OwnerPrintingInterProcessFileLock, SharedExclusiveFileLock
 from pants.subsystem.subsystem import Subsystem
 from pants.util.memo import testable_memoized_property
 
@@ -43,6 +44,12 @@ class PantsDaemonLauncher(object):
                help='Whether or not to use filesystem event detection.')
       register('--fs-event-workers', advanced=True, type=int, default=4,
                help='The number of workers to use for the filesystem event service executor pool.')
+      register('--read-only-goals', advanced=True, type=list,
+               default=['cloc', 'dependees', 'dependencies', 'depmap', 'filedeps', 'filemap',
+                        'filter', 'goals', 'list', 'list-owners', 'minimize', 'options', 'path',
+                        'pathdeps', 'paths', 'sort', 'targets'],
+               help='Goals that do not modify the workdir. Pantsd runs of only these goals run '
+                    'concurrently with one another, while runs of any other goal run exclusively.')
 
     @classmethod
     def subsystem_dependencies(cls):
@@ -67,7 +74,8 @@ class PantsDaemonLauncher(object):
                                  pants_ignore_patterns=options.pants_ignore,
                                  build_ignore_patterns=options.build_ignore,
                                  exclude_target_regexp=options.exclude_target_regexp,
-                                 subproject_roots=options.subproject_roots)
+                                 subproject_roots=options.subproject_roots,
+                                 read_only_goals=options.read_only_goals)
 
   def __init__(self,
                build_root,
@@ -81,7 +89,8 @@ class PantsDaemonLauncher(object):
                pants_ignore_patterns,
                build_ignore_patterns,
                exclude_target_regexp,
-               subproject_roots):
+               subproject_roots,
+               read_only_goals=None):
     """
     :param str build_root: The path of the build root.
     :param str pants_workdir: The path of the pants workdir.
@@ -95,7 +104,7 @@ class PantsDaemonLauncher(object):
     :param list build_ignore_patterns: A list of path ignore patterns for BUILD file parsing.
     :param list exclude_target_regexp: A list of target exclude regexps.
     :param list subproject_roots: A list of subproject roots.
-
+    :param list read_only_goals: A list of the goals that do not modify the workdir.
     """
     self._build_root = build_root
     self._pants_workdir = pants_workdir
@@ -109,6 +118,7 @@ class PantsDaemonLauncher(object):
     self._build_ignore_patterns = build_ignore_patterns
     self._exclude_target_regexp = exclude_target_regexp
     self._subproject_roots = subproject_roots
+    self._read_only_goals = frozenset(read_only_goals or ())
     self._native = Native.Factory.global_instance().create()
     # TODO(kwlzn): Thread filesystem path ignores here to Watchman's subscription registration.
 
@@ -125,6 +135,19 @@ class PantsDaemonLauncher(object):
   def watchman_launcher(self):
     return WatchmanLauncher.Factory.global_instance().create()
 
+  def run_lock(self, goals):
+    """Returns a contextmanager to hold for the duration of a pantsd run of the given goals.
+
+    Runs of only read-only goals hold the lock shared, and so run concurrently with one another,
+    while runs of any other goal hold it exclusively.
+
+    :param list goals: The names of the goals requested for the run.
+    """
+    lock = SharedExclusiveFileLock(os.path.join(self._pants_workdir, 'pantsd', 'run.lock'))
+    if goals and all(goal in self._read_only_goals for goal in goals):
+      return lock.shared()
+    return lock.exclusive()
+
   def _setup_services(self, watchman):
     """Initialize pantsd services.
 
@@ -139,6 +162,10 @@ class PantsDaemonLauncher(object):
 
     fs_event_service = FSEventService(watchman, self._build_root, self._fs_event_workers)
 
+    # Persist parsed BUILD files across daemon restarts, so that a restarted daemon need only
+    # re-parse those that have changed.
+    address_map_snapshot = AddressMapSnapshot(
+      os.path.join(self._pants_workdir, 'pantsd', 'address_maps.pickle'), self._build_root)
     legacy_graph_helper = self._engine_initializer.setup_legacy_graph(
       self._pants_ignore_patterns,
       self._pants_workdir,
@@ -146,8 +173,10 @@ class PantsDaemonLauncher(object):
       build_ignore_patterns=self._build_ignore_patterns,
       exclude_target_regexps=self._exclude_target_regexp,
       subproject_roots=self._subproject_roots,
+      address_map_snapshot=address_map_snapshot,
     )
-    scheduler_service = SchedulerService(fs_event_service, legacy_graph_helper)
+    scheduler_service = SchedulerService(fs_event_service, legacy_graph_helper,
+                                         address_map_snapshot=address_map_snapshot)
     services.extend((fs_event_service, scheduler_service))
 
     pailgun_service = PailgunService(bind_addr=(self._pailgun_host, self._pailgun_port),
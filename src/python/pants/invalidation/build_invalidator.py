@@ -8,12 +8,20 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import errno
 import hashlib
 import os
+import sqlite3
+import threading
+from abc import abstractmethod
 from collections import namedtuple
 
+from pants.base.build_environment import get_buildroot
 from pants.base.hash_utils import hash_all
 from pants.build_graph.target import Target
 from pants.fs.fs import safe_filename
-from pants.util.dirutil import safe_mkdir
+from pants.source.file_digests import FileDigestCache
+from pants.source.payload_fields import SourcesField
+from pants.source.wrapped_globs import LazyFilesetWithSpec
+from pants.util.dirutil import safe_mkdir, safe_mkdir_for, safe_rmtree
+from pants.util.meta import AbstractClass
 
 
 # A CacheKey represents some version of a set of targets.
@@ -62,6 +70,25 @@ class CacheKeyGenerator(object):
       hasher.update(base_fingerprint_input)
     self._base_hasher = hasher
 
+  def prefetch_source_digests(self, targets, transitive=False):
+    """Digests the sources of the given targets in one parallel batch.
+
+    Otherwise the sources of each target are digested one file at a time, as the target is first
+    fingerprinted by `key_for_target`.
+
+    :targets: The targets that are about to have CacheKeys created for them.
+    :transitive: Whether the CacheKeys will include fingerprints of the targets' dependencies.
+    """
+    if transitive:
+      targets = Target.closure_for_targets(targets)
+    paths = set()
+    for target in targets:
+      for _, field in target.payload.fields:
+        # Eager filesets come with a precomputed hash, so only lazy ones need their files digested.
+        if isinstance(field, SourcesField) and isinstance(field.sources, LazyFilesetWithSpec):
+          paths.update(os.path.join(get_buildroot(), path) for path in field.relative_to_buildroot())
+    FileDigestCache.global_instance().digest_many(paths)
+
   def key_for_target(self, target, transitive=False, fingerprint_strategy=None):
     """Get a key representing the given target and its sources.
 
@@ -87,15 +114,185 @@ class CacheKeyGenerator(object):
       return None
 
 
+class InvalidatorStore(AbstractClass):
+  """Persistent storage for a BuildInvalidator: a map from target set id to cache key hash."""
+
+  @abstractmethod
+  def get_many(self, ids):
+    """Returns a list of the stored hashes for the given ids, or None for ids with no hash."""
+
+  @abstractmethod
+  def put_many(self, id_hash_pairs):
+    """Atomically stores the given (id, hash) pairs."""
+
+  @abstractmethod
+  def delete(self, id):
+    """Removes the hash stored for the given id, if any."""
+
+  @abstractmethod
+  def clear(self):
+    """Removes all stored hashes."""
+
+
+class DirectoryInvalidatorStore(InvalidatorStore):
+  """Stores each hash in a `<id>.hash` file of its own under a directory."""
+
+  _EXTENSION = '.hash'
+
+  def __init__(self, root):
+    self._root = root
+    safe_mkdir(self._root)
+
+  def get_many(self, ids):
+    return [self._read_sha_by_id(id) for id in ids]
+
+  def put_many(self, id_hash_pairs):
+    # NB: Each file is written atomically, but the batch as a whole is not.
+    for id, hash in id_hash_pairs:
+      with open(self._sha_file_by_id(id), 'w') as fd:
+        fd.write(hash)
+
+  def delete(self, id):
+    try:
+      os.unlink(self._sha_file_by_id(id))
+    except OSError as e:
+      if e.errno != errno.ENOENT:
+        raise
+
+  def clear(self):
+    safe_mkdir(self._root, clean=True)
+
+  def _sha_file_by_id(self, id):
+    return os.path.join(self._root, safe_filename(id, extension=self._EXTENSION))
+
+  def _read_sha_by_id(self, id):
+    try:
+      with open(self._sha_file_by_id(id), 'rb') as fd:
+        return fd.read().strip()
+    except IOError as e:
+      if e.errno != errno.ENOENT:
+        raise
+      return None  # File doesn't exist.
+
+
+class SqliteInvalidatorStore(InvalidatorStore):
+  """Stores all hashes in a single sqlite database file.
+
+  On first use, any hashes found in a legacy DirectoryInvalidatorStore layout are imported, and
+  the legacy directory is removed once they are all confirmed to be stored.
+  """
+
+  # The largest number of ids to look up by key in one statement: this stays well below sqlite's
+  # default limit of 999 host parameters per statement.
+  _BATCH_SIZE = 500
+
+  def __init__(self, path, legacy_root=None):
+    self._path = path
+    self._legacy_root = legacy_root
+    # Versioned targets may be updated from worker threads: the connection is shared between them,
+    # and this lock serializes its use.
+    self._lock = threading.Lock()
+    self._conn = None
+
+  @property
+  def _connection(self):
+    if self._conn is None:
+      safe_mkdir_for(self._path)
+      db_mtime = os.path.getmtime(self._path) if os.path.exists(self._path) else None
+      conn = sqlite3.connect(self._path, timeout=60, check_same_thread=False)
+      with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS hashes (id TEXT PRIMARY KEY, hash TEXT NOT NULL)')
+      self._conn = conn
+      self._import_legacy_layout(db_mtime)
+    return self._conn
+
+  def _import_legacy_layout(self, db_mtime):
+    """Imports the hashes of the legacy layout, if any, and then removes it.
+
+    :param float db_mtime: The last modification time of the database before it was opened, or
+                           None if it did not exist.
+    """
+    if not self._legacy_root or not os.path.isdir(self._legacy_root):
+      return
+    newer_pairs, older_pairs = [], []
+    for filename in os.listdir(self._legacy_root):
+      # NB: Ids that were too long for a filename were hashed by `safe_filename` and can't be
+      # recovered: the targets they identify will be invalidated once.
+      id, ext = os.path.splitext(filename)
+      if ext == DirectoryInvalidatorStore._EXTENSION:
+        path = os.path.join(self._legacy_root, filename)
+        with open(path, 'rb') as fd:
+          pair = (id, fd.read().strip())
+        # A hash file written after the database was last modified (e.g. because the `directory`
+        # store was used in the meantime) supersedes the row for its id: otherwise the row wins.
+        if db_mtime is None or os.path.getmtime(path) > db_mtime:
+          newer_pairs.append(pair)
+        else:
+          older_pairs.append(pair)
+    with self._conn:
+      self._conn.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?)', newer_pairs)
+      self._conn.executemany('INSERT OR IGNORE INTO hashes VALUES (?, ?)', older_pairs)
+
+    ids = [id for id, _ in newer_pairs + older_pairs]
+    stored = 0
+    for i in range(0, len(ids), self._BATCH_SIZE):
+      batch = ids[i:i + self._BATCH_SIZE]
+      query = 'SELECT COUNT(*) FROM hashes WHERE id IN ({})'.format(','.join('?' * len(batch)))
+      stored += self._conn.execute(query, batch).fetchone()[0]
+    if stored == len(ids):
+      safe_rmtree(self._legacy_root)
+
+  def get_many(self, ids):
+    with self._lock:
+      conn = self._connection
+      if len(ids) > self._BATCH_SIZE:
+        # For large batches, a single scan of the table beats many indexed lookups.
+        found = dict(conn.execute('SELECT id, hash FROM hashes'))
+      else:
+        query = 'SELECT id, hash FROM hashes WHERE id IN ({})'.format(','.join('?' * len(ids)))
+        found = dict(conn.execute(query, ids))
+    return [found.get(id) for id in ids]
+
+  def put_many(self, id_hash_pairs):
+    with self._lock:
+      with self._connection as conn:
+        conn.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?)', id_hash_pairs)
+
+  def delete(self, id):
+    with self._lock:
+      with self._connection as conn:
+        conn.execute('DELETE FROM hashes WHERE id = ?', (id,))
+
+  def clear(self):
+    with self._lock:
+      with self._connection as conn:
+        conn.execute('DELETE FROM hashes')
+
+
 # A persistent map from target set to cache key, which is a fingerprint of all
 # the inputs to the current version of that target set. That cache key can then be used
 # to look up build artifacts in an artifact cache.
 class BuildInvalidator(object):
   """Invalidates build targets based on the SHA1 hash of source files and other inputs."""
 
-  def __init__(self, root):
-    self._root = os.path.join(root, GLOBAL_CACHE_KEY_GEN_VERSION)
-    safe_mkdir(self._root)
+  DIRECTORY_STORE = 'directory'
+  SQLITE_STORE = 'sqlite'
+  STORES = (DIRECTORY_STORE, SQLITE_STORE)
+
+  def __init__(self, root, store=DIRECTORY_STORE):
+    """
+    :param string root: The directory under which to persist cache keys.
+    :param string store: One of `STORES`: `directory` persists one file per target set, and
+                         `sqlite` persists all target sets in a single database file.
+    """
+    root = os.path.join(root, GLOBAL_CACHE_KEY_GEN_VERSION)
+    if store == self.SQLITE_STORE:
+      self._store = SqliteInvalidatorStore('{}.db'.format(root), legacy_root=root)
+    elif store == self.DIRECTORY_STORE:
+      self._store = DirectoryInvalidatorStore(root)
+    else:
+      raise ValueError('Unknown build invalidator store {!r}: must be one of {}'
+                       .format(store, self.STORES))
 
   def previous_key(self, cache_key):
     """If there was a previous successful build for the given key, return the previous key.
@@ -103,10 +300,13 @@ class BuildInvalidator(object):
     :param cache_key: A CacheKey object (as returned by CacheKeyGenerator.key_for().
     :returns: The previous cache_key, or None if there was not a previous build.
     """
-    previous_hash = self._read_sha(cache_key)
-    if not previous_hash:
-      return None
-    return CacheKey(cache_key.id, previous_hash)
+    return self.previous_keys([cache_key])[0]
+
+  def previous_keys(self, cache_keys):
+    """Returns the previous key for each of the given keys, as for `previous_key`."""
+    previous_hashes = self._store.get_many([cache_key.id for cache_key in cache_keys])
+    return [CacheKey(cache_key.id, previous_hash) if previous_hash else None
+            for cache_key, previous_hash in zip(cache_keys, previous_hashes)]
 
   def needs_update(self, cache_key):
     """Check if the given cached item is invalid.
@@ -114,45 +314,32 @@ class BuildInvalidator(object):
     :param cache_key: A CacheKey object (as returned by CacheKeyGenerator.key_for().
     :returns: True if the cached version of the item is out of date.
     """
-    return self._read_sha(cache_key) != cache_key.hash
+    return self.needs_update_many([cache_key])[0]
+
+  def needs_update_many(self, cache_keys):
+    """Returns a list of booleans indicating, for each of the given keys, whether it is invalid."""
+    previous_hashes = self._store.get_many([cache_key.id for cache_key in cache_keys])
+    return [previous_hash != cache_key.hash
+            for cache_key, previous_hash in zip(cache_keys, previous_hashes)]
 
   def update(self, cache_key):
     """Makes cache_key the valid version of the corresponding target set.
 
     :param cache_key: A CacheKey object (typically returned by CacheKeyGenerator.key_for()).
     """
-    self._write_sha(cache_key)
+    self.update_many([cache_key])
+
+  def update_many(self, cache_keys):
+    """Makes each of the given keys the valid version of its target set.
+
+    For stores that support it (e.g. `sqlite`), all of the keys are committed atomically.
+    """
+    self._store.put_many([(cache_key.id, cache_key.hash) for cache_key in cache_keys])
 
   def force_invalidate_all(self):
     """Force-invalidates all cached items."""
-    safe_mkdir(self._root, clean=True)
+    self._store.clear()
 
   def force_invalidate(self, cache_key):
     """Force-invalidate the cached item."""
-    try:
-      os.unlink(self._sha_file(cache_key))
-    except OSError as e:
-      if e.errno != errno.ENOENT:
-        raise
-
-  def _sha_file(self, cache_key):
-    return self._sha_file_by_id(cache_key.id)
-
-  def _sha_file_by_id(self, id):
-    return os.path.join(self._root, safe_filename(id, extension='.hash'))
-
-  def _write_sha(self, cache_key):
-    with open(self._sha_file(cache_key), 'w') as fd:
-      fd.write(cache_key.hash)
-
-  def _read_sha(self, cache_key):
-    return self._read_sha_by_id(cache_key.id)
-
-  def _read_sha_by_id(self, id):
-    try:
-      with open(self._sha_file_by_id(id), 'rb') as fd:
-        return fd.read().strip()
-    except IOError as e:
-      if e.errno != errno.ENOENT:
-        raise
-      return None  # File doesn't exist.
+    self._store.delete(cache_key.id)
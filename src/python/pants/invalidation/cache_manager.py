@@ -10,6 +10,8 @@ import shutil
 import sys
 from hashlib import sha1
 
+from twitter.common.collections import OrderedSet
+
 from pants.build_graph.build_graph import sort_targets
 from pants.build_graph.target import Target
 from pants.invalidation.build_invalidator import BuildInvalidator, CacheKeyGenerator
@@ -251,7 +253,8 @@ class InvalidationCacheManager(object):
                invalidation_report=None,
                task_name=None,
                task_version=None,
-               artifact_write_callback=lambda _: None):
+               artifact_write_callback=lambda _: None,
+               build_invalidator_store=BuildInvalidator.DIRECTORY_STORE):
     """
     :API: public
     """
@@ -259,7 +262,9 @@ class InvalidationCacheManager(object):
     self._task_name = task_name or 'UNKNOWN'
     self._task_version = task_version or 'Unknown_0'
     self._invalidate_dependents = invalidate_dependents
-    self._invalidator = BuildInvalidator(build_invalidator_dir)
+    self._invalidator = BuildInvalidator(build_invalidator_dir, store=build_invalidator_store)
+    # Previous keys looked up in batch by `wrap_targets`, pending their use by `previous_key`.
+    self._prefetched_previous_keys = {}
     self._fingerprint_strategy = fingerprint_strategy
     self._artifact_write_callback = artifact_write_callback
     self.invalidation_report = invalidation_report
@@ -275,15 +280,25 @@ class InvalidationCacheManager(object):
 
   def update(self, vts):
     """Mark a changed or invalidated VersionedTargetSet as successfully processed."""
-    for vt in vts.versioned_targets:
-      vt.ensure_legal()
-      if not vt.valid:
-        self._invalidator.update(vt.cache_key)
-        vt.valid = True
-        self._artifact_write_callback(vt)
-    if not vts.valid:
-      vts.ensure_legal()
-      self._invalidator.update(vts.cache_key)
+    self.update_many([vts])
+
+  def update_many(self, vts_list):
+    """Mark many changed or invalidated VersionedTargetSets as successfully processed.
+
+    The new versions of all of the sets are persisted together, in a single batch.
+    """
+    updated = OrderedSet()
+    for vts in vts_list:
+      for vt in vts.versioned_targets:
+        vt.ensure_legal()
+        if not vt.valid:
+          updated.add(vt)
+      if not vts.valid:
+        vts.ensure_legal()
+        updated.add(vts)
+
+    self._invalidator.update_many([vts.cache_key for vts in updated])
+    for vts in updated:
       vts.valid = True
       self._artifact_write_callback(vts)
 
@@ -343,13 +358,23 @@ class InvalidationCacheManager(object):
         sorted_targets = [t for t in reversed(sort_targets(targets)) if t in target_set]
       else:
         sorted_targets = sorted(targets)
-      for target in sorted_targets:
-        target_key = self._key_for(target)
-        if target_key is not None:
+      self._cache_key_generator.prefetch_source_digests(sorted_targets,
+                                                        transitive=self._invalidate_dependents)
+      keyed_targets = [(target, self._key_for(target)) for target in sorted_targets]
+      keyed_targets = [(target, key) for target, key in keyed_targets if key is not None]
+      # Look up all previous keys in one batch, rather than once per VersionedTarget.
+      keys = [key for _, key in keyed_targets]
+      self._prefetched_previous_keys = dict(zip(keys, self._invalidator.previous_keys(keys)))
+      try:
+        for target, target_key in keyed_targets:
           yield VersionedTarget(self, target, target_key)
+      finally:
+        self._prefetched_previous_keys = {}
     return list(vt_iter())
 
   def previous_key(self, cache_key):
+    if cache_key in self._prefetched_previous_keys:
+      return self._prefetched_previous_keys.pop(cache_key)
     return self._invalidator.previous_key(cache_key)
 
   def _key_for(self, target):
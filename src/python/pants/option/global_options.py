@@ -77,6 +77,11 @@ class GlobalOptionsRegistrar(Optionable):
              help='Load backends from these packages that are already on the path. '
                   'Add contrib and custom backends to this list.')
 
+    register('--lazy-backends', advanced=True, type=bool, default=False,
+             help='Load the backends that declare a manifest only when one of their goals is '
+                  'requested or one of their BUILD file aliases is used. Ignored when pantsd is '
+                  'enabled, as the daemon only loads backends once.')
+
     register('--pants-bootstrapdir', advanced=True, metavar='<dir>', default=get_pants_cachedir(),
              help='Use this dir for global cache.')
     register('--pants-configdir', advanced=True, metavar='<dir>', default=get_pants_configdir(),
@@ -183,6 +188,12 @@ class GlobalOptionsRegistrar(Optionable):
                   'to process the non-erroneous subset of the input.')
     register('--cache-key-gen-version', advanced=True, default='200', recursive=True,
              help='The cache key generation. Bump this to invalidate every artifact for a scope.')
+    register('--build-invalidator-store', advanced=True, choices=['directory', 'sqlite'],
+             default='directory',
+             help='How tasks persist the versions of the targets they have processed. directory: '
+                  'one file per target. sqlite: a single database file per task, which is '
+                  'faster to check for large numbers of targets. Switching to sqlite imports '
+                  'the existing per-target files.')
     register('--workdir-max-build-entries', advanced=True, type=int, default=None,
              help='Maximum number of previous builds to keep per task target pair in workdir. '
              'If set, minimum 2 will always be kept to support incremental compilation.')
@@ -191,6 +202,10 @@ class GlobalOptionsRegistrar(Optionable):
              'the command up into multiple invocations.')
     register('--print-exception-stacktrace', advanced=True, type=bool,
              help='Print to console the full exception stack trace if encountered.')
+    register('--sampling-profiler-rate', advanced=True, type=int, default=0,
+             help='Sample the python stacks of the threads doing work for the run this many times '
+                  'a second, and write them per goal in the collapsed stack format of flame graph '
+                  'tools under the run info dir of the run. Sampling is off if this is 0.')
     register('--build-file-rev', advanced=True,
              removal_hint='Lightly used feature, scheduled for removal.', removal_version='1.5.0.dev0',
              help='Read BUILD files from this scm rev instead of from the working tree.  This is '
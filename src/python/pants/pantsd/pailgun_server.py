@@ -7,7 +7,10 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import logging
 import socket
+import threading
+import time
 import traceback
+from collections import defaultdict
 
 from six.moves.socketserver import BaseRequestHandler, BaseServer, TCPServer
 
@@ -55,7 +58,10 @@ class PailgunHandler(PailgunHandlerBase):
   def _run_pants(self, sock, arguments, environment):
     """Execute a given run with a pants runner."""
     runner = self.server.runner_factory(sock, arguments, environment)
-    runner.run()
+    # N.B. Only the fork() itself is guarded by the context lock, so that requests are otherwise
+    # handled concurrently.
+    with self.server.context_lock():
+      runner.run()
 
   def handle(self):
     """Request handler for a single Pailgun request."""
@@ -87,8 +93,34 @@ class PailgunHandler(PailgunHandlerBase):
     NailgunProtocol.write_chunk(self.request, ChunkType.EXIT, '1')
 
 
+class LatencyHistogram(object):
+  """A thread-safe histogram of latencies, bucketed by powers of two milliseconds."""
+
+  def __init__(self):
+    self._counts = defaultdict(int)
+    self._lock = threading.Lock()
+
+  def record(self, secs):
+    """Records a latency, in seconds."""
+    bucket_ms = 1
+    while bucket_ms < secs * 1000:
+      bucket_ms *= 2
+    with self._lock:
+      self._counts[bucket_ms] += 1
+
+  def __str__(self):
+    with self._lock:
+      counts = sorted(self._counts.items())
+    return ', '.join('<={}ms: {}'.format(bucket_ms, count) for bucket_ms, count in counts)
+
+
 class PailgunServer(TCPServer):
-  """A (forking) pants nailgun server."""
+  """A (forking) pants nailgun server.
+
+  Each request is handled in its own thread, so that a slow client does not hold up the others.
+  Handling a request ends in a fork() of the run that it requests, under the context lock, and so
+  runs are concurrent.
+  """
 
   def __init__(self, server_address, runner_factory, context_lock,
                handler_class=None, bind_and_activate=True):
@@ -98,7 +130,7 @@ class PailgunServer(TCPServer):
 
     :param tuple server_address: An address tuple of (hostname, port) for socket.bind().
     :param class runner_factory: A factory function for creating a DaemonPantsRunner for each run.
-    :param func context_lock: A contextmgr that will be used as a lock during request handling/forking.
+    :param func context_lock: A contextmgr that will be used as a lock around each run's fork().
     :param class handler_class: The request handler class to use for each request. (Optional)
     :param bool bind_and_activate: If True, binds and activates networking at __init__ time.
                                    (Optional)
@@ -107,9 +139,11 @@ class PailgunServer(TCPServer):
     BaseServer.__init__(self, server_address, handler_class or PailgunHandler)
     self.socket = RecvBufferedSocket(socket.socket(self.address_family, self.socket_type))
     self.runner_factory = runner_factory
+    self._logger = logging.getLogger(__name__)
     self.allow_reuse_address = True           # Allow quick reuse of TCP_WAIT sockets.
     self.server_port = None                   # Set during server_bind() once the port is bound.
-    self._context_lock = context_lock
+    self.context_lock = context_lock
+    self.latencies = LatencyHistogram()
 
     if bind_and_activate:
       try:
@@ -125,15 +159,31 @@ class PailgunServer(TCPServer):
     _, self.server_port = self.socket.getsockname()[:2]
 
   def process_request(self, request, client_address):
-    """Override of TCPServer.process_request() that provides for forking request handlers and
-    delegates error handling to the request handler."""
+    """Override of TCPServer.process_request() that handles each request in a new thread."""
+    thread = threading.Thread(target=self.process_request_thread, args=(request, client_address))
+    thread.daemon = True
+    thread.start()
+    return thread
+
+  def process_request_thread(self, request, client_address):
+    """Handles a request with a forking request handler, delegating error handling to it."""
+    start = time.time()
+    try:
+      self._process_request(request, client_address)
+    finally:
+      # N.B. Only the daemon side of the fork() returns here.
+      latency = time.time() - start
+      self.latencies.record(latency)
+      self._logger.info('handled pailgun request in {:.3f}s. request latencies: {}'
+                        .format(latency, self.latencies))
+
+  def _process_request(self, request, client_address):
     # Instantiate the request handler.
     handler = self.RequestHandlerClass(request, client_address, self)
 
     try:
-      # Attempt to handle a request with the handler under the context_lock.
-      with self._context_lock():
-        handler.handle_request()
+      # Attempt to handle a request with the handler.
+      handler.handle_request()
     except Exception as e:
       # If that fails, (synchronously) handle the error with the error handler sans-fork.
       try:
@@ -66,8 +66,10 @@ class PailgunService(PantsService):
         try:
           self._logger.debug('warming the product graph via %s', self._scheduler_service)
           # N.B. This call is made in the pre-fork daemon context for reach and reuse of the
-          # resident scheduler.
-          graph_helper = self._scheduler_service.warm_product_graph(target_roots)
+          # resident scheduler. Requests are handled concurrently, so warming is serialized under
+          # the scheduler lock.
+          with self._scheduler_service.locked():
+            graph_helper = self._scheduler_service.warm_product_graph(target_roots)
         except Exception:
           deferred_exc = sys.exc_info()
           self._logger.warning(
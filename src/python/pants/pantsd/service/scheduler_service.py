@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import logging
 import Queue
+import time
 
 from pants.pantsd.service.pants_service import PantsService
 
@@ -19,17 +20,24 @@ class SchedulerService(PantsService):
   in memory.
   """
 
-  def __init__(self, fs_event_service, legacy_graph_helper):
+  # The minimum interval between saves of the BUILD file snapshot, in seconds.
+  _SNAPSHOT_INTERVAL_SECS = 30
+
+  def __init__(self, fs_event_service, legacy_graph_helper, address_map_snapshot=None):
     """
     :param FSEventService fs_event_service: An unstarted FSEventService instance for setting up
                                             filesystem event handlers.
     :param LegacyGraphHelper legacy_graph_helper: The LegacyGraphHelper instance for graph
                                                   construction.
+    :param AddressMapSnapshot address_map_snapshot: If specified, the snapshot of parsed BUILD
+                                                    files to periodically save.
     """
     super(SchedulerService, self).__init__()
     self._fs_event_service = fs_event_service
     self._graph_helper = legacy_graph_helper
     self._scheduler = legacy_graph_helper.scheduler
+    self._address_map_snapshot = address_map_snapshot
+    self._snapshot_saved_at = time.time()
 
     self._logger = logging.getLogger(__name__)
     self._event_queue = Queue.Queue(maxsize=64)
@@ -97,7 +105,18 @@ class SchedulerService(PantsService):
     self._graph_helper.warm_product_graph(spec_roots)
     return self._graph_helper
 
+  def _maybe_save_snapshot(self, force=False):
+    """Saves the BUILD file snapshot if it has changed, at most once per interval unless forced."""
+    if not self._address_map_snapshot or not self._address_map_snapshot.dirty:
+      return
+    now = time.time()
+    if force or now - self._snapshot_saved_at >= self._SNAPSHOT_INTERVAL_SECS:
+      self._address_map_snapshot.save()
+      self._snapshot_saved_at = now
+
   def run(self):
     """Main service entrypoint."""
     while not self.is_killed:
       self._process_event_queue()
+      self._maybe_save_snapshot()
+    self._maybe_save_snapshot(force=True)
@@ -6,14 +6,16 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import errno
+import fcntl
 import logging
 import os
 import sys
+from contextlib import contextmanager
 
 import psutil
 from fasteners import InterProcessLock
 
-from pants.util.dirutil import safe_delete
+from pants.util.dirutil import safe_delete, safe_mkdir_for
 
 
 logger = logging.getLogger(__name__)
@@ -62,3 +64,44 @@ class OwnerPrintingInterProcessFileLock(InterProcessLock):
     if self.acquired:
       safe_delete(self.message_path)
     return super(OwnerPrintingInterProcessFileLock, self).release()
+
+
+class SharedExclusiveFileLock(object):
+  """An inter-process readers-writer lock on a file.
+
+  Any number of processes may hold the lock shared at once, while a process holding it exclusively
+  excludes all others. The lock is released if its holder dies.
+  """
+
+  def __init__(self, path):
+    self.path = path
+
+  @contextmanager
+  def shared(self, message_fn=print_to_stderr):
+    """A contextmanager that holds the lock shared for its duration."""
+    with self._locked(fcntl.LOCK_SH, message_fn):
+      yield
+
+  @contextmanager
+  def exclusive(self, message_fn=print_to_stderr):
+    """A contextmanager that holds the lock exclusively for its duration."""
+    with self._locked(fcntl.LOCK_EX, message_fn):
+      yield
+
+  @contextmanager
+  def _locked(self, operation, message_fn):
+    safe_mkdir_for(self.path)
+    with open(self.path, 'a') as fp:
+      try:
+        fcntl.flock(fp, operation | fcntl.LOCK_NB)
+      except IOError as e:
+        if e.errno not in (errno.EAGAIN, errno.EACCES):
+          raise
+        message_fn('PID {} waiting for {} file lock ({}).'
+                   .format(os.getpid(), 'a shared' if operation == fcntl.LOCK_SH else 'an exclusive',
+                           self.path))
+        fcntl.flock(fp, operation)
+      try:
+        yield
+      finally:
+        fcntl.flock(fp, fcntl.LOCK_UN)
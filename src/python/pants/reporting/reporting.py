@@ -17,6 +17,7 @@ from pants.reporting.plaintext_reporter import LabelFormat, PlainTextReporter, T
 from pants.reporting.quiet_reporter import QuietReporter
 from pants.reporting.report import Report, ReportingError
 from pants.reporting.reporting_server import ReportingServerManager
+from pants.reporting.trace_event_reporter import TraceEventReporter
 from pants.subsystem.subsystem import Subsystem
 from pants.util.dirutil import relative_symlink, safe_mkdir, safe_rmtree
 
@@ -44,6 +45,12 @@ class Reporting(Subsystem):
              help='Controls the printing of workunit tool output to the console. Workunit types are '
                   '{workunits}.  Possible formatting values are {formats}'.format(
                workunits=WorkUnitLabel.keys(), formats=ToolOutputFormat.keys()))
+    register('--trace-events', type=bool,
+             help='Write the start and end of each workunit to trace.json in the reports dir of '
+                  'the run, in the Chrome trace event format, for viewing as a timeline in '
+                  'chrome://tracing or https://ui.perfetto.dev.')
+    register('--trace-events-buffer-size', advanced=True, type=int, default=4096,
+             help='Buffer this many trace events in memory before writing them out.')
 
   def initial_reporting(self, run_tracker):
     """Sets up the initial reporting configuration.
@@ -84,6 +91,15 @@ class Reporting(Subsystem):
     html_reporter = HtmlReporter(run_tracker, html_reporter_settings)
     report.add_reporter('html', html_reporter)
 
+    if self.get_options().trace_events:
+      trace_file = os.path.join(run_dir, 'trace.json')
+      trace_reporter_settings = TraceEventReporter.Settings(
+        log_level=Report.INFO,
+        trace_file=trace_file,
+        buffer_size=self.get_options().trace_events_buffer_size)
+      report.add_reporter('trace', TraceEventReporter(run_tracker, trace_reporter_settings))
+      run_tracker.run_info.add_info('trace_file', trace_file)
+
     # Add some useful RunInfo.
     run_tracker.run_info.add_info('default_report', html_reporter.report_path())
     port = ReportingServerManager().socket
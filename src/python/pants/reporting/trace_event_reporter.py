@@ -0,0 +1,96 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import os
+import threading
+from collections import namedtuple
+
+from pants.reporting.reporter import Reporter
+from pants.util.dirutil import safe_open
+
+
+class TraceEventReporter(Reporter):
+  """Streams the start and end of workunits to a file in the Chrome trace event format.
+
+  The file can be loaded into chrome://tracing or https://ui.perfetto.dev to view the run as a
+  timeline, with a track for each thread that ran workunits, including the threads of WorkerPools.
+
+  Events are buffered in memory and written out once `buffer_size` of them have accumulated, so that
+  the cost of reporting a workunit is that of building a small dict. The file is a JSON object
+  whose `traceEvents` array is closed when the report is, but viewers load the events of a file
+  whose array was left open by an aborted run, too.
+  """
+
+  # trace_file: The path of the file to write events to.
+  # buffer_size: The number of events to buffer before writing them to the file.
+  Settings = namedtuple('Settings', Reporter.Settings._fields + ('trace_file', 'buffer_size'))
+
+  _encoder = json.JSONEncoder(separators=(',', ':'))
+
+  def __init__(self, run_tracker, settings):
+    super(TraceEventReporter, self).__init__(run_tracker, settings)
+    self._pid = os.getpid()
+    self._trace_file = None
+    self._buffer = []
+    self._written_events = False
+    # Workunits may end on another thread than they started on, so end events are placed on the
+    # thread of the start event to keep the begin and end events of each thread nested.
+    self._tids = {}
+    self._thread_names = set()
+
+  def open(self):
+    self._trace_file = safe_open(self.settings.trace_file, 'w')
+    self._trace_file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+    self._trace_file.flush()
+    self._buffer.append({'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                         'args': {'name': 'pants'}})
+
+  def close(self):
+    self._flush()
+    self._trace_file.write('\n]}\n')
+    self._trace_file.close()
+
+  def start_workunit(self, workunit):
+    thread = threading.current_thread()
+    tid = thread.ident
+    if tid not in self._thread_names:
+      self._thread_names.add(tid)
+      self._append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                    'args': {'name': thread.name}})
+    self._tids[workunit.id] = tid
+    self._append({'name': workunit.name, 'cat': ','.join(sorted(workunit.labels)), 'ph': 'B',
+                  'ts': self._micros(workunit.start_time), 'pid': self._pid, 'tid': tid})
+
+  def end_workunit(self, workunit):
+    tid = self._tids.pop(workunit.id, None)
+    if tid is None:
+      return
+    # The RunTracker reports the end of a workunit before marking its end time.
+    end_time = workunit.start_time + workunit.duration()
+    self._append({'ph': 'E', 'ts': self._micros(end_time), 'pid': self._pid, 'tid': tid,
+                  'args': {'outcome': workunit.outcome_string(workunit.outcome())}})
+
+  def _append(self, event):
+    # The Report calls reporters under its lock, so no other lock is needed here.
+    self._buffer.append(event)
+    if len(self._buffer) >= self.settings.buffer_size:
+      self._flush()
+
+  def _flush(self):
+    if not self._buffer:
+      return
+    if self._written_events:
+      self._trace_file.write(',\n')
+    self._trace_file.write(',\n'.join(map(self._encoder.encode, self._buffer)))
+    self._trace_file.flush()
+    self._written_events = True
+    self._buffer = []
+
+  @staticmethod
+  def _micros(secs):
+    return int(secs * 1000000)
@@ -10,7 +10,9 @@ import re
 from abc import abstractmethod
 
 from pants.base.specs import DescendantAddresses
-from pants.build_graph.source_mapper import SpecSourceMapper
+from pants.build_graph.dependees_index import DependeesIndex
+from pants.build_graph.source_mapper import IndexedSourceMapper, SpecSourceMapper
+from pants.build_graph.source_owners_index import SourceOwnersIndex
 from pants.goal.workspace import ScmWorkspace
 from pants.util.meta import AbstractClass
 
@@ -56,18 +58,23 @@ class BuildGraphChangeCalculator(ChangeCalculator):
                diffspec=None,
                exclude_target_regexp=None):
     super(BuildGraphChangeCalculator, self).__init__(scm, workspace, changes_since, diffspec)
+    self._address_mapper = address_mapper
     self._build_graph = build_graph
     self._include_dependees = include_dependees
     self._fast = fast
     self._exclude_target_regexp = exclude_target_regexp or []
-    self._mapper = SpecSourceMapper(address_mapper, build_graph, fast)
+    source_owners_index = SourceOwnersIndex.global_instance()
+    if source_owners_index:
+      self._mapper = IndexedSourceMapper(source_owners_index, address_mapper, build_graph, fast)
+    else:
+      self._mapper = SpecSourceMapper(address_mapper, build_graph, fast)
 
   def _directly_changed_targets(self):
     # Internal helper to find target addresses containing SCM changes.
-    targets_for_source = self._mapper.target_addresses_for_source
+    changed_files = self.changed_files(self._changes_since, self._diffspec)
     result = set()
-    for src in self.changed_files(self._changes_since, self._diffspec):
-      result.update(set(targets_for_source(src)))
+    for addresses in self._mapper.target_addresses_for_sources(changed_files).values():
+      result.update(addresses)
     return result
 
   def _find_changed_targets(self):
@@ -81,6 +88,12 @@ class BuildGraphChangeCalculator(ChangeCalculator):
     if self._include_dependees == 'none':
       return changed
 
+    dependees_index = DependeesIndex.global_instance()
+    if dependees_index and self._include_dependees in ('direct', 'transitive'):
+      dependees_index.update(self._address_mapper, self._build_graph)
+      transitive = self._include_dependees == 'transitive'
+      return changed.union(dependees_index.dependees_of(changed, transitive=transitive))
+
     # Load the whole build graph since we need it for dependee finding in either remaining case.
     for _ in self._build_graph.inject_specs_closure([DescendantAddresses('')]):
       pass
@@ -0,0 +1,180 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+from pants.base.hash_utils import hash_file
+from pants.subsystem.subsystem import Subsystem
+from pants.util.dirutil import safe_mkdir_for
+
+
+logger = logging.getLogger(__name__)
+
+
+class FileDigestCache(object):
+  """Memoizes the sha1 digests of file contents, keyed by the stat of each file.
+
+  The digest of a file is reused for as long as its path, mtime, size and inode are unchanged, so
+  an unchanged file is only ever read once. Digests may also be persisted to a sqlite database,
+  in which case they are reused across runs.
+
+  Files that need to be read are digested in parallel by a pool of threads: hashlib releases the
+  GIL while it hashes, so the reads and hashes of separate files overlap.
+  """
+
+  DEFAULT_WORKERS = 4
+
+  # A file modified this recently may be modified again without a change to its stat, within the
+  # resolution of the filesystem's timestamps. Its digest is recomputed rather than memoized.
+  _RACY_WINDOW_SECS = 2
+
+  _global_instance = None
+
+  @classmethod
+  def global_instance(cls):
+    """Returns the cache used to fingerprint sources in this process.
+
+    Unless another has been installed via `set_global_instance`, this is a cache that is held in
+    memory only.
+    """
+    if cls._global_instance is None:
+      cls._global_instance = cls()
+    return cls._global_instance
+
+  @classmethod
+  def set_global_instance(cls, instance):
+    cls._global_instance = instance
+
+  def __init__(self, path=None, workers=DEFAULT_WORKERS):
+    """
+    :param string path: A sqlite database file to persist digests to, or None to hold them in
+                        memory only.
+    :param int workers: The maximum number of threads to digest files with.
+    """
+    self._path = path
+    self._workers = workers
+    # Digests may be requested from worker threads: this lock guards the memoized digests and the
+    # connection shared between them.
+    self._lock = threading.Lock()
+    self._conn = None
+    self._digests = None
+
+  def digest(self, path):
+    """Returns the hex sha1 digest of the content of the file at the given path."""
+    return self.digest_many([path])[0]
+
+  def digest_many(self, paths):
+    """Returns the hex sha1 digests of the contents of the files at the given paths, in order.
+
+    Any files not already memoized are digested in parallel.
+    """
+    paths = list(paths)
+    stat_keys = [self._stat_key(path) for path in paths]
+    known = self._known_digests()
+
+    digests = [None] * len(paths)
+    unknown = []
+    for i, (path, stat_key) in enumerate(zip(paths, stat_keys)):
+      entry = known.get(path)
+      if entry is not None and entry[0] == stat_key:
+        digests[i] = entry[1]
+      else:
+        unknown.append(i)
+
+    if unknown:
+      # NB: The stat is taken before the read, so a file modified in between is re-read next time.
+      racy_after = time.time() - self._RACY_WINDOW_SECS
+      updates = {}
+      for i, digest in zip(unknown, self._hash_files([paths[i] for i in unknown])):
+        digests[i] = digest
+        stat_key = stat_keys[i]
+        if stat_key[0] < racy_after:
+          updates[paths[i]] = (stat_key, digest)
+      if updates:
+        with self._lock:
+          known.update(updates)
+          self._persist(updates)
+    return digests
+
+  @staticmethod
+  def _stat_key(path):
+    st = os.stat(path)
+    return st.st_mtime, st.st_size, st.st_ino
+
+  def _hash_files(self, paths):
+    workers = min(self._workers, len(paths))
+    if workers <= 1:
+      return [hash_file(path) for path in paths]
+    pool = ThreadPool(workers)
+    try:
+      return pool.map(hash_file, paths, chunksize=1)
+    finally:
+      pool.close()
+      pool.join()
+
+  def _known_digests(self):
+    with self._lock:
+      if self._digests is None:
+        self._digests = self._load()
+      return self._digests
+
+  def _load(self):
+    if not self._path:
+      return {}
+    try:
+      safe_mkdir_for(self._path)
+      conn = sqlite3.connect(self._path, timeout=60, check_same_thread=False)
+      with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS digests (path TEXT PRIMARY KEY, mtime REAL, '
+                     'size INTEGER, inode INTEGER, digest TEXT NOT NULL)')
+      rows = conn.execute('SELECT path, mtime, size, inode, digest FROM digests')
+      digests = {path: ((mtime, size, inode), digest) for path, mtime, size, inode, digest in rows}
+    except sqlite3.Error as e:
+      # The digests are only an optimization: carry on without persisting them.
+      logger.warn('Failed to load file digests from {}, they will not be persisted: {}'
+                  .format(self._path, e))
+      self._path = None
+      return {}
+    self._conn = conn
+    return digests
+
+  def _persist(self, updates):
+    if self._conn is None:
+      return
+    rows = [(path, mtime, size, inode, digest)
+            for path, ((mtime, size, inode), digest) in updates.items()]
+    try:
+      with self._conn as conn:
+        conn.executemany('INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)', rows)
+    except sqlite3.Error as e:
+      logger.warn('Failed to persist file digests to {}: {}'.format(self._path, e))
+
+
+class FileDigests(Subsystem):
+  """Configures how the contents of source files are digested for target fingerprints."""
+
+  options_scope = 'file-digests'
+
+  @classmethod
+  def register_options(cls, register):
+    super(FileDigests, cls).register_options(register)
+    register('--persist', advanced=True, type=bool, default=True,
+             help='Persist the digests of source files under the workdir, so that files that are '
+                  'unchanged since a previous run are not read again.')
+    register('--workers', advanced=True, type=int, default=FileDigestCache.DEFAULT_WORKERS,
+             help='The maximum number of threads with which to digest source files.')
+
+  def install(self):
+    """Installs a FileDigestCache configured by these options as the global instance."""
+    options = self.get_options()
+    path = os.path.join(options.pants_workdir, 'file_digests.db') if options.persist else None
+    FileDigestCache.set_global_instance(FileDigestCache(path=path, workers=options.workers))
@@ -13,6 +13,7 @@ from six import string_types
 from twitter.common.dirutil.fileset import Fileset
 
 from pants.base.build_environment import get_buildroot
+from pants.source.file_digests import FileDigestCache
 from pants.util.dirutil import fast_relpath
 from pants.util.memo import memoized_property
 from pants.util.meta import AbstractClass
@@ -126,17 +127,44 @@ class LazyFilesetWithSpec(FilesetWithSpec):
 
   @property
   def files_hash(self):
+    paths = sorted(self.files)
+    root = os.path.join(get_buildroot(), self.rel_root)
+    digests = FileDigestCache.global_instance().digest_many(os.path.join(root, path)
+                                                            for path in paths)
     h = sha1()
-    for path in sorted(self.files):
+    for path, digest in zip(paths, digests):
       h.update(path)
-      with open(os.path.join(get_buildroot(), self.rel_root, path), 'rb') as f:
-        h.update(f.read())
+      h.update(digest)
     return h.digest()
 
   def matches(self, path_from_buildroot):
     return any(path_from_buildroot == path_in_spec for path_in_spec in self.paths_from_buildroot_iter())
 
 
+class _FilesCalculator(object):
+  """Lazily computes the file paths of a FilesetRelPathWrapper.
+
+  Unlike a closure, this can be pickled along with the LazyFilesetWithSpec that holds it.
+  """
+
+  def __init__(self, wrapper_type, root, patterns, kwargs, exclude):
+    self._wrapper_type = wrapper_type
+    self._root = root
+    self._patterns = patterns
+    self._kwargs = kwargs
+    self._exclude = exclude
+
+  def __call__(self):
+    cls = self._wrapper_type
+    result = cls.wrapped_fn(root=self._root, *self._patterns, **self._kwargs)
+    for ex in self._exclude:
+      result -= ex
+
+    # BUILD file's filesets should contain only files, not folders.
+    return [path for path in result
+            if not cls.validate_files or os.path.isfile(os.path.join(self._root, path))]
+
+
 class FilesetRelPathWrapper(AbstractClass):
   KNOWN_PARAMETERS = frozenset(['exclude', 'follow_links'])
 
@@ -196,16 +224,7 @@ class FilesetRelPathWrapper(AbstractClass):
 
   @classmethod
   def _file_calculator(cls, root, patterns, kwargs, exclude):
-    def files_calculator():
-      result = cls.wrapped_fn(root=root, *patterns, **kwargs)
-      for ex in exclude:
-        result -= ex
-
-      # BUILD file's filesets should contain only files, not folders.
-      return [path for path in result
-              if not cls.validate_files or os.path.isfile(os.path.join(root, path))]
-
-    return files_calculator
+    return _FilesCalculator(cls, root, patterns, kwargs, exclude)
 
   @staticmethod
   def _is_glob_dir_outside_root(glob, root):
@@ -5,8 +5,10 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import itertools
 import os
 import sqlite3
+from collections import namedtuple
 from contextlib import contextmanager
 
 from pants.subsystem.subsystem import Subsystem
@@ -33,7 +35,18 @@ class StatsDBFactory(Subsystem):
     return ret
 
 
+# A timing that grew between two time windows. Timings are in milliseconds.
+Regression = namedtuple('Regression', ['key', 'baseline', 'current', 'ratio'])
+
+
 class StatsDB(object):
+  # The column that timings are grouped by in percentile and regression queries, by timing table.
+  _KEY_COLUMNS = {
+    'cumulative_timings': 'label',
+    'self_timings': 'label',
+    'target_timings': 'target',
+  }
+
   def __init__(self, path):
     super(StatsDB, self).__init__()
     self._path = path
@@ -57,6 +70,7 @@ class StatsDB(object):
         )
       """)
       create_index('run_info', 'cmd_line')
+      create_index('run_info', 'timestamp')
 
       def create_timings_table(tab):
         c.execute("""
@@ -72,6 +86,30 @@ class StatsDB(object):
       create_timings_table('cumulative_timings')
       create_timings_table('self_timings')
 
+      c.execute("""
+        CREATE TABLE IF NOT EXISTS target_timings (
+          run_info_id TEXT,
+          target TEXT,
+          scope TEXT,
+          label TEXT,
+          timing INTEGER,  -- Milliseconds
+          FOREIGN KEY (run_info_id) REFERENCES run_info(id)
+        )
+      """)
+      create_index('target_timings', 'target')
+      create_index('target_timings', 'label')
+
+      c.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_cache_stats (
+          run_info_id TEXT,
+          cache_name TEXT,
+          num_hits INTEGER,
+          num_misses INTEGER,
+          FOREIGN KEY (run_info_id) REFERENCES run_info(id)
+        )
+      """)
+      create_index('artifact_cache_stats', 'cache_name')
+
   def insert_stats(self, stats):
     try:
       with self._cursor() as c:
@@ -95,6 +133,19 @@ class StatsDB(object):
               raise StatsDBError('Failed to insert stats. Key {} not found in timing: {}'.format(
                 e.args[0], str(timing)))
 
+        for target, scope, label, timing in self._target_timings(ri.get('target_data')):
+          c.execute("""INSERT INTO target_timings VALUES (?, ?, ?, ?, ?)""",
+                    [rid, target, scope, label, self._to_ms(timing)])
+
+        for cache_stat in stats.get('artifact_cache_stats', []):
+          try:
+            c.execute("""INSERT INTO artifact_cache_stats VALUES (?, ?, ?, ?)""",
+                      [rid, cache_stat['cache_name'], cache_stat['num_hits'],
+                       cache_stat['num_misses']])
+          except KeyError as e:
+            raise StatsDBError('Failed to insert stats. Key {} not found in cache stat: {}'.format(
+              e.args[0], str(cache_stat)))
+
     except KeyError as e:
       raise StatsDBError('Failed to insert stats. Key {} not found in stats object.'.format(
         e.args[0]))
@@ -129,6 +180,113 @@ class StatsDB(object):
         """.format(timing_table), [cmd_line_like]):
         yield row
 
+  def get_percentiles(self, timing_table, percentiles, since=None, until=None, label_like='%'):
+    """Returns a generator over percentiles of the timings recorded in a time window.
+
+    Timings are grouped by label for the workunit timing tables, and by target for
+    'target_timings', and each group yields a (key, count, percentile_timings) triple, in order of
+    key.
+
+    :param timing_table: One of 'cumulative_timings', 'self_timings' or 'target_timings'.
+    :param percentiles: The percentiles to compute for each group, as numbers from 0 to 100.
+    :param since: Only consider runs started at or after this many seconds since the epoch.
+    :param until: Only consider runs started before this many seconds since the epoch.
+    :param label_like: Only consider timings with labels LIKE this string, in the sql sense.
+    """
+    for key, timings in self._timings_by_key(timing_table, since, until, label_like):
+      yield key, len(timings), tuple(self._percentile(timings, p) for p in percentiles)
+
+  def get_regressions(self, timing_table, baseline, current, percentile=50, threshold=1.2,
+                      min_runs=1, label_like='%'):
+    """Returns the timings that grew between two time windows, the worst regression first.
+
+    :param timing_table: One of 'cumulative_timings', 'self_timings' or 'target_timings'.
+    :param baseline: A (since, until) pair of seconds since the epoch to compare against.
+    :param current: A (since, until) pair of seconds since the epoch to compare.
+    :param percentile: The percentile of the timings in each window to compare.
+    :param threshold: The ratio of the current timing to the baseline timing at or above which a
+                      timing has regressed.
+    :param min_runs: The number of timings each window must have for a key to be compared.
+    :param label_like: Only consider timings with labels LIKE this string, in the sql sense.
+    :returns: A list of :class:`Regression`.
+    """
+    def percentiles(window):
+      since, until = window
+      return {key: self._percentile(timings, percentile)
+              for key, timings in self._timings_by_key(timing_table, since, until, label_like)
+              if len(timings) >= min_runs}
+
+    baseline_timings = percentiles(baseline)
+    regressions = []
+    for key, current_timing in percentiles(current).items():
+      baseline_timing = baseline_timings.get(key)
+      if not baseline_timing:
+        continue
+      ratio = current_timing / baseline_timing
+      if ratio >= threshold:
+        regressions.append(Regression(key, baseline_timing, current_timing, ratio))
+    return sorted(regressions, key=lambda r: (-r.ratio, r.key))
+
+  def get_cache_stats(self, since=None, until=None):
+    """Returns a generator over (cache_name, num_hits, num_misses) totals in a time window.
+
+    :param since: Only consider runs started at or after this many seconds since the epoch.
+    :param until: Only consider runs started before this many seconds since the epoch.
+    """
+    with self._cursor() as c:
+      for row in c.execute("""
+          SELECT s.cache_name, sum(s.num_hits), sum(s.num_misses)
+          FROM artifact_cache_stats AS s INNER JOIN run_info AS ri ON (s.run_info_id=ri.id)
+          WHERE ri.timestamp >= ? AND ri.timestamp < ?
+          GROUP BY s.cache_name
+          ORDER BY s.cache_name
+        """, self._window(since, until)):
+        yield row
+
+  def _timings_by_key(self, timing_table, since, until, label_like):
+    """Returns a generator over (key, sorted timings) pairs of the given table in a time window."""
+    key_column = self._KEY_COLUMNS.get(timing_table)
+    if key_column is None:
+      raise StatsDBError('Unknown timing table {}. Must be one of {}.'.format(
+        timing_table, ', '.join(sorted(self._KEY_COLUMNS))))
+    with self._cursor() as c:
+      rows = c.execute("""
+          SELECT t.{key}, t.timing
+          FROM {table} AS t INNER JOIN run_info AS ri ON (t.run_info_id=ri.id)
+          WHERE ri.timestamp >= ? AND ri.timestamp < ? AND t.label LIKE ?
+          ORDER BY t.{key}, t.timing
+        """.format(key=key_column, table=timing_table),
+        self._window(since, until) + [label_like])
+      for key, group in itertools.groupby(rows, key=lambda row: row[0]):
+        yield key, [timing for _, timing in group]
+
+  @staticmethod
+  def _window(since, until):
+    # Sqlite integers are 64 bit, so this bounds any timestamp.
+    return [0 if since is None else int(since), 2 ** 62 if until is None else int(until)]
+
+  @staticmethod
+  def _percentile(sorted_timings, percentile):
+    """Returns the nearest-rank percentile of a non-empty sorted list."""
+    rank = int(len(sorted_timings) * percentile / 100.0 + 0.5)
+    return sorted_timings[min(max(rank, 1), len(sorted_timings)) - 1]
+
+  @staticmethod
+  def _target_timings(target_data):
+    """Returns (target, scope, label, secs) tuples for the compile timings of each target.
+
+    :param target_data: The target data reported to the RunTracker, a dict from target spec to
+                        scope to nested dicts of the data reported for that target by that scope.
+    """
+    for target, data_by_scope in sorted((target_data or {}).items()):
+      for scope, data in sorted(data_by_scope.items()):
+        compile_data = data.get('compile') if isinstance(data, dict) else None
+        if not isinstance(compile_data, dict):
+          continue
+        for name, secs in sorted(compile_data.items()):
+          if isinstance(secs, (int, float)) and not isinstance(secs, bool):
+            yield target, scope, 'compile.{}'.format(name), secs
+
   @staticmethod
   def _to_ms(timing_secs):
     """Convert a string representing a float of seconds to an int representing milliseconds."""
@@ -0,0 +1,157 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import heapq
+import json
+import logging
+import os
+import threading
+
+from pants.util.dirutil import safe_concurrent_creation
+
+
+logger = logging.getLogger(__name__)
+
+
+class RecordedDurations(object):
+  """The durations of units of work in previous runs, persisted in a json file.
+
+  Recorded durations are used to schedule the longest units of work first, or to balance units of
+  work across workers, in later runs. Each recorded duration is a moving average of the durations
+  of the runs of its unit of work.
+
+  Each unit of work has an entry, a dict which holds its `duration` once one is recorded.
+  Subclasses may record more about each unit of work in its entry.
+  """
+
+  _VERSION = 2
+
+  # The weight of the latest duration of a unit of work in its recorded moving average duration.
+  _SMOOTHING = 0.5
+
+  def __init__(self, path):
+    """
+    :param string path: The json file to load the durations from and save them to.
+    """
+    self._path = path
+    # Durations may be recorded from worker threads.
+    self._lock = threading.Lock()
+    self._entries = self._load()
+
+  def get(self, key):
+    """Returns the recorded duration of the given unit of work in seconds, or None."""
+    return self._entries.get(key, {}).get('duration')
+
+  def estimates(self, keys):
+    """Returns a dict of key to an estimated duration in seconds for each of the given keys.
+
+    A key with a recorded duration is estimated by it. A key without one is assumed to be a typical
+    unit of work, and is estimated by the median of the recorded durations. If there are no
+    recorded durations at all, every key is estimated at 0.
+    """
+    recorded = sorted(self._recorded_durations())
+    typical = recorded[len(recorded) // 2] if recorded else 0
+    estimates = {}
+    for key in keys:
+      duration = self.get(key)
+      estimates[key] = typical if duration is None else duration
+    return estimates
+
+  def longest_first(self, items, key=None):
+    """Returns the given items sorted by descending estimated duration.
+
+    Items with equal estimates keep their given order.
+
+    :param list items: The units of work to sort.
+    :param key: A function from an item to its key, or None if the items are keys themselves.
+    """
+    key = key or (lambda item: item)
+    estimates = self.estimates([key(item) for item in items])
+    return sorted(items, key=lambda item: -estimates[key(item)])
+
+  def balance(self, items, count, key=None, max_size=None):
+    """Packs the given items into batches with estimated total durations as equal as possible.
+
+    Items are assigned longest first to the batch with the least estimated duration so far. If no
+    item has an estimated duration, the number of items in each batch is balanced instead.
+
+    :param list items: The units of work to pack.
+    :param int count: The number of batches to pack the items into.
+    :param key: A function from an item to its key, or None if the items are keys themselves.
+    :param int max_size: The maximum number of items in a batch, or None for no maximum. More than
+                         `count` batches are packed if the items do not fit in `count` batches.
+    :returns: The non-empty batches, longest first. The items of each batch keep their given order.
+    :rtype: list of list
+    """
+    key = key or (lambda item: item)
+    if max_size:
+      count = max(count, (len(items) + max_size - 1) // max_size)
+    count = min(count, len(items))
+    if count < 1:
+      return []
+
+    estimates = self.estimates([key(item) for item in items])
+    weights = [estimates[key(item)] for item in items]
+    if not any(weights):
+      weights = [1] * len(items)
+
+    members = [[] for _ in range(count)]
+    totals = [0] * count
+    # Batches with room for more items, by estimated duration and then number of items.
+    open_batches = [(0, 0, index) for index in range(count)]
+    for i in sorted(range(len(items)), key=lambda i: -weights[i]):
+      total, size, index = heapq.heappop(open_batches)
+      members[index].append(i)
+      totals[index] = total + weights[i]
+      if not max_size or size + 1 < max_size:
+        heapq.heappush(open_batches, (totals[index], size + 1, index))
+
+    batches = sorted(range(count), key=lambda index: -totals[index])
+    return [[items[i] for i in sorted(members[index])] for index in batches]
+
+  def record(self, key, duration):
+    """Records the latest duration in seconds of the given unit of work.
+
+    Recorded durations are not persisted until `save` is called.
+    """
+    with self._lock:
+      entry = self._entries.setdefault(key, {})
+      previous = entry.get('duration')
+      if previous is not None:
+        duration = self._SMOOTHING * duration + (1 - self._SMOOTHING) * previous
+      entry['duration'] = duration
+
+  def save(self):
+    """Persists all recorded durations.
+
+    Failing to persist them is logged rather than raised: recorded durations only guide the
+    scheduling of later runs.
+    """
+    with self._lock:
+      try:
+        with safe_concurrent_creation(self._path) as tmp_path:
+          with open(tmp_path, 'wb') as fp:
+            json.dump({'version': self._VERSION, 'entries': self._entries}, fp)
+      except (IOError, OSError) as e:
+        logger.warn('Failed to save recorded durations to {}: {}'.format(self._path, e))
+
+  def _recorded_durations(self):
+    return [entry['duration'] for entry in self._entries.values()
+            if entry.get('duration') is not None]
+
+  def _load(self):
+    if not os.path.isfile(self._path):
+      return {}
+    try:
+      with open(self._path, 'rb') as fp:
+        content = json.load(fp)
+    except (IOError, ValueError) as e:
+      logger.warn('Ignoring unreadable recorded durations {}: {}'.format(self._path, e))
+      return {}
+    if content.get('version') != self._VERSION:
+      return {}
+    return content['entries']
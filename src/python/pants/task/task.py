@@ -180,6 +180,7 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
       self.context.options.for_global_scope().pants_workdir,
       'build_invalidator',
       self.stable_name())
+    self._build_invalidator_store = self.context.options.for_global_scope().build_invalidator_store
 
     self._cache_factory = CacheSetup.create_cache_factory_for_task(self)
 
@@ -248,7 +249,8 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
 
   def invalidate(self):
     """Invalidates all targets for this task."""
-    BuildInvalidator(self._build_invalidator_dir).force_invalidate_all()
+    BuildInvalidator(self._build_invalidator_dir,
+                     store=self._build_invalidator_store).force_invalidate_all()
 
   @property
   def create_target_dirs(self):
@@ -339,7 +341,8 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
                                              invalidation_report=self.context.invalidation_report,
                                              task_name=type(self).__name__,
                                              task_version=self.implementation_version_str(),
-                                             artifact_write_callback=self.maybe_write_artifact)
+                                             artifact_write_callback=self.maybe_write_artifact,
+                                             build_invalidator_store=self._build_invalidator_store)
 
     invalidation_check = cache_manager.check(targets, topological_order=topological_order)
 
@@ -397,8 +400,7 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
         invalidation_report.add_vts(cache_manager, vts.targets, vts.cache_key, vts.valid,
                                     phase='post-check')
 
-    for vt in invalidation_check.invalid_vts:
-      vt.update()
+    cache_manager.update_many(invalidation_check.invalid_vts)
 
     # Background work to clean up previous builds.
     if self.context.options.for_global_scope().workdir_max_build_entries is not None:
@@ -465,9 +467,13 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
       return [], [], []
 
     read_cache = self._cache_factory.get_read_cache()
+    # Probe for all keys in one batch first, so that only the artifacts which are present need to
+    # be fetched: on a cold cache this avoids a fetch attempt per versioned target.
+    present = read_cache.has_many([vt.cache_key for vt in vts])
     items = [(read_cache, vt.cache_key, vt.current_results_dir if self.cache_target_dirs else None)
-             for vt in vts]
-    res = self.context.subproc_map(call_use_cached_files, items)
+             for vt, is_present in zip(vts, present) if is_present]
+    fetched = iter(self.context.subproc_map(call_use_cached_files, items) if items else ())
+    res = [next(fetched) if is_present else False for is_present in present]
 
     cached_vts = []
     uncached_vts = []
@@ -504,6 +510,51 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
       self.context.submit_background_work_chain([update_artifact_cache_work],
                                                 parent_workunit_name='cache')
 
+  def fetch_cached_artifacts(self, cache_keys):
+    """Fetches the artifacts cached under the given keys, if we're configured to read them.
+
+    Unlike `check_artifact_cache`, the keys need not be those of VersionedTargetSets, so a task may
+    cache results at a finer granularity than targets. Fetched artifacts are extracted in place
+    under the artifact root.
+
+    :param list cache_keys: The `CacheKey`s to fetch the artifacts of.
+    :returns: Whether the artifact of each key was fetched, in order.
+    :rtype: list of bool
+    """
+    read_cache = self._cache_factory.get_read_cache() if cache_keys else None
+    if not read_cache:
+      return [False] * len(cache_keys)
+
+    present = read_cache.has_many(cache_keys)
+    items = [(read_cache, cache_key, None)
+             for cache_key, is_present in zip(cache_keys, present) if is_present]
+    fetched = iter(self.context.subproc_map(call_use_cached_files, items) if items else ())
+    res = []
+    for is_present in present:
+      was_in_cache = next(fetched) if is_present else False
+      if isinstance(was_in_cache, UnreadableArtifact):
+        self._cache_key_errors.update(was_in_cache.key)
+      res.append(bool(was_in_cache))
+    return res
+
+  def update_artifact_cache_for_keys(self, keys_artifactfiles_pairs):
+    """Write to the artifact cache under the given keys, if we're configured to.
+
+    keys_artifactfiles_pairs - a list of pairs (cache_key, artifactfiles) where
+      - cache_key is a `CacheKey`, as fetched by `fetch_cached_artifacts`.
+      - artifactfiles is a list of absolute paths to artifacts under the artifact root.
+    """
+    cache = self._cache_factory.get_write_cache()
+    if not cache or not keys_artifactfiles_pairs:
+      return
+
+    always_overwrite = self._cache_factory.overwrite()
+    args_tuples = [(cache, cache_key, artifactfiles,
+                    always_overwrite or cache_key in self._cache_key_errors)
+                   for cache_key, artifactfiles in keys_artifactfiles_pairs]
+    work = Work(lambda x: self.context.subproc_map(call_insert, x), [(args_tuples,)], 'insert')
+    self.context.submit_background_work_chain([work], parent_workunit_name='cache')
+
   def _get_update_artifact_cache_work(self, vts_artifactfiles_pairs):
     """Create a Work instance to update an artifact cache, if we're configured to.
 
@@ -15,6 +15,7 @@ from pants.backend.jvm.targets.scala_jar_dependency import ScalaJarDependency
 from pants.backend.python.targets.python_library import PythonLibrary
 from pants.backend.python.targets.python_tests import PythonTests
 from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.dependees_index import DependeesIndex
 from pants.build_graph.resources import Resources
 from pants.build_graph.target import Target
 from pants.java.jar.jar_dependency import JarDependency
@@ -301,3 +302,24 @@ class ReverseDepmapTestWithPantsBuildIgnore(BaseReverseDepmapTest):
 
   def test_overlaps_with_build_ignore_patterns(self):
     self.assert_console_output(targets=[self.target('common/a')])
+
+
+class IndexedReverseDepmapMixin(object):
+  """Answers the dependee queries of a ReverseDepmap test from a DependeesIndex."""
+
+  def setUp(self):
+    super(IndexedReverseDepmapMixin, self).setUp()
+    DependeesIndex.set_global_instance(DependeesIndex())
+
+  def tearDown(self):
+    DependeesIndex.set_global_instance(None)
+    super(IndexedReverseDepmapMixin, self).tearDown()
+
+
+class IndexedReverseDepmapTest(IndexedReverseDepmapMixin, ReverseDepmapTest):
+  pass
+
+
+class IndexedReverseDepmapTestWithPantsBuildIgnore(IndexedReverseDepmapMixin,
+                                                   ReverseDepmapTestWithPantsBuildIgnore):
+  pass
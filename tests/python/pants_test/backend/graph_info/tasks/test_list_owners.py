@@ -11,6 +11,7 @@ from pants.backend.graph_info.tasks.list_owners import ListOwners
 from pants.backend.python.targets.python_library import PythonLibrary
 from pants.base.exceptions import TaskError
 from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.source_owners_index import SourceOwnersIndex
 from pants_test.tasks.task_test_base import ConsoleTaskTestBase
 
 
@@ -110,3 +111,15 @@ class ListOwnersTest(ConsoleTaskTestBase):
       passthru_args=['a/a.txt', 'a/b.txt'],
       options={'output_format': 'json'}
     )
+
+
+class IndexedListOwnersTest(ListOwnersTest):
+  """Looks up the owners of a ListOwners test in a SourceOwnersIndex."""
+
+  def setUp(self):
+    super(IndexedListOwnersTest, self).setUp()
+    SourceOwnersIndex.set_global_instance(SourceOwnersIndex())
+
+  def tearDown(self):
+    SourceOwnersIndex.set_global_instance(None)
+    super(IndexedListOwnersTest, self).tearDown()
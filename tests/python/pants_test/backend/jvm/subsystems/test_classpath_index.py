@@ -0,0 +1,133 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import sqlite3
+import time
+import unittest
+from contextlib import closing
+
+from pants.backend.jvm.subsystems.classpath_index import ClasspathIndex
+from pants.util.contextutil import open_zip, temporary_dir
+from pants.util.dirutil import relative_symlink, safe_mkdir, touch
+
+
+class CountingClasspathIndex(ClasspathIndex):
+  def __init__(self, *args, **kwargs):
+    super(CountingClasspathIndex, self).__init__(*args, **kwargs)
+    self.listed = []
+
+  def _list_contents(self, entry):
+    self.listed.append(entry)
+    return super(CountingClasspathIndex, self)._list_contents(entry)
+
+
+class ClasspathIndexTest(unittest.TestCase):
+  def _jar(self, path, *rel_paths):
+    safe_mkdir(os.path.dirname(path))
+    with open_zip(path, 'w') as jar:
+      for rel_path in rel_paths:
+        jar.writestr(rel_path, b'')
+    return path
+
+  def _results_dir(self, workdir, name, *rel_paths):
+    """Creates a classes dir in a results dir reached via a stable symlink, as a compile would."""
+    current_results_dir = os.path.join(workdir, 'compile', name, '0123456789ab')
+    results_dir = os.path.join(workdir, 'compile', name, 'current')
+    for rel_path in rel_paths:
+      touch(os.path.join(current_results_dir, 'classes', rel_path))
+    relative_symlink(current_results_dir, results_dir)
+    return os.path.join(results_dir, 'classes')
+
+  def test_contents(self):
+    with temporary_dir() as workdir:
+      jar = self._jar(os.path.join(workdir, 'a.jar'), 'org/A.class', 'META-INF/MANIFEST.MF')
+      classes_dir = self._results_dir(workdir, 'b', 'org/B.class')
+      index = ClasspathIndex(workdir)
+      self.assertEqual(('org/A.class', 'META-INF/MANIFEST.MF'), index.contents(jar))
+      self.assertEqual(('org/', 'org/B.class'), index.contents(classes_dir))
+      self.assertEqual((), index.contents(os.path.join(workdir, 'missing.jar')))
+      self.assertEqual(['org.A'], index.classnames(jar))
+
+  def test_entries_listed_once(self):
+    with temporary_dir() as workdir:
+      jar = self._jar(os.path.join(workdir, 'a.jar'), 'org/A.class')
+      classes_dir = self._results_dir(workdir, 'b', 'org/B.class')
+      index = CountingClasspathIndex(workdir)
+      for _ in range(3):
+        index.contents(jar)
+        index.contents(classes_dir)
+      self.assertEqual([jar, classes_dir], index.listed)
+
+  def test_plain_directories_listed_each_time(self):
+    with temporary_dir() as workdir:
+      classes_dir = os.path.join(workdir, 'classes')
+      touch(os.path.join(classes_dir, 'A.class'))
+      index = CountingClasspathIndex(workdir)
+      self.assertEqual(['A'], index.classnames(classes_dir))
+      touch(os.path.join(classes_dir, 'B.class'))
+      self.assertEqual(['A', 'B'], sorted(index.classnames(classes_dir)))
+      self.assertEqual([classes_dir, classes_dir], index.listed)
+
+  def test_persisted(self):
+    with temporary_dir() as workdir:
+      db = os.path.join(workdir, 'classpath_index.db')
+      jar = self._jar(os.path.join(workdir, 'a.jar'), 'org/A.class')
+      classes_dir = self._results_dir(workdir, 'b', 'org/B.class')
+      first = CountingClasspathIndex(workdir, path=db)
+      self.assertEqual(['org.A'], first.classnames(jar))
+      self.assertEqual(['org.B'], first.classnames(classes_dir))
+
+      second = CountingClasspathIndex(workdir, path=db)
+      self.assertEqual(['org.A'], second.classnames(jar))
+      self.assertEqual(['org.B'], second.classnames(classes_dir))
+      self.assertEqual([], second.listed)
+
+  def test_unused_contents_deleted(self):
+    with temporary_dir() as workdir:
+      db = os.path.join(workdir, 'classpath_index.db')
+      a = self._jar(os.path.join(workdir, 'a.jar'), 'org/A.class')
+      b = self._jar(os.path.join(workdir, 'b.jar'), 'org/B.class')
+      first = ClasspathIndex(workdir, path=db)
+      first.contents(a)
+      first.contents(b)
+      last_used = int(time.time()) - ClasspathIndex._LAST_USED_RESOLUTION_SECS - 60
+      with closing(sqlite3.connect(db)) as conn, conn:
+        conn.execute('UPDATE contents SET last_used = ?', (last_used,))
+
+      # Looking contents up records their use.
+      used = CountingClasspathIndex(workdir, path=db)
+      self.assertEqual(('org/A.class',), used.contents(a))
+      self.assertEqual([], used.listed)
+      with closing(sqlite3.connect(db)) as conn, conn:
+        conn.execute('UPDATE contents SET last_used = last_used - ?',
+                     (ClasspathIndex._MAX_UNUSED_SECS - ClasspathIndex._LAST_USED_RESOLUTION_SECS,))
+
+      second = CountingClasspathIndex(workdir, path=db)
+      self.assertEqual(('org/A.class',), second.contents(a))
+      self.assertEqual(('org/B.class',), second.contents(b))
+      self.assertEqual([b], second.listed)
+
+  def test_jars_keyed_by_digest(self):
+    with temporary_dir() as workdir:
+      a = self._jar(os.path.join(workdir, 'a', 'same.jar'), 'org/A.class')
+      b = self._jar(os.path.join(workdir, 'b', 'same.jar'), 'org/A.class')
+      index = CountingClasspathIndex(workdir)
+      self.assertEqual(index.contents(a), index.contents(b))
+      self.assertEqual(1, len(index.listed))
+
+  def test_shared_contents(self):
+    with temporary_dir() as workdir:
+      a = self._jar(os.path.join(workdir, 'a.jar'), 'org/A.class', 'org/Dup.class')
+      b = self._jar(os.path.join(workdir, 'b.jar'), 'org/B.class')
+      classes_dir = self._results_dir(workdir, 'c', 'org/Dup.class')
+      index = ClasspathIndex(workdir)
+      self.assertEqual({'org/Dup.class': [a, classes_dir]},
+                       index.shared_contents([a, b, classes_dir, a]))
+      self.assertEqual([a, classes_dir],
+                       index.entries_containing('org/Dup.class', [a, b, classes_dir]))
+      self.assertEqual([b], index.entries_containing('org/B.class', [a, b, classes_dir]))
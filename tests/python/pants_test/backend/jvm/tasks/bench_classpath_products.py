@@ -0,0 +1,146 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import random
+import sys
+from collections import defaultdict
+
+from twitter.common.collections import OrderedSet
+
+from pants.backend.jvm.tasks.classpath_products import ClasspathProducts
+from pants.build_graph.address import Address
+from pants.build_graph.build_graph import BuildGraph
+from pants.build_graph.mutable_build_graph import MutableBuildGraph
+from pants.build_graph.target import Target
+from pants.goal.products import UnionProducts
+from pants.java.jar.jar_dependency_utils import M2Coordinate, ResolvedJar
+from pants.util.contextutil import Timer
+
+
+# The number of dependencies of each synthetic target, and of jars resolved for each jar library.
+_FANOUT = 8
+_JARS_PER_LIBRARY = 4
+
+# The number of times a classpath is copied and queried for each target, e.g. by compile, test and
+# bundle tasks.
+_COPIES = 3
+_QUERIES = 3
+
+_WORKDIR = '/pants.d'
+
+
+class _UnsharedClasspathProducts(ClasspathProducts):
+  """ClasspathProducts that copy every target's products, and recompute every query, as they did."""
+
+  def copy(self):
+    return _UnsharedClasspathProducts(pants_workdir=self._pants_workdir,
+                                      classpaths=self._deep_copy(self._classpaths),
+                                      excludes=self._deep_copy(self._excludes))
+
+  @staticmethod
+  def _deep_copy(union_products):
+    products_by_target = defaultdict(OrderedSet)
+    for target, products in union_products._products_by_target.items():
+      products_by_target[target] = OrderedSet(products)
+    return UnionProducts(products_by_target=products_by_target)
+
+  def get_classpath_entries_for_targets(self, targets, respect_excludes=True):
+    classpath_target_tuples = self._classpaths.get_product_target_mappings_for_targets(targets)
+    if respect_excludes:
+      closure = BuildGraph.closure(targets, bfs=True)
+      excludes = self._excludes.get_for_targets(closure)
+      classpath_target_tuples = [t for t in classpath_target_tuples
+                                 if not t[0][1].is_excluded_by(excludes)]
+    return list(OrderedSet(cp for cp, target in classpath_target_tuples))
+
+
+def _build_graph(size):
+  """Returns a graph of jar libraries and of libraries depending on them and on each other."""
+  rng = random.Random(size)
+  graph = MutableBuildGraph(address_mapper=None)
+  targets = []
+  for i in range(size):
+    address = Address('src/{}/{}'.format(i // 100, i % 100), 'lib{}'.format(i))
+    graph.inject_target(Target(name=address.target_name, address=address, build_graph=graph))
+    targets.append(graph.get_target(address))
+    for j in set(rng.randrange(i) for _ in range(min(i, _FANOUT))):
+      graph.inject_dependency(address, targets[j].address)
+  return targets
+
+
+def _populate(products, targets):
+  """Adds a jar classpath to every tenth target and a compiled classpath to every other one."""
+  for i, target in enumerate(targets):
+    if i % 10 == 0:
+      jars = []
+      for j in range(_JARS_PER_LIBRARY):
+        # Jar libraries commonly resolve the same jars, e.g. guava.
+        coordinate = M2Coordinate(org='org', name='jar{}'.format((i + j * 7) % (len(targets) // 5)),
+                                  rev='1.0')
+        path = os.path.join(_WORKDIR, 'ivy', 'jars', '{}.jar'.format(coordinate.name))
+        jars.append(ResolvedJar(coordinate, cache_path=path, pants_path=path))
+      products.add_jars_for_targets([target], 'default', jars)
+    else:
+      path = os.path.join(_WORKDIR, 'compile', target.id)
+      products.add_for_target(target, [('default', path)])
+
+
+def _run(products_type, targets):
+  with Timer() as timer:
+    products = products_type(pants_workdir=_WORKDIR)
+    _populate(products, targets)
+    populated = timer.elapsed
+
+    copies = [products]
+    for _ in range(_COPIES):
+      copies.append(copies[-1].copy())
+    copied = timer.elapsed
+
+    entries = 0
+    rng = random.Random(len(targets))
+    roots = [rng.choice(targets) for _ in range(100)]
+    for root in roots:
+      closure = BuildGraph.closure([root])
+      for copy in copies[1:]:
+        for _ in range(_QUERIES):
+          entries += len(copy.get_classpath_entries_for_targets(closure))
+    queried = timer.elapsed
+  return populated, copied - populated, queried - copied, entries
+
+
+def main():
+  """Measure the time to copy and query the classpaths of large graphs.
+
+  To run:
+
+  ./pants run tests/python/pants_test/backend/jvm/tasks:bench_classpath_products -- [<size> ...]
+
+  Builds a synthetic graph of the given numbers of targets (default 1000 and 10000), each with up to
+  eight dependencies, and adds a classpath for each: four of a shared pool of jars for every tenth
+  target, and a compiled classes directory for the others. The classpath is then copied three times
+  in a chain, as downstream tasks do, and each copy is queried three times for the transitive
+  classpath of each of 100 random targets. Reported are the times to copy and to query, with
+  products copied and queries computed in full, as they used to be, and as they are now.
+  """
+  sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+  print('{:>10} {:>10} {:>12} {:>12} {:>12}'.format('targets', 'products', 'populate (s)',
+                                                    'copy (s)', 'query (s)'))
+  for size in sizes:
+    targets = _build_graph(size)
+    results = [(name, _run(products_type, targets))
+               for name, products_type in (('unshared', _UnsharedClasspathProducts),
+                                           ('shared', ClasspathProducts))]
+    if len(set(entries for _, (_, _, _, entries) in results)) != 1:
+      raise AssertionError('The classpaths queried differ: {}'.format(results))
+    for name, (populated, copied, queried, _) in results:
+      print('{:>10} {:>10} {:>12.3f} {:>12.3f} {:>12.3f}'.format(size, name, populated, copied,
+                                                                 queried))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,90 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+from collections import defaultdict
+
+from pants.backend.jvm.tasks.class_fingerprinter import ClassFingerprinter
+from pants.goal.products import MultipleRootedProducts
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class ClassFingerprinterTest(unittest.TestCase):
+  def _fingerprinter(self, buildroot):
+    """Creates a library of two classes, and tests of one of them and of a class in a jar.
+
+    FooTest -> Foo -> Foo$Inner
+    BarTest -> Bar.java (in the same compile) -> bar.jar
+    """
+    lib_classes = os.path.join(buildroot, '.pants.d', 'lib', 'classes')
+    test_classes = os.path.join(buildroot, '.pants.d', 'test', 'classes')
+    self.files = {}
+    for classes_dir, rel_path in [(lib_classes, 'org/Foo.class'),
+                                  (lib_classes, 'org/Foo$Inner.class'),
+                                  (lib_classes, 'org/Bar.class'),
+                                  (test_classes, 'org/FooTest.class'),
+                                  (test_classes, 'org/BarTest.class')]:
+      self.files[rel_path] = os.path.join(classes_dir, rel_path)
+      safe_file_dump(self.files[rel_path], rel_path)
+    self.files['bar.jar'] = os.path.join(buildroot, 'bar.jar')
+    safe_file_dump(self.files['bar.jar'], 'bar.jar')
+
+    classes_by_source = defaultdict(MultipleRootedProducts)
+    classes_by_source['src/org/Foo.java'].add_rel_paths(lib_classes,
+                                                        ['org/Foo.class', 'org/Foo$Inner.class'])
+    classes_by_source['src/org/Bar.java'].add_rel_paths(lib_classes, ['org/Bar.class'])
+    classes_by_source['tests/org/FooTest.java'].add_rel_paths(test_classes, ['org/FooTest.class'])
+    classes_by_source['tests/org/BarTest.java'].add_rel_paths(test_classes, ['org/BarTest.class'])
+
+    src = lambda rel_src: os.path.join(buildroot, rel_src)
+    product_deps_by_src = {
+      'lib': {
+        src('src/org/Foo.java'): [],
+        src('src/org/Bar.java'): [self.files['bar.jar']],
+      },
+      'test': {
+        src('tests/org/FooTest.java'): [self.files['org/Foo.class'], '/jdk/rt.jar'],
+        src('tests/org/BarTest.java'): [src('src/org/Bar.java')],
+      },
+    }
+    return ClassFingerprinter(buildroot, classes_by_source, product_deps_by_src)
+
+  def test_dependencies(self):
+    with temporary_dir() as buildroot:
+      fingerprinter = self._fingerprinter(buildroot)
+      self.assertEqual({self.files['org/FooTest.class'],
+                        self.files['org/Foo.class'],
+                        self.files['org/Foo$Inner.class'],
+                        '/jdk/rt.jar'},
+                       fingerprinter.dependencies('org.FooTest'))
+      self.assertEqual({self.files['org/BarTest.class'],
+                        self.files['org/Bar.class'],
+                        self.files['bar.jar']},
+                       fingerprinter.dependencies('org.BarTest'))
+      self.assertIsNone(fingerprinter.dependencies('org.Unknown'))
+      self.assertIsNone(fingerprinter.fingerprint('org.Unknown'))
+
+  def test_fingerprint_changes_with_dependencies_only(self):
+    with temporary_dir() as buildroot:
+      fingerprinter = self._fingerprinter(buildroot)
+      foo_test = fingerprinter.fingerprint('org.FooTest')
+      bar_test = fingerprinter.fingerprint('org.BarTest')
+      self.assertNotEqual(foo_test, bar_test)
+
+      safe_file_dump(self.files['org/Foo$Inner.class'], 'changed')
+      self.assertNotEqual(foo_test, fingerprinter.fingerprint('org.FooTest'))
+      self.assertEqual(bar_test, fingerprinter.fingerprint('org.BarTest'))
+
+      safe_file_dump(self.files['bar.jar'], 'changed')
+      self.assertNotEqual(bar_test, fingerprinter.fingerprint('org.BarTest'))
+
+  def test_fingerprint_independent_of_paths(self):
+    with temporary_dir() as first, temporary_dir() as second:
+      self.assertEqual(self._fingerprinter(first).fingerprint('org.FooTest'),
+                       self._fingerprinter(second).fingerprint('org.FooTest'))
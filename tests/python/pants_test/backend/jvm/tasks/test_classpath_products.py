@@ -408,6 +408,56 @@ class ClasspathProductsTest(BaseTest):
                       ('default', ClasspathEntry(self.path('b/loose/classes/dir')))],
                      classpath)
 
+  def test_classpath_entries_interned(self):
+    b = self.make_target('b', JvmTarget)
+    a = self.make_target('a', JvmTarget, dependencies=[b])
+
+    classpath_product = ClasspathProducts(self.pants_workdir)
+    classpath_product.add_for_target(a, [('default', self.path('shared.jar'))])
+    classpath_product.add_for_target(b, [('default', self.path('shared.jar'))])
+    self.add_example_jar_classpath_element_for(classpath_product, a)
+    copied = classpath_product.copy()
+    self.add_example_jar_classpath_element_for(copied, b)
+
+    a_shared, a_jar = classpath_product.get_classpath_entries_for_targets([a])
+    b_shared, = classpath_product.get_classpath_entries_for_targets([b])
+    self.assertIs(a_shared, b_shared)
+    copied_b_shared, copied_b_jar = copied.get_classpath_entries_for_targets([b])
+    self.assertIs(a_shared, copied_b_shared)
+    self.assertIs(a_jar, copied_b_jar)
+
+  def test_memoized_classpaths(self):
+    b = self.make_target('b', JvmTarget, excludes=[Exclude('com.example', 'lib')])
+    a = self.make_target('a', JvmTarget, dependencies=[b])
+
+    classpath_product = ClasspathProducts(self.pants_workdir)
+    self.add_example_jar_classpath_element_for(classpath_product, a)
+    classpath_product.add_for_target(b, [('default', self.path('b/path'))])
+    a_closure = a.closure(bfs=True)
+
+    classpath = classpath_product.get_for_targets(a_closure)
+    self.assertEqual([('default', self._example_jar_path()), ('default', self.path('b/path'))],
+                     classpath)
+    # The memoized classpath is not affected by edits to the classpaths returned.
+    classpath.pop()
+    self.assertEqual([('default', self._example_jar_path()), ('default', self.path('b/path'))],
+                     classpath_product.get_for_targets(a_closure))
+
+    # Edits to the classpaths or excludes take effect.
+    classpath_product.add_for_target(a, [('default', self.path('a/path'))])
+    self.assertEqual([('default', self._example_jar_path()), ('default', self.path('a/path')),
+                      ('default', self.path('b/path'))],
+                     classpath_product.get_for_targets(a_closure))
+    self.add_excludes_for_targets(classpath_product, b)
+    self.assertEqual([('default', self.path('a/path')), ('default', self.path('b/path'))],
+                     classpath_product.get_for_targets(a_closure))
+    self.assertEqual([('default', self.path('a/path'))], classpath_product.get_for_targets([a]))
+    self.assertEqual([('default', self._example_jar_path()), ('default', self.path('a/path')),
+                      ('default', self.path('b/path'))],
+                     [(conf, entry.path) for conf, entry in
+                      classpath_product.get_classpath_entries_for_targets(a_closure,
+                                                                          respect_excludes=False)])
+
   def test_create_canonical_classpath(self):
     a = self.make_target('a/b', JvmTarget)
 
@@ -93,6 +93,35 @@ class DuplicateDetectorTest(JvmTaskTestBase):
     }
     self.assertEqual(expected, conflicts_by_binary)
 
+  def test_duplicates_found_per_binary(self):
+    self.set_options(fail_fast=False)
+    binary_a = self.make_target(spec='src/java/com/twitter:a',
+                                target_type=JvmBinary,
+                                dependencies=[self.test_jarlib, self.dups_jarlib])
+    binary_b = self.make_target(spec='src/java/com/twitter:b',
+                                target_type=JvmBinary,
+                                dependencies=[self.dups_jarlib, self.no_dups_jarlib])
+    context = self.context(target_roots=[binary_a, binary_b])
+    task = self.create_task(context)
+
+    classpath = self.get_runtime_classpath(context)
+    classpath.add_jars_for_targets([self.test_jarlib], 'default', [self.test_resolved_jar])
+    classpath.add_jars_for_targets([self.dups_jarlib], 'default', [self.dups_resolved_jar])
+    classpath.add_jars_for_targets([self.no_dups_jarlib], 'default', [self.no_dups_resolved_jar])
+
+    conflicts_by_binary = task.execute()
+    expected = {
+      binary_a: {
+        ('org.example-dups-0.0.1.jar', 'org.example-test-0.0.1.jar'):
+          {'com/twitter/commons/Duplicate.class'}
+      },
+      binary_b: {
+        ('org.example-dups-0.0.1.jar', 'org.example-no_dups-0.0.1.jar'):
+          {'org/apache/Unique.class'}
+      }
+    }
+    self.assertEqual(expected, conflicts_by_binary)
+
   def test_duplicate_skip(self):
     self.set_options(fail_fast=False, skip=True)
     task, _ = self._setup_external_duplicate()
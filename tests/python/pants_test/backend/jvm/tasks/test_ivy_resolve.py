@@ -417,7 +417,8 @@ class IvyResolveTest(JvmToolTaskTestBase):
 
   def _find_resolve_workdir(self, workdir):
     ivy_dir = os.path.join(workdir, 'ivy')
-    ivy_dir_subdirs = os.listdir(ivy_dir)
+    ivy_dir_subdirs = [name for name in os.listdir(ivy_dir)
+                       if os.path.isdir(os.path.join(ivy_dir, name))]
     ivy_dir_subdirs.remove('jars')  # Ignore the jars directory.
     self.assertEqual(1, len(ivy_dir_subdirs), 'There should only be the resolve directory.')
     print('>>> got dir {}'.format(ivy_dir_subdirs))
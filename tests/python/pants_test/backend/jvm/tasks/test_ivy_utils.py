@@ -11,11 +11,12 @@ import xml.etree.ElementTree as ET
 from collections import namedtuple
 from textwrap import dedent
 
+import mock
 from twitter.common.collections import OrderedSet
 
 from pants.backend.jvm.ivy_utils import (FrozenResolution, IvyFetchStep, IvyInfo, IvyModule,
-                                         IvyModuleRef, IvyResolveMappingError, IvyResolveResult,
-                                         IvyResolveStep, IvyUtils)
+                                         IvyModuleRef, IvyResolutionIndex, IvyResolveMappingError,
+                                         IvyResolveResult, IvyResolveStep, IvyUtils)
 from pants.backend.jvm.register import build_file_aliases as register_jvm
 from pants.backend.jvm.subsystems.jar_dependency_management import JarDependencyManagement
 from pants.backend.jvm.targets.jar_library import JarLibrary
@@ -26,6 +27,7 @@ from pants.java.jar.exclude import Exclude
 from pants.java.jar.jar_dependency import JarDependency
 from pants.java.jar.jar_dependency_utils import M2Coordinate
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
+from pants.util.dirutil import safe_file_dump, safe_rmtree
 from pants_test.base_test import BaseTest
 from pants_test.subsystem.subsystem_util import init_subsystem
 
@@ -407,6 +409,31 @@ class IvyUtilsGenerateIvyTest(IvyUtilsTestBase):
                                                                     'INVALID_REPORT_UNIQUE_NAME',
                                                                     'default'))
 
+  def test_parse_xml_report_cached(self):
+    with temporary_dir() as workdir:
+      report_path = os.path.join(workdir, 'resolve-report-default.xml')
+      with open(self.ivy_report_path('ivy_utils_resources/report_with_diamond.xml')) as fp:
+        safe_file_dump(report_path, fp.read())
+
+      ivy_info = IvyUtils.parse_xml_report('default', report_path, cache=True)
+      self.assertTrue(os.path.isfile(os.path.join(workdir, 'resolve-report-default.json')))
+
+      # While the report is unchanged its modules are loaded from the sidecar file.
+      with mock.patch.object(IvyUtils, '_parse_xml_report_modules') as parse:
+        cached_ivy_info = IvyUtils.parse_xml_report('default', report_path, cache=True)
+        self.assertFalse(parse.called)
+      self.assertEqual(ivy_info.modules_by_ref, cached_ivy_info.modules_by_ref)
+
+      with open(self.ivy_report_path('ivy_utils_resources/report_with_cycle.xml')) as fp:
+        safe_file_dump(report_path, fp.read())
+      self.assertEqual(self.parse_ivy_report('ivy_utils_resources/report_with_cycle.xml')
+                         .modules_by_ref,
+                       IvyUtils.parse_xml_report('default', report_path, cache=True)
+                         .modules_by_ref)
+
+  def ivy_report_path(self, rel_path):
+    return os.path.join('tests/python/pants_test/backend/jvm/tasks', rel_path)
+
   def parse_ivy_report(self, rel_path):
     path = os.path.join('tests/python/pants_test/backend/jvm/tasks', rel_path)
     ivy_info = IvyUtils.parse_xml_report(conf='default', path=path)
@@ -634,6 +661,119 @@ class IvyUtilsResolveStepsTest(BaseTest):
     return os.path.join('tests/python/pants_test/backend/jvm/tasks', rel_path)
 
 
+class IvyResolutionIndexTest(IvyUtilsTestBase):
+
+  REPORT = dedent("""
+    <?xml version="1.0" encoding="UTF-8"?>
+    <ivy-report version="1.0">
+      <info organisation="internal" module="{hash_name}" revision="latest" />
+      <dependencies>
+        <module organisation="org1" name="name1">
+          <revision name="0.0.1">
+            <caller organisation="internal" name="{hash_name}" callerrev="latest"/>
+            <artifacts>
+              <artifact ext="jar" location="{cache_dir}/org1/name1.jar"/>
+            </artifacts>
+          </revision>
+        </module>
+        <module organisation="org2" name="name2">
+          <revision name="0.0.1">
+            <caller organisation="org1" name="name1" callerrev="0.0.1"/>
+            <artifacts>
+              <artifact ext="jar" location="{cache_dir}/org2/name2.jar"/>
+            </artifacts>
+          </revision>
+          {evicted}
+        </module>
+        <module organisation="org3" name="name3">
+          <revision name="0.0.1">
+            <caller organisation="internal" name="{hash_name}" callerrev="latest"/>
+            <artifacts>
+              <artifact ext="jar" location="{cache_dir}/org3/name3.jar"/>
+            </artifacts>
+          </revision>
+        </module>
+      </dependencies>
+    </ivy-report>
+    """).strip()
+
+  EVICTED = '<revision name="0.0.0" evicted="latest-revision"/>'
+
+  def setUp(self):
+    super(IvyResolutionIndexTest, self).setUp()
+    self.lib1 = self.make_target('lib1', JarLibrary, jars=[JarDependency('org1', 'name1', '0.0.1')])
+    self.lib3 = self.make_target('lib3', JarLibrary, jars=[JarDependency('org3', 'name3', '0.0.1')])
+    self.cache_dir = os.path.join(self.build_root, 'ivy-cache')
+    self.ivy_workdir = os.path.join(self.build_root, 'ivy-workdir')
+
+  def resolve_step(self, hash_name, confs=('default',)):
+    return IvyResolveStep(confs, hash_name, None, False, self.cache_dir, self.ivy_workdir)
+
+  def record(self, hash_name, targets, evicted=False):
+    """Lays out the files of a resolve of the given targets as if ivy had run it, and records it."""
+    jars = []
+    for name in ('org1/name1', 'org2/name2', 'org3/name3'):
+      jar = os.path.join(self.cache_dir, '{}.jar'.format(name))
+      safe_file_dump(jar, '')
+      jars.append(jar)
+    resolve_step = self.resolve_step(hash_name)
+    safe_file_dump(resolve_step.ivy_cache_classpath_filename, os.pathsep.join(jars))
+    safe_file_dump(resolve_step.resolve_report_path('default'),
+                   self.REPORT.format(hash_name=hash_name,
+                                      cache_dir=self.cache_dir,
+                                      evicted=self.EVICTED if evicted else ''))
+    IvyResolutionIndex(self.ivy_workdir).record(resolve_step, targets)
+
+  def project(self, hash_name, targets, confs=('default',)):
+    return IvyResolutionIndex(self.ivy_workdir).project(self.resolve_step(hash_name, confs),
+                                                        targets)
+
+  def test_project(self):
+    self.record('superset', [self.lib1, self.lib3])
+
+    result = self.project('subset', [self.lib1])
+    self.assertEqual('subset', result.resolve_hash_name)
+    symlink_dir = os.path.join(self.ivy_workdir, 'jars')
+    self.assertEqual([os.path.join(symlink_dir, 'org1/name1.jar'),
+                      os.path.join(symlink_dir, 'org2/name2.jar')],
+                     result.resolved_artifact_paths)
+    [(target, resolved_jars)] = list(result.resolved_jars_for_each_target('default',
+                                                                          [self.lib1]))
+    self.assertEqual(self.lib1, target)
+    self.assertEqual([coord('org1', 'name1', ext='jar'), coord('org2', 'name2', ext='jar')],
+                     [resolved_jar.coordinate for resolved_jar in resolved_jars])
+
+    # The projection is stored as the resolve of its own step.
+    subset_step = self.resolve_step('subset')
+    self.assertTrue(subset_step.required_load_files_exist())
+    self.assertTrue(os.path.isfile(subset_step.frozen_resolve_file))
+    self.assertEqual(result.resolved_artifact_paths,
+                     subset_step.load([self.lib1]).resolved_artifact_paths)
+
+  def test_records_of_deleted_resolves_pruned(self):
+    self.record('superset', [self.lib1, self.lib3])
+    safe_rmtree(self.resolve_step('superset').workdir)
+    self.assertIsNone(self.project('subset', [self.lib1]))
+
+    self.record('other', [self.lib3])
+    with open(os.path.join(self.ivy_workdir, 'resolution-index.json')) as fp:
+      self.assertEqual(['other'], json.load(fp)['resolves'].keys())
+
+  def test_no_projection(self):
+    self.assertIsNone(self.project('subset', [self.lib1]))
+
+    self.record('superset', [self.lib1])
+    lib1_other_rev = self.make_target('lib1_other_rev', JarLibrary,
+                                      jars=[JarDependency('org1', 'name1', '0.0.2')])
+    self.assertIsNone(self.project('subset', [lib1_other_rev]))
+    self.assertIsNone(self.project('subset', [self.lib3]))
+    self.assertIsNone(self.project('subset', [self.lib1], confs=('default', 'sources')))
+
+  def test_evictions_not_recorded(self):
+    self.record('superset', [self.lib1, self.lib3], evicted=True)
+    self.assertIsNone(self.project('subset', [self.lib1]))
+
+
 class IvyFrozenResolutionTest(BaseTest):
 
   def test_spec_without_a_real_target(self):
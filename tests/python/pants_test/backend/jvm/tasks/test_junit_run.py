@@ -7,6 +7,8 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import subprocess
+import time
+from collections import defaultdict
 from textwrap import dedent
 
 from mock import patch
@@ -18,10 +20,12 @@ from pants.backend.python.targets.python_tests import PythonTests
 from pants.base.exceptions import TargetDefinitionException, TaskError
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.resources import Resources
+from pants.goal.products import MultipleRootedProducts
 from pants.ivy.bootstrapper import Bootstrapper
 from pants.ivy.ivy_subsystem import IvySubsystem
 from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import SubprocessExecutor
+from pants.java.junit.junit_xml_parser import Test as JUnitTest
 from pants.util.contextutil import environment_as
 from pants.util.dirutil import safe_file_dump
 from pants.util.timeout import TimeoutReached
@@ -147,9 +151,9 @@ class JUnitRunnerTest(JvmToolTaskTestBase):
       args, kwargs = mock_timeout.call_args
       self.assertEqual(args, (1,))
 
-  def _execute_junit_runner(self, list_of_filename_content_tuples, create_some_resources=True, **kwargs):
+  def _execute_junit_runner(self, list_of_filename_content_tuples, create_some_resources=True,
+                            test_rel_path='tests/java/org/pantsbuild/foo', **kwargs):
     # Create the temporary base test directory
-    test_rel_path = 'tests/java/org/pantsbuild/foo'
     test_abs_path = self.create_dir(test_rel_path)
 
     # Create the temporary classes directory under work dir
@@ -206,6 +210,19 @@ class JUnitRunnerTest(JvmToolTaskTestBase):
     # populated by java compilation step.
     self.populate_runtime_classpath(context=context, classpath=[test_classes_abs_path])
 
+    if kwargs.get('analyze'):
+      # Stand in for the analysis of the test classes that compilation with zinc would produce.
+      classes_by_source = context.products.safe_create_data(
+        'classes_by_source', lambda: defaultdict(MultipleRootedProducts))
+      product_deps_by_src = context.products.safe_create_data('product_deps_by_src', dict)
+      deps_by_src = product_deps_by_src.setdefault(target, {})
+      for test_java_file_abs_path in test_java_file_abs_paths:
+        classname, _ = os.path.splitext(os.path.basename(test_java_file_abs_path))
+        test_java_file_rel_path = os.path.relpath(test_java_file_abs_path, self.build_root)
+        classes_by_source[test_java_file_rel_path].add_rel_paths(test_classes_abs_path,
+                                                                 ['{}.class'.format(classname)])
+        deps_by_src[test_java_file_abs_path] = []
+
     # Finally execute the task.
     self.execute(context)
 
@@ -410,3 +427,101 @@ class JUnitRunnerTest(JvmToolTaskTestBase):
     self.set_options(max_subprocess_args=max_subprocess_args)
 
     self._execute_junit_runner(list_of_filename_content_tuples, target_name='foo:foo_test')
+
+  def test_junit_run_batch_concurrency(self):
+    list_of_filename_content_tuples = []
+    for n in range(4):
+      filename = 'FooTest{}.java'.format(n)
+      content = dedent("""
+          import org.junit.Test;
+          import static org.junit.Assert.assertTrue;
+          public class FooTest{}{{
+          @Test
+            public void testFoo() {{
+              assertTrue({});
+            }}
+          }}""".format(n, 'false' if n == 3 else 'true'))
+      list_of_filename_content_tuples.append((filename, content))
+
+    self.make_target(
+      spec='foo:foo_test',
+      target_type=JUnitTests,
+      sources=[name for name, _ in list_of_filename_content_tuples],
+    )
+    self.set_options(batch_concurrency=2)
+
+    with self.assertRaises(TaskError) as cm:
+      self._execute_junit_runner(list_of_filename_content_tuples, target_name='foo:foo_test')
+    self.assertEqual([t.name for t in cm.exception.failed_targets], ['foo_test'])
+
+  def test_partition_keeps_the_tests_of_a_class_together(self):
+    self.set_options(batch_concurrency=2)
+    task = self.create_task(self.context())
+    tests = [JUnitTest('FooTest', 'testA'), JUnitTest('BarTest'), JUnitTest('FooTest', 'testB'),
+             JUnitTest('BazTest')]
+    batches = task._partition(tests)
+    self.assertEqual(2, len(batches))
+    self.assertEqual(sorted(tests), sorted(test for batch in batches for test in batch))
+    foo_batch, = [batch for batch in batches if JUnitTest('FooTest', 'testA') in batch]
+    self.assertIn(JUnitTest('FooTest', 'testB'), foo_batch)
+
+  def test_prune_unused_test_results(self):
+    task = self.create_task(self.context())
+    results_dir = os.path.join(task.workdir, JUnitRun._TEST_RESULTS_DIR)
+    for classname in ('FooTest', 'BarTest'):
+      safe_file_dump(os.path.join(results_dir, classname, 'abc', 'TEST-{}.xml'.format(classname)),
+                     '')
+    stale = time.time() - JUnitRun._TEST_RESULTS_MAX_AGE_SECS - 60
+    os.utime(os.path.join(results_dir, 'BarTest'), (stale, stale))
+    task._prune_test_results()
+    self.assertEqual(['FooTest'], os.listdir(results_dir))
+
+  def test_junit_run_cache_test_results(self):
+    list_of_filename_content_tuples = [('FooTest.java', dedent("""
+        import org.junit.Test;
+        import static org.junit.Assert.assertTrue;
+        public class FooTest {
+          @Test
+          public void testFoo() {
+            assertTrue(5 > 3);
+          }
+        }
+      """))]
+    self.make_target(spec='foo:foo_test', target_type=JUnitTests, sources=['FooTest.java'])
+    self.set_options(cache_test_results=True)
+
+    self._execute_junit_runner(list_of_filename_content_tuples, target_name='foo:foo_test',
+                               analyze=True)
+    with patch.object(JUnitRun, '_spawn_and_wait') as spawn_and_wait:
+      self._execute_junit_runner(list_of_filename_content_tuples, target_name='foo:foo_test',
+                                 analyze=True)
+    self.assertFalse(spawn_and_wait.called)
+
+  def test_junit_run_cache_test_results_of_other_targets(self):
+    def test_class(classname):
+      return [('{}.java'.format(classname), dedent("""
+          import org.junit.Test;
+          import static org.junit.Assert.assertTrue;
+          public class {} {{
+            @Test
+            public void testFoo() {{
+              assertTrue(5 > 3);
+            }}
+          }}
+        """.format(classname)))]
+
+    self.make_target(spec='foo:foo_test', target_type=JUnitTests, sources=['FooTest.java'])
+    self.make_target(spec='bar:bar_test', target_type=JUnitTests, sources=['BarTest.java'])
+    self.set_options(cache_test_results=True)
+
+    def run_foo():
+      self._execute_junit_runner(test_class('FooTest'), target_name='foo:foo_test', analyze=True,
+                                 test_rel_path='tests/java/org/pantsbuild/foo')
+
+    run_foo()
+    # A run of disjoint targets keeps the stored results of the first.
+    self._execute_junit_runner(test_class('BarTest'), target_name='bar:bar_test', analyze=True,
+                               test_rel_path='tests/java/org/pantsbuild/bar')
+    with patch.object(JUnitRun, '_spawn_and_wait') as spawn_and_wait:
+      run_foo()
+    self.assertFalse(spawn_and_wait.called)
@@ -17,7 +17,7 @@ from pants.backend.python.tasks2.pytest_run import PytestRun
 from pants.backend.python.tasks2.resolve_requirements import ResolveRequirements
 from pants.backend.python.tasks2.select_interpreter import SelectInterpreter
 from pants.base.exceptions import ErrorWhileTesting
-from pants.util.contextutil import pushd
+from pants.util.contextutil import pushd, temporary_dir
 from pants.util.timeout import TimeoutReached
 from pants_test.backend.python.tasks.python_task_test_base import PythonTaskTestBase
 
@@ -333,6 +333,11 @@ class PytestTest(PytestTestBase):
     self.run_failing_tests(targets=[self.red, self.red_in_class], failed_targets=[self.red_in_class],
                            fail_fast=True, fast=True)
 
+  def test_partitions_run_concurrently(self):
+    self.run_failing_tests(targets=[self.green, self.red, self.red_in_class, self.error],
+                           failed_targets=[self.red, self.red_in_class, self.error],
+                           fast=False, partition_concurrency=2)
+
   def test_red_test_in_class(self):
     # for test in a class, the failure line is in the following format
     # F testprojects/tests/python/pants/constants_only/test_fail.py::TestClassName::test_boom
@@ -437,6 +442,17 @@ class PytestTest(PytestTestBase):
     self.assertEqual([1, 2, 5, 6], all_statements)
     self.assertEqual([], not_run_statements)
 
+  def test_coverage_concurrent_partitions(self):
+    with temporary_dir() as coverage_output_dir:
+      self.run_failing_tests(targets=[self.green, self.red], failed_targets=[self.red],
+                             coverage='auto', coverage_output_dir=coverage_output_dir,
+                             fast=False, partition_concurrency=2)
+      # Each partition emits its own coverage data and reports.
+      self.assertFalse(os.path.isfile(self.coverage_data_file()))
+      for target in (self.green, self.red):
+        self.assertTrue(os.path.isfile(os.path.join(coverage_output_dir, target.id,
+                                                    'coverage.xml')))
+
   def test_sharding(self):
     shard0_failed_targets = self.try_run_tests(targets=[self.red, self.green], test_shard='0/2')
     shard1_failed_targets = self.try_run_tests(targets=[self.red, self.green], test_shard='1/2')
@@ -57,6 +57,11 @@ class TestContext(Context):
 
     def report_target_info(self, scope, target, keys, val): pass
 
+    def register_thread(self, parent_workunit): pass
+
+    @contextmanager
+    def thread_working(self): yield
+
 
   @contextmanager
   def new_workunit(self, name, labels=None, cmd='', log_config=None):
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import threading
 import unittest
+from contextlib import contextmanager
 
 from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnit
@@ -17,6 +18,10 @@ class FakeRunTracker(object):
   def register_thread(self, one):
     pass
 
+  @contextmanager
+  def thread_working(self):
+    yield
+
 
 def keyboard_interrupt_raiser():
   raise KeyboardInterrupt()
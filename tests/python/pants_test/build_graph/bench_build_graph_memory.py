@@ -0,0 +1,110 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import random
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+from twitter.common.collections import OrderedSet
+
+from pants.build_graph.address import Address
+from pants.build_graph.address_graph import AddressGraph
+from pants.build_graph.mutable_build_graph import MutableBuildGraph
+from pants.build_graph.target import Target
+
+
+# The number of dependencies of each synthetic target.
+_FANOUT = 8
+
+
+def _addresses(size):
+  return [Address('src/{}/{}'.format(i // 100, i % 100), 'lib{}'.format(i)) for i in range(size)]
+
+
+def _edges(size):
+  rng = random.Random(size)
+  for i in range(1, size):
+    for j in set(rng.randrange(i) for _ in range(min(i, _FANOUT))):
+      yield i, j
+
+
+def _build_dicts(size):
+  addresses = _addresses(size)
+  dependencies = defaultdict(OrderedSet)
+  dependents = defaultdict(set)
+  for i, j in _edges(size):
+    dependencies[addresses[i]].add(addresses[j])
+    dependents[addresses[j]].add(addresses[i])
+  return dependencies, dependents
+
+
+def _build_address_graph(size):
+  addresses = _addresses(size)
+  graph = AddressGraph()
+  for address in addresses:
+    graph.id_of(address)
+  for i, j in _edges(size):
+    graph.add_edge(addresses[i], addresses[j])
+  return graph
+
+
+def _build_build_graph(size):
+  addresses = _addresses(size)
+  graph = MutableBuildGraph(address_mapper=None)
+  for address in addresses:
+    graph.inject_target(Target(name=address.target_name, address=address, build_graph=graph))
+  for i, j in _edges(size):
+    graph.inject_dependency(addresses[i], addresses[j])
+  return graph
+
+
+_LAYOUTS = [
+  ('dicts', _build_dicts),
+  ('address-graph', _build_address_graph),
+  ('build-graph', _build_build_graph),
+]
+
+
+def _measure(layout, size):
+  """Builds one graph in this process, and prints the growth of its peak RSS in KiB."""
+  build = dict(_LAYOUTS)[layout]
+  baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  graph = build(size)
+  print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline)
+  return graph
+
+
+def main():
+  """Measure the memory held by the edges of large build graphs.
+
+  To run:
+
+  ./pants run tests/python/pants_test/build_graph:bench_build_graph_memory -- [<size> ...]
+
+  Builds a synthetic graph of the given numbers of targets (default 10000, 100000 and 500000), each
+  with up to eight dependencies, in a fresh process per size and layout, and reports the growth of
+  peak RSS for each of: edges held in dicts of OrderedSets and sets as BuildGraph used to hold
+  them, edges held in an AddressGraph, and a whole BuildGraph of bare Targets.
+  """
+  args = sys.argv[1:]
+  if len(args) == 3 and args[0] == '--measure':
+    _measure(args[1], int(args[2]))
+    return
+
+  sizes = [int(arg) for arg in args] or [10000, 100000, 500000]
+  print('{:>10} {:>14} {:>12} {:>14}'.format('targets', 'layout', 'rss (MiB)', 'bytes/target'))
+  for size in sizes:
+    for layout, _ in _LAYOUTS:
+      cmd = [sys.executable, sys.argv[0], '--measure', layout, str(size)]
+      kib = int(subprocess.check_output(cmd).strip().splitlines()[-1])
+      print('{:>10} {:>14} {:>12.1f} {:>14.0f}'.format(size, layout, kib / 1024, kib * 1024 / size))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,83 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import random
+import sys
+
+from pants.build_graph.address import Address
+from pants.build_graph.mutable_build_graph import MutableBuildGraph
+from pants.build_graph.target import Target
+from pants.util.contextutil import Timer
+
+
+def _graph(layers, width, fanout):
+  """Builds a graph of `layers` layers of `width` targets, each depending on up to `fanout` targets
+  of the next layer, and returns it with the addresses of its first layer."""
+  rng = random.Random(layers * width)
+  graph = MutableBuildGraph(address_mapper=None)
+  layer = []
+  for i in reversed(range(layers)):
+    next_layer = layer
+    layer = [Address('layer{}'.format(i), 't{}'.format(j)) for j in range(width)]
+    for address in layer:
+      dependencies = set(rng.choice(next_layer) for _ in range(fanout)) if next_layer else ()
+      graph.inject_target(Target(name=address.target_name, address=address, build_graph=graph),
+                          dependencies=dependencies)
+  return graph, layer
+
+
+def _walk(graph, roots):
+  walked = []
+  graph.walk_transitive_dependency_graph(roots, walked.append)
+  return walked
+
+
+def _time(run, runs):
+  with Timer() as timer:
+    for _ in range(runs):
+      run()
+  return timer.elapsed / runs
+
+
+def main():
+  """Measure transitive walks of deep and of wide build graphs.
+
+  To run:
+
+  ./pants run tests/python/pants_test/build_graph:bench_build_graph_walks -- [<runs>]
+
+  Builds a deep graph (a chain of 20000 targets, deeper than the recursion limit) and a wide one
+  (50 layers of 2000 targets, each with up to 4 dependencies), and reports the mean time over the
+  given number of runs (default 5) of: an uncached walk of the dependencies of the first root and
+  of all roots, and `transitive_subgraph_of_addresses` for the same roots on a fresh graph epoch and
+  once memoized.
+  """
+  args = sys.argv[1:]
+  runs = int(args[0]) if args else 5
+
+  print('{:>6} {:>10} {:>10} {:>10} {:>10}'.format('graph', 'roots', 'walk (s)', 'cold (s)',
+                                                   'warm (s)'))
+  for name, layers, width, fanout in [('deep', 20000, 1, 1), ('wide', 50, 2000, 4)]:
+    graph, roots = _graph(layers, width, fanout)
+    for roots_name, addresses in [('one', roots[:1]), ('all', roots)]:
+      def walk():
+        _walk(graph, addresses)
+
+      def cold():
+        # Clearing the memo has the same effect as starting a new graph epoch.
+        graph._closures.clear()
+        graph.transitive_subgraph_of_addresses(addresses)
+
+      def warm():
+        graph.transitive_subgraph_of_addresses(addresses)
+
+      print('{:>6} {:>10} {:>10.4f} {:>10.4f} {:>10.4f}'.format(
+        name, roots_name, _time(walk, runs), _time(cold, runs), _time(warm, runs)))
+
+
+if __name__ == '__main__':
+  main()
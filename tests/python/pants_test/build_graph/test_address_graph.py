@@ -0,0 +1,77 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import pickle
+import unittest
+
+from pants.build_graph.address import Address, BuildFileAddress
+from pants.build_graph.address_graph import AddressGraph
+
+
+class AddressGraphTest(unittest.TestCase):
+
+  def setUp(self):
+    self.graph = AddressGraph()
+    self.a = Address('a', 'a')
+    self.b = Address('b', 'b')
+    self.c = Address('c', 'c')
+
+  def test_id_of(self):
+    self.assertEqual(0, self.graph.id_of(self.a))
+    self.assertEqual(1, self.graph.id_of(self.b))
+    self.assertEqual(0, self.graph.id_of(Address('a', 'a')))
+    self.assertEqual(2, len(self.graph))
+    self.assertIs(self.a, self.graph.address_of(0))
+
+  def test_id_of_canonical(self):
+    self.graph.id_of(self.a)
+    a = Address('a', 'a')
+    self.assertEqual(0, self.graph.id_of(a, canonical=True))
+    self.assertIs(a, self.graph.address_of(0))
+
+  def test_add_edge(self):
+    self.assertTrue(self.graph.add_edge(self.a, self.b))
+    self.assertTrue(self.graph.add_edge(self.a, self.c))
+    self.assertFalse(self.graph.add_edge(self.a, Address('b', 'b')))
+    self.assertTrue(self.graph.add_edge(self.c, self.b))
+
+    self.assertEqual([self.b, self.c], list(self.graph.dependencies_of(self.a)))
+    self.assertEqual([self.a, self.c], list(self.graph.dependees_of(self.b)))
+    self.assertEqual([], list(self.graph.dependees_of(self.a)))
+    self.assertEqual([1, 2], list(self.graph.dependency_ids(0)))
+    self.assertEqual((), self.graph.dependee_ids(0))
+
+  def test_views(self):
+    dependencies = self.graph.dependencies_of(self.a)
+    self.assertEqual(0, len(dependencies))
+    self.assertNotIn(self.b, dependencies)
+
+    # Views reflect edges added after they were taken.
+    self.graph.add_edge(self.a, self.b)
+    self.assertEqual(1, len(dependencies))
+    self.assertIn(self.b, dependencies)
+    self.assertNotIn(self.c, dependencies)
+    self.assertNotIn(Address('d', 'd'), dependencies)
+
+
+class SlottedAddressTest(unittest.TestCase):
+
+  def test_no_dict(self):
+    self.assertFalse(hasattr(Address('a', 'a'), '__dict__'))
+
+  def test_pickle(self):
+    address = Address('a/b', 'c')
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+      unpickled = pickle.loads(pickle.dumps(address, protocol))
+      self.assertEqual(address, unpickled)
+      self.assertEqual(hash(address), hash(unpickled))
+
+  def test_pickle_build_file_address(self):
+    address = BuildFileAddress(rel_path='a/b/BUILD', target_name='c')
+    unpickled = pickle.loads(pickle.dumps(address, pickle.HIGHEST_PROTOCOL))
+    self.assertEqual(address, unpickled)
+    self.assertEqual('a/b/BUILD', unpickled.rel_path)
@@ -173,6 +173,53 @@ class BuildConfigurationTest(unittest.TestCase):
       self.assertEqual(1, len(parse_state.parse_globals))
       yield parse_state.parse_globals['george']
 
+  def test_register_deferred_aliases(self):
+    class Fred(Target):
+      pass
+
+    loads = []
+
+    def load_aliases():
+      loads.append(True)
+      return BuildFileAliases(targets={'fred': Fred}, objects={'jane': 42, 'joe': 1})
+
+    self.build_configuration.register_deferred_aliases(['fred', 'jane'], load_aliases)
+    self.assertEqual({'fred', 'jane'}, self.build_configuration.deferred_aliases())
+
+    with self._create_mock_build_file('fred') as build_file:
+      parse_state = self.build_configuration.initialize_parse_state(build_file)
+      self.assertEqual(2, len(parse_state.parse_globals))
+      self.assertEqual([], loads)
+
+      parse_state.parse_globals['fred'](name='jake')
+      self.assertEqual([True], loads)
+      self.assertEqual(frozenset(), self.build_configuration.deferred_aliases())
+
+      self.assertEqual(1, len(parse_state.objects))
+      self.assertEqual(Fred, parse_state.objects[0].addressed_type)
+      self.assertEqual(42, parse_state.parse_globals['jane'])
+
+    # Only the aliases deferred to the loader are registered.
+    aliases = self.build_configuration.registered_aliases()
+    self.assertEqual(dict(fred=Fred), aliases.target_types)
+    self.assertEqual(dict(jane=42), aliases.objects)
+
+  def test_register_deferred_aliases_superseded(self):
+    self.build_configuration.register_deferred_aliases(['jane'], lambda: self.fail('Not loaded.'))
+    self._register_aliases(objects={'jane': 42})
+
+    self.assertEqual(frozenset(), self.build_configuration.deferred_aliases())
+    self.assertEqual(dict(jane=42), self.build_configuration.registered_aliases().objects)
+
+  def test_register_deferred_aliases_undefined(self):
+    self.build_configuration.register_deferred_aliases(['jane'], lambda: BuildFileAliases())
+
+    with self._create_mock_build_file('jane') as build_file:
+      parse_state = self.build_configuration.initialize_parse_state(build_file)
+      with self.assertRaises(NameError):
+        parse_state.parse_globals['jane']()
+      self.assertNotIn('jane', parse_state.parse_globals)
+
   @contextmanager
   def _create_mock_build_file(self, dirname):
     with temporary_dir() as root:
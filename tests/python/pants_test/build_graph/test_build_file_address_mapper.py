@@ -9,12 +9,16 @@ import os
 import re
 from textwrap import dedent
 
+from pants.backend.python.targets.python_library import PythonLibrary
 from pants.base.cmd_line_spec_parser import CmdLineSpecParser
 from pants.base.specs import DescendantAddresses, SingleAddress
 from pants.build_graph.address import Address, BuildFileAddress
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.build_file_address_mapper import BuildFileAddressMapper
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.mutable_build_graph import MutableBuildGraph
 from pants.build_graph.target import Target
+from pants.source.wrapped_globs import Globs
 from pants_test.base_test import BaseTest
 
 
@@ -277,3 +281,29 @@ Invalid BUILD files for \[::\]$""", re.DOTALL)
 
     self.assertEqual(sort(Address.parse(addr) for addr in expected),
                      sort(address_mapper.scan_specs(specs)))
+
+
+class ParallelBuildFileAddressMapperScanTest(BuildFileAddressMapperScanTest):
+  """Scans with BUILD files parsed in worker processes."""
+
+  def setUp(self):
+    super(ParallelBuildFileAddressMapperScanTest, self).setUp()
+    self.address_mapper = BuildFileAddressMapper(self.build_file_parser, self.project_tree,
+                                                 parse_workers=2)
+    self.build_graph = MutableBuildGraph(address_mapper=self.address_mapper)
+
+  @property
+  def alias_groups(self):
+    return BuildFileAliases(targets={'target': Target, 'python_library': PythonLibrary},
+                            context_aware_object_factories={'globs': Globs})
+
+  def test_parsed_in_workers(self):
+    self.add_to_build_file('globbed', 'python_library(sources=globs("*.py"))\n')
+    self.create_file('globbed/a.py')
+    self.address_mapper._parse_spec_paths(['a', 'a/b', 'globbed'])
+
+    # Nothing is left to parse on demand, not even the lazily globbed sources.
+    self.build_file_parser.parse_build_file = lambda build_file: self.fail('Parsed on demand.')
+    self.assert_scanned(['a::', 'globbed'], expected=['a', 'a:b', 'a/b', 'a/b:c', 'globbed'])
+    target = self.target('globbed')
+    self.assertEqual(['globbed/a.py'], target.sources_relative_to_buildroot())
@@ -0,0 +1,107 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import time
+import unittest
+
+import mock
+import six
+
+from pants.base.build_file import BuildFile
+from pants.base.file_system_project_tree import FileSystemProjectTree
+from pants.build_graph.build_file_code_cache import BuildFileCodeCache
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class BuildFileCodeCacheTest(unittest.TestCase):
+
+  def build_file(self, root, content, relpath='a/BUILD'):
+    safe_file_dump(os.path.join(root, relpath), content)
+    BuildFile.clear_cache()
+    return BuildFile(FileSystemProjectTree(root), relpath)
+
+  def evaluate(self, code):
+    parse_globals = {}
+    six.exec_(code, parse_globals)
+    return parse_globals['x']
+
+  def test_code(self):
+    with temporary_dir() as root:
+      cache = BuildFileCodeCache()
+      code = cache.code(self.build_file(root, 'x = 1\n'))
+      self.assertEqual(1, self.evaluate(code))
+      self.assertEqual(os.path.join(os.path.realpath(root), 'a', 'BUILD'), code.co_filename)
+      self.assertIs(code, cache.code(self.build_file(root, 'x = 1\n')))
+      self.assertEqual(2, self.evaluate(cache.code(self.build_file(root, 'x = 2\n'))))
+
+  def test_syntax_error(self):
+    with temporary_dir() as root:
+      with self.assertRaises(SyntaxError):
+        BuildFileCodeCache().code(self.build_file(root, 'x = (\n'))
+
+  def test_persisted(self):
+    with temporary_dir() as root:
+      with temporary_dir() as path:
+        BuildFileCodeCache(path=path).code(self.build_file(root, 'x = 1\n'))
+        self.assertEqual(1, len(os.listdir(path)))
+
+        # The persisted code object is loaded rather than compiled again.
+        cache = BuildFileCodeCache(path=path)
+        cache._save = lambda build_file, key, code: self.fail('Compiled again.')
+        self.assertEqual(1, self.evaluate(cache.code(self.build_file(root, 'x = 1\n'))))
+
+        # A persisted code object compiled from other content is not used.
+        cache = BuildFileCodeCache(path=path)
+        self.assertEqual(2, self.evaluate(cache.code(self.build_file(root, 'x = 2\n'))))
+
+  def test_bounded(self):
+    with temporary_dir() as root:
+      cache = BuildFileCodeCache(max_entries=1)
+      code = cache.code(self.build_file(root, 'x = 1\n'))
+      cache.code(self.build_file(root, 'x = 2\n', relpath='b/BUILD'))
+      self.assertIsNot(code, cache.code(self.build_file(root, 'x = 1\n')))
+
+  def test_prune(self):
+    with temporary_dir() as root:
+      with temporary_dir() as path:
+        cache = BuildFileCodeCache(path=path)
+        cache.code(self.build_file(root, 'x = 1\n'))
+        cache.code(self.build_file(root, 'x = 2\n', relpath='b/BUILD'))
+        safe_file_dump(os.path.join(path, 'other-version', 'a', 'BUILD.code'), '')
+
+        os.unlink(os.path.join(root, 'b', 'BUILD'))
+        cache.prune(root)
+        self.assertEqual([cache._code_path(self.build_file(root, 'x = 1\n'))],
+                         [os.path.join(dirpath, filename)
+                          for dirpath, _, filenames in os.walk(path) for filename in filenames])
+
+  def test_maybe_prune(self):
+    with temporary_dir() as root:
+      with temporary_dir() as path:
+        cache = BuildFileCodeCache(path=path)
+        cache.code(self.build_file(root, 'x = 1\n'))
+        code_path = cache._code_path(self.build_file(root, 'x = 1\n'))
+        self.assertTrue(cache.maybe_prune(root))
+        self.assertTrue(os.path.isfile(code_path))
+
+        # A warm run soon after does not stat the BUILD files of the persisted code objects.
+        os.unlink(os.path.join(root, 'a', 'BUILD'))
+        cache = BuildFileCodeCache(path=path)
+        with mock.patch.object(os.path, 'isfile', wraps=os.path.isfile) as isfile:
+          self.assertFalse(cache.maybe_prune(root))
+        self.assertFalse(isfile.called)
+        self.assertTrue(os.path.isfile(code_path))
+
+        # Once the prune interval has passed, the code of the deleted BUILD file is pruned.
+        marker = os.path.join(path, BuildFileCodeCache._PRUNED_MARKER)
+        pruned_at = time.time() - BuildFileCodeCache._PRUNE_INTERVAL_SECS - 60
+        os.utime(marker, (pruned_at, pruned_at))
+        self.assertTrue(cache.maybe_prune(root))
+        self.assertFalse(os.path.exists(code_path))
+        self.assertTrue(os.path.isfile(marker))
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import sys
 from collections import defaultdict
 
 import six
@@ -146,6 +147,61 @@ class BuildGraphTest(BaseTest):
     assertDependencyWalk(a, [a, b, c, d, e])
     assertDependencyWalk(a, [c, d, b, e, a], postorder=True)
 
+  def test_walk_deep_graph(self):
+    targets = [self.make_target('deep:0')]
+    for i in range(1, sys.getrecursionlimit() + 1):
+      targets.append(self.make_target('deep:{}'.format(i), dependencies=[targets[-1]]))
+
+    walked = []
+    self.build_graph.walk_transitive_dependency_graph([targets[-1].address], walked.append)
+    self.assertEqual(targets[::-1], walked)
+
+    walked = []
+    self.build_graph.walk_transitive_dependee_graph([targets[0].address], walked.append,
+                                                    postorder=True)
+    self.assertEqual(targets[::-1], walked)
+
+    self.assertEqual(targets, list(targets[-1].closure(postorder=True)))
+
+  def test_transitive_subgraph_of_addresses_memoized(self):
+    a = self.make_target('a')
+    b = self.make_target('b', dependencies=[a])
+    c = self.make_target('c', dependencies=[b])
+    d = self.make_target('d')
+
+    def assertClosure(expected, roots, **kwargs):
+      walked = []
+      self.build_graph.walk_transitive_dependency_graph([t.address for t in roots],
+                                                        walked.append, **kwargs)
+      self.assertEqual(expected, walked)
+      for _ in range(2):
+        closure = self.build_graph.transitive_subgraph_of_addresses([t.address for t in roots],
+                                                                    **kwargs)
+        self.assertEqual(expected, list(closure))
+
+    assertClosure([c, b, a], [c])
+    assertClosure([a, b, c], [c], postorder=True)
+    assertClosure([a, b, c, d], [b, c, d], postorder=True)
+
+    # Closures are recomputed once the graph changes.
+    self.build_graph.inject_dependency(a.address, d.address)
+    assertClosure([c, b, a, d], [c])
+    assertClosure([d, a, b, c], [c], postorder=True)
+    assertClosure([d, a, b, c], [b, c, d], postorder=True)
+    self.assertEqual([d, a, b, c],
+                     list(self.build_graph.transitive_dependees_of_addresses([d.address])))
+
+  def test_transitive_subgraph_of_addresses_memo_bounded(self):
+    a = self.make_target('a')
+    b = self.make_target('b', dependencies=[a])
+    c = self.make_target('c', dependencies=[b])
+    self.build_graph._MAX_MEMOIZED_CLOSURES = 2
+
+    for root in (a, b, c, a):
+      self.assertEqual(list(root.closure()),
+                       list(self.build_graph.transitive_subgraph_of_addresses([root.address])))
+    self.assertEqual(2, len(self.build_graph._closures))
+
   def test_target_closure(self):
     a = self.make_target('a')
     self.assertEquals([a], a.closure())
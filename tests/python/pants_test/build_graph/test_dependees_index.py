@@ -0,0 +1,91 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+
+from pants.build_graph.address import Address
+from pants.build_graph.dependees_index import DependeesIndex
+from pants.util.contextutil import temporary_dir
+from pants_test.base_test import BaseTest
+
+
+class DependeesIndexTest(BaseTest):
+
+  def setUp(self):
+    super(DependeesIndexTest, self).setUp()
+    self.add_to_build_file('a', "target(name='a')")
+    self.add_to_build_file('b', "target(name='b', dependencies=['a'])")
+    self.add_to_build_file('c', "target(name='c', dependencies=['b'])")
+
+  def update(self, index):
+    """Updates the index from a fresh build graph, and returns the addresses it injected."""
+    self.reset_build_graph()
+    index.update(self.address_mapper, self.build_graph)
+    return {target.address.spec for target in self.build_graph.targets()}
+
+  def dependees_of(self, index, spec, transitive=False):
+    addresses = index.dependees_of([Address.parse(spec)], transitive=transitive)
+    return {address.spec for address in addresses}
+
+  def dependees_of_all(self, index, specs):
+    addresses = index.dependees_of([Address.parse(spec) for spec in specs])
+    return {address.spec for address in addresses}
+
+  def test_dependees_of(self):
+    index = DependeesIndex()
+    self.update(index)
+    self.assertEqual({'b:b'}, self.dependees_of(index, 'a'))
+    self.assertEqual({'b:b', 'c:c'}, self.dependees_of(index, 'a', transitive=True))
+    self.assertEqual(set(), self.dependees_of(index, 'c', transitive=True))
+
+  def test_update_injects_changed_build_files_only(self):
+    index = DependeesIndex()
+    self.assertEqual({'a:a', 'b:b', 'c:c'}, self.update(index))
+    self.assertEqual(set(), self.update(index))
+
+    self.create_file('c/BUILD', "target(name='c', dependencies=['a'])")
+    self.assertEqual({'a:a', 'c:c'}, self.update(index))
+    self.assertEqual({'b:b', 'c:c'}, self.dependees_of(index, 'a'))
+    self.assertEqual(set(), self.dependees_of(index, 'b'))
+
+  def test_update_removed_build_files(self):
+    index = DependeesIndex()
+    self.update(index)
+
+    os.unlink(os.path.join(self.build_root, 'b', 'BUILD'))
+    self.assertEqual(set(), self.update(index))
+    self.assertEqual(set(), self.dependees_of(index, 'a', transitive=True))
+
+  def test_update_broken_build_files(self):
+    index = DependeesIndex()
+    self.update(index)
+
+    self.create_file('b/BUILD', "target(name='b', dependencies=['a']")
+    self.update(index)
+    self.assertEqual(set(), self.dependees_of(index, 'a'))
+
+    self.create_file('b/BUILD', "target(name='b', dependencies=['a'])")
+    self.assertEqual({'a:a', 'b:b'}, self.update(index))
+    self.assertEqual({'b:b'}, self.dependees_of(index, 'a'))
+
+  def test_dependees_of_excludes_roots(self):
+    index = DependeesIndex()
+    self.update(index)
+    self.assertEqual({'c:c'}, self.dependees_of_all(index, ['a', 'b']))
+
+  def test_persisted(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'dependees_index.pickle')
+      self.update(DependeesIndex(path=path, fingerprint='1'))
+
+      index = DependeesIndex(path=path, fingerprint='1')
+      self.assertEqual(set(), self.update(index))
+      self.assertEqual({'b:b', 'c:c'}, self.dependees_of(index, 'a', transitive=True))
+
+      # An index persisted with another fingerprint is discarded.
+      self.assertEqual({'a:a', 'b:b', 'c:c'},
+                       self.update(DependeesIndex(path=path, fingerprint='2')))
@@ -0,0 +1,86 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+
+from pants.backend.python.targets.python_library import PythonLibrary
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.source_owners_index import SourceOwnersIndex
+from pants.source.wrapped_globs import Globs
+from pants.util.contextutil import temporary_dir
+from pants_test.base_test import BaseTest
+
+
+class SourceOwnersIndexTest(BaseTest):
+
+  @property
+  def alias_groups(self):
+    return BuildFileAliases(targets={'python_library': PythonLibrary},
+                            context_aware_object_factories={'globs': Globs})
+
+  def setUp(self):
+    super(SourceOwnersIndexTest, self).setUp()
+    self.add_to_build_file('a', "python_library(name='a', sources=['a.py', 'b/c.py'])")
+    self.add_to_build_file('a/b', "python_library(name='b', sources=globs('*.py'))")
+
+  def owners_of(self, index, *paths, **kwargs):
+    """Looks up owners from a fresh build graph, and returns them with the addresses injected."""
+    self.reset_build_graph()
+    owners = index.owners_of(self.address_mapper, self.build_graph, paths, **kwargs)
+    injected = {target.address.spec for target in self.build_graph.targets()}
+    return {path: {address.spec for address in addresses}
+            for path, addresses in owners.items()}, injected
+
+  def test_owners_of(self):
+    owners, _ = self.owners_of(SourceOwnersIndex(), 'a/a.py', 'a/b/c.py', 'a/b/d.py', 'a/BUILD',
+                               'a/e.py', 'f.py')
+    self.assertEqual({'a/a.py': {'a:a'},
+                      'a/b/c.py': {'a:a', 'a/b:b'},
+                      'a/b/d.py': {'a/b:b'},
+                      'a/BUILD': {'a:a'},
+                      'a/e.py': set(),
+                      'f.py': set()},
+                     owners)
+
+  def test_stop_after_match(self):
+    owners, injected = self.owners_of(SourceOwnersIndex(), 'a/b/c.py', stop_after_match=True)
+    self.assertEqual({'a/b/c.py': {'a/b:b'}}, owners)
+    self.assertEqual({'a/b:b'}, injected)
+
+  def test_changed_build_files_only_are_reindexed(self):
+    index = SourceOwnersIndex()
+    _, injected = self.owners_of(index, 'a/b/c.py')
+    self.assertEqual({'a:a', 'a/b:b'}, injected)
+    _, injected = self.owners_of(index, 'a/b/c.py')
+    self.assertEqual(set(), injected)
+
+    self.create_file('a/BUILD', "python_library(name='a', sources=['a.py'])")
+    owners, injected = self.owners_of(index, 'a/b/c.py')
+    self.assertEqual({'a/b/c.py': {'a/b:b'}}, owners)
+    self.assertEqual({'a:a'}, injected)
+
+  def test_new_sources_are_owned_without_reindexing(self):
+    index = SourceOwnersIndex()
+    self.owners_of(index, 'a/b/c.py')
+
+    self.create_file('a/b/d.py')
+    owners, injected = self.owners_of(index, 'a/b/d.py')
+    self.assertEqual({'a/b/d.py': {'a/b:b'}}, owners)
+    self.assertEqual(set(), injected)
+
+  def test_persisted(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'source-owners-index.pickle')
+      self.owners_of(SourceOwnersIndex(path=path, fingerprint='1'), 'a/b/c.py')
+
+      owners, injected = self.owners_of(SourceOwnersIndex(path=path, fingerprint='1'), 'a/b/c.py')
+      self.assertEqual({'a/b/c.py': {'a:a', 'a/b:b'}}, owners)
+      self.assertEqual(set(), injected)
+
+      # An index persisted with another fingerprint is discarded.
+      _, injected = self.owners_of(SourceOwnersIndex(path=path, fingerprint='2'), 'a/b/c.py')
+      self.assertEqual({'a:a', 'a/b:b'}, injected)
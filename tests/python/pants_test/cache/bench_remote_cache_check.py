@@ -0,0 +1,71 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import shutil
+import sys
+
+from pants.cache.local_artifact_cache import TempLocalArtifactCache
+from pants.cache.pinger import BestUrlSelector
+from pants.cache.restful_artifact_cache import RESTfulArtifactCache
+from pants.invalidation.build_invalidator import CacheKey
+from pants.util.contextutil import Timer, temporary_dir
+from pants.util.dirutil import safe_file_dump, safe_mkdir_for
+from pants_test.cache.cache_server import cache_server
+
+
+def main():
+  """Compare the wall time of checking a remote artifact cache key by key vs. in one batch.
+
+  To run:
+
+  ./pants run tests/python/pants_test/cache:bench_remote_cache_check -- \
+    [<number of keys>] [<server latency in ms>] [<fraction of keys that hit>]
+
+  The stand-in server answers every request after the given latency, and handles requests
+  concurrently. The key by key check mirrors what a single worker did before batching: a GET per
+  key. The batched check probes all keys with `has_many`, and then GETs only the hits.
+  """
+  num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+  latency_secs = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+  hit_ratio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+
+  keys = [CacheKey('target_{}'.format(i), 'hash_{}'.format(i)) for i in range(num_keys)]
+  hits = keys[:int(num_keys * hit_ratio)]
+
+  with temporary_dir() as artifact_root, temporary_dir() as server_root:
+    local = TempLocalArtifactCache(artifact_root, compression=1)
+    artifact = os.path.join(artifact_root, 'some.class')
+    safe_file_dump(artifact, b'0' * 4096)
+
+    # Populate the server's storage directly, rather than paying its latency for every insert.
+    for key in hits:
+      with local.insert_paths(key, [artifact]) as tarball:
+        dest = os.path.join(server_root, key.id, '{}.tgz'.format(key.hash))
+        safe_mkdir_for(dest)
+        shutil.copy(tarball, dest)
+
+    with cache_server(cache_root=server_root, delay=latency_secs) as server:
+      cache = RESTfulArtifactCache(artifact_root, BestUrlSelector([server.url]), local)
+
+      with Timer() as key_by_key:
+        found = sum(1 for key in keys if cache.use_cached_files(key))
+      assert found == len(hits), 'Expected {} hits, found {}.'.format(len(hits), found)
+
+      with Timer() as batched:
+        present = cache.has_many(keys)
+        found = sum(1 for key, is_present in zip(keys, present)
+                    if is_present and cache.use_cached_files(key))
+      assert found == len(hits), 'Expected {} hits, found {}.'.format(len(hits), found)
+
+  print('{} keys, {} hits, {:.0f}ms latency:'.format(num_keys, len(hits), latency_secs * 1000))
+  print('  key by key: {:.3f}s'.format(key_by_key.elapsed))
+  print('  batched:    {:.3f}s'.format(batched.elapsed))
+
+
+if __name__ == '__main__':
+  main()
@@ -8,6 +8,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import os
 import re
 import SocketServer
+import time
 from contextlib import contextmanager
 from multiprocessing import Process, Queue
 
@@ -20,11 +21,23 @@ from pants_test.testutils.file_test_util import exact_files
 
 # A very trivial server that serves files under the cwd.
 class SimpleRESTHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
+  # Seconds to wait before handling each request, to simulate a remote server's latency.
+  delay = 0
+
   def __init__(self, request, client_address, server):
     # The base class implements GET and HEAD.
     # Old-style class, so we must invoke __init__ this way.
     SimpleHTTPServer.SimpleHTTPRequestHandler.__init__(self, request, client_address, server)
 
+  def parse_request(self):
+    if self.delay:
+      time.sleep(self.delay)
+    return SimpleHTTPServer.SimpleHTTPRequestHandler.parse_request(self)
+
+  def log_message(self, format, *args):
+    # Keep the output of tests and benchmarks quiet.
+    pass
+
   def do_HEAD(self):
     return SimpleHTTPServer.SimpleHTTPRequestHandler.do_HEAD(self)
 
@@ -104,7 +117,7 @@ class TestCacheServer(object):
     return count
 
 
-def _cache_server_process(queue, return_failed, cache_root):
+def _cache_server_process(queue, return_failed, cache_root, delay):
   """A pickleable top-level function to wrap a SimpleRESTHandler.
 
   We fork a separate process to avoid affecting the `cwd` of the requesting process.
@@ -116,9 +129,14 @@ def _cache_server_process(queue, return_failed, cache_root):
       with pushd(cache_root):  # SimpleRESTHandler serves from the cwd.
         if return_failed:
           handler = FailRESTHandler
+          server_type = SocketServer.TCPServer
         else:
           handler = SimpleRESTHandler
-        httpd = SocketServer.TCPServer(('localhost', 0), handler)
+          # NB: This is safe since we run in a dedicated process.
+          handler.delay = delay
+          # A delayed server handles requests concurrently, like a real remote cache would.
+          server_type = SocketServer.ThreadingTCPServer if delay else SocketServer.TCPServer
+        httpd = server_type(('localhost', 0), handler)
         port = httpd.server_address[1]
         queue.put(port)
         httpd.serve_forever()
@@ -128,13 +146,16 @@ def _cache_server_process(queue, return_failed, cache_root):
 
 
 @contextmanager
-def cache_server(return_failed=False, cache_root=None):
+def cache_server(return_failed=False, cache_root=None, delay=0):
   """A context manager which launches a temporary cache server on a random port.
 
+  :param float delay: If set, seconds to wait before handling each request; requests are then
+                      handled concurrently.
+
   Yields a TestCacheServer to represent the running server.
   """
   queue = Queue()
-  process = Process(target=_cache_server_process, args=(queue,return_failed, cache_root))
+  process = Process(target=_cache_server_process, args=(queue, return_failed, cache_root, delay))
   process.start()
   try:
     port = queue.get()
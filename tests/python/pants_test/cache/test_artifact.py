@@ -49,6 +49,21 @@ class TarballArtifactTest(unittest.TestCase):
 
       self.assertTrue(artifact.exists())
 
+  def test_extract_from_stream(self):
+    with temporary_dir() as tmpdir:
+      artifact_root = os.path.join(tmpdir, 'artifacts')
+      tarball = os.path.join(tmpdir, 'some.tar')
+
+      path = self.touch_file_in(os.path.join(artifact_root, 'sub', 'dir'))
+      TarballArtifact(artifact_root, tarball).collect([os.path.join(artifact_root, 'sub')])
+      os.unlink(path)
+
+      artifact = TarballArtifact(artifact_root, os.path.join(tmpdir, 'unused.tar'))
+      with open(tarball, 'rb') as stream:
+        artifact.extract(fileobj=stream)
+      self.assertTrue(os.path.isfile(path))
+      self.assertIn(path, list(artifact.get_paths()))
+
   def touch_file_in(self, artifact_root):
     path = os.path.join(artifact_root, 'some.file')
     with safe_open(path, 'w') as f:
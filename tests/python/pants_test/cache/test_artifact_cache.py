@@ -6,17 +6,19 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import os
+import stat
 import unittest
 from contextlib import contextmanager
 
 from pants.cache.artifact_cache import (NonfatalArtifactCacheError, call_insert,
                                         call_use_cached_files)
+from pants.cache.content_addressed_artifact_cache import ContentAddressedArtifactCache
 from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
 from pants.cache.pinger import BestUrlSelector, InvalidRESTfulCacheProtoError
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
 from pants.invalidation.build_invalidator import CacheKey
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import safe_file_dump, safe_mkdir
 from pants_test.cache.cache_server import cache_server
 
 
@@ -31,6 +33,15 @@ class TestArtifactCache(unittest.TestCase):
       with temporary_dir() as cache_root:
         yield LocalArtifactCache(artifact_root, cache_root, compression=1)
 
+  @contextmanager
+  def setup_content_addressed_cache(self, max_entries_per_target=None, gc_batch_size=None,
+                                    link=True):
+    with temporary_dir() as artifact_root:
+      with temporary_dir() as cache_root:
+        yield ContentAddressedArtifactCache(artifact_root, cache_root, compression=1,
+                                            max_entries_per_target=max_entries_per_target,
+                                            link=link, gc_batch_size=gc_batch_size)
+
   @contextmanager
   def setup_server(self, return_failed=False, cache_root=None):
     with cache_server(return_failed=return_failed, cache_root=cache_root) as server:
@@ -56,6 +67,121 @@ class TestArtifactCache(unittest.TestCase):
     with self.setup_local_cache() as artifact_cache:
       self.do_test_artifact_cache(artifact_cache)
 
+  def test_content_addressed_cache(self):
+    with self.setup_content_addressed_cache() as artifact_cache:
+      self.do_test_artifact_cache(artifact_cache)
+
+  def test_content_addressed_cache_dedups_files(self):
+    with self.setup_content_addressed_cache() as artifact_cache:
+      results_dir = os.path.join(artifact_cache.artifact_root, 'results')
+      safe_mkdir(results_dir)
+      with self.setup_test_file(results_dir) as path:
+        artifact_cache.insert(CacheKey('muppet_key', 'fake_hash'), [results_dir])
+        artifact_cache.insert(CacheKey('other_key', 'other_hash'), [path])
+
+        blobs = [f for _, _, files in os.walk(artifact_cache._blobs_root) for f in files]
+        self.assertEquals(1, len(blobs))
+
+        os.unlink(path)
+        self.assertTrue(artifact_cache.use_cached_files(CacheKey('muppet_key', 'fake_hash'),
+                                                        results_dir=results_dir))
+        with open(path, 'r') as infile:
+          self.assertEquals(TEST_CONTENT1, infile.read())
+
+  def test_content_addressed_cache_links_only_read_only_files(self):
+    key = CacheKey('muppet_key', 'fake_hash')
+    for link in (True, False):
+      with self.setup_content_addressed_cache(link=link) as artifact_cache:
+        results_dir = os.path.join(artifact_cache.artifact_root, 'results')
+        writable = os.path.join(results_dir, 'writable')
+        read_only = os.path.join(results_dir, 'read_only')
+        safe_file_dump(writable, TEST_CONTENT1)
+        safe_file_dump(read_only, TEST_CONTENT2)
+        os.chmod(read_only, 0o444)
+        artifact_cache.insert(key, [results_dir])
+
+        self.assertTrue(artifact_cache.use_cached_files(key, results_dir=results_dir))
+        self.assertEquals(1, os.stat(writable).st_nlink)
+        self.assertEquals(2 if link else 1, os.stat(read_only).st_nlink)
+
+        # Writing to a restored file in place does not change the cache.
+        with open(writable, 'w') as outfile:
+          outfile.write(TEST_CONTENT2)
+        self.assertTrue(artifact_cache.use_cached_files(key, results_dir=results_dir))
+        with open(writable, 'r') as infile:
+          self.assertEquals(TEST_CONTENT1, infile.read())
+        self.assertTrue(os.stat(writable).st_mode & stat.S_IWUSR)
+
+  def test_content_addressed_cache_collects_garbage(self):
+    with self.setup_content_addressed_cache(max_entries_per_target=1,
+                                            gc_batch_size=2) as artifact_cache:
+      def blobs():
+        return [f for _, _, files in os.walk(artifact_cache._blobs_root) for f in files]
+
+      with self.setup_test_file(artifact_cache.artifact_root) as path:
+        for i, content in enumerate([TEST_CONTENT1, TEST_CONTENT2, TEST_CONTENT1]):
+          with open(path, 'w') as outfile:
+            outfile.write(content)
+          if i > 0:
+            # Make sure each manifest is strictly newer than the last.
+            os.utime(artifact_cache._manifest_for_key(CacheKey('muppet_key', 'hash{}'.format(i))),
+                     (0, 0))
+          artifact_cache.insert(CacheKey('muppet_key', 'hash{}'.format(i + 1)), [path])
+          if i == 1:
+            # The first prune is batched up, leaving the blob it released behind.
+            self.assertFalse(artifact_cache.has(CacheKey('muppet_key', 'hash1')))
+            self.assertEquals(2, len(blobs()))
+
+        self.assertFalse(artifact_cache.has(CacheKey('muppet_key', 'hash2')))
+        self.assertTrue(artifact_cache.has(CacheKey('muppet_key', 'hash3')))
+        self.assertEquals(1, len(blobs()))
+
+  def test_content_addressed_cache_symlink_cycle(self):
+    with self.setup_content_addressed_cache() as artifact_cache:
+      results_dir = os.path.join(artifact_cache.artifact_root, 'results')
+      safe_mkdir(results_dir)
+      with self.setup_test_file(results_dir) as path:
+        os.symlink(results_dir, os.path.join(results_dir, 'cycle'))
+        artifact_cache.insert(CacheKey('muppet_key', 'fake_hash'), [results_dir])
+
+        os.unlink(path)
+        self.assertTrue(artifact_cache.use_cached_files(CacheKey('muppet_key', 'fake_hash')))
+        with open(path, 'r') as infile:
+          self.assertEquals(TEST_CONTENT1, infile.read())
+
+  def test_content_addressed_cache_missing_blob(self):
+    key = CacheKey('muppet_key', 'fake_hash')
+    with self.setup_content_addressed_cache() as artifact_cache:
+      with self.setup_test_file(artifact_cache.artifact_root) as path:
+        artifact_cache.insert(key, [path])
+        # Simulate a blob lost to a concurrent garbage collection.
+        for root, _, files in os.walk(artifact_cache._blobs_root):
+          for f in files:
+            os.unlink(os.path.join(root, f))
+
+        self.assertFalse(artifact_cache.use_cached_files(key))
+        self.assertFalse(artifact_cache.has(key))
+
+  def test_content_addressed_backed_remote_cache(self):
+    with self.setup_server() as server:
+      with self.setup_content_addressed_cache() as local:
+        remote = RESTfulArtifactCache(local.artifact_root, BestUrlSelector([server.url]),
+                                      TempLocalArtifactCache(local.artifact_root, 0))
+        combined = RESTfulArtifactCache(local.artifact_root, BestUrlSelector([server.url]), local)
+
+        key = CacheKey('muppet_key', 'fake_hash')
+        with self.setup_test_file(local.artifact_root) as path:
+          remote.insert(key, [path])
+          self.assertFalse(local.has(key))
+
+          # Successfully using via combined should backfill the local content addressed cache.
+          self.assertTrue(bool(combined.use_cached_files(key)))
+          self.assertTrue(local.has(key))
+          os.unlink(path)
+          self.assertTrue(bool(local.use_cached_files(key)))
+          with open(path, 'r') as infile:
+            self.assertEquals(TEST_CONTENT1, infile.read())
+
   def test_restful_cache(self):
     with self.assertRaises(InvalidRESTfulCacheProtoError):
       RESTfulArtifactCache('foo', BestUrlSelector(['ftp://localhost/bar']), 'foo')
@@ -63,6 +189,28 @@ class TestArtifactCache(unittest.TestCase):
     with self.setup_rest_cache() as artifact_cache:
       self.do_test_artifact_cache(artifact_cache)
 
+  def test_has_many(self):
+    keys = [CacheKey('muppet_key', 'fake_hash'), CacheKey('other_key', 'other_hash')]
+    with self.setup_local_cache() as local:
+      with self.setup_server() as server:
+        remote = RESTfulArtifactCache(local.artifact_root, BestUrlSelector([server.url]),
+                                      TempLocalArtifactCache(local.artifact_root, 0))
+        combined = RESTfulArtifactCache(local.artifact_root, BestUrlSelector([server.url]), local)
+        with self.setup_test_file(local.artifact_root) as path:
+          self.assertEquals([False, False], combined.has_many(keys))
+
+          remote.insert(keys[1], [path])
+          self.assertEquals([False, True], remote.has_many(keys))
+          self.assertEquals([False, True], combined.has_many(keys))
+
+          local.insert(keys[0], [path])
+          self.assertEquals([True, False], local.has_many(keys))
+          self.assertEquals([True, True], combined.has_many(keys))
+
+  def test_has_many_reports_failed_probes_as_present(self):
+    with self.setup_rest_cache(return_failed=True) as cache:
+      self.assertEquals([True], cache.has_many([CacheKey('muppet_key', 'fake_hash')]))
+
   def test_restful_cache_failover(self):
     bad_url = 'http://badhost:123'
 
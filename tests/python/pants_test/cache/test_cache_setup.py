@@ -13,6 +13,7 @@ from pants.cache.cache_setup import (CacheFactory, CacheSetup, CacheSpec, CacheS
                                      EmptyCacheSpecError, InvalidCacheSpecError,
                                      LocalCacheSpecRequiredError, RemoteCacheSpecRequiredError,
                                      TooManyCacheSpecsError)
+from pants.cache.content_addressed_artifact_cache import ContentAddressedArtifactCache
 from pants.cache.local_artifact_cache import LocalArtifactCache
 from pants.cache.resolver import Resolver
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
@@ -141,24 +142,27 @@ class TestCacheSetup(BaseTest):
                       self.cache_factory._resolve(self.CACHE_SPEC_LOCAL_RESOLVE))
 
   def test_cache_spec_parsing(self):
-    def mk_cache(spec, resolver=None):
+    def mk_cache(spec, resolver=None, local_store='tarball', **options):
       Subsystem.reset()
       self.set_options_for_scope(CacheSetup.subscope(DummyTask.options_scope),
-                                 read_from=spec, compression=1)
+                                 read_from=spec, compression=1, local_store=local_store, **options)
       self.context(for_task_types=[DummyTask])  # Force option initialization.
       cache_factory = CacheSetup.create_cache_factory_for_task(DummyTask,
                                                                pinger=self.pinger,
                                                                resolver=resolver)
       return cache_factory.get_read_cache()
 
-    def check(expected_type, spec, resolver=None):
-      cache = mk_cache(spec, resolver=resolver)
+    def check(expected_type, spec, resolver=None, local_store='tarball'):
+      cache = mk_cache(spec, resolver=resolver, local_store=local_store)
       self.assertIsInstance(cache, expected_type)
       self.assertEquals(cache.artifact_root, self.pants_workdir)
 
     with temporary_dir() as tmpdir:
       cachedir = os.path.join(tmpdir, 'cachedir')  # Must be a real path, so we can safe_mkdir it.
       check(LocalArtifactCache, [cachedir])
+      check(ContentAddressedArtifactCache, [cachedir], local_store='content-addressed')
+      self.assertFalse(mk_cache([cachedir], local_store='content-addressed',
+                                link_local_store_files=False)._link)
       check(RESTfulArtifactCache, ['http://localhost/bar'])
       check(RESTfulArtifactCache, ['https://localhost/bar'])
       check(RESTfulArtifactCache, [cachedir, 'http://localhost/bar'])
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import pickle
 import unittest
 import urlparse
 
@@ -114,3 +115,11 @@ class TestBestUrlSelector(BaseTest):
     self.call_url(self.url2, with_error=True)
     self.call_url(self.url2, with_error=True)
     self.call_url(self.url1)
+
+  def test_selector_pickles(self):
+    selector = pickle.loads(pickle.dumps(BestUrlSelector([self.url1, self.url2], max_failures=0)))
+    with self.assertRaises(RequestException):
+      with selector.select_best_url():
+        raise RequestException('boom')
+    with selector.select_best_url() as url:
+      self.assertEquals(urlparse.urlparse(self.url2), url)
@@ -0,0 +1,66 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import time
+
+from pants.core_tasks.run_stats import RunStats
+from pants.stats.statsdb import StatsDB
+from pants_test.tasks.task_test_base import ConsoleTaskTestBase
+
+
+class RunStatsTest(ConsoleTaskTestBase):
+  @classmethod
+  def task_type(cls):
+    return RunStats
+
+  def setUp(self):
+    super(RunStatsTest, self).setUp()
+    path = os.path.join(self.build_root, 'statsdb.sqlite')
+    self.set_options_for_scope('statsdb', path=path)
+    self.statsdb = StatsDB(path)
+    self.statsdb.ensure_tables()
+
+  def insert_run(self, days_ago, zinc_secs):
+    self.statsdb.insert_stats({
+      'run_info': {
+        'id': 'run{}'.format(days_ago),
+        'timestamp': str(time.time() - days_ago * 24 * 60 * 60),
+        'machine': 'ernie',
+        'user': 'bert',
+        'version': '9.8.7',
+        'buildroot': '/path/to/repo',
+        'outcome': 'SUCCESS',
+        'cmd_line': 'pants compile a',
+        'target_data': {'a:a': {'compile.zinc': {'compile': {'run_time': zinc_secs}}}},
+      },
+      'cumulative_timings': [],
+      'self_timings': [{'label': 'main:compile:zinc', 'timing': zinc_secs}],
+      'artifact_cache_stats': [{'cache_name': 'compile.zinc', 'num_hits': 3, 'num_misses': 1}],
+    })
+
+  def test_stats(self):
+    for days_ago, zinc_secs in ((10, 1), (9, 1), (2, 2.5), (1, 3)):
+      self.insert_run(days_ago, zinc_secs)
+
+    self.assert_console_output_ordered(
+      'Slowest tasks over the last 7 days (p50 of self_timings):',
+      '      2.500s  main:compile:zinc  (2 runs)',
+      'Tasks trending up (p50 over the last 7 days vs the 7 days before):',
+      '      1.000s ->     2.500s  x2.50  main:compile:zinc',
+      'Targets trending up (p50 over the last 7 days vs the 7 days before):',
+      '      1.000s ->     2.500s  x2.50  a:a',
+      'Artifact cache over the last 7 days:',
+      '  compile.zinc: 6 hits, 2 misses (75% hit rate)',
+      options={'min_runs': 2})
+
+  def test_no_stats(self):
+    self.assert_console_output_ordered(
+      'Slowest tasks over the last 7 days (p50 of self_timings):',
+      'Tasks trending up (p50 over the last 7 days vs the 7 days before):',
+      'Targets trending up (p50 over the last 7 days vs the 7 days before):',
+      'Artifact cache over the last 7 days:')
@@ -0,0 +1,119 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.engine.address_map_snapshot import AddressMapSnapshot
+from pants.engine.mapper import AddressMap
+from pants.engine.parser import SymbolTable
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+from pants_test.engine.examples.parsers import JsonParser
+from pants_test.engine.util import Target
+
+
+class SnapshotTable(SymbolTable):
+  @classmethod
+  def table(cls):
+    return {'target': Target}
+
+
+class OtherSnapshotTable(SymbolTable):
+  @classmethod
+  def table(cls):
+    return {'target': Target, 'other': Target}
+
+
+class CountingParser(JsonParser):
+  parsed = []
+
+  @classmethod
+  def parse(cls, filepath, filecontent, symbol_table_cls):
+    cls.parsed.append(filepath)
+    return super(CountingParser, cls).parse(filepath, filecontent, symbol_table_cls)
+
+
+class AddressMapSnapshotTest(unittest.TestCase):
+  _CONTENT = b'{"type_alias": "target", "name": "one"}'
+
+  def setUp(self):
+    del CountingParser.parsed[:]
+
+  @staticmethod
+  def create_build_file(root, relpath='a/BUILD'):
+    safe_file_dump(os.path.join(root, relpath), '')
+
+  def parse(self, snapshot, content=_CONTENT, symbol_table_cls=SnapshotTable):
+    return snapshot.parse('a/BUILD', content, symbol_table_cls, CountingParser)
+
+  def test_parsed_once(self):
+    with temporary_dir() as root:
+      snapshot = AddressMapSnapshot(os.path.join(root, 'snapshot'), root)
+      address_map = self.parse(snapshot)
+      self.assertEqual(AddressMap.parse('a/BUILD', self._CONTENT, SnapshotTable, JsonParser),
+                       address_map)
+      self.assertIs(address_map, self.parse(snapshot))
+      self.assertEqual(['a/BUILD'], CountingParser.parsed)
+      self.assertTrue(snapshot.dirty)
+
+  def test_changed_content_reparsed(self):
+    with temporary_dir() as root:
+      snapshot = AddressMapSnapshot(os.path.join(root, 'snapshot'), root)
+      self.parse(snapshot)
+      address_map = self.parse(snapshot, content=b'{"type_alias": "target", "name": "two"}')
+      self.assertEqual(['two'], address_map.objects_by_name.keys())
+      self.assertEqual(['a/BUILD', 'a/BUILD'], CountingParser.parsed)
+
+  def test_changed_symbol_table_reparsed(self):
+    with temporary_dir() as root:
+      snapshot = AddressMapSnapshot(os.path.join(root, 'snapshot'), root)
+      self.parse(snapshot)
+      self.parse(snapshot, symbol_table_cls=OtherSnapshotTable)
+      self.assertEqual(['a/BUILD', 'a/BUILD'], CountingParser.parsed)
+
+  def test_persisted_across_instances(self):
+    with temporary_dir() as root:
+      path = os.path.join(root, 'snapshot')
+      self.create_build_file(root)
+      first = AddressMapSnapshot(path, root)
+      address_map = self.parse(first)
+      first.save()
+      self.assertFalse(first.dirty)
+
+      second = AddressMapSnapshot(path, root)
+      self.assertEqual(address_map, self.parse(second))
+      self.assertEqual(['a/BUILD'], CountingParser.parsed)
+      self.assertFalse(second.dirty)
+
+  def test_unreadable_snapshot_ignored(self):
+    with temporary_dir() as root:
+      path = os.path.join(root, 'snapshot')
+      self.create_build_file(root)
+      safe_file_dump(path, 'not a snapshot')
+      snapshot = AddressMapSnapshot(path, root)
+      self.parse(snapshot)
+      self.assertEqual(['a/BUILD'], CountingParser.parsed)
+      snapshot.save()
+      self.assertEqual(['a/BUILD'], AddressMapSnapshot(path, root)._loaded.keys())
+
+  def test_deleted_build_files_pruned(self):
+    with temporary_dir() as root:
+      path = os.path.join(root, 'snapshot')
+      self.create_build_file(root)
+      self.create_build_file(root, 'b/BUILD')
+      first = AddressMapSnapshot(path, root)
+      self.parse(first)
+      first.parse('b/BUILD', self._CONTENT, SnapshotTable, CountingParser)
+      first.save()
+
+      os.unlink(os.path.join(root, 'a/BUILD'))
+      second = AddressMapSnapshot(path, root)
+      second.parse('b/BUILD', b'{"type_alias": "target", "name": "two"}', SnapshotTable,
+                   CountingParser)
+      second.save()
+      self.assertEqual(['b/BUILD'], AddressMapSnapshot(path, root)._loaded.keys())
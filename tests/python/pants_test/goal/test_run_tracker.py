@@ -10,9 +10,12 @@ import json
 import threading
 import urlparse
 
+from pants.base.worker_pool import Work, WorkerPool
 from pants.goal.run_tracker import RunTracker
+from pants.reporting.report import Report
 from pants.util.contextutil import temporary_file_path
 from pants_test.base_test import BaseTest
+from pants_test.subsystem.subsystem_util import global_subsystem_instance
 
 
 class RunTrackerTest(BaseTest):
@@ -166,3 +169,31 @@ class RunTrackerTest(BaseTest):
     keys = ['one', 'two', 'a', 'b', 'c']
     with self.assertRaises(ValueError):
       RunTracker._merge_list_of_keys_into_dict(data, keys, 'new A')
+
+  def test_current_workunits(self):
+    run_tracker = global_subsystem_instance(RunTracker)
+    run_tracker.start(Report())
+    try:
+      main_ident = threading.current_thread().ident
+      root = run_tracker.current_workunits()[main_ident]
+      with run_tracker.new_workunit('outer') as outer:
+        self.assertIs(outer, run_tracker.current_workunits()[main_ident])
+      self.assertIs(root, run_tracker.current_workunits()[main_ident])
+
+      def current_workunit():
+        ident = threading.current_thread().ident
+        return ident, run_tracker.current_workunits().get(ident)
+
+      pool = WorkerPool(root, run_tracker, 1)
+      try:
+        (pool_ident, workunit), = pool.submit_work_and_wait(Work(current_workunit, [()]))
+        self.assertIs(root, workunit)
+        (pool_ident, workunit), = pool.submit_work_and_wait(Work(current_workunit, [()], 'named'))
+        self.assertIs(root, workunit)
+        # Idle pool threads are not doing work for the run.
+        self.assertNotIn(pool_ident, run_tracker.current_workunits())
+      finally:
+        pool.shutdown()
+    finally:
+      run_tracker.end()
+    self.assertEqual({}, run_tracker.current_workunits())
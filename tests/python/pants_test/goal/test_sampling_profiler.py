@@ -0,0 +1,84 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import threading
+import time
+import unittest
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.goal.sampling_profiler import SamplingProfiler
+from pants.util.contextutil import temporary_dir
+
+
+class FakeRunTracker(object):
+  def __init__(self):
+    self.workunits = {}
+
+  def current_workunits(self):
+    return dict(self.workunits)
+
+
+class SamplingProfilerTest(unittest.TestCase):
+
+  def setUp(self):
+    self.run_tracker = FakeRunTracker()
+    self.main = WorkUnit(run_info_dir=None, parent=None, name='main')
+    self.setup = WorkUnit(run_info_dir=None, parent=self.main, name='setup')
+    self.goal = WorkUnit(run_info_dir=None, parent=self.main, name='compile',
+                         labels=[WorkUnitLabel.GOAL])
+    self.task = WorkUnit(run_info_dir=None, parent=self.goal, name='zinc',
+                         labels=[WorkUnitLabel.TASK])
+
+  def sample_in_workunit(self, profiler, workunit):
+    self.run_tracker.workunits[threading.current_thread().ident] = workunit
+    profiler._sample()
+
+  def test_attribution(self):
+    profiler = SamplingProfiler(self.run_tracker, interval_secs=1)
+    self.sample_in_workunit(profiler, self.setup)
+    self.sample_in_workunit(profiler, self.task)
+    self.sample_in_workunit(profiler, self.task)
+
+    # Threads without a current workunit are not sampled.
+    self.assertEqual(3, profiler.num_samples)
+
+    stacks = profiler.collapsed_stacks()
+    self.assertEqual({'compile', 'setup'}, set(stacks.keys()))
+    (setup_stack, setup_count), = stacks['setup'].items()
+    self.assertTrue(setup_stack.startswith('main;setup;'))
+    self.assertEqual(1, setup_count)
+
+    (task_stack, task_count), = stacks['compile'].items()
+    self.assertTrue(task_stack.startswith('main;compile;zinc;'))
+    frames = task_stack.split(';')
+    self.assertIn('sample_in_workunit ({}:'.format(self.sample_in_workunit.__code__.co_filename),
+                  frames[-2])
+    self.assertTrue(frames[-1].startswith('_sample ('))
+    self.assertEqual(2, task_count)
+
+  def test_sampling_thread(self):
+    self.run_tracker.workunits[threading.current_thread().ident] = self.task
+    profiler = SamplingProfiler(self.run_tracker, interval_secs=0.001)
+    profiler.start()
+    deadline = time.time() + 5
+    while profiler.num_samples < 3 and time.time() < deadline:
+      time.sleep(0.01)
+    profiler.stop()
+
+    num_samples = profiler.num_samples
+    self.assertGreaterEqual(num_samples, 3)
+    time.sleep(0.01)
+    self.assertEqual(num_samples, profiler.num_samples)
+
+    with temporary_dir() as profile_dir:
+      paths = profiler.write(profile_dir)
+      self.assertEqual([os.path.join(profile_dir, 'compile.collapsed')], paths)
+      with open(paths[0]) as fp:
+        lines = fp.read().splitlines()
+      self.assertEqual(num_samples, sum(int(line.rsplit(' ', 1)[1]) for line in lines))
+      self.assertTrue(all(line.startswith('main;compile;zinc;') for line in lines))
@@ -0,0 +1,50 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import subprocess
+import sys
+
+from pants.base.build_environment import get_buildroot
+from pants.util.contextutil import Timer
+
+
+def main():
+  """Measure the startup cost of loading backends eagerly and on demand.
+
+  To run:
+
+  ./pants run tests/python/pants_test/init:bench_backend_loading -- [<runs>] [<spec> ...]
+
+  Runs `./pants --version` and `./pants list <spec> ...` (defaulting to `src/python/pants/init:`)
+  in the buildroot the given number of times (default 5) with and without `--lazy-backends`, and
+  reports the fastest and mean wall times of each.
+  """
+  args = sys.argv[1:]
+  runs = int(args.pop(0)) if args and args[0].isdigit() else 5
+  specs = args or ['src/python/pants/init:']
+
+  commands = [('--version', ['--version']), ('list', ['list'] + specs)]
+  modes = [('eager', '--no-lazy-backends'), ('lazy', '--lazy-backends')]
+
+  buildroot = get_buildroot()
+  with open(os.devnull, 'w') as devnull:
+    print('{:>10} {:>8} {:>10} {:>10}'.format('command', 'backends', 'min (s)', 'mean (s)'))
+    for command_name, command in commands:
+      for mode_name, flag in modes:
+        cmd = [os.path.join(buildroot, 'pants'), '--no-enable-pantsd', flag] + command
+        elapsed = []
+        for _ in range(runs):
+          with Timer() as timer:
+            subprocess.check_call(cmd, cwd=buildroot, stdout=devnull)
+          elapsed.append(timer.elapsed)
+        print('{:>10} {:>8} {:>10.3f} {:>10.3f}'.format(
+          command_name, mode_name, min(elapsed), sum(elapsed) / len(elapsed)))
+
+
+if __name__ == '__main__':
+  main()
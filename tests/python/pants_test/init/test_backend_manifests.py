@@ -0,0 +1,76 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import importlib
+import unittest
+
+from pants.build_graph.build_configuration import BuildConfiguration
+from pants.goal.goal import Goal
+from pants.init.extension_loader import (BackendManifest, load_backend,
+                                         load_build_configuration_from_source)
+
+
+class BackendManifestsTest(unittest.TestCase):
+  """Checks that the manifests of the source backends match what their register modules provide."""
+
+  BACKEND_PACKAGES = [
+    'pants.backend.graph_info',
+    'pants.backend.python',
+    'pants.backend.jvm',
+    'pants.backend.codegen.antlr.java',
+    'pants.backend.codegen.antlr.python',
+    'pants.backend.codegen.jaxb',
+    'pants.backend.codegen.protobuf.java',
+    'pants.backend.codegen.ragel.java',
+    'pants.backend.codegen.thrift.java',
+    'pants.backend.codegen.thrift.python',
+    'pants.backend.codegen.wire.java',
+    'pants.backend.project_info',
+    'pants.backend.docgen',
+  ]
+
+  def setUp(self):
+    Goal.clear()
+    self.build_configuration = BuildConfiguration()
+    load_build_configuration_from_source(self.build_configuration)
+
+  def tearDown(self):
+    Goal.clear()
+
+  @staticmethod
+  def task_scopes():
+    return {Goal.scope(goal.name, task_name)
+            for goal in Goal.all() for task_name in goal.ordered_task_names()}
+
+  def test_manifests(self):
+    # Backends are loaded in order, as backends may install tasks relative to earlier ones.
+    for backend_package in self.BACKEND_PACKAGES:
+      manifest = BackendManifest.load(backend_package)
+      self.assertIsNotNone(manifest, '{} has no manifest.'.format(backend_package))
+
+      task_scopes = self.task_scopes()
+      subsystems = set(self.build_configuration.subsystems())
+      load_backend(self.build_configuration, backend_package)
+
+      self.assertEqual({scope_info.scope for scope_info in manifest.scope_infos()},
+                       self.task_scopes() - task_scopes,
+                       'The goals in the {} manifest are out of date.'.format(backend_package))
+      self.assertTrue(manifest.independent_goals.issubset(manifest.goals),
+                      'The {} manifest declares unknown independent goals.'.format(backend_package))
+
+      register = importlib.import_module(backend_package + '.register')
+      aliases = register.build_file_aliases() if hasattr(register, 'build_file_aliases') else None
+      alias_names = set()
+      if aliases:
+        alias_names.update(aliases.target_types_by_alias, aliases.objects,
+                           aliases.context_aware_object_factories)
+      self.assertEqual(alias_names, manifest.build_file_aliases,
+                       'The aliases in the {} manifest are out of date.'.format(backend_package))
+
+      self.assertTrue(
+        (self.build_configuration.subsystems() - subsystems).issubset(manifest.subsystem_types()),
+        'The subsystems in the {} manifest are out of date.'.format(backend_package))
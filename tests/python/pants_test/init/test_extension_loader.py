@@ -20,8 +20,9 @@ from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.target import Target
 from pants.goal.goal import Goal
 from pants.goal.task_registrar import TaskRegistrar
-from pants.init.extension_loader import (PluginLoadOrderError, PluginNotFound, load_backend,
-                                         load_backends_and_plugins, load_plugins)
+from pants.init.extension_loader import (BackendManifest, DeferredBackends, PluginLoadOrderError,
+                                         PluginNotFound, load_backend, load_backends_and_plugins,
+                                         load_build_configuration_from_source, load_plugins)
 from pants.subsystem.subsystem import Subsystem
 from pants.task.task import Task
 
@@ -93,7 +94,7 @@ class LoaderTest(unittest.TestCase):
 
   @contextmanager
   def create_register(self, build_file_aliases=None, register_goals=None, global_subsystems=None,
-                      module_name='register'):
+                      module_name='register', manifest=None):
 
     package_name = b'__test_package_{0}'.format(uuid.uuid4().hex)
     self.assertFalse(package_name in sys.modules)
@@ -114,6 +115,14 @@ class LoaderTest(unittest.TestCase):
       register_entrypoint('global_subsystems', global_subsystems)
       register_entrypoint('register_goals', register_goals)
 
+      if manifest is not None:
+        manifest_module_fqn = b'{0}.manifest'.format(package_name)
+        manifest_module = types.ModuleType(manifest_module_fqn)
+        for name, value in manifest.items():
+          setattr(manifest_module, name, value)
+        setattr(package_module, 'manifest', manifest_module)
+        sys.modules[manifest_module_fqn] = manifest_module
+
       yield package_name
     finally:
       del sys.modules[package_name]
@@ -306,3 +315,106 @@ class LoaderTest(unittest.TestCase):
     # the plugin will override the alias registered by the backend
     registered_aliases = self.build_configuration.registered_aliases()
     self.assertEqual(DummyTarget2, registered_aliases.target_types['override-alias'])
+
+  def load_deferred(self, backends):
+    deferred_backends = DeferredBackends()
+    load_build_configuration_from_source(self.build_configuration, backends,
+                                         deferred_backends=deferred_backends)
+    return deferred_backends
+
+  def test_load_manifest(self):
+    manifest = dict(GOALS={'jack': ['jill']}, INDEPENDENT_GOALS=['jack'],
+                    BUILD_FILE_ALIASES=['bob'], SUBSYSTEMS=[DummySubsystem2.__module__ + '.' +
+                                                            DummySubsystem2.__name__])
+    with self.create_register(manifest=manifest) as backend_package:
+      backend_manifest = BackendManifest.load(backend_package)
+      self.assertEqual({'jack': ('jill',)}, backend_manifest.goals)
+      self.assertEqual({'jack'}, backend_manifest.independent_goals)
+      self.assertEqual({'bob'}, backend_manifest.build_file_aliases)
+      self.assertEqual([DummySubsystem2], backend_manifest.subsystem_types())
+      self.assertEqual(['jack.jill'], [si.scope for si in backend_manifest.scope_infos()])
+
+    with self.create_register() as backend_package:
+      self.assertIsNone(BackendManifest.load(backend_package))
+
+  def test_deferred_aliases(self):
+    loads = []
+
+    def build_file_aliases():
+      loads.append(True)
+      return BuildFileAliases(targets={'bob': DummyTarget})
+
+    manifest = dict(BUILD_FILE_ALIASES=['bob'],
+                    SUBSYSTEMS=[DummySubsystem1.__module__ + '.' + DummySubsystem1.__name__])
+    with self.create_register(build_file_aliases=build_file_aliases,
+                              manifest=manifest) as backend_package:
+      self.load_deferred([backend_package])
+      self.assertEqual([], loads)
+      self.assertEqual({'bob'}, self.build_configuration.deferred_aliases())
+      self.assertIn(DummySubsystem1, self.build_configuration.subsystems())
+
+      self.assertNotIn('bob', self.build_configuration.registered_aliases().target_types)
+      self.assertEqual([], loads)
+
+      registered_aliases = self.build_configuration.registered_aliases(resolve_deferred=True)
+      self.assertEqual([True], loads)
+      self.assertEqual(DummyTarget, registered_aliases.target_types['bob'])
+
+  def test_deferred_goals(self):
+    def register_goals():
+      Goal.by_name('jack').install(TaskRegistrar('jill', DummyTask))
+
+    manifest = dict(GOALS={'jack': ['jill']}, INDEPENDENT_GOALS=['jack'])
+    with self.create_register(register_goals=register_goals, manifest=manifest) as backend_package:
+      deferred_backends = self.load_deferred([backend_package])
+      self.assertEqual([], Goal.by_name('jack').ordered_task_names())
+
+      # Nothing is loaded when no goal needs the backend.
+      deferred_backends.load_for_goals(self.build_configuration, goals=[], scopes=[])
+      self.assertEqual([], Goal.by_name('jack').ordered_task_names())
+      self.assertEqual(1, len(deferred_backends.pending))
+
+      # Setting an option of one of its tasks needs the backend as much as requesting its goal.
+      deferred_backends.load_for_goals(self.build_configuration, goals=[], scopes=['jack.jill'])
+      self.assertEqual(['jill'], Goal.by_name('jack').ordered_task_names())
+      self.assertEqual([], deferred_backends.pending)
+
+  def test_deferred_goals_independent(self):
+    def register_goals1():
+      Goal.by_name('jack').install(TaskRegistrar('jill', DummyTask))
+
+    def register_goals2():
+      Goal.by_name('bill').install(TaskRegistrar('ben', DummyTask))
+
+    manifest1 = dict(GOALS={'jack': ['jill']}, INDEPENDENT_GOALS=['jack'])
+    manifest2 = dict(GOALS={'bill': ['ben']})
+    with self.create_register(register_goals=register_goals1, manifest=manifest1) as backend1:
+      with self.create_register(register_goals=register_goals2, manifest=manifest2) as backend2:
+        deferred_backends = self.load_deferred([backend1, backend2])
+
+        # An independent goal only needs the backends declaring it.
+        deferred_backends.load_for_goals(self.build_configuration, goals=['jack'], scopes=[])
+        self.assertEqual(['jill'], Goal.by_name('jack').ordered_task_names())
+        self.assertEqual([], Goal.by_name('bill').ordered_task_names())
+
+        # Any other goal needs them all.
+        deferred_backends.load_for_goals(self.build_configuration, goals=['list'], scopes=[])
+        self.assertEqual(['ben'], Goal.by_name('bill').ordered_task_names())
+
+  def test_deferred_goals_load_order(self):
+    def register_goals1():
+      Goal.by_name('jack').install(TaskRegistrar('jill', DummyTask))
+
+    def register_goals2():
+      Goal.by_name('jack').install(TaskRegistrar('bob', DummyTask), before='jill')
+
+    # The eager backend installs its task relative to that of the deferred backend loaded before
+    # it: both must be registered in their original load order once the deferred one is loaded.
+    with self.create_register(register_goals=register_goals1,
+                              manifest=dict(GOALS={'jack': ['jill']})) as backend1:
+      with self.create_register(register_goals=register_goals2) as backend2:
+        deferred_backends = self.load_deferred([backend1, backend2])
+        self.assertEqual(['bob'], Goal.by_name('jack').ordered_task_names())
+
+        deferred_backends.load_for_goals(self.build_configuration, goals=['jack'], scopes=[])
+        self.assertEqual(['bob', 'jill'], Goal.by_name('jack').ordered_task_names())
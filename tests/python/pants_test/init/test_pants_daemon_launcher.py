@@ -5,6 +5,8 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import threading
+
 import mock
 
 from pants.init.pants_daemon_launcher import PantsDaemonLauncher
@@ -51,3 +53,21 @@ class PantsDaemonLauncherTest(BaseTest):
     self.assertEqual(mock_setup_services.call_count, 0)
     self.assertGreater(self.mock_pantsd.is_alive.call_count, 0)
     self.assertEqual(self.mock_pantsd.daemonize.call_count, 0)
+
+  def test_run_lock_mutating_run_waits_for_read_only_runs(self):
+    pdl = self.pants_daemon_launcher()
+    acquired = []
+
+    def run_compile():
+      with pdl.run_lock(['compile']):
+        acquired.append('compile')
+
+    # Runs of only read-only goals hold the lock at the same time.
+    with pdl.run_lock(['list']), pdl.run_lock(['filedeps', 'dependees']):
+      thread = threading.Thread(target=run_compile)
+      thread.start()
+      thread.join(1)
+      self.assertTrue(thread.is_alive())
+      self.assertEqual([], acquired)
+    thread.join(30)
+    self.assertEqual(['compile'], acquired)
@@ -0,0 +1,44 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import sys
+
+from pants.invalidation.build_invalidator import BuildInvalidator, CacheKey
+from pants.util.contextutil import Timer, temporary_dir
+
+
+def main():
+  """Measure the latency of invalidation checks against each BuildInvalidator store.
+
+  To run:
+
+  ./pants run tests/python/pants_test/invalidation:bench_build_invalidator -- \
+    [<number of targets> ...]
+
+  Defaults to 10k, 100k and 1M targets. For each store, all targets are first recorded as valid,
+  and then checked again from a fresh invalidator, as a no-op run would.
+  """
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+  print('{:>10} {:>10} {:>12} {:>12} {:>12}'.format(
+    'targets', 'store', 'update (s)', 'check (s)', 'us/target'))
+  for size in sizes:
+    keys = [CacheKey('src.java.org.pantsbuild.target_{}'.format(i), '{:040x}'.format(i))
+            for i in range(size)]
+    for store in BuildInvalidator.STORES:
+      with temporary_dir() as root:
+        with Timer() as update:
+          BuildInvalidator(root, store=store).update_many(keys)
+        with Timer() as check:
+          invalid = BuildInvalidator(root, store=store).needs_update_many(keys)
+        assert not any(invalid), 'Expected all {} targets to be valid.'.format(size)
+      print('{:>10} {:>10} {:>12.3f} {:>12.3f} {:>12.2f}'.format(
+        size, store, update.elapsed, check.elapsed, check.elapsed * 1000000 / size))
+
+
+if __name__ == '__main__':
+  main()
@@ -8,9 +8,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import hashlib
 import os
 import tempfile
+import unittest
 from contextlib import contextmanager
 
-from pants.invalidation.build_invalidator import BuildInvalidator, CacheKeyGenerator
+from pants.invalidation.build_invalidator import (GLOBAL_CACHE_KEY_GEN_VERSION, BuildInvalidator,
+                                                  CacheKey, CacheKeyGenerator)
 from pants.util.contextutil import temporary_dir
 
 
@@ -58,3 +60,75 @@ def test_env(content=TEST_CONTENT):
 #     assert cache.needs_update(key)
 #     cache.update(key)
 #     assert not cache.needs_update(key)
+
+
+class BuildInvalidatorTest(unittest.TestCase):
+
+  KEYS = [CacheKey('a', 'hash_a'), CacheKey('b', 'hash_b')]
+
+  def assert_invalidation(self, store):
+    with temporary_dir() as root:
+      invalidator = BuildInvalidator(root, store=store)
+      self.assertEquals([True, True], invalidator.needs_update_many(self.KEYS))
+      self.assertEquals([None, None], invalidator.previous_keys(self.KEYS))
+
+      invalidator.update_many(self.KEYS)
+      self.assertEquals([False, False], invalidator.needs_update_many(self.KEYS))
+      self.assertTrue(invalidator.needs_update(CacheKey('a', 'hash_a2')))
+      self.assertEquals(self.KEYS[0], invalidator.previous_key(CacheKey('a', 'hash_a2')))
+
+      # Keys persist across instances.
+      invalidator = BuildInvalidator(root, store=store)
+      self.assertFalse(invalidator.needs_update(self.KEYS[1]))
+
+      invalidator.force_invalidate(self.KEYS[0])
+      self.assertEquals([True, False], invalidator.needs_update_many(self.KEYS))
+
+      invalidator.force_invalidate_all()
+      self.assertEquals([True, True], invalidator.needs_update_many(self.KEYS))
+
+  def test_directory_store(self):
+    self.assert_invalidation(BuildInvalidator.DIRECTORY_STORE)
+
+  def test_sqlite_store(self):
+    self.assert_invalidation(BuildInvalidator.SQLITE_STORE)
+
+  def test_sqlite_store_batches(self):
+    keys = [CacheKey('target_{}'.format(i), 'hash_{}'.format(i)) for i in range(1234)]
+    with temporary_dir() as root:
+      invalidator = BuildInvalidator(root, store=BuildInvalidator.SQLITE_STORE)
+      invalidator.update_many(keys[::2])
+      self.assertEquals([i % 2 == 1 for i in range(len(keys))], invalidator.needs_update_many(keys))
+
+  def test_sqlite_store_imports_directory_layout(self):
+    with temporary_dir() as root:
+      BuildInvalidator(root, store=BuildInvalidator.DIRECTORY_STORE).update_many(self.KEYS)
+
+      invalidator = BuildInvalidator(root, store=BuildInvalidator.SQLITE_STORE)
+      self.assertEquals([False, False], invalidator.needs_update_many(self.KEYS))
+      # The legacy layout is removed once imported.
+      self.assertEquals([True, True],
+                        BuildInvalidator(root, store=BuildInvalidator.DIRECTORY_STORE)
+                        .needs_update_many(self.KEYS))
+
+  def test_sqlite_store_imports_newer_directory_layout(self):
+    with temporary_dir() as root:
+      BuildInvalidator(root, store=BuildInvalidator.SQLITE_STORE).update_many(self.KEYS)
+      db = os.path.join(root, '{}.db'.format(GLOBAL_CACHE_KEY_GEN_VERSION))
+      os.utime(db, (0, 0))
+
+      # Switching back to the directory store leaves a legacy layout that is newer than the rows.
+      directory = BuildInvalidator(root, store=BuildInvalidator.DIRECTORY_STORE)
+      directory.update(CacheKey('a', 'hash_a2'))
+      directory.update(CacheKey('b', 'hash_b2'))
+      legacy_b = os.path.join(root, GLOBAL_CACHE_KEY_GEN_VERSION, 'b.hash')
+      os.utime(legacy_b, (0, 0))
+
+      invalidator = BuildInvalidator(root, store=BuildInvalidator.SQLITE_STORE)
+      self.assertEquals([CacheKey('a', 'hash_a2'), self.KEYS[1]],
+                        invalidator.previous_keys(self.KEYS))
+
+  def test_unknown_store(self):
+    with temporary_dir() as root:
+      with self.assertRaises(ValueError):
+        BuildInvalidator(root, store='bogus')
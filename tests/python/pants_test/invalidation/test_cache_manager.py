@@ -97,6 +97,19 @@ class InvalidationCacheManagerTest(BaseTest):
     vts_targets = [vt.targets[0] for vt in all_vts]
     self.assertEquals(set(targets), set(vts_targets))
 
+  def test_update_many(self):
+    a = self.make_target(':a', dependencies=[])
+    b = self.make_target(':b', dependencies=[a])
+
+    ic = self.cache_manager.check([a, b])
+    self.cache_manager.update_many(ic.invalid_vts)
+    self.assertTrue(all(vt.valid for vt in ic.all_vts))
+
+    ic = self.cache_manager.check([a, b])
+    self.assertEquals([], ic.invalid_vts)
+    self.assertEquals([vt.cache_key for vt in ic.all_vts],
+                      [vt.previous_cache_key for vt in ic.all_vts])
+
   def test_force_invalidate(self):
     vt = self.make_vt()
     self.assertTrue(vt.valid)
@@ -13,7 +13,7 @@ from SocketServer import TCPServer
 import mock
 
 from pants.java.nailgun_protocol import ChunkType, NailgunProtocol
-from pants.pantsd.pailgun_server import PailgunHandler, PailgunServer
+from pants.pantsd.pailgun_server import LatencyHistogram, PailgunHandler, PailgunServer
 
 
 PATCH_OPTS = dict(autospec=True, spec_set=True)
@@ -51,20 +51,29 @@ class TestPailgunServer(unittest.TestCase):
   @mock.patch.object(PailgunServer, 'close_request', **PATCH_OPTS)
   def test_process_request(self, mock_close_request):
     mock_request = mock.Mock()
-    self.server.process_request(mock_request, ('1.2.3.4', 31338))
+    self.server.process_request(mock_request, ('1.2.3.4', 31338)).join()
     self.assertIs(self.mock_handler_inst.handle_request.called, True)
     mock_close_request.assert_called_once_with(self.server, mock_request)
+    self.assertRegexpMatches(str(self.server.latencies), r'^<=\d+ms: 1$')
 
   @mock.patch.object(PailgunServer, 'shutdown_request', **PATCH_OPTS)
   def test_process_request_error(self, mock_shutdown_request):
     mock_request = mock.Mock()
     self.mock_handler_inst.handle_request.side_effect = AttributeError('oops')
-    self.server.process_request(mock_request, ('1.2.3.4', 31338))
+    self.server.process_request_thread(mock_request, ('1.2.3.4', 31338))
     self.assertIs(self.mock_handler_inst.handle_request.called, True)
     self.assertIs(self.mock_handler_inst.handle_error.called, True)
     mock_shutdown_request.assert_called_once_with(self.server, mock_request)
 
 
+class TestLatencyHistogram(unittest.TestCase):
+  def test_buckets(self):
+    histogram = LatencyHistogram()
+    for secs in (0.0005, 0.001, 0.003, 0.004, 1.5):
+      histogram.record(secs)
+    self.assertEqual('<=1ms: 2, <=4ms: 2, <=2048ms: 1', str(histogram))
+
+
 class TestPailgunHandler(unittest.TestCase):
   def setUp(self):
     self.client_sock, self.server_sock = socket.socketpair()
@@ -82,6 +91,24 @@ class TestPailgunHandler(unittest.TestCase):
     self.assertEquals(last_chunk_type, ChunkType.EXIT)
     self.assertEquals(bytes(last_payload), '1')
 
+  def test_run_pants_forks_under_context_lock(self):
+    locked = []
+
+    @contextmanager
+    def context_lock():
+      locked.append(True)
+      yield
+      locked.append(False)
+
+    mock_runner = mock.Mock()
+    mock_runner.run.side_effect = lambda: self.assertEqual([True], locked)
+    mock_server = mock.Mock(context_lock=context_lock)
+    mock_server.runner_factory.return_value = mock_runner
+    handler = PailgunHandler(self.server_sock, self.client_sock.getsockname()[:2], mock_server)
+    handler._run_pants(self.server_sock, ['./pants'], {})
+    self.assertIs(mock_runner.run.called, True)
+    self.assertEqual([True, False], locked)
+
   @mock.patch.object(PailgunHandler, '_run_pants', **PATCH_OPTS)
   def test_handle_request(self, mock_run_pants):
     NailgunProtocol.send_request(self.client_sock, '/test', './pants', 'help-advanced')
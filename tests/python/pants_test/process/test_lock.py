@@ -12,7 +12,7 @@ import unittest
 from multiprocessing import Manager, Process
 from threading import Thread
 
-from pants.process.lock import OwnerPrintingInterProcessFileLock
+from pants.process.lock import OwnerPrintingInterProcessFileLock, SharedExclusiveFileLock
 
 
 def hold_lock_until_terminate(path, lock_held, terminate):
@@ -97,3 +97,37 @@ class TestOwnerPrintingInterProcessFileLock(unittest.TestCase):
     self.assertTrue(self.lock.acquired)
     self.lock.release()
     self.assertFalse(self.lock.acquired)
+
+
+class TestSharedExclusiveFileLock(unittest.TestCase):
+  def setUp(self):
+    self.lock_dir = tempfile.mkdtemp()
+    self.lock = SharedExclusiveFileLock(os.path.join(self.lock_dir, 'dir', 'lock'))
+    self.messages = []
+
+  def tearDown(self):
+    shutil.rmtree(self.lock_dir)
+
+  def test_shared_holders_concurrent(self):
+    with self.lock.shared(message_fn=self.messages.append):
+      with self.lock.shared(message_fn=self.messages.append):
+        pass
+    self.assertEqual([], self.messages)
+
+  def test_exclusive_waits_for_shared(self):
+    acquired = []
+
+    def acquire_exclusive():
+      with self.lock.exclusive(message_fn=self.messages.append):
+        acquired.append(True)
+
+    with self.lock.shared():
+      thread = Thread(target=acquire_exclusive)
+      thread.start()
+      thread.join(1)
+      self.assertTrue(thread.is_alive())
+      self.assertEqual([], acquired)
+    thread.join(30)
+    self.assertEqual([True], acquired)
+    self.assertEqual(1, len(self.messages))
+    self.assertIn('waiting for an exclusive file lock', self.messages[0])
@@ -0,0 +1,74 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import sys
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.reporting.report import Report
+from pants.reporting.trace_event_reporter import TraceEventReporter
+from pants.util.contextutil import Timer, temporary_dir
+
+
+def _run(report, run_info_dir, num_targets):
+  """Starts and ends the workunits of a compile of `num_targets` targets, as the RunTracker does."""
+  with Timer() as timer:
+    main = WorkUnit(run_info_dir=run_info_dir, parent=None, name='main')
+    main.start()
+    report.start_workunit(main)
+    compile = WorkUnit(run_info_dir=run_info_dir, parent=main, name='compile',
+                       labels=[WorkUnitLabel.TASK])
+    compile.start()
+    report.start_workunit(compile)
+    for i in range(num_targets):
+      workunit = WorkUnit(run_info_dir=run_info_dir, parent=compile, name='t{}'.format(i),
+                          labels=[WorkUnitLabel.COMPILER])
+      workunit.start()
+      report.start_workunit(workunit)
+      workunit.set_outcome(WorkUnit.SUCCESS)
+      report.end_workunit(workunit)
+      workunit.end()
+    for workunit in (compile, main):
+      workunit.set_outcome(WorkUnit.SUCCESS)
+      report.end_workunit(workunit)
+      workunit.end()
+  return timer.elapsed
+
+
+def main():
+  """Measure the time that streaming trace events adds to reporting the workunits of a compile.
+
+  To run:
+
+  ./pants run tests/python/pants_test/reporting:bench_trace_event_reporter -- [<number of targets>]
+
+  Each target is compiled in a workunit that does no work, so the cost of reporting is compared
+  against that of the workunit bookkeeping alone rather than against that of a real compile.
+  """
+  num_targets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+  with temporary_dir() as tmpdir:
+    baseline = _run(Report(), tmpdir, num_targets)
+
+    report = Report()
+    settings = TraceEventReporter.Settings(log_level=Report.INFO,
+                                           trace_file=os.path.join(tmpdir, 'trace.json'),
+                                           buffer_size=4096)
+    reporter = TraceEventReporter(run_tracker=None, settings=settings)
+    report.add_reporter('trace', reporter)
+    reporter.open()
+    traced = _run(report, tmpdir, num_targets)
+    reporter.close()
+    trace_size = os.path.getsize(settings.trace_file)
+
+  print('{} workunits:'.format(num_targets + 2))
+  print('  without trace events: {:.3f}s'.format(baseline))
+  print('  with trace events:    {:.3f}s ({:.1f}us per workunit, {} bytes written)'.format(
+    traced, (traced - baseline) * 1000000 / (num_targets + 2), trace_size))
+
+
+if __name__ == '__main__':
+  main()
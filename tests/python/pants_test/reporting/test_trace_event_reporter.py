@@ -0,0 +1,90 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import os
+import threading
+import unittest
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.reporting.report import Report
+from pants.reporting.trace_event_reporter import TraceEventReporter
+from pants.util.contextutil import temporary_dir
+
+
+class TraceEventReporterTest(unittest.TestCase):
+
+  def reporter(self, tmpdir, buffer_size=1000):
+    trace_file = os.path.join(tmpdir, 'reports', 'trace.json')
+    settings = TraceEventReporter.Settings(log_level=Report.INFO, trace_file=trace_file,
+                                           buffer_size=buffer_size)
+    return TraceEventReporter(run_tracker=None, settings=settings), trace_file
+
+  def run_workunit(self, reporter, tmpdir, parent, name, labels=None):
+    workunit = WorkUnit(run_info_dir=tmpdir, parent=parent, name=name, labels=labels)
+    workunit.start()
+    reporter.start_workunit(workunit)
+    return workunit
+
+  def end_workunit(self, reporter, workunit):
+    workunit.set_outcome(WorkUnit.SUCCESS)
+    reporter.end_workunit(workunit)
+    workunit.end()
+
+  def load_events(self, trace_file):
+    with open(trace_file) as fp:
+      return json.load(fp)['traceEvents']
+
+  def test_trace_events(self):
+    with temporary_dir() as tmpdir:
+      reporter, trace_file = self.reporter(tmpdir, buffer_size=2)
+      reporter.open()
+      main = self.run_workunit(reporter, tmpdir, None, 'main')
+      compile = self.run_workunit(reporter, tmpdir, main, 'compile', labels=[WorkUnitLabel.TASK])
+
+      def work():
+        self.end_workunit(reporter, self.run_workunit(reporter, tmpdir, compile, 'zinc'))
+      worker = threading.Thread(target=work, name='worker')
+      worker.start()
+      worker.join()
+
+      self.end_workunit(reporter, compile)
+      self.end_workunit(reporter, main)
+      reporter.close()
+
+      events = self.load_events(trace_file)
+      self.assertEqual(['process_name', 'thread_name', 'main', 'compile', 'thread_name', 'zinc',
+                        None, None, None],
+                       [event.get('name') for event in events])
+      self.assertEqual([threading.current_thread().name, 'worker'],
+                       [event['args']['name'] for event in events
+                        if event.get('name') == 'thread_name'])
+
+      main_tid = events[1]['tid']
+      worker_tid = events[4]['tid']
+      self.assertNotEqual(main_tid, worker_tid)
+      self.assertEqual([('B', main_tid), ('B', main_tid), ('B', worker_tid), ('E', worker_tid),
+                        ('E', main_tid), ('E', main_tid)],
+                       [(event['ph'], event['tid']) for event in events[2:] if event['ph'] != 'M'])
+      self.assertEqual('TASK', events[3]['cat'])
+      self.assertEqual('SUCCESS', events[-1]['args']['outcome'])
+      self.assertLessEqual(events[2]['ts'], events[-1]['ts'])
+
+  def test_buffered(self):
+    with temporary_dir() as tmpdir:
+      reporter, trace_file = self.reporter(tmpdir, buffer_size=3)
+      reporter.open()
+      with open(trace_file) as fp:
+        self.assertEqual('{"displayTimeUnit": "ms", "traceEvents": [\n', fp.read())
+
+      main = self.run_workunit(reporter, tmpdir, None, 'main')
+      self.run_workunit(reporter, tmpdir, main, 'compile')
+      # The events of a run that never closes its report are still loadable, by closing the array.
+      with open(trace_file) as fp:
+        events = json.loads(fp.read() + ']}')
+      self.assertEqual(['process_name', 'thread_name', 'main'],
+                       [event['name'] for event in events['traceEvents']])
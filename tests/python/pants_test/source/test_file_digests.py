@@ -0,0 +1,81 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import time
+import unittest
+
+from pants.base.hash_utils import hash_file
+from pants.source.file_digests import FileDigestCache
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class CountingFileDigestCache(FileDigestCache):
+  def __init__(self, *args, **kwargs):
+    super(CountingFileDigestCache, self).__init__(*args, **kwargs)
+    self.hashed = []
+
+  def _hash_files(self, paths):
+    self.hashed.extend(paths)
+    return super(CountingFileDigestCache, self)._hash_files(paths)
+
+
+class FileDigestCacheTest(unittest.TestCase):
+  def _write(self, path, content, age_secs=60):
+    safe_file_dump(path, content)
+    # Age the file beyond the racy window, unless told otherwise.
+    mtime = time.time() - age_secs
+    os.utime(path, (mtime, mtime))
+    return path
+
+  def test_digest_many(self):
+    with temporary_dir() as root:
+      paths = [self._write(os.path.join(root, str(i)), 'content {}'.format(i)) for i in range(20)]
+      cache = FileDigestCache(workers=4)
+      self.assertEqual([hash_file(path) for path in paths], cache.digest_many(paths))
+      self.assertEqual(hash_file(paths[3]), cache.digest(paths[3]))
+
+  def test_unchanged_files_not_reread(self):
+    with temporary_dir() as root:
+      a = self._write(os.path.join(root, 'a'), 'a')
+      b = self._write(os.path.join(root, 'b'), 'b')
+      cache = CountingFileDigestCache()
+      cache.digest_many([a, b])
+      self.assertEqual([a, b], cache.hashed)
+
+      del cache.hashed[:]
+      self._write(b, 'bb', age_secs=30)
+      self.assertEqual([hash_file(a), hash_file(b)], cache.digest_many([a, b]))
+      self.assertEqual([b], cache.hashed)
+
+  def test_recently_modified_files_not_memoized(self):
+    with temporary_dir() as root:
+      path = self._write(os.path.join(root, 'a'), 'a', age_secs=0)
+      cache = CountingFileDigestCache()
+      cache.digest(path)
+      cache.digest(path)
+      self.assertEqual([path, path], cache.hashed)
+
+  def test_persisted_across_instances(self):
+    with temporary_dir() as root:
+      db = os.path.join(root, 'digests.db')
+      path = self._write(os.path.join(root, 'a'), 'a')
+      first = CountingFileDigestCache(path=db)
+      first.digest(path)
+      self.assertEqual([path], first.hashed)
+
+      second = CountingFileDigestCache(path=db)
+      self.assertEqual(hash_file(path), second.digest(path))
+      self.assertEqual([], second.hashed)
+
+  def test_unusable_database_not_persisted(self):
+    with temporary_dir() as root:
+      db = os.path.join(root, 'digests.db')
+      safe_file_dump(db, 'not a database')
+      path = self._write(os.path.join(root, 'a'), 'a')
+      self.assertEqual(hash_file(path), FileDigestCache(path=db).digest(path))
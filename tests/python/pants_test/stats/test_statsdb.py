@@ -8,7 +8,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import os
 import unittest
 
-from pants.stats.statsdb import StatsDB
+from pants.stats.statsdb import StatsDB, StatsDBError
 from pants.util.contextutil import temporary_dir
 
 
@@ -67,3 +67,75 @@ class StatsDBTest(unittest.TestCase):
       self.assertEqual(
         sorted([('2015-08-03', 'compile.java', 2, 21340), ('2015-08-03', 'resolve.ivy', 1, 56000)]),
         sorted(aggs))
+
+  def insert_run(self, statsdb, run_id, timestamp, self_timings, target_data=None,
+                 artifact_cache_stats=None):
+    run_info = {
+      'id': run_id,
+      'timestamp': str(timestamp),
+      'machine': 'ernie',
+      'user': 'bert',
+      'version': '9.8.7',
+      'buildroot': '/path/to/repo',
+      'outcome': 'SUCCESS',
+      'cmd_line': 'pants compile baz:qux'
+    }
+    if target_data:
+      run_info['target_data'] = target_data
+    statsdb.insert_stats({
+      'run_info': run_info,
+      'cumulative_timings': [],
+      'self_timings': self_timings,
+      'artifact_cache_stats': artifact_cache_stats or [],
+    })
+
+  def test_percentiles(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i in range(10):
+        self.insert_run(statsdb, 'run{}'.format(i), 1000 + i,
+                        [t('compile.zinc', i + 1), t('resolve.ivy', 2)])
+
+      self.assertEqual([('compile.zinc', 10, (1000, 5000, 9000, 10000)),
+                        ('resolve.ivy', 10, (2000, 2000, 2000, 2000))],
+                       list(statsdb.get_percentiles('self_timings', [0, 50, 90, 100])))
+      self.assertEqual([('compile.zinc', 3, (5000, 6000))],
+                       list(statsdb.get_percentiles('self_timings', [50, 100], since=1003,
+                                                    until=1006, label_like='compile.%')))
+
+  def test_regressions(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i, (zinc, ivy) in enumerate([(1, 2), (1, 2), (3, 2), (4, 2.1)]):
+        self.insert_run(statsdb, 'run{}'.format(i), 1000 + i,
+                        [t('compile.zinc', zinc), t('resolve.ivy', ivy)],
+                        target_data={'a:a': {'compile.zinc': {'compile': {'run_time': zinc,
+                                                                          'queue_wait': 0.5}},
+                                             'GLOBAL': {'target_type': 'java_library'}}})
+
+      self.assertEqual(
+        [('compile.zinc', 1000, 3000, 3.0)],
+        statsdb.get_regressions('self_timings', (1000, 1002), (1002, 1004), percentile=0))
+      self.assertEqual(
+        [('a:a', 1000, 3000, 3.0)],
+        statsdb.get_regressions('target_timings', (1000, 1002), (1002, 1004), percentile=0,
+                                label_like='compile.run_time'))
+      self.assertEqual(
+        [], statsdb.get_regressions('self_timings', (1000, 1002), (1002, 1004), min_runs=3))
+      with self.assertRaises(StatsDBError):
+        statsdb.get_regressions('run_info', (1000, 1002), (1002, 1004))
+
+  def test_cache_stats(self):
+    with temporary_dir() as tmpdir:
+      statsdb = StatsDB(os.path.join(tmpdir, 'statsdb.sqlite'))
+      statsdb.ensure_tables()
+      for i in range(3):
+        self.insert_run(statsdb, 'run{}'.format(i), 1000 + i, [],
+                        artifact_cache_stats=[{'cache_name': 'compile.zinc', 'num_hits': i,
+                                               'num_misses': 1, 'hits': [], 'misses': []}])
+
+      self.assertEqual([('compile.zinc', 3, 3)], list(statsdb.get_cache_stats()))
+      self.assertEqual([('compile.zinc', 1, 1)], list(statsdb.get_cache_stats(since=1001,
+                                                                             until=1002)))
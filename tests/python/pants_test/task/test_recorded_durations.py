@@ -0,0 +1,99 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.task.recorded_durations import RecordedDurations
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class RecordedDurationsTest(unittest.TestCase):
+  def test_no_durations(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      self.assertIsNone(durations.get('A'))
+      self.assertEqual({'A': 0, 'B': 0}, durations.estimates(['A', 'B']))
+      self.assertEqual(['B', 'A'], durations.longest_first(['B', 'A']))
+
+  def test_durations_persisted(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'nested', 'durations.json')
+      durations = RecordedDurations(path)
+      durations.record('A', 2.0)
+      durations.record('B', 1.0)
+      self.assertIsNone(RecordedDurations(path).get('A'))
+
+      durations.save()
+      durations = RecordedDurations(path)
+      self.assertEqual(2.0, durations.get('A'))
+      self.assertEqual(1.0, durations.get('B'))
+
+  def test_durations_smoothed(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      durations.record('A', 2.0)
+      durations.record('A', 4.0)
+      self.assertEqual(3.0, durations.get('A'))
+
+  def test_unrecorded_estimated_as_typical(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      for key, duration in (('A', 1.0), ('B', 5.0), ('C', 9.0)):
+        durations.record(key, duration)
+      self.assertEqual({'A': 1.0, 'D': 5.0}, durations.estimates(['A', 'D']))
+
+  def test_longest_first(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      durations.record('a', 1.0)
+      durations.record('b', 3.0)
+      items = [('a',), ('b',), ('c',), ('d',)]
+      # Unrecorded items are estimated at the median recorded duration and keep their order.
+      self.assertEqual([('b',), ('c',), ('d',), ('a',)],
+                       durations.longest_first(items, key=lambda item: item[0]))
+
+  def test_balance(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      for key, duration in (('a', 7.0), ('b', 5.0), ('c', 4.0), ('d', 3.0), ('e', 1.0)):
+        durations.record(key, duration)
+      self.assertEqual([['a'], ['c', 'd'], ['b', 'e']],
+                       durations.balance(['a', 'b', 'c', 'd', 'e'], 3))
+      self.assertEqual([['a', 'd'], ['b', 'c', 'e']], durations.balance(['a', 'b', 'c', 'd', 'e'], 2))
+
+  def test_balance_max_size(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      durations.record('a', 10.0)
+      batches = durations.balance(['a', 'b', 'c', 'd', 'e'], 1, max_size=2)
+      self.assertEqual(3, len(batches))
+      self.assertTrue(all(len(batch) <= 2 for batch in batches))
+      self.assertEqual(['a', 'b', 'c', 'd', 'e'], sorted(sum(batches, [])))
+
+  def test_balance_without_durations(self):
+    with temporary_dir() as workdir:
+      durations = RecordedDurations(os.path.join(workdir, 'durations.json'))
+      self.assertEqual([['a', 'c'], ['b', 'd']], durations.balance(['a', 'b', 'c', 'd'], 2))
+      self.assertEqual([['a']], durations.balance(['a'], 4))
+      self.assertEqual([], durations.balance([], 4))
+
+  def test_unreadable_durations_ignored(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'durations.json')
+      safe_file_dump(path, 'not json')
+      self.assertIsNone(RecordedDurations(path).get('A'))
+
+  def test_save_failure_logged(self):
+    with temporary_dir() as workdir:
+      blocker = os.path.join(workdir, 'blocker')
+      safe_file_dump(blocker, 'not a dir')
+      durations = RecordedDurations(os.path.join(blocker, 'durations.json'))
+      durations.record('A', 1.0)
+      durations.save()
+      self.assertEqual(1.0, durations.get('A'))
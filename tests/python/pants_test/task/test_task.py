@@ -11,8 +11,9 @@ from pants.base.build_environment import get_buildroot
 from pants.base.payload import Payload
 from pants.build_graph.target import Target
 from pants.cache.cache_setup import CacheSetup
+from pants.invalidation.build_invalidator import CacheKey
 from pants.task.task import Task
-from pants.util.dirutil import safe_rmtree
+from pants.util.dirutil import safe_file_dump, safe_rmtree
 from pants_test.tasks.task_test_base import TaskTestBase
 
 
@@ -273,3 +274,17 @@ class TaskTest(TaskTestBase):
     vtC_live = list(vtC.live_dirs())
     self.assertNotIn(vtB.current_results_dir, vtC_live)
     self.assertEqual(len(vtC_live), 2)
+
+  def test_artifact_cache_for_keys(self):
+    self._toggle_cache(enable_artifact_cache=True)
+    task, _ = self._fixture(incremental=False)
+    cache_key = CacheKey('dummy.result', '0123456789ab')
+    result = os.path.join(task.workdir, 'results', 'result.txt')
+    safe_file_dump(result, self._file_contents)
+    self.assertEqual([False], task.fetch_cached_artifacts([cache_key]))
+
+    task.update_artifact_cache_for_keys([(cache_key, [result])])
+    os.unlink(result)
+    self.assertEqual([True], task.fetch_cached_artifacts([cache_key]))
+    with open(result, 'r') as f:
+      self.assertEqual(self._file_contents, f.read())
@@ -0,0 +1,102 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import random
+import sys
+from heapq import heappop, heappush
+
+from pants.backend.jvm.tasks.jvm_compile.execution_graph import ExecutionGraph, Job
+from pants.backend.jvm.tasks.jvm_compile.execution_history import ExecutionHistory
+
+
+def simulate(exec_graph, jobs, durations, num_workers):
+  """Returns the makespan of executing the given graph, when each job takes its given duration."""
+  pending = {job.key: len(job.dependencies) for job in jobs}
+  dependees = {job.key: [] for job in jobs}
+  for job in jobs:
+    for dependency in job.dependencies:
+      dependees[dependency].append(job.key)
+
+  ready = []
+  running = []
+  now = 0.0
+
+  def make_ready(keys):
+    for key in keys:
+      heappush(ready, (-exec_graph._job_priority[key], key))
+
+  make_ready(key for key, count in pending.items() if count == 0)
+  while ready or running:
+    while ready and len(running) < num_workers:
+      _, key = heappop(ready)
+      heappush(running, (now + durations[key], key))
+    now, key = heappop(running)
+    for dependee in dependees[key]:
+      pending[dependee] -= 1
+      if pending[dependee] == 0:
+        make_ready([dependee])
+  return now
+
+
+def recorded_graph(path):
+  """Loads the jobs and durations of a recorded ExecutionHistory."""
+  history = ExecutionHistory(path)
+  recorded = {key: entry for key, entry in history.jobs.items() if 'duration' in entry}
+  jobs = [Job(key, None, [dep for dep in entry['dependencies'] if dep in recorded], entry['size'])
+          for key, entry in recorded.items()]
+  return jobs, {key: entry['duration'] for key, entry in recorded.items()}
+
+
+def synthetic_graph(num_jobs, seed=0):
+  """Generates a graph of jobs whose sizes are only loosely correlated with durations."""
+  rng = random.Random(seed)
+  jobs = []
+  durations = {}
+  for i in range(num_jobs):
+    key = 'job_{}'.format(i)
+    # Depending mostly on recent jobs gives the graph long chains, as in a real build.
+    dependencies = sorted(set('job_{}'.format(rng.randrange(max(0, i - 50), i))
+                              for _ in range(min(i, 3))))
+    durations[key] = rng.lognormvariate(0, 1)
+    size = int(durations[key] * rng.lognormvariate(0, 1.5) * 1000)
+    jobs.append(Job(key, None, dependencies, size))
+  return jobs, durations
+
+
+def main():
+  """Compare the makespan of a compile graph when prioritized by size estimates vs. durations.
+
+  To run:
+
+  ./pants run tests/python/pants_test/tasks:bench_execution_graph -- \
+    [<number of workers>] [<recorded execution_history.json, or number of synthetic jobs>]
+
+  A recorded history is found under the workdir of a compile task, e.g.:
+  .pants.d/compile/zinc/execution_history.json. Each job is simulated to take its recorded
+  duration. The durations that prioritize the jobs are the same durations being simulated, so the
+  result is the best case for a history that is up to date.
+  """
+  num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+  source = sys.argv[2] if len(sys.argv) > 2 else '2000'
+  if source.isdigit():
+    jobs, durations = synthetic_graph(int(source))
+  else:
+    jobs, durations = recorded_graph(source)
+
+  by_size = simulate(ExecutionGraph(jobs), jobs, durations, num_workers)
+  by_duration = simulate(ExecutionGraph(jobs, job_weights=durations), jobs, durations, num_workers)
+  lower_bound = max(sum(durations.values()) / num_workers,
+                    max(ExecutionGraph(jobs, job_weights=durations)._job_priority.values()))
+
+  print('{} jobs on {} workers, simulated makespan:'.format(len(jobs), num_workers))
+  print('  prioritized by size:     {:.2f}s'.format(by_size))
+  print('  prioritized by duration: {:.2f}s'.format(by_duration))
+  print('  lower bound:             {:.2f}s'.format(lower_bound))
+
+
+if __name__ == '__main__':
+  main()
@@ -5,18 +5,31 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import time
 import unittest
+from contextlib import contextmanager
 
 from pants.backend.jvm.tasks.jvm_compile.execution_graph import (ExecutionFailure, ExecutionGraph,
                                                                  Job, JobExistsError,
                                                                  NoRootJobError, UnknownJobError)
+from pants.base.worker_pool import WorkerPool
 
 
 class ImmediatelyExecutingPool(object):
   num_workers = 1
 
-  def submit_async_work(self, work):
-    work.func(*work.args_tuples[0])
+  def submit_async_call(self, func, *args):
+    func(*args)
+
+
+class FakeRunTracker(object):
+
+  def register_thread(self, parent_workunit):
+    pass
+
+  @contextmanager
+  def thread_working(self):
+    yield
 
 
 class PrintLogger(object):
@@ -249,6 +262,23 @@ class ExecutionGraphTest(unittest.TestCase):
     self.execute(exec_graph)
     self.assertEqual(self.jobs_run, ["A", "D", "B", "C", "E"])
 
+  def test_priorities_for_job_weights(self):
+    exec_graph = ExecutionGraph([self.job("A", passing_fn, [], 4),
+                                 self.job("B", passing_fn, ["A"], 1),
+                                 self.job("C", passing_fn, ["A"], 2)],
+                                job_weights={"A": 1, "B": 8, "C": 3})
+    self.assertEqual(exec_graph._job_priority, {"A": 9, "B": 8, "C": 3})
+    self.execute(exec_graph)
+    self.assertEqual(self.jobs_run, ["A", "B", "C"])
+
+  def test_durations_of_successful_jobs(self):
+    exec_graph = ExecutionGraph([self.job("A", passing_fn, []),
+                                 self.job("B", raising_fn, ["A"]),
+                                 self.job("C", passing_fn, ["A"])])
+    with self.assertRaises(ExecutionFailure):
+      self.execute(exec_graph)
+    self.assertEqual({"A", "C"}, set(exec_graph.job_durations))
+
   def test_jobs_not_canceled_multiple_times(self):
     failures = list()
 
@@ -272,3 +302,41 @@ class ExecutionGraphTest(unittest.TestCase):
 
     self.assertEqual(self.jobs_run, ['A'])
     self.assertEqual(failures, ['A', 'B1', 'B2', 'C1', 'C2', 'E'])
+
+  def test_workers_refill_their_own_slots(self):
+    def sleeping_fn(secs):
+      return lambda: time.sleep(secs)
+
+    jobs = [self.job("long", sleeping_fn(0.5), [], 10)]
+    jobs.extend(self.job("short{}".format(i), sleeping_fn(0.02), [], 1) for i in range(10))
+    exec_graph = ExecutionGraph(jobs)
+
+    pool = WorkerPool(None, FakeRunTracker(), 2)
+    try:
+      start = time.time()
+      exec_graph.execute(pool, PrintLogger())
+      elapsed = time.time() - start
+    finally:
+      pool.shutdown()
+
+    # The short jobs all run in the second slot while the long job runs in the first.
+    self.assertLess(elapsed, 2)
+    self.assertEqual("long", self.jobs_run[0])
+    self.assertEqual(set(job.key for job in jobs), set(exec_graph.job_queue_waits))
+    self.assertGreaterEqual(exec_graph.job_durations["long"], 0.5)
+
+  def test_queue_waits_measured_from_ready(self):
+    jobs = [self.job("A{}".format(i), lambda: time.sleep(0.1), [], 1) for i in range(3)]
+    exec_graph = ExecutionGraph(jobs)
+
+    pool = WorkerPool(None, FakeRunTracker(), 1)
+    try:
+      exec_graph.execute(pool, PrintLogger())
+    finally:
+      pool.shutdown()
+
+    # With a single worker, each job after the first waited for those before it to run.
+    waits = sorted(exec_graph.job_queue_waits.values())
+    self.assertLess(waits[0], 0.1)
+    self.assertGreaterEqual(waits[1], 0.09)
+    self.assertGreaterEqual(waits[2], 0.18)
@@ -0,0 +1,64 @@
+# coding=utf-8
+# Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.backend.jvm.tasks.jvm_compile.execution_graph import Job
+from pants.backend.jvm.tasks.jvm_compile.execution_history import ExecutionHistory
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+def job(key, dependencies=(), size=0):
+  return Job(key, lambda: None, list(dependencies), size)
+
+
+class ExecutionHistoryTest(unittest.TestCase):
+  def test_sizes_used_without_durations(self):
+    with temporary_dir() as workdir:
+      history = ExecutionHistory(os.path.join(workdir, 'history.json'))
+      jobs = [job('A', size=10), job('B', ['A'], size=20)]
+      self.assertEqual({'A': 10, 'B': 20}, history.weights_for(jobs))
+
+  def test_durations_persisted(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'history.json')
+      jobs = [job('A', size=10), job('B', ['A'], size=20)]
+      ExecutionHistory(path).record_jobs(jobs, {'A': 2.0, 'B': 1.0})
+
+      history = ExecutionHistory(path)
+      self.assertEqual({'A': 2.0, 'B': 1.0}, history.weights_for(jobs))
+      self.assertEqual({'size': 20, 'dependencies': ['A'], 'duration': 1.0}, history.jobs['B'])
+
+  def test_durations_smoothed(self):
+    with temporary_dir() as workdir:
+      history = ExecutionHistory(os.path.join(workdir, 'history.json'))
+      jobs = [job('A')]
+      history.record_jobs(jobs, {'A': 2.0})
+      history.record_jobs(jobs, {'A': 4.0})
+      history.record_jobs(jobs, {})
+      self.assertEqual({'A': 3.0}, history.weights_for(jobs))
+
+  def test_unknown_jobs_scaled_from_sizes(self):
+    with temporary_dir() as workdir:
+      history = ExecutionHistory(os.path.join(workdir, 'history.json'))
+      history.record_jobs([job('A', size=10), job('B', size=100)], {'A': 1.0, 'B': 10.0})
+      weights = history.weights_for([job('A', size=10), job('C', size=50)])
+      self.assertEqual({'A': 1.0, 'C': 5.0}, weights)
+
+  def test_unknown_jobs_without_sizes(self):
+    with temporary_dir() as workdir:
+      history = ExecutionHistory(os.path.join(workdir, 'history.json'))
+      history.record_jobs([job('A'), job('B'), job('C')], {'A': 1.0, 'B': 3.0, 'C': 5.0})
+      self.assertEqual({'A': 1.0, 'D': 3.0}, history.weights_for([job('A'), job('D')]))
+
+  def test_unreadable_history_ignored(self):
+    with temporary_dir() as workdir:
+      path = os.path.join(workdir, 'history.json')
+      safe_file_dump(path, '{not json')
+      self.assertEqual({}, ExecutionHistory(path).jobs)